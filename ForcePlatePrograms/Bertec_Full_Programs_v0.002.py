@@ -3,19 +3,25 @@ import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.ticker import MaxNLocator
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
-import seaborn as sns
 from PyQt5.QtWidgets import (QMainWindow, QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-                             QLabel, QComboBox, QPushButton, QTableWidget, QTableWidgetItem,
-                             QHeaderView, QFileDialog, QInputDialog, QMessageBox) 
-from PyQt5.QtCore import Qt
+                             QLabel, QComboBox, QCheckBox, QPushButton, QTableWidget,
+                             QHeaderView, QFileDialog, QInputDialog) 
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
-from scipy.integrate import (cumulative_trapezoid as int_cumtrapz, trapezoid as int_trapz)
 import qdarktheme
 from win32api import GetSystemMetrics
 
+# shared analysis code lives in the biomech package at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from biomech import analyses, forceplate, live, profiling, segment, session, streaming, watch
+from biomech.registry import AthleteRegistry
+from biomech.filtering import lowpass
+from biomech.overlay import TrialOverlay
+from biomech.ragged import RaggedBuffer
+from biomech.qt_table import fill_table
+
 
 ##### defining global constants
 custom_theme = {"axes.spines.right": False, "axes.spines.top": False,
@@ -33,6 +39,35 @@ plt.rcParams.update({
     "axes.titlecolor": "white"    # white title label
 })
 
+# optional zero lag low-pass applied to every Fz column before analysis (Hz),
+# None analyses the raw plate data as before
+FZ_FILTER_CUTOFF = None
+
+# per-trial stage timings (read, filter, integrate, events, table, plot...) are appended
+# here as JSON lines and shown in each window's status bar; None turns the log off
+TIMING_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "forceplate_timings.jsonl")
+
+# body mass and box height per athlete for the drop tests, matched on the first token of
+# the file name (see biomech/registry.py); without this file the window asks once for
+# one mass/box height, athletes missing from it are asked for once each
+ATHLETE_REGISTRY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "athletes.csv")
+
+# live mode: Fz frames (float32, LIVE_CHANNELS per sample, left then right plate) from a
+# UDP port or TCP server, see biomech/live.py for the packet layout
+LIVE_PROTOCOL = 'udp'
+LIVE_HOST = "127.0.0.1"
+LIVE_PORT = 5005
+LIVE_CHANNELS = 2
+LIVE_SF = 1000  # Hz
+LIVE_FPS = 30  # scrolling plot refreshes per second
+
+# watch folder: trials exported into the chosen folder are analysed in WATCH_WORKERS
+# processes (None for one per CPU) once their size has been stable for WATCH_SETTLE s,
+# and each one is also saved to WATCH_STORE (SQLite or CSV, None for none)
+WATCH_SETTLE = 1.0
+WATCH_WORKERS = None
+WATCH_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "watched_results.db")
+
 # define style sheet for hte table
 TABLE_STYLE =  """
 QTableWidget {
@@ -52,320 +87,17 @@ QScrollBar:horizontal, QScrollBar:vertical {
     }
 """
 
-## global constants
-# dictionary for single leg jump variables
-singleplate_slj_vars_dict = { 
-    "bodymass": "Body Mass (kg)", 
-    "jh_cm": "Jump Height (cm)", 
-    "mrsi": "Modified Reactive Strength Index (AU)",
-    "con_peak_power": "Concentric Peak Power (W)", 
-    "ecc_peak_power": "Eccentric Peak Power (W)",
-    "land_peak_power": "Landing Peak Power (W)",
-    "con_mean_power":"Concentric Mean Power (W)",
-    "ecc_mean_power": "Eccentric Mean Power (W)",
-    "land_mean_power": "Landing Mean Power (W)", 
-    "con_peak_force_n": "Concentric Peak Force (N)", 
-    "con_peak_force_nkg": 'Concentric Peak Force (N\u2022kg\u207B\u00B9)',
-    "ecc_peak_force_n": "Eccentric Peak Force (N)",
-    "ecc_peak_force_nkg": "Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "con_mean_force_n": "Concentric Mean Force (N)",
-    "con_mean_force_nkg": "Concentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "ecc_mean_force_n": "Eccentric Mean Force (N)",
-    "ecc_mean_force_nkg": "Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "land_peak_force_n": "Landing Peak Force (N)",
-    "land_peak_force_nkg": "Landing Peak Force (N\u2022kg\u207B\u00B9)",
-    "land_mean_force_n": "Landing Mean Force (N)",
-    "land_mean_force_nkg": "Landing Mean Force (N\u2022kg\u207B\u00B9)",
-    "con_impulse": "Concentric Impulse (Ns)",
-    "ecc_impulse": "Eccentric Impulse (Ns)",
-    "positive_impulse": "Positive Impulse (Ns)",
-    "land_impulse": "Landing Impulse (Ns)",
-    "con_rfd": "Concentric Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "ecc_rfd": "Eccentric Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "land_rfd": "Landing Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "unweigh_dur": "Unweighing Phase Duration (s)",
-    "ecc_time_s": "Eccentric Phase Duration (s)",
-    "con_time_s": "Concentric Phase Duration (s)",
-    "contraction_time_s": "Contraction Duration (s)",
-    "flight_time_s": "Flight Time (s)",
-    "land_time_s": "Landing Phase Duration (s)",
-    "con_peak_velocity": "Concentric Peak Velocity (m\u2022s\u207B\u00B9)",
-    "ecc_peak_velocity": "Eccentric Peak Velocity (m\u2022s\u207B\u00B9)",
-    "land_peak_velocity": "Landing Peak Velocity (m\u2022s\u207B\u00B9)",
-    "con_mean_velocity": "Concentric Mean Velocity (m\u2022s\u207B\u00B9)",
-    "ecc_mean_velocity": "Eccentric Mean Velocity (m\u2022s\u207B\u00B9)",
-    "vto": "Takeoff Velocity (m\u2022s\u207B\u00B9)",  
-    "cm_depth": "Countermovement depth (cm)"      
-}
-
-# single plate drop landing vars dictionary
-singleplate_droplanding_vars_dict = {
-    "bodymass": "Body Mass (kg)",
-    "peak_fz_total": "Peak Landing Force (N)",
-    "peak_fz_rel_total": "Peak Landing Force (N\u2022kg\u207B\u00B9)",
-    "loading_rate": "Loading Rate (BW/s)"
-}
-
-# single plate drop jump vars dictionary
-singleplate_dropjump_vars_dict = {
-    "bodymass": "Body Mass (kg)",
-    "box_height": "Box Height (cm)",
-    "jh_cm": "Jump Height (cm)",
-    "rsi": "Reactive Strength Index (AU)",
-    "con_peak_power": "Concentric Peak Power (W)",
-    "ecc_peak_power": "Eccentric Peak Power (W)",
-    "land_peak_power": "Landing Peak Power (W)",
-    "con_mean_power": "Concentric Mean Power (W)",
-    "ecc_mean_power": "Eccentric Mean Power (W)",
-    "land_mean_power": "Landing Mean Power (W)",
-    "con_peak_force_n": "Total Concentric Peak Force (N)",
-    "con_peak_force_nkg": "Total Concentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "ecc_peak_force_n": "Total Eccentric Peak Force (N)",
-    "ecc_peak_force_nkg": "Total Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "con_mean_force_n": "Total Concentric Mean Force (N)",
-    "con_mean_force_nkg": "Total Concentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "ecc_mean_force_n": "Total Eccentric Mean Force (N)",
-    "ecc_mean_force_nkg": "Total Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "land_peak_force_n": "Total Landing Peak Force (N)",
-    "land_peak_force_nkg": "Total Landing Peak Force (N\u2022kg\u207B\u00B9)",
-    "land_mean_force_n": "Total Landing Mean Force (N)",
-    "land_mean_force_nkg": "Total Landing Mean Force (N\u2022kg\u207B\u00B9)",
-    "con_impulse": "Total Concentric Impulse (Ns)",
-    "ecc_impulse": "Total Eccentric Impulse (Ns)",
-    "positive_impulse": "Total Positive Impulse (Ns)",
-    "land_impulse": "Total Landing Impulse (Ns)",
-    "groundcontact_time_s": "Ground Contact Phase Duration (s)",
-    "ecc_time_s": "Eccentric Phase Duration (s)",
-    "con_time_s": "Concentric Phase Duration (s)",
-    "flight_time_s": "Flight Time (s)",
-    "land_time_s": "Landing Phase Duration (s)",
-    "con_peak_velocity": "Concentric Peak Velocity (m\u2022s\u207B\u00B9)",
-    "land_peak_velocity": "Landing Peak Velocity (m\u2022s\u207B\u00B9)",
-    "land_mean_velocity": "Landing Mean Velocity (m\u2022s\u207B\u00B9)",
-    "con_mean_velocity": "Concentric Mean Velocity (m\u2022s\u207B\u00B9)",
-    "ecc_mean_velocity": "Eccentric Mean Velocity (m\u2022s\u207B\u00B9)",
-    "vto": "Takeoff Velocity (m\u2022s\u207B\u00B9)",   
-}
-
+# optional pre-processing stage shared by all analyses
+def prefilter_fz(fz, sf = 1000):
+    if FZ_FILTER_CUTOFF is None:
+        return fz
+    return lowpass(fz, FZ_FILTER_CUTOFF, sf)
 
-# single plate CMJ vars dictionary
-singleplate_cmj_vars_dict = {
-    "bodymass": "Body Mass (kg)", 
-    "jh_cm": "Jump Height (cm)", 
-    "mrsi": "Modified Reactive Strength Index (AU)",
-    "con_peak_power": "Concentric Peak Power (W)", # start of total variables
-    "ecc_peak_power": "Eccentric Peak Power (W)",
-    "land_peak_power": "Landing Peak Power (W)",
-    "con_mean_power":"Concentric Mean Power (W)",
-    "ecc_mean_power": "Eccentric Mean Power (W)",
-    "land_mean_power": "Landing Mean Power (W)", 
-    "con_peak_force_n": "Concentric Peak Force (N)", 
-    "con_peak_force_nkg": "Concentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "ecc_peak_force_n": "Eccentric Peak Force (N)",
-    "ecc_peak_force_nkg": "Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "con_mean_force_n": "Concentric Mean Force (N)",
-    "con_mean_force_nkg": "Concentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "ecc_mean_force_n": "Eccentric Mean Force (N)",
-    "ecc_mean_force_nkg": "Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "land_peak_force_n": "Landing Peak Force (N)",
-    "land_peak_force_nkg": "Landing Peak Force (N\u2022kg\u207B\u00B9)",
-    "land_mean_force_n": "Landing Mean Force (N)",
-    "land_mean_force_nkg": "Landing Mean Force (N\u2022kg\u207B\u00B9)",
-    "con_impulse": "Concentric Impulse (Ns)",
-    "ecc_impulse": "Eccentric Impulse (Ns)",
-    "positive_impulse": "Positive Impulse (Ns)",
-    "land_impulse": "Landing Impulse (Ns)",
-    "con_rfd": "Concentric Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "ecc_rfd": "Eccentric Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "land_rfd": "Landing Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "unweigh_dur": "Unweighing Phase Duration (s)",
-    "ecc_time_s": "Eccentric Phase Duration (s)",
-    "con_time_s": "Concentric Phase Duration (s)",
-    "contraction_time_s": "Contraction Duration (s)",
-    "flight_time_s": "Flight Time (s)",
-    "land_time_s": "Landing Phase Duration (s)",
-    "con_peak_velocity": "Concentric Peak Velocity (m\u2022s\u207B\u00B9)",
-    "ecc_peak_velocity": "Eccentric Peak Velocity (m\u2022s\u207B\u00B9)",
-    "land_peak_velocity": "Landing Peak Velocity (m\u2022s\u207B\u00B9)",
-    "con_mean_velocity": "Concentric Mean Velocity (m\u2022s\u207B\u00B9)",
-    "ecc_mean_velocity": "Eccentric Mean Velocity (m\u2022s\u207B\u00B9)",
-    "vto": "Takeoff Velocity (m\u2022s\u207B\u00B9)",  
-    "cm_depth": "Countermovement depth (cm)"      
-}
-
-# Double Plate Vars
-dualplate_cmj_vars_dict = {
-    "bodymass": "Body Mass (kg)", 
-    "jh_cm": "Jump Height (cm)", 
-    "mrsi": "Modified Reactive Strength Index (AU)",
-    "con_peak_power": "Concentric Peak Power (W)", # start of total variables
-    "ecc_peak_power": "Eccentric Peak Power (W)",
-    "land_peak_power": "Landing Peak Power (W)",
-    "con_mean_power":"Concentric Mean Power (W)",
-    "ecc_mean_power": "Eccentric Mean Power (W)",
-    "land_mean_power": "Landing Mean Power (W)", 
-    "total_con_peak_force_n": "Total Concentric Peak Force (N)", 
-    "total_con_peak_force_nkg": "Total Concentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "total_ecc_peak_force_n": "Total Eccentric Peak Force (N)",
-    "total_ecc_peak_force_nkg": "Total Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "total_con_mean_force_n": "Total Concentric Mean Force (N)",
-    "total_con_mean_force_nkg": "Total Concentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "total_ecc_mean_force_n": "Total Eccentric Mean Force (N)",
-    "total_ecc_mean_force_nkg": "Total Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "total_land_peak_force_n": "Total Landing Peak Force (N)",
-    "total_land_peak_force_nkg": "Total Landing Peak Force (N\u2022kg\u207B\u00B9)",
-    "total_land_mean_force_n": "Total Landing Mean Force (N)",
-    "total_land_mean_force_nkg": "Total Landing Mean Force (N\u2022kg\u207B\u00B9)",
-    "total_con_impulse": "Total Concentric Impulse (Ns)",
-    "total_ecc_impulse": "Total Eccentric Impulse (Ns)",
-    "total_positive_impulse": "Total Positive Impulse (Ns)",
-    "total_land_impulse": "Total Landing Impulse (Ns)",
-    "total_con_rfd": "Total Concentric Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "total_ecc_rfd": "Total Eccentric Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "total_land_rfd": "Total Landing Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "left_con_peak_force_n": "Left Concentric Peak Force (N)", # start of left leg variables 
-    "left_con_peak_force_nkg": "Left Concentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "left_ecc_peak_force_n": "Left Eccentric Peak Force (N)",
-    "left_ecc_peak_force_nkg": "Left Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "left_con_mean_force_n": "Left Concentric Mean Force (N)",
-    "left_con_mean_force_nkg": "Left Concentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "left_ecc_mean_force_n": "Left Eccentric Mean Force (N)",
-    "left_ecc_mean_force_nkg": "Left Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "left_land_peak_force_n": "Left Landing Peak Force (N)",
-    "left_land_peak_force_nkg": "Left Landing Peak Force (N\u2022kg\u207B\u00B9)",
-    "left_land_mean_force_n": "Left Landing Mean Force (N)",
-    "left_land_mean_force_nkg": "Left Landing Mean Force (N\u2022kg\u207B\u00B9)",
-    "left_con_impulse": "Left Concentric Impulse (Ns)",
-    "left_ecc_impulse":"Left Eccentric Impulse (Ns)",
-    "left_positive_impulse": "Left Positive Impulse (Ns)",
-    "left_land_impulse": "Left Landing Impulse (Ns)",
-    "left_con_rfd": "Left Concentric Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "left_ecc_rfd": "Left Eccentric Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "left_land_rfd": "Left Landing Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "right_con_peak_force_n": "Right Concentric Peak Force (N)", # start of right leg variables 
-    "right_con_peak_force_nkg": "Right Concentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "right_ecc_peak_force_n": "Right Eccentric Peak Force (N)",
-    "right_ecc_peak_force_nkg": "Right Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "right_con_mean_force_n": "Right Concentric Mean Force (N)",
-    "right_con_mean_force_nkg": "Right Concentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "right_ecc_mean_force_n": "Right Eccentric Mean Force (N)",
-    "right_ecc_mean_force_nkg": "Right Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "right_land_peak_force_n": "Right Landing Peak Force (N)",
-    "right_land_peak_force_nkg": "Right Landing Peak Force (N\u2022kg\u207B\u00B9)",
-    "right_land_mean_force_n": "Right Landing Mean Force (N)",
-    "right_land_mean_force_nkg": "Right Landing Mean Force (N\u2022kg\u207B\u00B9)",
-    "right_con_impulse": "Right Concentric Impulse (Ns)",
-    "right_ecc_impulse": "Right Eccentric Impulse (Ns)",
-    "right_positive_impulse": "Right Positive Impulse (Ns)",
-    "right_land_impulse": "Right Landing Impulse (Ns)",
-    "right_con_rfd": "Right Concentric Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "right_ecc_rfd": "Right Eccentric Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "right_land_rfd": "Right Landing Rate of Force Development (N\u2022s\u207B\u00B9)",
-    "unweigh_dur": "Unweighing Phase Duration (s)",
-    "ecc_time_s": "Eccentric Phase Duration (s)",
-    "con_time_s": "Concentric Phase Duration (s)",
-    "contraction_time_s": "Contraction Duration (s)",
-    "flight_time_s": "Flight Time (s)",
-    "land_time_s": "Landing Phase Duration (s)",
-    "con_peak_velocity": "Concentric Peak Velocity (m\u2022s\u207B\u00B9)",
-    "ecc_peak_velocity": "Eccentric Peak Velocity (m\u2022s\u207B\u00B9)",
-    "land_peak_velocity": "Landing Peak Velocity (m\u2022s\u207B\u00B9)",
-    "con_mean_velocity": "Concentric Mean Velocity (m\u2022s\u207B\u00B9)",
-    "ecc_mean_velocity": "Eccentric Mean Velocity (m\u2022s\u207B\u00B9)",
-    "vto": "Takeoff Velocity (m\u2022s\u207B\u00B9)",  
-    "cm_depth": "Countermovement depth (cm)"      
-}
-
-# dual plate drop landing vars dictionary
-dualplate_droplanding_vars_dict = {
-    "bodymass": "Body Mass (kg)",
-    "total_peak_force_n": "Total Peak Landing Force (N)",
-    "total_peak_force_nkg": "Total Peak Landing Force (N\u2022kg\u207B\u00B9)",
-    "left_peak_force_n": "Left Peak Landing Force (N)",
-    "left_peak_force_nkg": "Left Peak Landing Force (N\u2022kg\u207B\u00B9)",
-    "right_peak_force_n": "Right Peak Landing Force (N)",
-    "right_peak_force_nkg": "Right Peak Landing Force (N\u2022kg\u207B\u00B9)",
-    "total_loading_rate_bw_s": "Total Loading Rate (BW/s)",
-    "left_loading_rate_bw_s": "Left Loading Rate (BW/s)",
-    "right_loading_rate_bw_s": "Right Loading Rate (BW/s)",
-}
-
-# dual plate drop jump vars
-dualplate_dropjump_vars_dict = {
-    "bodymass": "Body Mass (kg)",
-    "box_height": "Box Height (cm)",
-    "jh_cm": "Jump Height (cm)",
-    "rsi": "Reactive Strength Index (AU)",
-    "con_peak_power": "Concentric Peak Power (W)",
-    "ecc_peak_power": "Eccentric Peak Power (W)",
-    "land_peak_power": "Landing Peak Power (W)",
-    "con_mean_power": "Concentric Mean Power (W)",
-    "ecc_mean_power": "Eccentric Mean Power (W)",
-    "land_mean_power": "Landing Mean Power (W)",
-    "total_con_peak_force_n": "Total Concentric Peak Force (N)",
-    "total_con_peak_force_nkg": "Total Concentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "total_ecc_peak_force_n": "Total Eccentric Peak Force (N)",
-    "total_ecc_peak_force_nkg": "Total Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "total_con_mean_force_n": "Total Concentric Mean Force (N)",
-    "total_con_mean_force_nkg": "Total Concentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "total_ecc_mean_force_n": "Total Eccentric Mean Force (N)",
-    "total_ecc_mean_force_nkg": "Total Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "total_land_peak_force_n": "Total Landing Peak Force (N)",
-    "total_land_peak_force_nkg": "Total Landing Peak Force (N\u2022kg\u207B\u00B9)",
-    "total_land_mean_force_n": "Total Landing Mean Force (N)",
-    "total_land_mean_force_nkg": "Total Landing Mean Force (N\u2022kg\u207B\u00B9)",
-    "total_con_impulse": "Total Concentric Impulse (Ns)",
-    "total_ecc_impulse": "Total Eccentric Impulse (Ns)",
-    "total_positive_impulse": "Total Positive Impulse (Ns)",
-    "total_land_impulse": "Total Landing Impulse (Ns)",
-    "left_con_peak_force_n": "Left Concentric Peak Force (N)", # start of left leg variables 
-    "left_con_peak_force_nkg": "Left Concentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "left_ecc_peak_force_n": "Left Eccentric Peak Force (N)",
-    "left_ecc_peak_force_nkg": "Left Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "left_con_mean_force_n": "Left Concentric Mean Force (N)",
-    "left_con_mean_force_nkg": "Left Concentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "left_ecc_mean_force_n": "Left Eccentric Mean Force (N)",
-    "left_ecc_mean_force_nkg": "Left Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "left_land_peak_force_n": "Left Landing Peak Force (N)",
-    "left_land_peak_force_nkg": "Left Landing Peak Force (N\u2022kg\u207B\u00B9)",
-    "left_land_mean_force_n": "Left Landing Mean Force (N)",
-    "left_land_mean_force_nkg": "Left Landing Mean Force (N\u2022kg\u207B\u00B9)",
-    "left_con_impulse": "Left Concentric Impulse (Ns)",
-    "left_ecc_impulse":"Left Eccentric Impulse (Ns)",
-    "left_positive_impulse": "Left Positive Impulse (Ns)",
-    "left_land_impulse": "Left Landing Impulse (Ns)",
-    "right_con_peak_force_n": "Right Concentric Peak Force (N)", # start of right leg variables 
-    "right_con_peak_force_nkg": "Right Concentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "right_ecc_peak_force_n": "Right Eccentric Peak Force (N)",
-    "right_ecc_peak_force_nkg": "Right Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
-    "right_con_mean_force_n": "Right Concentric Mean Force (N)",
-    "right_con_mean_force_nkg": "Right Concentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "right_ecc_mean_force_n": "Right Eccentric Mean Force (N)",
-    "right_ecc_mean_force_nkg": "Right Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
-    "right_land_peak_force_n": "Right Landing Peak Force (N)",
-    "right_land_peak_force_nkg": "Right Landing Peak Force (N\u2022kg\u207B\u00B9)",
-    "right_land_mean_force_n": "Right Landing Mean Force (N)",
-    "right_land_mean_force_nkg": "Right Landing Mean Force (N\u2022kg\u207B\u00B9)",
-    "right_con_impulse": "Right Concentric Impulse (Ns)",
-    "right_ecc_impulse": "Right Eccentric Impulse (Ns)",
-    "right_positive_impulse": "Right Positive Impulse (Ns)",
-    "right_land_impulse": "Right Landing Impulse (Ns)",
-    "groundcontact_time_s": "Ground Contact Phase Duration (s)",
-    "ecc_time_s": "Eccentric Phase Duration (s)",
-    "con_time_s": "Concentric Phase Duration (s)",
-    "flight_time_s": "Flight Time (s)",
-    "land_time_s": "Landing Phase Duration (s)",
-    "con_peak_velocity": "Concentric Peak Velocity (m\u2022s\u207B\u00B9)",
-    "land_peak_velocity": "Landing Peak Velocity (m\u2022s\u207B\u00B9)",
-    "land_mean_velocity": "Landing Mean Velocity (m\u2022s\u207B\u00B9)",
-    "con_mean_velocity": "Concentric Mean Velocity (m\u2022s\u207B\u00B9)",
-    "ecc_mean_velocity": "Eccentric Mean Velocity (m\u2022s\u207B\u00B9)",
-    "vto": "Takeoff Velocity (m\u2022s\u207B\u00B9)",   
-}
 
+##### Analysis windows: one window class, the test (biomech.analyses) does the maths
+class AnalysisWindow(QMainWindow):
+    test = None  # an analyses.TestType, set by each window below
 
-##### Start of analysis functions, first SLJ
-class SinglePlateSLJAnalysisWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.initUI()
@@ -373,24 +105,36 @@ class SinglePlateSLJAnalysisWindow(QMainWindow):
         
         # File dictionary to enable handling of multiple files
         self.file_path_dict = {}
-        self.current_file_left = None
-        self.current_file_right = None
-        self.table_dat = pd.DataFrame()
+        self.current_file = None
         
-        # Initialize dataframes 
-        self.outcome_dat =  pd.DataFrame({'Variable': singleplate_slj_vars_dict.values()})
-        self.selected_vars = []
+        # continuous recordings split into trials: Fz columns by file, and the recording
+        # and slice each trial name comes from
+        self.recordings = {}
+        self.segments = {}
+        
+        # what each trial was analysed with and gave (for saving the session), and the
+        # opened session file each reviewed trial's signal is in
+        self.trial_data = {}
+        self.sessions = {}
         
-        # Display the default table (outcome_dat)
-        self.display_table(self.table_dat)
-        self.left_drop_count = 0
-        self.right_drop_count = 0
+        # Initialize dataframes 
+        self.outcome_dat = pd.DataFrame({'Variable': self.test.variables.values()})
+        self.average_dat = pd.DataFrame()
+        self.lsi_data = pd.DataFrame()
+        
+        # body mass and drop height for the drop tests, per athlete when there is a registry
+        self.pt_mass = None
+        self.drop_height = None
+        self.registry = AthleteRegistry(ATHLETE_REGISTRY)
+        if not self.registry.exists():
+            self.get_user_inputs()
+        
+        # Display the default table
+        self.display_table(pd.DataFrame())
+        self.drop_count = 0
         
-         # Initialize the VariableSelectionDialog with the data dictionary
-        self.slj_vars_dict = singleplate_slj_vars_dict
-              
     def initUI(self):
-        self.setWindowTitle("SLJ Analysis")
+        self.setWindowTitle(self.test.name)
         self.setGeometry(100, 100, 1600, 800)
 
         self.centralWidget = QWidget(self)
@@ -405,48 +149,50 @@ class SinglePlateSLJAnalysisWindow(QMainWindow):
         self.topLayout.addLayout(self.leftLayout, stretch = 3)
         self.topLayout.addLayout(self.rightLayout, stretch = 2) 
         
-        # Create a dropdown box for selecting files for the left plot
-        self.fileComboBoxLeft = QComboBox()
-        self.fileComboBoxLeft.currentIndexChanged.connect(self.on_file_combobox_left_changed)
-        self.leftLayout.addWidget(self.fileComboBoxLeft)
-
-        # Label for left plot file selection
-        self.label1 = QLabel("Drag and Drop Left Leg Trial(s) here:", self)
-        self.label1.setFont(QFont("Arial bold", 10))
-        self.label1.setAlignment(Qt.AlignLeft)
-        self.leftLayout.addWidget(self.label1)
-
-        # First plot (Left)
-        self.figure1 = plt.Figure(figsize=(12, 10))
-        self.canvas1 = FigureCanvas(self.figure1)
-        self.leftLayout.addWidget(self.canvas1)
-        self.toolbar1 = NavigationToolbar(self.canvas1, self, coordinates = False)
-        self.leftLayout.addWidget(self.toolbar1)
-
-        # Create a dropdown box for selecting files for the right plot
-        self.fileComboBoxRight = QComboBox()
-        self.fileComboBoxRight.currentIndexChanged.connect(self.on_file_combobox_right_changed)
-        self.leftLayout.addWidget(self.fileComboBoxRight)
-        
-        # Label for right plot file selection
-        self.label2 = QLabel("Drag and Drop Right Leg Trial(s) here:", self)
-        self.label2.setFont(QFont("Arial bold", 10))
-        self.label2.setAlignment(Qt.AlignLeft)
-        self.leftLayout.addWidget(self.label2)
-
-        # Second plot (Right)
-        self.figure2 = plt.Figure(figsize=(12, 10))
-        self.canvas2 = FigureCanvas(self.figure2)
-        self.leftLayout.addWidget(self.canvas2)
-        self.toolbar2 = NavigationToolbar(self.canvas2, self, coordinates = False)
-        self.leftLayout.addWidget(self.toolbar2)
+        # one trial per plot, or every trial of the session overlaid on an event
+        self.plotModeComboBox = QComboBox()
+        self.plotModeComboBox.addItem("Single Trial")
+        for label in self.test.overlay_events.values():
+            self.plotModeComboBox.addItem(f"Overlay All Trials - aligned to {label}")
+        self.plotModeComboBox.currentIndexChanged.connect(self.on_plot_mode_changed)
+        self.leftLayout.addWidget(self.plotModeComboBox)
+        
+        # one file with several jumps (or drops) becomes one trial per jump
+        self.splitCheckBox = QCheckBox("Split continuous recordings into trials")
+        self.splitCheckBox.setEnabled(self.test.recording_kind is not None)
+        self.leftLayout.addWidget(self.splitCheckBox)
+        
+        # live force from the plates, scrolling above the trial plots while running
+        self.liveFigure = plt.Figure(figsize = (12, 3))
+        self.liveCanvas = FigureCanvas(self.liveFigure)
+        self.liveCanvas.setVisible(False)
+        self.leftLayout.addWidget(self.liveCanvas)
+        self.liveTimer = QTimer(self)
+        self.liveTimer.timeout.connect(self.on_live_tick)
+        self.live_count = 0
+        self.receiver = None
+        self.watchTimer = QTimer(self)
+        self.watchTimer.timeout.connect(self.on_watch_tick)
+        self.watchSession = None
+        
+        # force around each processed trial, cached for the overlays
+        self.crops = RaggedBuffer()
+        
+        # one plot per leg for single leg tests, keyed by the LEFT/RIGHT file name token
+        if self.test.unilateral:
+            self.panels = {"LEFT": self.add_plot_panel("Left Leg Trial(s)", (12, 10)),
+                           "RIGHT": self.add_plot_panel("Right Leg Trial(s)", (12, 10))}
+        else:
+            self.panels = {None: self.add_plot_panel(self.test.trial_label, (12, 16))}
         
         # defining the table for values
         # Create a QComboBox for selecting data displayed in table
-        self.comboBox = QComboBox()
-        self.comboBox.addItems(['Full Results', "Average Results"])
-        self.comboBox.currentIndexChanged.connect(self.on_combobox_changed)
-        self.rightLayout.addWidget(self.comboBox)
+        self.tableComboBox = QComboBox()
+        self.tableComboBox.addItems(["Full Results", "Average Results"])
+        if self.test.plates == 2:
+            self.tableComboBox.addItem("LSI Results")
+        self.tableComboBox.currentIndexChanged.connect(self.on_tablecombobox_changed)
+        self.rightLayout.addWidget(self.tableComboBox)
         self.table = QTableWidget(self)
         self.rightLayout.addWidget(self.table)
         self.table.setEditTriggers(QTableWidget.NoEditTriggers)
@@ -463,12 +209,31 @@ class SinglePlateSLJAnalysisWindow(QMainWindow):
         self.exportButton = QPushButton("Save Data", self)
         self.exportButton.clicked.connect(self.exportData)
         self.buttonLayout.addWidget(self.exportButton)
+        
+        # the whole session (signals, events, values) in one file, and reviewing one later
+        self.saveSessionButton = QPushButton("Save Session", self)
+        self.saveSessionButton.clicked.connect(self.saveSession)
+        self.buttonLayout.addWidget(self.saveSessionButton)
+        self.openSessionButton = QPushButton("Open Session", self)
+        self.openSessionButton.clicked.connect(self.openSession)
+        self.buttonLayout.addWidget(self.openSessionButton)
+        
+        # live acquisition, trials are captured as they finish (single leg tests
+        # need the leg in a file name, so they stay file based)
+        self.liveButton = QPushButton("Start Live", self)
+        self.liveButton.clicked.connect(self.toggle_live)
+        self.liveButton.setEnabled(self.test.recording_kind is not None and not self.test.unilateral)
+        self.buttonLayout.addWidget(self.liveButton)
+        
+        # trials written to a folder (e.g. by the Bertec software) are analysed as they arrive
+        self.watchButton = QPushButton("Watch Folder", self)
+        self.watchButton.clicked.connect(self.toggle_watch)
+        self.buttonLayout.addWidget(self.watchButton)
                      
         # Quit program button       
         self.closeAppButton = QPushButton("Quit Program", self)
         self.closeAppButton.clicked.connect(self.closeApp)
         self.buttonLayout.addWidget(self.closeAppButton) 
-        self.setAcceptDrops(True)
         
         # Home button
         self.homeButton = QPushButton('Return to Home', self)
@@ -478,70 +243,144 @@ class SinglePlateSLJAnalysisWindow(QMainWindow):
         self.topLayout.addLayout(self.buttonLayout)
         
         # Column selection for safety of making sure
-        self.columnSelectionPrompt()   
+        self.columnSelectionPrompt()
+        
+        # for dropping
+        self.setAcceptDrops(True)
+        
+    # file dropdown, label, figure and toolbar for one plot
+    def add_plot_panel(self, trial_label, figsize):
+        fileComboBox = QComboBox()
+        fileComboBox.currentIndexChanged.connect(lambda _, box = fileComboBox: self.on_file_combobox_changed(box))
+        self.leftLayout.addWidget(fileComboBox)
+
+        label = QLabel(f"Drag and Drop {trial_label} here:", self)
+        label.setFont(QFont("Arial bold", 10))
+        label.setAlignment(Qt.AlignLeft)
+        self.leftLayout.addWidget(label)
+
+        figure = plt.Figure(figsize = figsize)
+        canvas = FigureCanvas(figure)
+        self.leftLayout.addWidget(canvas)
+        toolbar = NavigationToolbar(canvas, self, coordinates = False)
+        self.leftLayout.addWidget(toolbar)
+        return {"fileComboBox": fileComboBox, "figure": figure, "canvas": canvas,
+                "overlay": TrialOverlay(self.crops), "current": None}
         
     # Define column selection prompt page
     def columnSelectionPrompt(self):
         columnOptions = [chr(i) for i in range(65, 87)]
-        
-        self.fz_col, ok1 = QInputDialog.getItem(self, "Select Column", "Select 'Fz' Column from Excel file, double check this prior \nto any analyses or the program will not run:", columnOptions, 5, False)
-            
-        if ok1:
-            self.fz_col = ord(self.fz_col) - 65
+        if self.test.plates == 1:
+            prompts = [("Select 'Fz' Column from Excel file, double check this prior \nto any analyses or the program will not run:", 5)]
         else:
+            prompts = [('Select Fz Left Column from Excel file', 5),
+                       ('Select Fz Right Column from Excel file', 16)]
+        
+        self.fz_cols = []
+        for prompt, default in prompts:
+            fz_col, ok = QInputDialog.getItem(self, "Select Column", prompt, columnOptions, default, False)
+            if not ok:
+                self.close()
+                return
+            self.fz_cols.append(ord(fz_col) - 65)
+        
+    # custom function for user inputs
+    def get_user_inputs(self, athlete = None, ask_mass = True, ask_drop_height = True, close_on_cancel = True):
+        # prompts for the window's values, or for one athlete missing from the registry
+        who = "Individual's" if athlete is None else f"{athlete}'s"
+        ok = True
+        if self.test.needs_mass and ask_mass:
+            # input for participant's body mass
+            pt_mass_lb, ok1 = QInputDialog.getDouble(self, "Input", f"Enter {who} Body Mass (pounds)- This must be accurate:", decimals = 2)
+            if ok1:
+                self.pt_mass = pt_mass_lb / 2.2046
+            ok = ok and ok1
+        if self.test.needs_drop_height and ask_drop_height and ok:
+            # input for box height
+            # defaults and constants    
+            default_box_height_in = 16.0
+            drop_height_in, ok2 = QInputDialog.getDouble(self, "Input", "Enter Box Height (inches):", decimals = 2, value = default_box_height_in)
+            if ok2:
+                drop_height_cm = drop_height_in * 2.54
+                self.drop_height = drop_height_cm / 100
+            ok = ok and ok2
+        if not ok and close_on_cancel:
             self.close()
+        return ok
+    
+    # body mass and drop height for one trial: the window's values without a registry,
+    # else the athlete's, asking once for whatever the registry doesn't have for them;
+    # None if that prompt was cancelled
+    def trial_inputs(self, file_name):
+        if not (self.test.needs_mass or self.test.needs_drop_height):
+            return None, None
+        if not self.registry.exists():
+            return self.pt_mass, self.drop_height
+        athlete, known = self.registry.lookup(file_name)
+        ask_mass = self.test.needs_mass and known["bodymass"] is None
+        ask_drop_height = self.test.needs_drop_height and known["drop_height"] is None
+        if ask_mass or ask_drop_height:
+            if not self.get_user_inputs(athlete, ask_mass, ask_drop_height, close_on_cancel = False):
+                return None
+            self.registry.remember(athlete, self.pt_mass if ask_mass else None,
+                                   self.drop_height if ask_drop_height else None)
+            athlete, known = self.registry.lookup(file_name)
+        return known["bodymass"], known["drop_height"]
     
-     # Method to update the table display       
+    # Method to update the table display       
     def display_table(self, dataframe):
-        self.table.clear()
-        self.table.setRowCount(len(dataframe))
-        self.table.setColumnCount(dataframe.shape[1])
-        self.table.setHorizontalHeaderLabels(dataframe.columns)
-        # Font settings for table
-        variable_font = QFont()
-        variable_font.setBold(True)
-        variable_font.setFamily("Arial")
-        variable_font.setPointSize(8) 
-        value_font = QFont()
-        value_font.setFamily("Arial")
-        value_font.setPointSize(8)
-     
-        # Loop through the dataframe to populate the table
-        for i in range(dataframe.shape[0]):
-            for j in range(dataframe.shape[1]):
-                value = dataframe.iat[i, j]
-                if j == 0:  # First column (strings)
-                    item = QTableWidgetItem(str(value))
-                    item.setFont(variable_font)
-                else:  # Second and subsequent columns (floats)
-                    numeric_value = float(value)
-                    item = QTableWidgetItem(f"{numeric_value:.2f}")
-                    item.setFont(value_font)
-                    item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
-                self.table.setItem(i, j, item)
-
-        self.table.setStyleSheet(TABLE_STYLE)
-        self.table.setAlternatingRowColors(True)
-        self.table.resizeColumnsToContents()
+        fill_table(self.table, dataframe, TABLE_STYLE, QHeaderView.ResizeToContents)
         
-    # Update the on_combobox_changed method to handle three dataframes this needs to be modifed
-    def on_combobox_changed(self, index):
+    # actions for changing what values are displayed in the table     
+    def on_tablecombobox_changed(self, index):
         if index == 0:
             self.display_table(self.outcome_dat)
         if index == 1:
-            self.display_table(self.average_dat)  
+            self.display_table(self.average_dat)
+        if index == 2:
+            self.display_table(self.lsi_data)
     
-    # Dropdown (Left) changed method
-    def on_file_combobox_left_changed(self):
-        file_key = self.fileComboBoxLeft.currentText()
-        self.current_file_left = self.file_path_dict[file_key]
-        self.processSLJFile(self.current_file_left)
-
-    # Dropdown (Right) changed method
-    def on_file_combobox_right_changed(self):
-        file_key = self.fileComboBoxRight.currentText()
-        self.current_file_right = self.file_path_dict[file_key]
-        self.processSLJFile(self.current_file_right)
+    # actions for changing what plot is displayed
+    def on_file_combobox_changed(self, fileComboBox):
+        file_key = fileComboBox.currentText()
+        if file_key in self.file_path_dict:
+            self.current_file = self.file_path_dict[file_key]
+            overlay = self.panels[self.leg_of(file_key)]["overlay"]
+            if self.overlay_event() is not None and file_key in overlay:
+                overlay.highlight(file_key)  # already drawn, no need to process it again
+            else:
+                self.processFile(self.current_file)
+                
+    # event the trials are aligned on, None when plotting one trial at a time
+    def overlay_event(self):
+        index = self.plotModeComboBox.currentIndex()
+        return list(self.test.overlay_events)[index - 1] if index > 0 else None
+    
+    def on_plot_mode_changed(self, index):
+        event = self.overlay_event()
+        for panel in self.panels.values():
+            overlay = panel["overlay"]
+            if event is None:
+                overlay.detach()
+                panel["figure"].clear()
+                if panel["current"] is not None:
+                    self.processFile(panel["current"])
+                else:
+                    panel["canvas"].draw()
+            elif overlay.ax is not None:
+                overlay.set_align(event)
+            else:
+                panel["figure"].clear()
+                overlay.attach(panel["figure"].add_subplot(111), event)
+            
+    # which plot a trial goes in (None for tests with one plot)
+    def leg_of(self, file_name):
+        if not self.test.unilateral:
+            return None
+        for leg in self.panels:
+            if leg in file_name.upper():
+                return leg
+        return None
 
     # For dragging in new files        
     def dragEnterEvent(self, event):
@@ -550,3004 +389,387 @@ class SinglePlateSLJAnalysisWindow(QMainWindow):
                 
     def dropEvent(self, event):
         for url in event.mimeData().urls():
-            file_path = url.toLocalFile()
-            if file_path.endswith('.csv'):
-                file_name = os.path.basename(file_path)[:-4]  # Remove .csv extension
-                self.file_path_dict[file_name] = file_path
+            if url.toLocalFile().endswith('.csv'):
+                for file_path in self.trials_in(url.toLocalFile()):
+                    self.add_trial(file_path)
+    
+    # result is the analysis when it has already been done (watched folders), with the
+    # (bodymass, drop_height) inputs it was done with
+    def add_trial(self, file_path, result = None, inputs = None):
+        file_name = os.path.basename(file_path)[:-4]  # Remove .csv extension
+        leg = self.leg_of(file_name)
+        if self.test.unilateral and leg is None:
+            return
+        self.file_path_dict[file_name] = file_path
+        
+        # select the trial without the dropdown processing it a second time
+        fileComboBox = self.panels[leg]["fileComboBox"]
+        fileComboBox.blockSignals(True)
+        if fileComboBox.findText(file_name) == -1:
+            fileComboBox.addItem(file_name)
+        fileComboBox.setCurrentText(file_name)
+        fileComboBox.blockSignals(False)
+        self.current_file = file_path
+        if result is None:
+            self.processFile(file_path)
+        else:
+            self.show_result(file_path, result, inputs)
+        self.drop_count = self.drop_count + 1
+    
+    # live mode: receiver thread -> ring buffer -> scrolling plot, and every finished
+    # trial straight into the table/plots as LIVE-001, LIVE-002...
+    def toggle_live(self):
+        if self.receiver is not None:
+            self.stop_live()
+            return
+        self.ring = live.RingBuffer(int(live.buffer_seconds * LIVE_SF), LIVE_CHANNELS)
+        self.receiver = live.Receiver(self.ring, LIVE_PORT, LIVE_HOST, LIVE_PROTOCOL)
+        self.receiver.start()
+        self.liveFigure.clear()
+        labels = ["Fz"] if LIVE_CHANNELS == 1 else ["Left", "Right"] + [f"Fz {i + 1}" for i in range(2, LIVE_CHANNELS)]
+        colors = [analyses.trace_styles.get(label, ('grey', 1))[0] for label in labels]
+        self.liveView = live.LiveView(self.liveFigure.add_subplot(111), self.ring, sf = LIVE_SF,
+                                      colors = colors, labels = labels)
+        self.liveCapture = live.LiveCapture(self.ring, self.test.recording_kind, self.test.plates, LIVE_SF)
+        # CMJs also get their jump height at takeoff, before the trial is captured
+        self.liveDetector = None
+        if self.test.recording_kind == 'cmj':
+            self.liveDetector = streaming.CMJDetector(LIVE_SF, self.test.end_land_delay)
+        self.live_fed = 0
+        self.liveCanvas.setVisible(True)
+        self.liveCanvas.draw()
+        self.liveTimer.start(int(1000 / LIVE_FPS))
+        self.liveButton.setText("Stop Live")
+    
+    def stop_live(self):
+        if self.receiver is None:
+            return
+        self.liveTimer.stop()
+        self.receiver.stop()
+        self.receiver = None
+        self.liveView.close()
+        self.liveCanvas.setVisible(False)
+        self.liveButton.setText("Start Live")
+    
+    def on_live_tick(self):
+        if self.receiver.error is not None:
+            self.statusBar().showMessage(f"Live source {LIVE_HOST}:{LIVE_PORT} failed: {self.receiver.error}")
+            self.stop_live()
+            return
+        self.liveView.update()
+        if self.liveDetector is not None:
+            self.live_feedback()
+        for trial in self.liveCapture.poll():
+            self.live_count += 1
+            file_name = f"LIVE-{self.live_count:03d}"
+            self.recordings[file_name] = trial
+            self.segments[file_name] = (file_name, slice(None))
+            try:
+                self.add_trial(file_name + ".csv")
+            except ValueError as error:  # e.g. a hop the CMJ rules can't find the events of
+                fileComboBox = self.panels[None]["fileComboBox"]
+                fileComboBox.blockSignals(True)
+                fileComboBox.removeItem(fileComboBox.findText(file_name))
+                fileComboBox.blockSignals(False)
+                del self.file_path_dict[file_name], self.segments[file_name], self.recordings[file_name]
+                self.statusBar().showMessage(f"{file_name} not analysed: {error}")
+    
+    def live_feedback(self):
+        detector = self.liveDetector
+        written = self.ring.written
+        new = self.ring.latest(written - self.live_fed, written)[:, :self.test.plates].sum(axis = 1)
+        self.live_fed = written
+        for name, _ in detector.feed(new):
+            if name == "start_move":
+                self.statusBar().showMessage("Live: jumping...")
+        height = detector.jump_height()
+        if height is not None and "land" not in detector.events:
+            self.statusBar().showMessage(f"Live: jump height {height * 100:.1f} cm")
+        # start again on the next jump (or after 30 s of standing still)
+        if detector.done or (detector.state == 'standing' and detector.n > 30 * LIVE_SF):
+            detector.reset()
+    
+    # watch folder: finished exports are routed on the test token in their name (CMJ,
+    # SLJ, DL, DJ; files without one are taken as this window's test, other tests are
+    # left alone), analysed in a process pool and added like dropped files
+    def toggle_watch(self):
+        if self.watchSession is not None:
+            self.stop_watch()
+            return
+        folder = QFileDialog.getExistingDirectory(self, "Folder the trials are exported to")
+        if not folder:
+            return
+        routes = {token: (test if type(test) is type(self.test) else None)
+                  for token, test in watch.routes[self.test.plates].items()}
+        self.watchSession = watch.WatchSession(folder, routes, self.fz_cols, default = self.test,
+                                               inputs = lambda file_name, test: self.trial_inputs(file_name[:-4]),
+                                               store = WATCH_STORE, workers = WATCH_WORKERS,
+                                               cutoff = FZ_FILTER_CUTOFF, settle = WATCH_SETTLE).start()
+        self.watchTimer.start(int(watch.poll_interval * 1000))
+        self.watchButton.setText("Stop Watching")
+        self.statusBar().showMessage(f"Watching {folder}")
+    
+    def stop_watch(self):
+        if self.watchSession is None:
+            return
+        self.watchTimer.stop()
+        self.watchSession.shutdown()
+        self.watchSession = None
+        self.watchButton.setText("Watch Folder")
+    
+    def on_watch_tick(self):
+        # no new ticks while a body mass prompt is open
+        self.watchTimer.stop()
+        try:
+            for entry in self.watchSession.poll():
+                file_name = os.path.basename(entry["file"])
+                if entry["error"] is not None:
+                    self.statusBar().showMessage(f"{file_name} not analysed: {entry['error']}")
+                else:
+                    self.add_trial(entry["file"], entry["result"], entry["inputs"])
+        finally:
+            if self.watchSession is not None:
+                self.watchTimer.start()
+    
+    # the trials in a dropped file: the file itself, or with splitting on one trial per
+    # jump named <file>-01, <file>-02... (the Fz columns are read once and each trial
+    # is a view of them)
+    def trials_in(self, file_path):
+        if not self.splitCheckBox.isChecked():
+            return [file_path]
+        dat = forceplate.read_trial(file_path)
+        fz = np.column_stack([forceplate.fz_column(dat, col) for col in self.fz_cols])
+        slices = segment.trial_slices(fz.sum(axis = 1), self.test.recording_kind)
+        if len(slices) <= 1:
+            return [file_path]
+        self.recordings[file_path] = fz
+        base = file_path[:-4]
+        trial_paths = [f"{base}-{i + 1:02d}.csv" for i in range(len(slices))]
+        for trial_path, trial in zip(trial_paths, slices):
+            self.segments[os.path.basename(trial_path)[:-4]] = (file_path, trial)
+        return trial_paths
                 
-                if 'LEFT' in file_name.upper():
-                    if self.fileComboBoxLeft.findText(file_name) == -1:
-                        self.fileComboBoxLeft.addItem(file_name)
-                    self.fileComboBoxLeft.setCurrentText(file_name)
-                    self.current_file_left = file_path
-                    self.on_file_combobox_left_changed()
-                    self.left_drop_count = self.left_drop_count + 1
-                    self.processSLJFile(file_path)
-                    self.average_data(self.outcome_dat)
-
-                if 'RIGHT' in file_name.upper():
-                    if self.fileComboBoxRight.findText(file_name) == -1:
-                        self.fileComboBoxRight.addItem(file_name)
-                    self.right_drop_count = self.right_drop_count + 1
-                    self.fileComboBoxRight.setCurrentText(file_name)
-                    self.current_file_right = file_path
-                    self.on_file_combobox_right_changed()
-                    self.processSLJFile(file_path)
-                    self.average_data(self.outcome_dat)
-
-    # Process the SLJ file(s) 
-    def processSLJFile(self, file_path):
-        outcome_dat = self.outcome_dat
+    # the Fz columns of a trial: from its split recording, the session it was opened from
+    # or its file
+    def trial_fz(self, file_path):
         file_name = os.path.basename(file_path)[:-4]
-        
-        if 'LEFT' in file_name.upper():
-            self.jump_leg_name = 'LEFT'
-        if 'RIGHT' in file_name.upper():
-            self.jump_leg_name = 'RIGHT'
-
-        dat = pd.read_csv(file_path)
-        
-        fz_jump_leg = dat.iloc[:, self.fz_col]
-        fz_total = fz_jump_leg
-        
-        # would prefer for this to be a whole 1-3 seconds. 
-        bw_mean = fz_total[0:1500].mean()
-        bw_sd = fz_total[0:1500].std()
-        body_mass = bw_mean / 9.81
-        
-        # calculate time
-        sf = 1000
-        dat_len = len(fz_jump_leg)
-        trial_time = dat_len / sf
-        time_s = np.linspace(start = 0, stop = trial_time, num = dat_len)
-        
-        # calculate other arrays
-        accel = (fz_total - bw_mean) / body_mass
-        velo = int_cumtrapz(x = time_s, y = accel) 
-        position = int_cumtrapz(x = time_s[1:], y = velo)
-        power = fz_jump_leg[1:] * velo
-
-        start_move = 20
-        while fz_jump_leg[start_move] > (bw_mean - (bw_sd  * 5)):
-            start_move = start_move + 1
-        while fz_total[start_move] < bw_mean:
-                start_move = start_move - 1
-            
-        takeoff = start_move 
-        while fz_jump_leg[takeoff] > 30:
-            takeoff = takeoff + 1
-            
-        start_ecc_velo = min(velo[start_move:takeoff])
-        start_ecc = list(velo).index(start_ecc_velo)
-        
-        start_con = start_ecc
-        while velo[start_con] < 0:
-            start_con = start_con + 1    
-            
-        land = takeoff + 150
-        while fz_jump_leg[land] < 30:
-            land = land + 1
-            
-        end_land = land + 100
-        while fz_jump_leg[end_land] > bw_mean:
-            end_land = end_land + 1
-        while fz_jump_leg[end_land] < bw_mean:
-            end_land = end_land - 1        
-            
-        ### Make arrays for each phase - force
-        unweigh_fz = fz_jump_leg[start_move:start_ecc]
-        ecc_fz = fz_jump_leg[start_ecc:start_con]
-        con_fz = fz_jump_leg[start_con:takeoff]
-        land_fz = fz_jump_leg[land:end_land]
-        positive_fz = fz_jump_leg[start_ecc:takeoff]
-        
-        ### - velo
-        unweigh_velo = velo[start_move:start_ecc]
-        ecc_velo = velo[start_ecc:start_con]
-        con_velo = velo[start_con:takeoff]
-        land_velo = velo[land:end_land]
-                
-        ### - power 
-        ecc_power = power[start_ecc:start_con]
-        con_power = power[start_con:takeoff]
-        land_power = power[land:end_land]
-                
-        ##### Power outcomes 
-        ecc_peak_power = ecc_power.min()
-        ecc_mean_power = ecc_power.mean()
-        con_peak_power = con_power.max()
-        con_mean_power = con_power.mean()
-        land_peak_power = land_power.max()
-        land_mean_power = land_power.mean()
-        
-        ##### Kinetic phase-specific outcome variables
-        ### TOTAL kinetic phase outcome variables
-        # eccentric
-        ecc_fz_peak_force_n = ecc_fz.max()
-        ecc_fz_peak_force_nkg = ecc_fz_peak_force_n/body_mass
-        ecc_fz_mean_force_n = ecc_fz.mean()
-        ecc_fz_mean_force_nkg = ecc_fz_mean_force_n/body_mass
-        ecc_fz_imp = int_trapz(ecc_fz)/sf
-                
-        # concentric
-        con_fz_peak_force_n = con_fz.max()
-        con_fz_peak_force_nkg = con_fz_peak_force_n/body_mass
-        con_fz_mean_force_n = con_fz.mean()
-        con_fz_mean_force_nkg = con_fz_mean_force_n/body_mass
-        con_fz_imp = int_trapz(con_fz)/sf
-                
-        # positve impulse
-        positive_imp = int_trapz(positive_fz)/sf
-            
-        # landing
-        land_fz_peak_force_n = land_fz.max()
-        land_fz_peak_force_nkg = land_fz_peak_force_n/body_mass
-        land_fz_mean_force_n = land_fz.mean()
-        land_fz_mean_force_nkg = land_fz_mean_force_n/body_mass
-        land_fz_imp = int_trapz(land_fz)/sf   
-                
-        ##### Time specific outcomes
-        unweigh_time_s = time_s[start_ecc] - time_s[start_move]
-        contraction_time_s = time_s[takeoff] - time_s[start_move]
-        ecc_time_s = time_s[start_con] - time_s[start_ecc]
-        con_time_s = time_s[takeoff] - time_s[start_con]
-        flight_time_s = time_s[land] - time_s[takeoff]
-        land_time_s = time_s[end_land] - time_s[land]        
-                
-        ##### RFD outcomes
-        ecc_rfd = (fz_jump_leg[start_con] - fz_jump_leg[start_ecc]) / ecc_time_s
-        con_rfd = (fz_jump_leg[start_con] - fz_jump_leg[takeoff]) / con_time_s
-        land_rfd = (fz_jump_leg[end_land] - fz_jump_leg[land]) / land_time_s
-            
-        ##### Velocity outcomes
-        ecc_peak_velo = ecc_velo.min()
-        con_peak_velo = con_velo.max()
-        ecc_mean_velo = ecc_velo.mean()
-        con_mean_velo = con_velo.mean()
-        land_peak_velo = land_velo.min()
-                                
-        ##### Outcome variables
-        vto = velo[takeoff]
-        jh = ((vto ** 2)/(9.81 * 2))
-        jh_cm = jh * 100
-        mrsi = jh/contraction_time_s
-        depth = position[start_move:takeoff].min()
-        depth_cm = depth * 100
-            
-        # combine into a list
-        values_dat = [body_mass, jh_cm, mrsi, con_peak_power,
-                    ecc_peak_power,land_peak_power, con_mean_power, ecc_mean_power,
-                    land_mean_power, con_fz_peak_force_n, con_fz_peak_force_nkg, ecc_fz_peak_force_n, 
-                    ecc_fz_peak_force_nkg, con_fz_mean_force_n, con_fz_mean_force_nkg, ecc_fz_mean_force_n,
-                    ecc_fz_mean_force_nkg, land_fz_peak_force_n, land_fz_peak_force_nkg, 
-                    land_fz_mean_force_n, land_fz_mean_force_nkg, con_fz_imp,
-                    ecc_fz_imp, positive_imp, land_fz_imp, con_rfd,
-                    ecc_rfd, land_rfd, unweigh_time_s, ecc_time_s,
-                    con_time_s, contraction_time_s, flight_time_s, land_time_s,
-                    con_peak_velo, ecc_peak_velo, land_peak_velo, con_mean_velo,
-                    ecc_mean_velo, vto, depth_cm]
-        
-        # round with list comprehension
-        values_dat_clean = [round(float(n), 3) for n in values_dat]
-        values_dat_table = [round(float(n),3) for n in values_dat]
-                  
-        table_vars = list(singleplate_slj_vars_dict.values())   
-        
-        self.table_dat = pd.DataFrame({'Variable': table_vars,
-                                      file_name: values_dat_table})
-        self.display_table(self.outcome_dat) # display data in table
-        
-        outcome_dat[file_name] = values_dat_clean 
-        
-        # Define time outcomes for plotting  
-        start_move_s = time_s[start_move]
-        start_ecc_s = time_s[start_ecc]
-        start_con_s = time_s[start_con]
-        takeoff_s = time_s[takeoff]
-        land_s = time_s[land]
-        end_land_s = time_s[end_land]
-        
-        # For adding annotations             
-        annotations = {"Unweigh": start_move_s, 
-                       "Ecentric": start_ecc_s, 
-                       "Concentric": start_con_s, 
-                       "Flight": takeoff_s, 
-                       "Landing": land_s+0.1}
-        
-        if 'LEFT' in file_name.upper():
-            col_jump = 'blue'
-            self.figure1.clear()
-            ax = self.figure1.add_subplot(111)          
-            ax.axhline(y = bw_mean, color = 'black', ls = "--", lw = 0.4)
-            ax.axvline(x = start_move_s, ls = ":", color = 'black', lw = 0.4)
-            ax.axvline(x = start_ecc_s, ls = ':', color = 'black', lw = 0.4)
-            ax.axvline(x = start_con_s, ls = ":", color = 'black', lw = 0.4)
-            ax.axvline(x = takeoff_s, ls = ":", color = 'black', lw = 0.4)
-            ax.axvline(x = land_s, ls = ":", color = 'black', lw = 0.4)
-            ax.axvline(x = end_land_s, ls = ":", color = 'black', lw = 0.4)
-            sns.lineplot(x=time_s[0:end_land+500], y=fz_jump_leg[0:end_land+500], color=col_jump, ax=ax)
-            ax.xaxis.set_major_locator(MaxNLocator(integer = True, prune = 'both'))
-            ax.yaxis.set_major_locator(MaxNLocator(nbins = 'auto', prune = 'both'))
-            ax.set_ylabel("Force (N)")
-            y_pos = ax.get_ylim()[1]*0.95
-            for label, x_coord in annotations.items():
-                ax.annotate(label, xy = (x_coord, y_pos), xytext = (5,5),
-                             textcoords = 'offset points', ha = 'left', va = 'top',
-                             fontsize = 8, fontweight = 'bold', color = 'black', rotation = -90)
-            self.figure1.tight_layout()
-            self.canvas1.draw()
-
-        if 'RIGHT' in file_name.upper():
-            col_jump = 'red'
-            self.figure2.clear()
-            ax = self.figure2.add_subplot(111)
-            ax.axhline(y = bw_mean, color = 'black', ls = "--", lw = 0.4)
-            ax.axvline(x = start_move_s, ls = ":", color = 'black', lw = 0.4)
-            ax.axvline(x = start_ecc_s, ls = ':', color = 'black', lw = 0.4)
-            ax.axvline(x = start_con_s, ls = ":", color = 'black', lw = 0.4)
-            ax.axvline(x = takeoff_s, ls = ":", color = 'black', lw = 0.4)
-            ax.axvline(x = land_s, ls = ":", color = 'black', lw = 0.4)
-            ax.axvline(x = end_land_s, ls = ":", color = 'black', lw = 0.4)
-            sns.lineplot(x=time_s[0:end_land+500], y=fz_jump_leg[0:end_land+500], color=col_jump, ax=ax)
-            ax.xaxis.set_major_locator(MaxNLocator(integer = True, prune = 'both'))
-            ax.yaxis.set_major_locator(MaxNLocator(nbins = 'auto', prune = 'both'))
-            ax.set_ylabel("Force (N)")
-            
-            y_pos = ax.get_ylim()[1]*0.95
-            # add annotations to force plt
-            for label, x_coord in annotations.items():
-                ax.annotate(label, xy = (x_coord, y_pos), xytext = (5,5),
-                             textcoords = 'offset points', ha = 'left', va = 'top',
-                             fontsize = 8, fontweight = 'bold', color = 'black', rotation = -90)
-            self.figure2.tight_layout()    
-            self.canvas2.draw()
-            
-        self.outcome_dat = outcome_dat  
+        if file_name in self.segments:
+            recording, trial = self.segments[file_name]
+            return list(self.recordings[recording][trial].T)  # views, nothing is re-read or copied
+        if file_name in self.sessions:
+            return list(self.sessions[file_name].signal(file_name).T)
+        dat = forceplate.read_trial(file_path)
+        return [forceplate.fz_column(dat, col) for col in self.fz_cols]
+    
+    # Process one trial: read, analyse, add it to the table and plot it
+    @profiling.profiled(TIMING_LOG)
+    def processFile(self, file_path):
+        file_name = os.path.basename(file_path)[:-4]
+        if file_name in self.sessions:
+            trial = self.sessions[file_name].trial(file_name)
+            inputs = (trial["bodymass"], trial["drop_height"])  # as saved, nothing to ask for
+        else:
+            inputs = self.trial_inputs(file_name)
+        if inputs is None:
+            return
+        bodymass, drop_height = inputs
+        
+        fz = self.trial_fz(file_path)
+        profiling.lap("read")
+        fz = [prefilter_fz(f) for f in fz]
+        profiling.lap("filter")
+        
+        result = self.test.analyze(fz[0] if self.test.plates == 1 else fz,
+                                   bodymass = bodymass, drop_height = drop_height)
+        profiling.lap("metrics")
+        self.show_result(file_path, result, inputs)
+    
+    # add an analysed trial to the table and plot it
+    def show_result(self, file_path, result, inputs = None):
+        file_name = os.path.basename(file_path)[:-4]
+        leg = self.leg_of(file_name)
+        bodymass, drop_height = (None, None) if inputs is None else inputs
+        self.trial_data[file_name] = {"bodymass": bodymass, "drop_height": drop_height,
+                                      "events": result["events"], "values": result["values"]}
+        values_dat_clean = self.test.table_values(result["values"])
+        self.outcome_dat[file_name] = values_dat_clean
+        self.average_data(self.outcome_dat)
+        if self.test.plates == 2:
+            self.get_lsi(self.average_dat)
+        self.on_tablecombobox_changed(self.tableComboBox.currentIndex())
+        profiling.lap("table")
+        
+        # figure, the overlay caches the trial either way and draws it only when shown
+        panel = self.panels[leg]
+        panel["current"] = file_path
+        plot = result["plot"]
+        panel["overlay"].add(file_name, plot["traces"][0][1], plot["start"], plot["stop"], result["events"],
+                             color = analyses.leg_colors.get(leg, analyses.trace_styles["Total"][0]))
+        if self.overlay_event() is None:
+            panel["figure"].clear()
+            ax = panel["figure"].add_subplot(111)
+            analyses.plot_trial(ax, plot, color = analyses.leg_colors.get(leg, 'black'))
+            profiling.lap("plot")
+            panel["figure"].tight_layout()
+            panel["canvas"].draw()
+        profiling.lap("draw")
     
     # average data
     def average_data(self, dataframe):
-        var_names = dataframe.iloc[:, 0]
-        var_names = var_names[1:]
-        left_columns = dataframe.loc[:, dataframe.columns.str.contains("LEFT")]
-        right_columns = dataframe.loc[:, dataframe.columns.str.contains("RIGHT")]
-        left_columns_mean = left_columns.mean(axis = 1)
-        left_columns_mean = left_columns_mean[1:]
-        left_columns_mean = left_columns_mean.round(3)
-        right_columns_mean = right_columns.mean(axis = 1)
-        right_columns_mean = right_columns_mean[1:]
-        right_columns_mean = right_columns_mean.round(3)
-        left_right_lsi = left_columns_mean/right_columns_mean
-        left_right_lsi = left_right_lsi.round(3)
-        right_left_lsi = right_columns_mean/left_columns_mean
-        right_left_lsi = right_left_lsi.round(3)
-        average_dat = pd.DataFrame({"Variable": var_names,
-                                    "Left": left_columns_mean,
-                                    "Right": right_columns_mean,
-                                    "L/R LSI": left_right_lsi,
-                                    "R/L LSI": right_left_lsi})        
-        self.average_dat = average_dat
-    
+        if self.test.unilateral:
+            # left and right means (without body mass) and the limb symmetry indices
+            var_names = dataframe.iloc[1:, 0]
+            left_columns_mean = dataframe.loc[:, dataframe.columns.str.contains("LEFT")].mean(axis = 1)[1:].round(3)
+            right_columns_mean = dataframe.loc[:, dataframe.columns.str.contains("RIGHT")].mean(axis = 1)[1:].round(3)
+            self.average_dat = pd.DataFrame({"Variable": var_names,
+                                             "Left": left_columns_mean,
+                                             "Right": right_columns_mean,
+                                             "L/R LSI": (left_columns_mean / right_columns_mean).round(3),
+                                             "R/L LSI": (right_columns_mean / left_columns_mean).round(3)})
+        else:
+            var_names = dataframe.iloc[:, 0]
+            values_dat = dataframe.iloc[:, 1:]
+            self.average_dat = pd.DataFrame({"Variable": var_names,
+                                             self.test.average_label: values_dat.mean(axis = 1)})
+       
+    # function to get Limb symmetry indices 
+    def get_lsi(self, dataframe):
+        leg_data = dataframe[dataframe['Variable'].str.contains("Left|Right")].copy()
+        leg_data['leg'] = leg_data['Variable'].apply(lambda x: 'Left' if 'Left' in x else 'Right')
+        leg_data['Metric'] = leg_data['Variable'].apply(lambda x: x.split(' ', 1)[1])
+        leg_data_clean = leg_data[['Metric', 'leg', self.test.average_label]]
+        leg_data_wide = leg_data_clean.pivot(index = 'Metric', columns = 'leg', values = self.test.average_label).reset_index()
+        leg_data_wide["L/R LSI"]  = np.round(leg_data_wide['Left'] / leg_data_wide['Right'], 2)
+        leg_data_wide['R/L LSI'] = np.round(leg_data_wide['Right'] / leg_data_wide['Left'], 2)
+        
+        self.lsi_data = leg_data_wide       
+        
     # defining export data function
     def exportData(self):
         options = QFileDialog.Options()
         save_path, _ = QFileDialog.getSaveFileName(self, "Save file", "", "XLSX Files (*.xlsx);;All Files (*)", options=options)
-        average_df = self.average_dat
-        outcome_df = self.outcome_dat        
         if save_path:
             if not save_path.endswith('.xlsx'):
                 save_path += '.xlsx'
             with pd.ExcelWriter(save_path, engine='xlsxwriter') as writer:
-                average_df.to_excel(writer, sheet_name = "Average Data", index = False)
-                outcome_df.to_excel(writer, sheet_name = "Individual Data", index = False)     
+                if self.test.plates == 2:
+                    self.lsi_data.to_excel(writer, sheet_name = "LSI Data", index = False)
+                self.average_dat.to_excel(writer, sheet_name = "Average Data", index = False)
+                self.outcome_dat.to_excel(writer, sheet_name = "Individual Data", index = False)
+    
+    # every trial in the table with its signal, inputs, events and values in one file
+    # (biomech/session.py), so the session can be reviewed without the CSVs
+    def saveSession(self):
+        save_path, _ = QFileDialog.getSaveFileName(self, "Save session", "", f"Sessions (*{session.extension});;All Files (*)")
+        if not save_path:
+            return
+        if not save_path.endswith(session.extension):
+            save_path += session.extension
+        names = [name for name in self.outcome_dat.columns[1:] if name in self.trial_data]
+        trials = ({"name": name, "fz": self.trial_fz(self.file_path_dict[name]), **self.trial_data[name]} for name in names)
+        # saving over the session the trials were opened from: read them before it is replaced
+        replaced = {stored for stored in self.sessions.values() if os.path.abspath(stored.path) == os.path.abspath(save_path)}
+        if replaced:
+            trials = [{**trial, "fz": np.column_stack(trial["fz"])} for trial in trials]
+            for stored in replaced:
+                stored.close()
+        try:
+            session.save(save_path, self.test, trials, {"fz_columns": self.fz_cols, "cutoff": FZ_FILTER_CUTOFF})
+        except OSError as error:  # e.g. a trial's CSV has been moved since
+            self.statusBar().showMessage(f"Session not saved: {error}")
+            return
+        if replaced:
+            saved = session.Session(save_path)
+            for name, stored in self.sessions.items():
+                if stored in replaced:
+                    self.sessions[name] = saved
+        self.statusBar().showMessage(f"Saved {len(names)} trials to {save_path}")
+    
+    # the tables come from the saved values straight away; a trial's signal is only read
+    # (and analysed again, with this program's settings) when it is plotted
+    def openSession(self):
+        open_path, _ = QFileDialog.getOpenFileName(self, "Open session", "", f"Sessions (*{session.extension});;All Files (*)")
+        if not open_path:
+            return
+        try:
+            stored = session.Session(open_path)
+        except (OSError, ValueError) as error:
+            self.statusBar().showMessage(f"Could not open {open_path}: {error}")
+            return
+        if stored.test_name != type(self.test).__name__:
+            self.statusBar().showMessage(f"{os.path.basename(open_path)} is a {stored.test().name} session")
+            return
+        columns = {}
+        for name in stored.names:
+            trial = stored.trial(name)
+            self.file_path_dict[name] = name + ".csv"
+            self.sessions[name] = stored
+            self.trial_data[name] = {key: trial[key] for key in ("bodymass", "drop_height", "events", "values")}
+            columns[name] = self.test.table_values(trial["values"])
+            fileComboBox = self.panels[self.leg_of(name)]["fileComboBox"]
+            fileComboBox.blockSignals(True)
+            if fileComboBox.findText(name) == -1:
+                fileComboBox.addItem(name)
+            fileComboBox.setCurrentText(name)
+            fileComboBox.blockSignals(False)
+        # one new block of columns rather than one insert per trial
+        kept = self.outcome_dat.drop(columns = [name for name in columns if name in self.outcome_dat])
+        self.outcome_dat = pd.concat([kept, pd.DataFrame(columns, index = kept.index)], axis = 1)
+        # plotting the last trial of each panel updates the tables as well
+        shown = [panel["fileComboBox"].currentText() for panel in self.panels.values()]
+        shown = [name for name in shown if name in columns]
+        for name in shown:
+            self.current_file = self.file_path_dict[name]
+            self.processFile(self.current_file)
+        if not shown:
+            self.average_data(self.outcome_dat)
+            if self.test.plates == 2:
+                self.get_lsi(self.average_dat)
+            self.on_tablecombobox_changed(self.tableComboBox.currentIndex())
+        self.statusBar().showMessage(f"Opened {len(columns)} trials from {open_path}")
+    
     def returntoHome(self):
+        self.stop_live()
+        self.stop_watch()
         self.home = AnalysisSelector()
         self.home.show()
         self.close() 
+        
     def closeApp(self):
+        self.stop_live()
+        self.stop_watch()
         self.close()
-        
-class SinglePlateSLDropWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.initUI()
-        self.showMaximized()
-    
-     # File dictionary to enable handling of multiple files
-        self.file_path_dict = {}
-        self.current_file_left = None
-        self.current_file_right = None
-        self.table_dat = pd.DataFrame()
-        
-        # Initialize dataframes 
-        self.outcome_dat =  pd.DataFrame({'Variable': singleplate_droplanding_vars_dict.values()})
-        self.selected_vars = []
-        
-        # get user inputs for mass and drop height
-        self.get_user_inputs()
-        
-        # Display the default table (outcome_dat)
-        self.display_table(self.table_dat)
-        self.left_drop_count = 0
-        self.right_drop_count = 0
-        
-         # Initialize the VariableSelectionDialog with the data dictionary
-        self.sldrop_vars_dict = singleplate_droplanding_vars_dict
-       
-    def initUI(self):
-        self.setWindowTitle("Single Plate Drop Landing Analysis")
-        self.setGeometry(100, 100, 1600, 800)
-
-        self.centralWidget = QWidget(self)
-        self.setCentralWidget(self.centralWidget)
 
-        self.layout = QVBoxLayout(self.centralWidget)
-        self.topLayout = QHBoxLayout()
-        self.layout.addLayout(self.topLayout)
-        self.leftLayout = QVBoxLayout()  # for plots
-        self.rightLayout = QVBoxLayout()  # for table
-     
-        self.topLayout.addLayout(self.leftLayout, stretch = 3)
-        self.topLayout.addLayout(self.rightLayout, stretch = 2) 
-        
-        # Create a dropdown box for selecting files for the left plot
-        self.fileComboBoxLeft = QComboBox()
-        self.fileComboBoxLeft.currentIndexChanged.connect(self.on_file_combobox_left_changed)
-        self.leftLayout.addWidget(self.fileComboBoxLeft)
-
-        # Label for left plot file selection
-        self.label1 = QLabel("Drag and Drop Left Leg Trial(s) here:", self)
-        self.label1.setFont(QFont("Arial bold", 10))
-        self.label1.setAlignment(Qt.AlignLeft)
-        self.leftLayout.addWidget(self.label1)
 
-        # First plot (Left)
-        self.figure1 = plt.Figure(figsize=(12, 8))
-        self.canvas1 = FigureCanvas(self.figure1)
-        self.leftLayout.addWidget(self.canvas1)
+##### The tests, single plate first
+class SinglePlateSLJAnalysisWindow(AnalysisWindow):
+    test = analyses.SingleLegJump()
 
-        # Create a dropdown box for selecting files for the right plot
-        self.fileComboBoxRight = QComboBox()
-        self.fileComboBoxRight.currentIndexChanged.connect(self.on_file_combobox_right_changed)
-        self.leftLayout.addWidget(self.fileComboBoxRight)
-        
-        # Label for right plot file selection
-        self.label2 = QLabel("Drag and Drop Right Leg Trial(s) here:", self)
-        self.label2.setFont(QFont("Arial bold", 10))
-        self.label2.setAlignment(Qt.AlignLeft)
-        self.leftLayout.addWidget(self.label2)
 
-        # Second plot (Right)
-        self.figure2 = plt.Figure(figsize=(12, 8))
-        self.canvas2 = FigureCanvas(self.figure2)
-        self.leftLayout.addWidget(self.canvas2)
-        
-        # defining the table for values
-        # Create a QComboBox for selecting data displayed in table
-        self.comboBox = QComboBox()
-        self.comboBox.addItems(['Full Results', "Average Results"])
-        self.comboBox.currentIndexChanged.connect(self.on_combobox_changed)
-        self.rightLayout.addWidget(self.comboBox)
-        self.table = QTableWidget(self)
-        self.rightLayout.addWidget(self.table)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.resizeRowsToContents()
-        self.table.verticalHeader().setVisible(False)
-        header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)   
-            
-        # Adding in buttons
-        self.buttonLayout = QVBoxLayout()
-        self.buttonLayout.setAlignment(Qt.AlignTop)
-        
-        # Add export data button
-        self.exportButton = QPushButton("Save Data", self)
-        self.exportButton.clicked.connect(self.exportData)
-        self.buttonLayout.addWidget(self.exportButton)
-                     
-        # Quit program button       
-        self.closeAppButton = QPushButton("Quit Program", self)
-        self.closeAppButton.clicked.connect(self.closeApp)
-        self.buttonLayout.addWidget(self.closeAppButton) 
-        self.setAcceptDrops(True)
-        
-        # Home Button
-        self.homeButton = QPushButton('Return to Home', self)
-        self.homeButton.clicked.connect(self.returntoHome)
-        self.buttonLayout.addWidget(self.homeButton)
-               
-        self.topLayout.addLayout(self.buttonLayout)
-        
-        # Column selection for safety of making sure
-        self.columnSelectionPrompt()
-        
-    def get_user_inputs(self):
-        # input for participant's body mass
-        pt_mass_lb, ok1 = QInputDialog.getDouble(self, "Input", "Enter Individual's Body Mass (pounds) - this MUST be accurate:", decimals=2)
-        if ok1:
-            pt_mass_kg = pt_mass_lb/2.2046
-            self.pt_mass = pt_mass_kg
-        else:
-            self.close()
+class SinglePlateSLDropWindow(AnalysisWindow):
+    test = analyses.DropLanding()
 
-    # Define column selection prompt page
-    def columnSelectionPrompt(self):
-        columnOptions = [chr(i) for i in range(65, 87)]
-        self.fz_col, ok1 = QInputDialog.getItem(self, "Select Column", "Select 'Fz' Column from Excel file, double check this prior \nto any analyses or the program will not run:", columnOptions, 5, False)
-        if ok1:
-            self.fz_col = ord(self.fz_col) - 65
-        else:
-            self.close()
-    
-    # Method to update the table display       
-    def display_table(self, dataframe):
-        self.table.clear()
-        self.table.setRowCount(len(dataframe))
-        self.table.setColumnCount(dataframe.shape[1])
-        self.table.setHorizontalHeaderLabels(dataframe.columns)
-        
-        # Font settings for table
-        variable_font = QFont()
-        variable_font.setBold(True)
-        variable_font.setFamily("Arial")
-        variable_font.setPointSize(8)
-            
-        value_font = QFont()
-        value_font.setFamily("Arial")
-        value_font.setPointSize(8)
-     
-        # Loop through the dataframe to populate the table
-        for i in range(dataframe.shape[0]):
-            for j in range(dataframe.shape[1]):
-                value = dataframe.iat[i, j]
 
-                if j == 0:  # First column (strings)
-                    item = QTableWidgetItem(str(value))
-                    item.setFont(variable_font)
-                else:  # Second and subsequent columns (floats)
-                    numeric_value = float(value)
-                    item = QTableWidgetItem(f"{numeric_value:.2f}")
-                    item.setFont(value_font)
-                    item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
-                
-                self.table.setItem(i, j, item)
+class SinglePlateDropJumpAnalysisWindow(AnalysisWindow):
+    test = analyses.DropJump()
 
-        self.table.setStyleSheet(TABLE_STYLE)
-        self.table.setAlternatingRowColors(True)
-        self.table.resizeColumnsToContents()
-        
-    # Update the on_combobox_changed method to handle three dataframes this needs to be modifed
-    def on_combobox_changed(self, index):
-        if index == 0:
-            self.display_table(self.outcome_dat)
-        if index == 1:
-            self.average_data(self.outcome_dat)
-            self.display_table(self.average_dat)  
-    
-    # Dropdown (Left) changed method
-    def on_file_combobox_left_changed(self):
-        file_key = self.fileComboBoxLeft.currentText()
-        self.current_file_left = self.file_path_dict[file_key]
-        self.processSLDropFile(self.current_file_left)
 
-    # Dropdown (Right) changed method
-    def on_file_combobox_right_changed(self):
-        file_key = self.fileComboBoxRight.currentText()
-        self.current_file_right = self.file_path_dict[file_key]
-        self.processSLDropFile(self.current_file_right)
+class SinglePlateCMJAnalysisWindow(AnalysisWindow):
+    test = analyses.CMJ()
 
-    # For dragging in new files        
-    def dragEnterEvent(self, event):
-        if event.mimeData().hasUrls():
-            event.acceptProposedAction()
-                
-    def dropEvent(self, event):
-        for url in event.mimeData().urls():
-            file_path = url.toLocalFile()
-            if file_path.endswith('.csv'):
-                file_name = os.path.basename(file_path)[:-4]  # Remove .csv extension
-                self.file_path_dict[file_name] = file_path
-                if 'LEFT' in file_name.upper():
-                    if self.fileComboBoxLeft.findText(file_name) == -1:
-                        self.fileComboBoxLeft.addItem(file_name)
-                    self.fileComboBoxLeft.setCurrentText(file_name)
-                    self.current_file_left = file_path
-                    self.on_file_combobox_left_changed()
-                    self.left_drop_count = self.left_drop_count + 1 
-                    self.processSLDropFile(file_path)
-                    self.average_data(self.outcome_dat)   
-                if 'RIGHT' in file_name.upper():
-                    if self.fileComboBoxRight.findText(file_name) == -1:
-                        self.fileComboBoxRight.addItem(file_name)
-                    self.right_drop_count = self.right_drop_count + 1
-                    self.fileComboBoxRight.setCurrentText(file_name)
-                    self.current_file_right = file_path
-                    self.on_file_combobox_right_changed()
-                    self.right_drop_count = self.right_drop_count +1
-                    self.processSLDropFile(file_path)
-                    self.average_data(self.outcome_dat)
-               
-    # Process the SL Drop Landing file(s) 
-    def processSLDropFile(self, file_path):
-        # constants
-        sf = 1000
-        pt_mass = self.pt_mass
-        pt_weight = pt_mass * 9.81
-        outcome_dat = self.outcome_dat
-        file_name = os.path.basename(file_path)[:-4]
-        
-        if 'LEFT' in file_name.upper():
-            self.jump_leg_name = 'LEFT'
-        if 'RIGHT' in file_name.upper():
-            self.jump_leg_name = 'RIGHT'
 
-        dat = pd.read_csv(file_path)           
-        fz_landing_leg = dat.iloc[:, self.fz_col]
-        fz_total = fz_landing_leg
-        
-        trial_len = len(fz_total)
-        trial_time = trial_len/sf
-        time = np.linspace(start = 0, stop = trial_time, num = trial_len)
+class DualPlateCMJAnalysisWindow(AnalysisWindow):
+    test = analyses.DualCMJ()
 
-        # determine indices
-        impact = 500
-        while fz_total[impact] < 30:
-            impact = impact + 1 
-        impact_time = time[impact]
-        
-        # identify peak values and their indices of time and index
-        peak_fz = fz_total.max()
-        peak_fz_index = fz_total.argmax(axis = 0)
-        peak_fz_time = time[peak_fz_index]
-        
-        # peak fz relative
-        peak_fz_rel = peak_fz/pt_mass
-        
-        # calculate time to peak Fz for loading rate
-        time_to_peak_fz = peak_fz_time - impact_time
-        
-        # calculate force in units of N of BM
-        fz_bwn = fz_total/pt_weight
-        peak_fz_bwn = fz_bwn.max()
-        
-        # calculate loading rate
-        loading_rate = peak_fz_bwn/time_to_peak_fz
-        
-        # combine into a list
-        values_dat = [pt_mass,
-                      peak_fz,
-                      peak_fz_rel,
-                      loading_rate]
-                      #tts 
-                      
-        
-        # round with list comprehension
-        values_dat_clean = [round(float(n), 3) for n in values_dat]
-        values_dat_table = [round(float(n),3) for n in values_dat]
-                  
-        table_vars = list(singleplate_droplanding_vars_dict.values())   
-        
-        self.table_dat = pd.DataFrame({'Variable': table_vars,
-                                      file_name: values_dat_table})
-        self.display_table(self.outcome_dat) # display data in table
-        
-        outcome_dat[file_name] = values_dat_clean 
-        
-        # Cropped arrays for plotting
-        cropped_time = time[impact-250:]
-        fz_cropped = fz_total[impact-250:]
-        
-        # For adding annotations             
-        annotations = {"Impact": impact_time, 
-                       "Peak Force": peak_fz_time}
-        
-        if 'LEFT' in file_name.upper():
-            col_jump = 'blue'
-            self.figure1.clear()
-            ax = self.figure1.add_subplot(111)          
-            ax.axvline(x = impact_time, ls = ":", color = 'black', lw = 0.4)
-            ax.axvline(x = peak_fz_time, ls = ':', color = 'black', lw = 0.4)
-            sns.lineplot(x=cropped_time, y=fz_cropped, color=col_jump, ax=ax)
-            ax.xaxis.set_major_locator(MaxNLocator(integer = True, prune = 'both'))
-            ax.yaxis.set_major_locator(MaxNLocator(nbins = 'auto', prune = 'both'))
-            ax.set_ylabel("Force (N)")
-            y_pos = ax.get_ylim()[1]*0.95
-            # add annotations to force plt
-            for label, x_coord in annotations.items():
-                ax.annotate(label, xy = (x_coord, y_pos), xytext = (5,5),
-                             textcoords = 'offset points', ha = 'left', va = 'top',
-                             fontsize = 8, fontweight = 'bold', color = 'black', rotation = -90)
-            self.figure1.tight_layout();
-            self.canvas1.draw()
 
-        if 'RIGHT' in file_name.upper():
-            col_jump = 'red'
-            self.figure2.clear()
-            ax = self.figure2.add_subplot(111)           
-            ax.axvline(x = impact_time, ls = ":", color = 'black', lw = 0.4)
-            ax.axvline(x = peak_fz_time, ls = ':', color = 'black', lw = 0.4)
-            sns.lineplot(x=cropped_time, y=fz_cropped, color=col_jump, ax=ax)
-            ax.xaxis.set_major_locator(MaxNLocator(integer = True, prune = 'both'))
-            ax.yaxis.set_major_locator(MaxNLocator(nbins = 'auto', prune = 'both'))
-            ax.set_ylabel("Force (N)")
-            y_pos = ax.get_ylim()[1]*0.95
-            # add annotations to force plt
-            for label, x_coord in annotations.items():
-                ax.annotate(label, xy = (x_coord, y_pos), xytext = (5,5),
-                             textcoords = 'offset points', ha = 'left', va = 'top',
-                             fontsize = 8, fontweight = 'bold', color = 'black', rotation = -90)
-            self.figure2.tight_layout();
-            self.canvas2.draw()
+class DualPlateDropLandingAnalysisWindow(AnalysisWindow):
+    test = analyses.DualDropLanding()
 
-        self.outcome_dat = outcome_dat  
-    
-    # average data
-    def average_data(self, dataframe):
-        var_names = dataframe.iloc[:, 0]
-        var_names = var_names[1:]
-        left_columns = dataframe.loc[:, dataframe.columns.str.contains("LEFT")]
-        right_columns = dataframe.loc[:, dataframe.columns.str.contains("RIGHT")]
-        left_columns_mean = left_columns.mean(axis = 1)
-        left_columns_mean = left_columns_mean[1:]
-        left_columns_mean = left_columns_mean.round(3)
-        right_columns_mean = right_columns.mean(axis = 1)
-        right_columns_mean = right_columns_mean[1:]
-        right_columns_mean = right_columns_mean.round(3)
-        left_right_lsi = left_columns_mean/right_columns_mean
-        left_right_lsi = left_right_lsi.round(3)
-        right_left_lsi = right_columns_mean/left_columns_mean
-        right_left_lsi = right_left_lsi.round(3)
-        average_dat = pd.DataFrame({"Variable": var_names,
-                                    "Left": left_columns_mean,
-                                    "Right": right_columns_mean,
-                                    "L/R LSI": left_right_lsi,
-                                    "R/L LSI": right_left_lsi})        
-        self.average_dat = average_dat
-    # defining export data function
-    def exportData(self):
-        options = QFileDialog.Options()
-        save_path, _ = QFileDialog.getSaveFileName(self, "Save file", "", "XLSX Files (*.xlsx);;All Files (*)", options=options)
-        average_df = self.average_dat
-        outcome_df = self.outcome_dat        
-        if save_path:
-            if not save_path.endswith('.xlsx'):
-                save_path += '.xlsx'
-            with pd.ExcelWriter(save_path, engine='xlsxwriter') as writer:
-                average_df.to_excel(writer, sheet_name = "Average Data", index = False)
-                outcome_df.to_excel(writer, sheet_name = "Individual Data", index = False)
-    def returntoHome(self):
-        self.home = AnalysisSelector()
-        self.home.show()
-        self.close()                    
-    def closeApp(self):
-        self.close()
-        
-# single leg drop jump analysis
-class SinglePlateDropJumpAnalysisWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.initUI()
-        self.showMaximized()
-        
-        self.file_path_dict = {}
-        self.current_file_left = None
-        self.current_file_right = None
-        self.table_dat = pd.DataFrame()
-        
-        # initialize dataframes
-        self.outcome_dat = pd.DataFrame({'Variable': singleplate_dropjump_vars_dict.values()})
-        
-        # get user inputs
-        self.pt_mass = ()
-        self.box_height = ()
-        self.get_user_inputs()
-        
-        # display the default table
-        self.display_table(self.table_dat)
-        self.left_drop_count = 0
-        self.right_drop_count = 0
-        
-    def initUI(self):
-        self.setWindowTitle("Single Plate Drop Jump Analysis")
-        self.setGeometry(100, 100, 1600, 800)
-        self.centralWidget = QWidget(self)
-        self.setCentralWidget(self.centralWidget)
-        self.layout = QVBoxLayout(self.centralWidget)
-        self.topLayout = QHBoxLayout()
-        self.layout.addLayout(self.topLayout)
-        self.leftLayout = QVBoxLayout()  # for plots
-        self.rightLayout = QVBoxLayout()  # for table
-        self.topLayout.addLayout(self.leftLayout, stretch = 3)
-        self.topLayout.addLayout(self.rightLayout, stretch = 2) 
-        
-        # Create a dropdown box for selecting files for the left plot
-        self.fileComboBoxLeft = QComboBox()
-        self.fileComboBoxLeft.currentIndexChanged.connect(self.on_file_combobox_left_changed)
-        self.leftLayout.addWidget(self.fileComboBoxLeft)
 
-        # Label for left plot file selection
-        self.label1 = QLabel("Drag and Drop Left Leg Trial(s) here:", self)
-        self.label1.setFont(QFont("Arial bold", 10))
-        self.label1.setAlignment(Qt.AlignLeft)
-        self.leftLayout.addWidget(self.label1)
+class DualPlateDropJumpAnalysisWindow(AnalysisWindow):
+    test = analyses.DualDropJump()
 
-        # First plot (Left)
-        self.figure1 = plt.Figure(figsize=(12, 10))
-        self.canvas1 = FigureCanvas(self.figure1)
-        self.leftLayout.addWidget(self.canvas1)
-        self.toolbar1 = NavigationToolbar(self.canvas1, self, coordinates = False)
-        self.leftLayout.addWidget(self.toolbar1)
 
-        # Create a dropdown box for selecting files for the right plot
-        self.fileComboBoxRight = QComboBox()
-        self.fileComboBoxRight.currentIndexChanged.connect(self.on_file_combobox_right_changed)
-        self.leftLayout.addWidget(self.fileComboBoxRight)
-        
-        # Label for right plot file selection
-        self.label2 = QLabel("Drag and Drop Right Leg Trial(s) here:", self)
-        self.label2.setFont(QFont("Arial bold", 10))
-        self.label2.setAlignment(Qt.AlignLeft)
-        self.leftLayout.addWidget(self.label2)
-
-        # Second plot (Right)
-        self.figure2 = plt.Figure(figsize=(12, 10))
-        self.canvas2 = FigureCanvas(self.figure2)
-        self.leftLayout.addWidget(self.canvas2)
-        self.toolbar2 = NavigationToolbar(self.canvas2, self, coordinates = False)
-        self.leftLayout.addWidget(self.toolbar2)
-
-        # defining the table for values
-        # Create a QComboBox for selecting data displayed in table
-        self.comboBox = QComboBox()
-        self.comboBox.addItems(['Full Results', "Average Results"])
-        self.comboBox.currentIndexChanged.connect(self.on_combobox_changed)
-        self.rightLayout.addWidget(self.comboBox)
-        self.table = QTableWidget(self)
-        self.rightLayout.addWidget(self.table)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.resizeRowsToContents()
-        self.table.verticalHeader().setVisible(False)
-        header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)   
-            
-        # Adding in buttons
-        self.buttonLayout = QVBoxLayout()
-        self.buttonLayout.setAlignment(Qt.AlignTop)
-        
-        # Add export data button
-        self.exportButton = QPushButton("Save Data", self)
-        self.exportButton.clicked.connect(self.exportData)
-        self.buttonLayout.addWidget(self.exportButton)
-                     
-        # Quit program button       
-        self.closeAppButton = QPushButton("Quit Program", self)
-        self.closeAppButton.clicked.connect(self.closeApp)
-        self.buttonLayout.addWidget(self.closeAppButton) 
-        self.setAcceptDrops(True)
-        
-        # Home button
-        self.homeButton = QPushButton('Return to Home', self)
-        self.homeButton.clicked.connect(self.returntoHome)
-        self.buttonLayout.addWidget(self.homeButton)
-               
-        self.topLayout.addLayout(self.buttonLayout)
-        
-        # Column selection for safety of making sure
-        self.columnSelectionPrompt()  
-    
-    # custom function for user inputs
-    def get_user_inputs(self):
-        # input for participant's body mass
-        pt_mass_lb, ok1 = QInputDialog.getDouble(self, "Input", "Enter Individual's Body Mass (pounds)- This must be accurate:", decimals = 2)
-        if ok1:
-            pt_mass_kg = pt_mass_lb / 2.2046
-            self.pt_mass = pt_mass_kg
-        else:
-            self.close()
-        # input for box height
-        # defaults and constants    
-        default_box_height_in = 16.0
-
-        drop_height_in, ok2 = QInputDialog.getDouble(self, "Input", "Enter Box Height (inches):", decimals = 2, value = default_box_height_in)
-        if ok2:
-            drop_height_cm = drop_height_in * 2.54
-            drop_height_m = drop_height_cm/100
-            self.drop_height = drop_height_m
-        else:
-            self.close()
-    
-    # Define column selection prompt page
-    def columnSelectionPrompt(self):
-        columnOptions = [chr(i) for i in range(65, 87)]
-        self.fz_col, ok1 = QInputDialog.getItem(self, "Select Column", "Select 'Fz' Column from Excel file, double check this prior \nto any analyses or the program will not run:", columnOptions, 5, False)
-        if ok1:
-            self.fz_col = ord(self.fz_col) - 65
-        else:
-            self.close()
-    
-    # Method to update the table display       
-    def display_table(self, dataframe):
-        self.table.clear()
-        self.table.setRowCount(len(dataframe))
-        self.table.setColumnCount(dataframe.shape[1])
-        self.table.setHorizontalHeaderLabels(dataframe.columns)
-        # Font settings for table
-        variable_font = QFont()
-        variable_font.setBold(True)
-        variable_font.setFamily("Arial")
-        variable_font.setPointSize(8) 
-        value_font = QFont()
-        value_font.setFamily("Arial")
-        value_font.setPointSize(8)
-     
-        # Loop through the dataframe to populate the table
-        for i in range(dataframe.shape[0]):
-            for j in range(dataframe.shape[1]):
-                value = dataframe.iat[i, j]
-                if j == 0:  # First column (strings)
-                    item = QTableWidgetItem(str(value))
-                    item.setFont(variable_font)
-                else:  # Second and subsequent columns (floats)
-                    numeric_value = float(value)
-                    item = QTableWidgetItem(f"{numeric_value:.2f}")
-                    item.setFont(value_font)
-                    item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
-                self.table.setItem(i, j, item)
-
-        self.table.setStyleSheet(TABLE_STYLE)
-        self.table.setAlternatingRowColors(True)
-        self.table.resizeColumnsToContents()
-        
-    # Update the on_combobox_changed method to handle three dataframes this needs to be modifed
-    def on_combobox_changed(self, index):
-        if index == 0:
-            self.display_table(self.outcome_dat)
-        if index == 1:
-            self.display_table(self.average_dat)  
-    
-    # Dropdown (Left) changed method
-    def on_file_combobox_left_changed(self):
-        file_key = self.fileComboBoxLeft.currentText()
-        self.current_file_left = self.file_path_dict[file_key]
-        self.processsingleDropJumpfile(self.current_file_left)
-
-    # Dropdown (Right) changed method
-    def on_file_combobox_right_changed(self):
-        file_key = self.fileComboBoxRight.currentText()
-        self.current_file_right = self.file_path_dict[file_key]
-        self.processsingleDropJumpfile(self.current_file_right)
-
-    # For dragging in new files        
-    def dragEnterEvent(self, event):
-        if event.mimeData().hasUrls():
-            event.acceptProposedAction()
-                
-    def dropEvent(self, event):
-        for url in event.mimeData().urls():
-            file_path = url.toLocalFile()
-            if file_path.endswith('.csv'):
-                file_name = os.path.basename(file_path)[:-4]  # Remove .csv extension
-                self.file_path_dict[file_name] = file_path
-                
-                if 'LEFT' in file_name.upper():
-                    if self.fileComboBoxLeft.findText(file_name) == -1:
-                        self.fileComboBoxLeft.addItem(file_name)
-                    self.fileComboBoxLeft.setCurrentText(file_name)
-                    self.current_file_left = file_path
-                    self.on_file_combobox_left_changed()
-                    self.left_drop_count = self.left_drop_count + 1
-                    self.processsingleDropJumpfile(file_path)
-                    self.average_data(self.outcome_dat)
-
-                if 'RIGHT' in file_name.upper():
-                    if self.fileComboBoxRight.findText(file_name) == -1:
-                        self.fileComboBoxRight.addItem(file_name)
-                    self.right_drop_count = self.right_drop_count + 1
-                    self.fileComboBoxRight.setCurrentText(file_name)
-                    self.current_file_right = file_path
-                    self.on_file_combobox_right_changed()
-                    self.processsingleDropJumpfile(file_path)
-                    self.average_data(self.outcome_dat)
-                    
-    # now the processing script
-    def processsingleDropJumpfile(self, file_path):
-        # constants
-        sf = 1000
-        pt_mass = self.pt_mass
-        pt_weight = pt_mass * 9.81
-        bodymass = pt_mass
-        drop_height = self.drop_height
-        box_height = drop_height
-        impact_velo = np.sqrt(2 * 9.81 * drop_height) * -1
-        outcome_dat = self.outcome_dat
-        
-        # pull file name and time of creation
-        file_name = os.path.basename(file_path)[:-4]
-        
-        if 'LEFT' in file_name.upper():
-            self.jump_leg_name = 'LEFT'
-        if 'RIGHT' in file_name.upper():
-            self.jump_leg_name = 'RIGHT'
-        
-        # read in data
-        dat = pd.read_csv(file_path)
-        
-        fz_jump_leg = dat.iloc[:, self.fz_col]
-        fz_total = fz_jump_leg
-        
-        # calculate time
-        trial_len = len(fz_total)
-        trial_time = trial_len/sf
-        time_s = np.linspace(start = 0, stop = trial_time, num = trial_len)
-        
-        # find ground contact
-        ground_contact = 500
-        while fz_total[ground_contact] < 30:
-            ground_contact = ground_contact + 1
-        time_ground_contact_s = time_s[ground_contact]
-        
-        # takeoff calculation
-        takeoff = ground_contact + 1
-        while fz_total[takeoff] > 30:
-            takeoff = takeoff + 1
-        time_takeoff_s = time_s[takeoff]
-        
-        # land calculation
-        land = takeoff + 250
-        while fz_total[land] < 30:
-            land = land + 1
-        time_land_s = time_s[land]
-        
-        
-        # end land calculation
-        end_land = land+200
-        while fz_total[end_land] > pt_weight:
-            end_land = end_land + 1
-        while fz_total[end_land] < pt_weight:
-            end_land = end_land -1
-        # sanity check
-        if end_land > land:
-            end_land = end_land
-        else:
-            end_land = land+500
-        time_end_land_s = time_s[end_land]
-        
-        # initial crop of arays from ground contact to end landing
-        fz_total_cropped = fz_total[ground_contact:end_land]
-        fz_net_cropped = fz_total_cropped - pt_weight # net (vGRF - pt weight)
-        time_cropped_s = time_s[ground_contact:end_land]
-        
-        # calculate acceleration
-        accel = np.array(fz_net_cropped / bodymass)
-        
-        # calculate velocity with a custom function, this is because
-        # int_cumptraz no longer takes an initial argument (e.g., impact velo)
-        # and we are not really interested in the drop phase velocity
-        velo = [0] * len(accel) # empty array of 0s length of accel array
-        velo[0] = impact_velo # set first value to impact velocity
-        # loop that performs cumulative integration on the cropped arays
-        for i in range(1, len(accel)):
-            velo[i] = accel[i] * (time_cropped_s[i] - time_cropped_s[i-1]) + velo[i-1]
-        # make sure velocity is an array and not a list
-       # print(velo)
-        velo = np.array(velo)
-        #print(len(velo))
-        
-        # now we can calculate phases
-        # concnetric based on when velocity crosses 0
-        start_concentric = 1
-        while velo[start_concentric] < 0:
-            start_concentric = start_concentric + 1
-        time_cropped_at_start_concentric_s = time_cropped_s[start_concentric]
-        
-        # get indices for time in the cropped array
-        time_cropped_takeoff_index = np.where(time_cropped_s == time_takeoff_s)[0][0]
-        time_cropped_land_index = np.where(time_cropped_s == time_land_s)[0][0]
-        time_cropped_end_land_index = len(velo) # for now, end of landing phase is the lenght of velo
-        
-        # lastly, full time array at start concentric
-        full_index_at_start_concentric = np.where(time_s == time_cropped_at_start_concentric_s)[0][0]
-        time_s_at_start_concentric = time_s[full_index_at_start_concentric]
-        
-        ##### Phase Calculations
-        # total force arrays
-        ecc_fz_total = fz_total[ground_contact:full_index_at_start_concentric]
-        con_fz_total = fz_total[full_index_at_start_concentric:takeoff]
-        land_fz_total = fz_total[land:end_land]
-        positive_fz_total = fz_total[ground_contact:takeoff]
-        
-        # velocity arrays
-        ecc_velo = velo[0:start_concentric]
-        con_velo = velo[start_concentric:time_cropped_takeoff_index]
-        land_velo = velo[time_cropped_land_index:time_cropped_end_land_index]
-        
-        # power arrays
-        ecc_power = ecc_velo * ecc_fz_total
-        con_power = con_velo * con_fz_total
-        land_power = land_velo * land_fz_total
-        
-        ##### Outcomes start here
-        # power outcomes
-        ecc_peak_power = ecc_power.min()
-        ecc_mean_power = ecc_power.mean()
-        con_peak_power = con_power.max()
-        con_mean_power = con_power.mean()
-        land_peak_power = land_power.min()
-        land_mean_power = land_power.mean()    
-        
-        # kinetic phase specific outcomes
-        # eccentric
-        ecc_peak_force_n = ecc_fz_total.max()
-        ecc_peak_force_nkg = ecc_peak_force_n/bodymass    
-        ecc_mean_force_n = ecc_fz_total.mean()
-        ecc_mean_force_nkg = ecc_mean_force_n/bodymass
-        ecc_impulse = int_trapz(ecc_fz_total)/sf
-        # concentric
-        con_peak_force_n = con_fz_total.max()
-        con_peak_force_nkg = con_peak_force_n/bodymass    
-        con_mean_force_n = con_fz_total.mean()
-        con_mean_force_nkg = con_mean_force_n/bodymass
-        con_impulse = int_trapz(con_fz_total)/sf
-        positive_impulse = int_trapz(positive_fz_total)/sf
-        # land
-        land_peak_force_n = land_fz_total.max()
-        land_peak_force_nkg = land_peak_force_n/bodymass    
-        land_mean_force_n = land_fz_total.mean()
-        land_mean_force_nkg = land_mean_force_n/bodymass
-        land_impulse = int_trapz(land_fz_total)/sf
-        
-        # velocity outcomes
-        con_peak_velocity = con_velo.max()
-        con_mean_velocity = con_velo.mean()
-        ecc_mean_velocity = ecc_velo.mean()
-        land_peak_velocity = land_velo.min()
-        land_mean_velocity = land_velo.mean()
-        
-        # time constrained outcomes
-        groundcontact_time_s = time_s[takeoff] - time_s[ground_contact]
-        ecc_time_s = time_s_at_start_concentric - time_ground_contact_s
-        con_time_s = time_takeoff_s - time_s_at_start_concentric
-        flight_time_s = time_land_s - time_takeoff_s
-        land_time_s = time_end_land_s - time_land_s
-        
-        # performance outcomes
-        vto = velo[time_cropped_takeoff_index]
-        jh_m = ((vto ** 2))/(9.81 * 2)
-        jh_cm = jh_m * 100
-        rsi = flight_time_s/time_ground_contact_s
-        
-        # aggregate into a list
-        values_dat = [bodymass, box_height, jh_cm, rsi,
-                    con_peak_power, ecc_peak_power, land_peak_power,
-                    con_mean_power, ecc_mean_power, land_mean_power,
-                    con_peak_force_n, con_peak_force_nkg, ecc_peak_force_n,
-                    ecc_peak_force_nkg, con_mean_force_n, con_mean_force_nkg,
-                    ecc_mean_force_n, ecc_mean_force_nkg, land_peak_force_n,
-                    land_peak_force_nkg, land_mean_force_n, land_mean_force_nkg,
-                    con_impulse, ecc_impulse, positive_impulse,
-                    land_impulse, groundcontact_time_s, ecc_time_s,
-                    con_time_s, flight_time_s, land_time_s,
-                    con_peak_velocity, land_peak_velocity, land_mean_velocity,
-                    con_mean_velocity, ecc_mean_velocity, vto]
-        
-        values_dat_clean = [round(float(n), 3) for n in values_dat]
-        values_dat_table = [round(float(n), 3) for n in values_dat]
-        
-        full_table_vars = list(singleplate_dropjump_vars_dict.values())
-        self.display_table(self.outcome_dat)
-        outcome_dat[file_name] = values_dat_clean
-        
-        ##### Plotting
-        time_at_ground_contact_s = time_s[ground_contact]
-        time_at_start_concentric_s = time_s_at_start_concentric
-        time_at_takeoff_s = time_s[takeoff]
-        time_at_land_s = time_s[land]
-        
-        # for adding annotations
-        annotations = {'Ground Contact': time_at_ground_contact_s,
-                       'Concentric': time_at_start_concentric_s,
-                       'Flight': time_at_takeoff_s,
-                       'Landing': time_at_land_s+0.1}
-        
-        if 'LEFT' in file_name.upper():
-            col_jump = 'blue'
-            self.figure1.clear()
-            ax = self.figure1.add_subplot(111)
-            #figure itself
-            ax.axvline(x = time_at_ground_contact_s, ls = ":", color = 'grey', lw = 0.4)
-            ax.axvline(x = time_at_start_concentric_s, ls = ":", color = 'grey', lw = 0.4)
-            ax.axvline(x = time_at_takeoff_s, ls = ":", color = 'grey', lw = 0.4)
-            ax.axvline(x = time_at_land_s, ls = ":", color = 'grey', lw = 0.4)
-            sns.lineplot(x = time_s[ground_contact-500:], y = fz_total[ground_contact-500:], color = col_jump, ax = ax)
-            ax.xaxis.set_major_locator(MaxNLocator(nbins = 'auto'))
-            ax.yaxis.set_major_locator(MaxNLocator(nbins = 'auto'))
-            ax.set_ylabel('Force (N)')
-            ax.set_xlabel('Time (seconds)')
-            y_pos = ax.get_ylim()[1]*0.95 # annotations code below
-            for label, x_coord in annotations.items():
-                ax.annotate(label, xy = (x_coord, y_pos), xytext = (5,5),
-                            textcoords = 'offset points', ha = 'left', va = 'top',
-                            fontsize = 8, fontweight = 'bold', color = 'black', rotation = -90)
-            self.figure1.tight_layout();
-            self.canvas1.draw()
-        if 'RIGHT' in file_name.upper():
-            col_jump = 'red'
-            self.figure2.clear()
-            ax = self.figure2.add_subplot(111)
-            #figure itself
-            ax.axvline(x = time_at_ground_contact_s, ls = ":", color = 'grey', lw = 0.4)
-            ax.axvline(x = time_at_start_concentric_s, ls = ":", color = 'grey', lw = 0.4)
-            ax.axvline(x = time_at_takeoff_s, ls = ":", color = 'grey', lw = 0.4)
-            ax.axvline(x = time_at_land_s, ls = ":", color = 'grey', lw = 0.4)
-            sns.lineplot(x = time_s[ground_contact-500:], y = fz_total[ground_contact-500:], color = col_jump, ax = ax)
-            ax.xaxis.set_major_locator(MaxNLocator(nbins = 'auto'))
-            ax.yaxis.set_major_locator(MaxNLocator(nbins = 'auto'))
-            ax.set_ylabel('Force (N)')
-            ax.set_xlabel('Time (seconds)')
-            y_pos = ax.get_ylim()[1]*0.95 # annotations code below
-            for label, x_coord in annotations.items():
-                ax.annotate(label, xy = (x_coord, y_pos), xytext = (5,5),
-                            textcoords = 'offset points', ha = 'left', va = 'top',
-                            fontsize = 8, fontweight = 'bold', color = 'black', rotation = -90)
-            self.figure2.tight_layout();
-            self.canvas2.draw()
-        self.outcome_dat = outcome_dat # again for emphasis?
-        
-    # custom function for average data
-    def average_data(self, dataframe):
-        var_names = dataframe.iloc[:,0]
-        var_names = var_names[1:]
-        left_columns = dataframe.loc[:, dataframe.columns.str.contains("LEFT")]
-        right_columns = dataframe.loc[:, dataframe.columns.str.contains("RIGHT")]
-        left_columns_mean = left_columns.mean(axis = 1)
-        left_columns_mean = left_columns_mean[1:]
-        left_columns_mean = left_columns_mean.round(3)
-        right_columns_mean = right_columns.mean(axis = 1)
-        right_columns_mean = right_columns_mean[1:]
-        right_columns_mean = right_columns_mean.round(3)
-        left_right_lsi = left_columns_mean/right_columns_mean
-        left_right_lsi = left_right_lsi.round(3)
-        right_left_lsi = right_columns_mean/left_columns_mean
-        right_left_lsi = right_left_lsi.round(3)
-        average_dat = pd.DataFrame({"Variable": var_names,
-                                    "Left": left_columns_mean,
-                                    "Right": right_columns_mean,
-                                    "L/R LSI": left_right_lsi,
-                                    "R/L LSI": right_left_lsi})        
-        self.average_dat = average_dat
-    
-    # other custom functions    
-    # defining export data function
-    def exportData(self):
-        options = QFileDialog.Options()
-        save_path, _ = QFileDialog.getSaveFileName(self, "Save file", "", "XLSX Files (*.xlsx);;All Files (*)", options=options)
-        average_df = self.average_dat
-        outcome_df = self.outcome_dat        
-        if save_path:
-            if not save_path.endswith('.xlsx'):
-                save_path += '.xlsx'
-            with pd.ExcelWriter(save_path, engine='xlsxwriter') as writer:
-                average_df.to_excel(writer, sheet_name = "Average Data", index = False)
-                outcome_df.to_excel(writer, sheet_name = "Individual Data", index = False)
-                 
-    def returntoHome(self):
-        self.home = AnalysisSelector()
-        self.home.show()
-        self.close()
-    
-    def closeApp(self):
-        self.close()       
-        
-        
-##### Now for the CMJ analysis        
-class SinglePlateCMJAnalysisWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.initUI()
-        self.showMaximized()
-        
-        # File dictionary to enable handling of multiple files
-        self.file_path_dict = {}
-        self.current_file = None
-        self.table_dat = pd.DataFrame()
-        
-        # Initialize dataframes 
-        self.outcome_dat =  pd.DataFrame({'Variable': singleplate_cmj_vars_dict.values()})
-        
-        # Display the default table (outcome_dat)
-        self.display_table(self.table_dat)
-        self.drop_count = 0
-        
-        # Initialize the VariableSelectionDialog with the data dictionary
-        self.cmj_vars_dict = singleplate_cmj_vars_dict
-       
-    def initUI(self):
-        self.setWindowTitle("CMJ Analysis- Single Plate")
-        self.setGeometry(100, 100, 1600, 800)
-
-        self.centralWidget = QWidget(self)
-        self.setCentralWidget(self.centralWidget)
-
-        self.layout = QVBoxLayout(self.centralWidget)
-        self.topLayout = QHBoxLayout()
-        self.layout.addLayout(self.topLayout)
-        self.leftLayout = QVBoxLayout()  # for plots
-        self.rightLayout = QVBoxLayout()  # for table
-     
-        self.topLayout.addLayout(self.leftLayout, stretch = 3)
-        self.topLayout.addLayout(self.rightLayout, stretch = 2) 
-        
-        # Create a dropdown box for selecting files for the left plot
-        self.fileComboBox = QComboBox()
-        self.fileComboBox.currentIndexChanged.connect(self.on_file_combobox_changed)
-        self.leftLayout.addWidget(self.fileComboBox)
-
-        # Label for left plot file selection
-        self.label = QLabel("Drag and Drop CMJ Trial(s) here:", self)
-        self.label.setFont(QFont("Arial bold", 10))
-        self.label.setAlignment(Qt.AlignLeft)
-        self.leftLayout.addWidget(self.label)
-
-        # First plot (Left)
-        self.figure = plt.Figure(figsize=(12, 16))
-        self.canvas = FigureCanvas(self.figure)
-        self.leftLayout.addWidget(self.canvas)
-        self.toolbar = NavigationToolbar(self.canvas, self, coordinates = False)
-        self.leftLayout.addWidget(self.toolbar)
-        
-        # defining the table for values
-        # Create a QComboBox for selecting data displayed in table
-        self.comboBox = QComboBox()
-        self.comboBox.addItems(['Full Results', "Average Results"])
-        self.comboBox.currentIndexChanged.connect(self.on_combobox_changed)
-        self.rightLayout.addWidget(self.comboBox)
-        self.table = QTableWidget(self)
-        self.rightLayout.addWidget(self.table)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.resizeRowsToContents()
-        self.table.verticalHeader().setVisible(False)
-        header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)   
-            
-        # Adding in buttons
-        self.buttonLayout = QVBoxLayout()
-        self.buttonLayout.setAlignment(Qt.AlignTop)
-        
-        # Add export data button
-        self.exportButton = QPushButton("Save Data", self)
-        self.exportButton.clicked.connect(self.exportData)
-        self.buttonLayout.addWidget(self.exportButton)
-                     
-        # Quit program button       
-        self.closeAppButton = QPushButton("Quit Program", self)
-        self.closeAppButton.clicked.connect(self.closeApp)
-        self.buttonLayout.addWidget(self.closeAppButton) 
-        
-        # home button
-        self.homeButton = QPushButton('Return to Home', self)
-        self.homeButton.clicked.connect(self.returntoHome)
-        self.buttonLayout.addWidget(self.homeButton)
-        
-        # odd spot
-        self.setAcceptDrops(True)
-                
-        self.topLayout.addLayout(self.buttonLayout)
-        
-        # Column selection for safety of making sure
-        self.columnSelectionPrompt()   
-
-    # Define column selection prompt page
-    def columnSelectionPrompt(self):
-        columnOptions = [chr(i) for i in range(65, 87)]
-        self.fz_col, ok1 = QInputDialog.getItem(self, "Select Column", "Select 'Fz' Column from Excel file, double check this prior \nto any analyses or the program will not run:", columnOptions, 5, False)
-        if ok1:
-            self.fz_col = ord(self.fz_col) - 65
-        else:
-            self.close()
-    
-     # Method to update the table display       
-    def display_table(self, dataframe):
-        self.table.clear()
-        self.table.setRowCount(len(dataframe))
-        self.table.setColumnCount(dataframe.shape[1])
-        self.table.setHorizontalHeaderLabels(dataframe.columns)
-        variable_font = QFont()
-        variable_font.setBold(True)
-        variable_font.setFamily("Arial")
-        variable_font.setPointSize(8)    
-        value_font = QFont()
-        value_font.setFamily("Arial")
-        value_font.setPointSize(8)
-     
-        # Loop through the dataframe to populate the table
-        for i in range(dataframe.shape[0]):
-            for j in range(dataframe.shape[1]):
-                value = dataframe.iat[i, j]
-                if j == 0:  # First column (strings)
-                    item = QTableWidgetItem(str(value))
-                    item.setFont(variable_font)
-                else:  # Second and subsequent columns (floats)
-                    numeric_value = float(value)
-                    item = QTableWidgetItem(f"{numeric_value:.2f}")
-                    item.setFont(value_font)
-                    item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
-                self.table.setItem(i, j, item)
-        self.table.setStyleSheet(TABLE_STYLE)
-        self.table.setAlternatingRowColors(True)
-        self.table.resizeColumnsToContents()
-        
-    # Update the on_combobox_changed method to handle three dataframes this needs to be modifed
-    def on_combobox_changed(self, index):
-        if index == 0:
-            self.display_table(self.outcome_dat)
-        if index == 1:
-            self.average_data(self.outcome_dat)
-            self.display_table(self.average_dat)  
-
-    # Dropdown file changed method
-    def on_file_combobox_changed(self):
-        file_key = self.fileComboBox.currentText()
-        self.current_file = self.file_path_dict[file_key]
-        self.processCMJfile(self.current_file)
-
-    # For dragging in new files        
-    def dragEnterEvent(self, event):
-        if event.mimeData().hasUrls():
-            event.acceptProposedAction()
-                
-    def dropEvent(self, event):
-        for url in event.mimeData().urls():
-            file_path = url.toLocalFile()
-            if file_path.endswith('.csv'):
-                file_name = os.path.basename(file_path)[:-4]  # Remove .csv extension
-                self.file_path_dict[file_name] = file_path
-                self.processCMJfile(file_path)
-                if self.fileComboBox.findText(file_name) == -1:
-                    self.fileComboBox.addItem(file_name)
-                self.fileComboBox.setCurrentText(file_name)
-                self.current_file = file_path
-                self.on_combobox_changed(0)
-               
-    # Process the SLJ file(s) 
-    def processCMJfile(self, file_path):
-        outcome_dat = self.outcome_dat
-        file_name = os.path.basename(file_path)[:-4]
-
-        dat = pd.read_csv(file_path)
-
-        
-        fz_total = dat.iloc[:, self.fz_col]
-        
-        # would prefer for this to be a whole 1-3 seconds. 
-        bw_mean = fz_total[0:1500].mean()
-        bw_sd = fz_total[0:1500].std()
-        bodymass = bw_mean / 9.81
-        
-        # calculate time
-        sf = 1000
-        dat_len = len(fz_total)
-        trial_time = dat_len / sf
-        time_s = np.linspace(start = 0, stop = trial_time, num = dat_len)
-        
-        # calculate other arrays
-        accel = (fz_total - bw_mean) / bodymass
-        velo = int_cumtrapz(x = time_s, y = accel) 
-        position = int_cumtrapz(x = time_s[1:], y = velo)
-        power = fz_total[1:] * velo
-
-        start_move = 20
-        while fz_total[start_move] > (bw_mean - (bw_sd  * 5)):
-            start_move = start_move + 1
-        while fz_total[start_move] < bw_mean:
-                start_move = start_move - 1
-            
-        takeoff = start_move 
-        while fz_total[takeoff] > 30:
-            takeoff = takeoff + 1
-            
-        start_ecc_velo = min(velo[start_move:takeoff])
-        start_ecc = list(velo).index(start_ecc_velo)
-        
-        start_con = start_ecc
-        while velo[start_con] < 0:
-            start_con = start_con + 1    
-            
-        land = takeoff + 150
-        while fz_total[land] < 30:
-            land = land + 1
-            
-        end_land = land + 100
-        while fz_total[end_land] > bw_mean:
-            end_land = end_land + 1
-        while fz_total[end_land] < bw_mean:
-            end_land = end_land - 1        
-            
-        ### Make arrays for each phase - force
-        unweigh_fz = fz_total[start_move:start_ecc]
-        ecc_fz = fz_total[start_ecc:start_con]
-        con_fz = fz_total[start_con:takeoff]
-        land_fz = fz_total[land:end_land]
-        positive_fz = fz_total[start_ecc:takeoff]
-        
-        ### - velo
-        unweigh_velo = velo[start_move:start_ecc]
-        ecc_velo = velo[start_ecc:start_con]
-        con_velo = velo[start_con:takeoff]
-        land_velo = velo[land:end_land]
-                
-        ### - power 
-        ecc_power = power[start_ecc:start_con]
-        con_power = power[start_con:takeoff]
-        land_power = power[land:end_land]
-                
-        ##### Power outcomes 
-        ecc_peak_power = ecc_power.min()
-        ecc_mean_power = ecc_power.mean()
-        con_peak_power = con_power.max()
-        con_mean_power = con_power.mean()
-        land_peak_power = land_power.max()
-        land_mean_power = land_power.mean()
-        
-        ##### Kinetic phase-specific outcome variables
-        ### TOTAL kinetic phase outcome variables
-        # eccentric
-        ecc_peak_force_n = ecc_fz.max()
-        ecc_peak_force_nkg = ecc_peak_force_n/bodymass
-        ecc_mean_force_n = ecc_fz.mean()
-        ecc_mean_force_nkg = ecc_mean_force_n/bodymass
-        ecc_impulse = int_trapz(ecc_fz)/sf
-                
-        # concentric
-        con_peak_force_n = con_fz.max()
-        con_peak_force_nkg = con_peak_force_n/bodymass
-        con_mean_force_n = con_fz.mean()
-        con_mean_force_nkg = con_mean_force_n/bodymass
-        con_impulse = int_trapz(con_fz)/sf
-                
-        # positve impulse
-        positive_impulse = int_trapz(positive_fz)/sf
-            
-        # landing
-        land_peak_force_n = land_fz.max()
-        land_peak_force_nkg = land_peak_force_n/bodymass
-        land_mean_force_n = land_fz.mean()
-        land_mean_force_nkg = land_mean_force_n/bodymass
-        land_impulse = int_trapz(land_fz)/sf   
-                
-        ##### Time specific outcomes
-        unweigh_dur = time_s[start_ecc] - time_s[start_move]
-        contraction_time_s = time_s[takeoff] - time_s[start_move]
-        ecc_time_s = time_s[start_con] - time_s[start_ecc]
-        con_time_s = time_s[takeoff] - time_s[start_con]
-        flight_time_s = time_s[land] - time_s[takeoff]
-        land_time_s = time_s[end_land] - time_s[land]        
-                
-        ##### RFD outcomes
-        ecc_rfd = (fz_total[start_con] - fz_total[start_ecc]) / ecc_time_s
-        con_rfd = (fz_total[start_con] - fz_total[takeoff]) / con_time_s
-        land_rfd = (fz_total[end_land] - fz_total[land]) / land_time_s
-            
-        ##### Velocity outcomes
-        ecc_peak_velocity = ecc_velo.min()
-        con_peak_velocity = con_velo.max()
-        ecc_mean_velocity = ecc_velo.mean()
-        con_mean_velocity = con_velo.mean()
-        land_peak_velocity = land_velo.min()
-                                
-        ##### Outcome variables
-        vto = velo[takeoff]
-        jh = ((vto ** 2)/(9.81 * 2))
-        jh_cm = jh * 100
-        mrsi = jh/contraction_time_s
-        depth = position[start_move:takeoff].min()
-        cm_depth = depth * 100
-            
-        # combine into a list
-        values_dat = [bodymass,
-                        jh_cm,
-                        mrsi,
-                        con_peak_power,
-                        ecc_peak_power,
-                        land_peak_power,
-                        con_mean_power,
-                        ecc_mean_power,
-                        land_mean_power,
-                        con_peak_force_n,
-                        con_peak_force_nkg,
-                        ecc_peak_force_n,
-                        ecc_peak_force_nkg,
-                        con_mean_force_n,
-                        con_mean_force_nkg,
-                        ecc_mean_force_n,
-                        ecc_mean_force_nkg,
-                        land_peak_force_n,
-                        land_peak_force_nkg,
-                        land_mean_force_n,
-                        land_mean_force_nkg,
-                        con_impulse,
-                        ecc_impulse,
-                        positive_impulse,
-                        land_impulse,
-                        con_rfd,
-                        ecc_rfd,
-                        land_rfd,
-                        unweigh_dur,
-                        ecc_time_s,
-                        con_time_s,
-                        contraction_time_s,
-                        flight_time_s,
-                        land_time_s,
-                        con_peak_velocity,
-                        ecc_peak_velocity,
-                        land_peak_velocity,
-                        con_mean_velocity,
-                        ecc_mean_velocity,
-                        vto,
-                        cm_depth]
-
-        
-        # round with list comprehension
-        values_dat_clean = [round(float(n), 3) for n in values_dat]
-        values_dat_table = [round(float(n),3) for n in values_dat]
-                        
-
-        self.display_table(self.outcome_dat) # display data in table
-        
-        outcome_dat[file_name] = values_dat_clean 
-        
-        # Define time outcomes for plotting  
-        start_move_s = time_s[start_move]
-        start_ecc_s = time_s[start_ecc]
-        start_con_s = time_s[start_con]
-        takeoff_s = time_s[takeoff]
-        land_s = time_s[land]
-        end_land_s = time_s[end_land]
-        
-        # For adding annotations             
-        annotations = {"Unweigh": start_move_s, 
-                       "Ecentric": start_ecc_s, 
-                       "Concentric": start_con_s, 
-                       "Flight": takeoff_s, 
-                       "Landing": land_s+0.1}
-        
-        # figure
-        self.figure.clear()   
-        ax = self.figure.add_subplot(111)    
-        ax.axhline(y = bw_mean, color = 'black', ls = "--", lw = 0.4)
-        ax.axvline(x = start_move_s, ls = ":", color = 'black', lw = 0.4)
-        ax.axvline(x = start_ecc_s, ls = ':', color = 'black', lw = 0.4)
-        ax.axvline(x = start_con_s, ls = ":", color = 'black', lw = 0.4)
-        ax.axvline(x = takeoff_s, ls = ":", color = 'black', lw = 0.4)
-        ax.axvline(x = land_s, ls = ":", color = 'black', lw = 0.4)
-        ax.axvline(x = end_land_s, ls = ":", color = 'black', lw = 0.4)
-        sns.lineplot(x=time_s[0:end_land+500], y=fz_total[0:end_land+500], color= 'black', ax=ax)
-        ax.xaxis.set_major_locator(MaxNLocator(integer = True, prune = 'both'))
-        ax.yaxis.set_major_locator(MaxNLocator(nbins = 'auto', prune = 'both'))
-        ax.set_ylabel("Force (N)")
-            
-        y_pos = ax.get_ylim()[1]*0.95
-        # add annotations to force plt
-        for label, x_coord in annotations.items():
-                ax.annotate(label, xy = (x_coord, y_pos), xytext = (5,5),
-                             textcoords = 'offset points', ha = 'left', va = 'top',
-                             fontsize = 8, fontweight = 'bold', color = 'black', rotation = -90)
-        self.figure.tight_layout();    
-        self.canvas.draw()
-        self.outcome_dat = outcome_dat  
-    
-    # average data
-    def average_data(self, dataframe):
-        var_names = dataframe.iloc[:, 0]
-        values_dat = dataframe.iloc[:,1:]
-        values_dat_mean = values_dat.mean(axis = 1)       
-        average_dat = pd.DataFrame({"Variable": var_names,
-                                    "Value": values_dat_mean})
-        self.average_dat = average_dat     
-    
-    # defining export data function
-    def exportData(self):
-        options = QFileDialog.Options()
-        save_path, _ = QFileDialog.getSaveFileName(self, "Save file", "", "XLSX Files (*.xlsx);;All Files (*)", options=options)
-        average_df = self.average_dat
-        outcome_df = self.outcome_dat    
-        if save_path:
-            if not save_path.endswith('.xlsx'):
-                save_path += '.xlsx'
-            with pd.ExcelWriter(save_path, engine='xlsxwriter') as writer:
-                average_df.to_excel(writer, sheet_name = 'Average Data', index = False)
-                outcome_df.to_excel(writer, sheet_name = "Individual Data", index = False)
-    def returntoHome(self):
-        self.home = AnalysisSelector()
-        self.home.show()
-        self.close()           
-    def closeApp(self):
-        self.close()
-        
-class DualPlateCMJAnalysisWindow(QMainWindow):       
-    def __init__(self):
-        super().__init__()
-        self.initUI()
-        self.showMaximized()
-        
-        # File dictionary to enable handling of multiple files
-        self.file_path_dict = {}
-        self.current_file = None
-        self.table_dat = pd.DataFrame()
-        
-        # Initialize dataframes 
-        self.outcome_dat =  pd.DataFrame({'Variable': dualplate_cmj_vars_dict.values()})
-        self.selected_vars = []
-        
-        # Display the default table (outcome_dat)
-        self.display_table(self.table_dat)
-        self.drop_count = 0
-        
-    def initUI(self):
-        self.setWindowTitle("Dual Plate CMJ Analysis")
-        self.setGeometry(100, 100, 1600, 800)
-                
-        self.centralWidget = QWidget(self)
-        self.setCentralWidget(self.centralWidget)
-        
-        self.layout = QVBoxLayout(self.centralWidget)
-        self.topLayout = QHBoxLayout()
-        self.layout.addLayout(self.topLayout)
-        self.leftLayout = QVBoxLayout() # plots
-        self.rightLayout = QVBoxLayout() # table
-        
-        self.topLayout.addLayout(self.leftLayout, stretch = 3)
-        self.topLayout.addLayout(self.rightLayout, stretch = 2)
-        
-        # dropdown box for file plot selection
-        self.fileComboBox = QComboBox()
-        self.fileComboBox.currentIndexChanged.connect(self.on_file_combobox_changed)
-        self.leftLayout.addWidget(self.fileComboBox)
-        
-        # label for left plot file selection
-        self.label = QLabel("Drag and Drop CMJ Trial(s) here:", self)
-        self.label.setFont(QFont("Arial bold", 10))
-        self.label.setAlignment(Qt.AlignLeft)
-        self.leftLayout.addWidget(self.label)
-        
-        # cmj plot
-        self.figure = plt.Figure(figsize = (12,16))
-        self.canvas = FigureCanvas(self.figure)
-        self.leftLayout.addWidget(self.canvas)
-        
-        # toolbar
-        self.toolbar = NavigationToolbar(self.canvas, self, coordinates = False)
-        self.addToolBar(Qt.BottomToolBarArea, self.toolbar)
-        
-        # define table for values
-        self.tableComboBox = QComboBox()
-        self.tableComboBox.addItems(["Full Results", "Average Results", "LSI Results"])
-        self.tableComboBox.currentIndexChanged.connect(self.on_tablecombobox_changed)
-        self.rightLayout.addWidget(self.tableComboBox)
-        self.table = QTableWidget(self)
-        self.rightLayout.addWidget(self.table)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.resizeRowsToContents()
-        self.table.verticalHeader().setVisible(False)
-        header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
-        
-        # buttons for things, save data, quit program, eventually add back in go to home screen button
-        self.buttonLayout = QVBoxLayout()
-        self.buttonLayout.setAlignment(Qt.AlignTop)
-        
-        # export data button
-        self.exportButton = QPushButton("Save Data", self)
-        self.exportButton.clicked.connect(self.exportData)
-        self.buttonLayout.addWidget(self.exportButton)
-        
-        # close program button
-        self.closeAppButton = QPushButton("Quit Program", self)
-        self.closeAppButton.clicked.connect(self.closeApp)
-        self.buttonLayout.addWidget(self.closeAppButton)
-        
-        # return to home screen button
-        self.homeButton = QPushButton('Return to Home', self)
-        self.homeButton.clicked.connect(self.returntoHome)
-        self.buttonLayout.addWidget(self.homeButton)
-                
-        self.topLayout.addLayout(self.buttonLayout)
-        
-        # column selection
-        self.columnSelectionPrompt()
-        
-        # for dropping
-        self.setAcceptDrops(True)
-        
-    def columnSelectionPrompt(self):
-        columnOptions = [chr(i) for i in range(65, 87)]
-        self.fz_left_col, ok1 = QInputDialog.getItem(self, 'Select Column', 'Select Fz Left Column from Excel file', columnOptions, 5, False)
-        self.fz_right_col, ok2 = QInputDialog.getItem(self, 'Select Column', 'Select Fz Right Column from Excel file', columnOptions, 16, False)
-        
-        if ok1 and ok2:
-            self.fz_left_col = ord(self.fz_left_col) - 65
-            self.fz_right_col = ord(self.fz_right_col) - 65
-        else:
-            self.close()
-            
-    def display_table(self, dataframe):
-        self.table.clear()
-        self.table.setRowCount(len(dataframe))
-        self.table.setColumnCount(dataframe.shape[1])
-        self.table.setHorizontalHeaderLabels(dataframe.columns)
-        
-        variable_font = QFont()
-        variable_font.setBold(True)
-        variable_font.setFamily('Arial')
-        variable_font.setPointSize(8)
-        value_font = QFont()
-        value_font.setFamily('Arial')
-        value_font.setPointSize(8)
-        
-        for i in range(dataframe.shape[0]):
-            for j in range(dataframe.shape[1]):
-                value = dataframe.iat[i,j]
-                if j == 0:
-                    item = QTableWidgetItem(str(value))
-                    item.setFont(variable_font)
-                else:
-                    numeric_value = float(value)
-                    item = QTableWidgetItem(f'{numeric_value:.2f}')
-                    item.setFont(value_font)
-                    item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
-                self.table.setItem(i , j, item)
-        self.table.setStyleSheet(TABLE_STYLE)
-        self.table.setAlternatingRowColors(True)
-        self.table.resizeColumnsToContents()
-    
-    # actions for changing what values are displayed in the table     
-    def on_tablecombobox_changed(self, index):
-        if index == 0:
-            self.display_table(self.outcome_dat)
-        if index == 1:
-            self.display_table(self.average_dat)
-        if index == 2:
-            self.display_table(self.lsi_data)
-    
-    # actions for changing what plot is displayed
-    def on_file_combobox_changed(self):
-        file_key = self.fileComboBox.currentText()
-        self.current_file = self.file_path_dict[file_key]
-        self.processdualCMJfile(self.current_file)
-    
-    # functions for dropping new files    
-    def dragEnterEvent(self, event):
-        if event.mimeData().hasUrls():
-            event.acceptProposedAction()
-    
-    def dropEvent(self, event):
-        for url in event.mimeData().urls():
-            file_path = url.toLocalFile()
-            if file_path.endswith('.csv'):
-                file_name = os.path.basename(file_path)[:-4]
-                self.file_path_dict[file_name] = file_path
-                self.processdualCMJfile(file_path) # process the file
-                self.average_data(self.outcome_dat) # calculate averages
-                self.get_lsi(self.average_dat)  # calculate LSIs
-                if self.fileComboBox.findText(file_name) == -1:
-                    self.fileComboBox.addItem(file_name)
-                self.fileComboBox.setCurrentText(file_name)
-                self.current_file = file_path
-                self.on_tablecombobox_changed(0)
-    
-    # now, the processing a dual plate CMJ                
-    def processdualCMJfile(self, file_path):
-        outcome_dat = self.outcome_dat
-        file_name = os.path.basename(file_path)[:-4]
-        # pull test date from file
-        
-        dat = pd.read_csv(file_path)
-        #dat = dat.iloc[1000:]
-        #dat.reset_index(inplace = True, drop = True)
-        
-        # read force columns
-        fz_left = dat.iloc[:, self.fz_left_col]
-        fz_right = dat.iloc[:, self.fz_right_col]
-        fz_total = fz_left + fz_right
-        
-        bw_mean = fz_total[0:1500].mean()
-        bw_sd = fz_total[0:1500].std()
-        
-        bodymass = bw_mean / 9.81
-        
-        # calculate time
-        sf = 1000
-        trial_len = len(fz_total)
-        trial_time = trial_len/sf
-        time_s = np.linspace(start = 0, stop = trial_time, num = trial_len)
-        
-        # calcualte accel, velo, position, and power
-        accel = (fz_total - bw_mean) / bodymass
-        velo = int_cumtrapz(x = time_s, y = accel)
-        position = int_cumtrapz(y = velo, x = time_s[1:len(dat)])
-        power = fz_total[1:len(fz_total)] * velo
-        
-        # identify indices
-        start_move = 20
-        while fz_total[start_move] > (bw_mean - (bw_sd * 5)):
-            start_move = start_move + 1
-        while fz_total[start_move] < bw_mean:
-            start_move = start_move - 1
-            
-        # takeoff indices
-        takeoff = start_move
-        while fz_total[takeoff] > 30:
-            takeoff = takeoff + 1
-        
-        # Eccentric phase index
-        start_ecc_velo = min(velo[start_move:takeoff])
-        start_ecc = list(velo).index(start_ecc_velo)
-        
-        # Concentric phase index
-        start_con = start_ecc
-        while velo[start_con] < 0:
-            start_con = start_con  + 1 
-            
-        # landing phase indices
-        land = takeoff + 150
-        while fz_total[land] < 30:
-            land = land + 1
-            
-        end_land = land + 500
-        while fz_total[end_land] < bw_mean:
-            end_land = end_land + 1
-        while fz_total[end_land] < bw_mean:
-            end_land = end_land - 1
-        
-        # make total arrays for each phase - force first
-        unweigh_fz_total = fz_total[start_move:start_ecc]
-        ecc_fz_total = fz_total[start_ecc:start_con]
-        con_fz_total = fz_total[start_con:takeoff]
-        land_fz_total = fz_total[land:end_land]
-        positive_fz_total = fz_total[start_ecc:takeoff]
-        
-        # left force arrays
-        unweigh_fz_left = fz_left[start_move:start_ecc]
-        ecc_fz_left = fz_left[start_ecc:start_con]
-        con_fz_left = fz_left[start_con:takeoff]
-        land_fz_left = fz_left[land:end_land]
-        positive_fz_left = fz_left[start_ecc:takeoff]
-        
-        # right force arrays
-        unweigh_fz_right = fz_right[start_move:start_ecc]
-        ecc_fz_right = fz_right[start_ecc:start_con]
-        con_fz_right = fz_right[start_con:takeoff]
-        land_fz_right = fz_right[land:end_land]
-        positive_fz_right = fz_right[start_ecc:takeoff]
-        
-        # velocity arrays
-        unweigh_velo = velo[start_move:start_ecc]
-        ecc_velo = velo[start_ecc:start_con]
-        con_velo = velo[start_con:takeoff]
-        land_velo = velo[land:end_land]
-        
-        # power arrays
-        ecc_power = power[start_ecc:start_con]
-        con_power = power[start_con:takeoff]
-        land_power = power[land:end_land]
-        
-        ##### Outcomes Start Here
-        # power outcomes
-        ecc_peak_power = ecc_power.min()
-        ecc_mean_power = ecc_power.mean()
-        con_peak_power = con_power.max()
-        con_mean_power = con_power.mean()
-        land_peak_power = land_power.max()
-        land_mean_power = land_power.mean()
-        
-        # Total Kinetic Phase Specific Outcomes
-        # eccentric 
-        total_ecc_peak_force_n = ecc_fz_total.max()
-        total_ecc_peak_force_nkg = total_ecc_peak_force_n/bodymass
-        total_ecc_mean_force_n = ecc_fz_total.mean()
-        total_ecc_mean_force_nkg = total_ecc_mean_force_n/bodymass
-        total_ecc_impulse = int_trapz(ecc_fz_total)/sf
-        
-        # concentric
-        total_con_peak_force_n = con_fz_total.max()
-        total_con_peak_force_nkg = total_con_peak_force_n/bodymass
-        total_con_mean_force_n = con_fz_total.mean()
-        total_con_mean_force_nkg = total_con_mean_force_n/bodymass
-        total_con_impulse = int_trapz(con_fz_total)/sf
-        
-        # positive impulses
-        total_positive_impulse = int_trapz(positive_fz_total)/sf
-        left_positive_impulse = int_trapz(positive_fz_left)/sf
-        right_positive_impulse = int_trapz(positive_fz_right)/sf
-        
-        # landing
-        total_land_peak_force_n = land_fz_total.max()
-        total_land_peak_force_nkg = total_land_peak_force_n/bodymass
-        total_land_mean_force_n = land_fz_total.mean()
-        total_land_mean_force_nkg = total_land_mean_force_n/bodymass
-        total_land_impulse = int_trapz(land_fz_total)/sf
-        
-        # Left Leg Phase Specific Outcomes
-        # eccentric 
-        left_ecc_peak_force_n = ecc_fz_left.max()
-        left_ecc_peak_force_nkg = left_ecc_peak_force_n/bodymass
-        left_ecc_mean_force_n = ecc_fz_left.mean()
-        left_ecc_mean_force_nkg = left_ecc_mean_force_n/bodymass
-        left_ecc_impulse = int_trapz(ecc_fz_left)/sf
-        
-        # concentric
-        left_con_peak_force_n = con_fz_left.max()
-        left_con_peak_force_nkg = left_con_peak_force_n/bodymass
-        left_con_mean_force_n = con_fz_left.mean()
-        left_con_mean_force_nkg = left_con_mean_force_n/bodymass
-        left_con_impulse = int_trapz(con_fz_left)/sf
-        
-        # landing
-        left_land_peak_force_n = land_fz_left.max()
-        left_land_peak_force_nkg = left_land_peak_force_n/bodymass
-        left_land_mean_force_n = land_fz_left.mean()
-        left_land_mean_force_nkg = left_land_mean_force_n/bodymass
-        left_land_impulse = int_trapz(land_fz_left)/sf
-        
-        # Right Leg Phase Specific Outcomes
-        # eccentric 
-        right_ecc_peak_force_n = ecc_fz_right.max()
-        right_ecc_peak_force_nkg = right_ecc_peak_force_n/bodymass
-        right_ecc_mean_force_n = ecc_fz_right.mean()
-        right_ecc_mean_force_nkg = right_ecc_mean_force_n/bodymass
-        right_ecc_impulse = int_trapz(ecc_fz_right)/sf
-        
-        # concentric
-        right_con_peak_force_n = con_fz_right.max()
-        right_con_peak_force_nkg = right_con_peak_force_n/bodymass
-        right_con_mean_force_n = con_fz_right.mean()
-        right_con_mean_force_nkg = right_con_mean_force_n/bodymass
-        right_con_impulse = int_trapz(con_fz_right)/sf
-        
-        # landing
-        right_land_peak_force_n = land_fz_right.max()
-        right_land_peak_force_nkg = right_land_peak_force_n/bodymass
-        right_land_mean_force_n = land_fz_right.mean()
-        right_land_mean_force_nkg = right_land_mean_force_n/bodymass
-        right_land_impulse = int_trapz(land_fz_right)/sf
-        
-        # time-constrained outcomes
-        unweigh_dur = time_s[start_ecc] - time_s[start_move]
-        ecc_time_s = time_s[start_con] - time_s[start_ecc]
-        con_time_s = time_s[takeoff] - time_s[start_con]
-        contraction_time_s = time_s[takeoff] - time_s[start_move]
-        flight_time_s = time_s[land] - time_s[takeoff]
-        land_time_s = time_s[end_land] - time_s[land]
-        
-        # RFD outcomes
-        total_ecc_rfd = (fz_total[start_con] - fz_total[start_ecc]) / ecc_time_s
-        total_con_rfd = (fz_total[start_con] - fz_total[takeoff]) / con_time_s
-        total_land_rfd = (fz_total[end_land] - fz_total[land]) / land_time_s
-        left_ecc_rfd = (fz_left[start_con] - fz_left[start_ecc]) / ecc_time_s
-        left_con_rfd = (fz_left[start_con] - fz_left[takeoff]) / con_time_s
-        left_land_rfd = (fz_left[end_land] - fz_left[land]) / land_time_s
-        right_ecc_rfd = (fz_right[start_con] - fz_right[start_ecc]) / ecc_time_s
-        right_con_rfd = (fz_right[start_con] - fz_right[takeoff]) / con_time_s
-        right_land_rfd = (fz_right[end_land] - fz_right[land]) / land_time_s
-        
-        # Velocity outcomes
-        ecc_peak_velocity = ecc_velo.min()
-        ecc_mean_velocity = ecc_velo.mean()
-        con_peak_velocity = con_velo.max()
-        con_mean_velocity = con_velo.mean()
-        land_peak_velocity = land_velo.min()
-        
-        # Performance outcomes
-        vto = velo[takeoff]
-        jh = ((vto ** 2)/(9.81 * 2))
-        jh_cm = jh * 100
-        mrsi = jh/contraction_time_s
-        depth = position[start_move:takeoff].min()
-        cm_depth = depth * 100
-                
-        # arrange values in a list
-        values_dat = [bodymass, jh_cm, mrsi, 
-                      con_peak_power, ecc_peak_power, land_peak_power, 
-                      con_mean_power, ecc_mean_power, land_mean_power, 
-                      total_con_peak_force_n, total_con_peak_force_nkg, total_ecc_peak_force_n, 
-                      total_ecc_peak_force_nkg, total_con_mean_force_n, total_con_mean_force_nkg, 
-                      total_ecc_mean_force_n, total_ecc_mean_force_nkg, total_land_peak_force_n, 
-                      total_land_peak_force_nkg, total_land_mean_force_n, total_land_mean_force_nkg, 
-                      total_con_impulse, total_ecc_impulse, total_positive_impulse, 
-                      total_land_impulse, total_con_rfd, total_ecc_rfd, 
-                      total_land_rfd, left_con_peak_force_n, left_con_peak_force_nkg, 
-                      left_ecc_peak_force_n, left_ecc_peak_force_nkg, left_con_mean_force_n, 
-                      left_con_mean_force_nkg, left_ecc_mean_force_n, left_ecc_mean_force_nkg, 
-                      left_land_peak_force_n, left_land_peak_force_nkg, left_land_mean_force_n, 
-                      left_land_mean_force_nkg, left_con_impulse, left_ecc_impulse, 
-                      left_positive_impulse, left_land_impulse, left_con_rfd, 
-                      left_ecc_rfd, left_land_rfd, right_con_peak_force_n, 
-                      right_con_peak_force_nkg, right_ecc_peak_force_n, right_ecc_peak_force_nkg, 
-                      right_con_mean_force_n, right_con_mean_force_nkg, right_ecc_mean_force_n, 
-                      right_ecc_mean_force_nkg, right_land_peak_force_n, right_land_peak_force_nkg, 
-                      right_land_mean_force_n, right_land_mean_force_nkg, right_con_impulse, 
-                      right_ecc_impulse, right_positive_impulse, right_land_impulse, 
-                      right_con_rfd, right_ecc_rfd, right_land_rfd, 
-                      unweigh_dur, ecc_time_s, con_time_s, 
-                      contraction_time_s, flight_time_s, land_time_s, 
-                      con_peak_velocity, ecc_peak_velocity, land_peak_velocity, 
-                      con_mean_velocity, ecc_mean_velocity, vto, cm_depth]
-        
-        values_dat_clean = [round(float(n), 3) for n in values_dat]
-        values_dat_table = [round(float(n), 3) for n in values_dat]
-        
-        full_table_vars = list(dualplate_cmj_vars_dict.values())
-                
-        self.display_table(self.outcome_dat)
-        outcome_dat[file_name] = values_dat_clean
-        
-        ##### Plotting
-        start_move_s = time_s[start_move]
-        start_ecc_s = time_s[start_ecc]
-        start_con_s = time_s[start_con]
-        takeoff_s = time_s[takeoff]
-        land_s = time_s[land]
-        end_land_s = time_s[end_land]
-        
-        # for adding annotations
-        annotations = {'Unweigh': start_move_s,
-                       'Eccentric': start_ecc_s,
-                       'Concentric': start_con_s,
-                       'Fight': takeoff_s,
-                       'Landing': land_s+0.1}
-        
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.axhline(y = bw_mean, color = 'grey', ls = "--", lw = 0.4)
-        ax.axvline(x = start_move_s, ls = ":", color = 'grey', lw = 0.4)
-        ax.axvline(x = start_ecc_s, ls = ':', color = 'grey', lw = 0.4)
-        ax.axvline(x = start_con_s, ls = ":", color = 'grey', lw = 0.4)
-        ax.axvline(x = takeoff_s, ls = ":", color = 'grey', lw = 0.4)
-        ax.axvline(x = land_s, ls = ":", color = 'grey', lw = 0.4)
-        ax.axvline(x = end_land_s, ls = ":", color = 'grey', lw = 0.4)
-        sns.lineplot(x = time_s[0:end_land+500], y = fz_total[0:end_land+500], label = "Total", color = "#0072B2", lw = 2, ax = ax)
-        sns.lineplot(x = time_s[0:end_land+500], y = fz_left[0:end_land+500], label = "Left", color = "#D55E00", lw = 1, ax = ax)
-        sns.lineplot(x = time_s[0:end_land+500], y = fz_right[0:end_land+500], label = 'Right', color = "#56B4E9", lw = 1, ax = ax)
-        ax.xaxis.set_major_locator(MaxNLocator(integer = True, prune = 'both', nbins = 'auto'))
-        ax.yaxis.set_major_locator(MaxNLocator(nbins = 'auto', prune = 'both'))
-        ax.set_ylabel("Force (N)")
-        ax.set_xlabel("Time (seconds)")
-        ax.legend(loc = 'upper right', frameon = False)
-            
-        # add annotations to plot
-        y_pos = ax.get_ylim()[1]*0.95
-        for label, x_coord in annotations.items():
-                ax.annotate(label, xy = (x_coord, y_pos), xytext = (5,5),
-                             textcoords = 'offset points', ha = 'left', va = 'top',
-                             fontsize = 8, fontweight = 'bold', color = 'black', rotation = -90)
-        self.figure.tight_layout()    
-        self.canvas.draw()
-        self.outcome_dat = outcome_dat  
-    
-    # function to calculate averages        
-    def average_data(self, dataframe):
-        var_names = dataframe.iloc[:, 0]
-        
-        values_dat = dataframe.iloc[:,1:]
-        values_dat_mean = values_dat.mean(axis = 1)
-        
-        average_dat = pd.DataFrame({"Variable": var_names,
-                                    "Average": values_dat_mean})
-        
-        self.average_dat = average_dat
-       
-    # function to get Limb symmetry indices 
-    def get_lsi(self, dataframe):
-        leg_data = dataframe[dataframe['Variable'].str.contains("Left|Right")].copy()
-        leg_data['leg'] = leg_data['Variable'].apply(lambda x: 'Left' if 'Left' in x else 'Right')
-        leg_data['Metric'] = leg_data['Variable'].apply(lambda x: x.split(' ', 1)[1])
-        leg_data_clean = leg_data[['Metric', 'leg', 'Average']]
-        leg_data_wide = leg_data_clean.pivot(index = 'Metric', columns = 'leg', values = 'Average').reset_index()
-        leg_data_wide["L/R LSI"]  = np.round(leg_data_wide['Left'] / leg_data_wide['Right'], 2)
-        leg_data_wide['R/L LSI'] = np.round(leg_data_wide['Right'] / leg_data_wide['Left'], 2)
-        
-        self.lsi_data = leg_data_wide       
-        
-    def exportData(self):
-        options = QFileDialog.Options()
-        save_path, _ = QFileDialog.getSaveFileName(self, "Save File", "", "XLSX Files (.xlsx);;All Files (*)", options = options)
-        
-        lsi_data = self.lsi_data
-        average_df = self.average_dat
-        outcome_df = self.outcome_dat
-        
-        if save_path:
-            if not save_path.endswith('.xlsx'):
-                save_path += ".xlsx"
-            with pd.ExcelWriter(save_path, engine = 'xlsxwriter') as writer:
-                lsi_data.to_excel(writer, sheet_name = "LSI Data", index = False)
-                average_df.to_excel(writer, sheet_name = "Average Data", index = False)
-                outcome_df.to_excel(writer, sheet_name = 'Individual Data', index = False)
-        
-        # for later
-        # rel_dualplate_cmj_vars_dict = {key: value for key, value in dualplate_cmj_vars_dict.items() if not value.endswith("Force (N)")}
-    
-    def returntoHome(self):
-        self.home = AnalysisSelector()
-        self.home.show()
-        self.close()
-    
-    def closeApp(self):
-        self.close()
-
-# dual plate drop ladning analysies        
-class DualPlateDropLandingAnalysisWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.initUI()
-        self.showMaximized()
-        
-        self.file_path_dict = {}
-        self.current_file = None
-        self.table_dat = pd.DataFrame()
-        
-        # initialize dataframes
-        self.outcome_dat = pd.DataFrame({'Variable': dualplate_droplanding_vars_dict.values()})
-        full_export_vars = list(dualplate_droplanding_vars_dict.values())
-        full_export_vars.insert(0, 'Test Date')
-        self.full_export_vars = full_export_vars
-        self.export_dat = pd.DataFrame({"Variable": full_export_vars}) 
-        
-        # get user inputs (body mass)
-        self.pt_mass = ()
-        self.get_user_inputs()
-        
-        # display default table
-        self.display_table(self.table_dat)
-        self.drop_count = 0
-    
-    def initUI(self):
-        self.setWindowTitle("Dual Plate Drop Landing Analysis")
-        self.setGeometry(100, 100, 1600, 800)
-                
-        self.centralWidget = QWidget(self)
-        self.setCentralWidget(self.centralWidget)
-        
-        self.layout = QVBoxLayout(self.centralWidget)
-        self.topLayout = QHBoxLayout()
-        self.layout.addLayout(self.topLayout)
-        self.leftLayout = QVBoxLayout() # plots
-        self.rightLayout = QVBoxLayout() # table
-        
-        self.topLayout.addLayout(self.leftLayout, stretch = 3)
-        self.topLayout.addLayout(self.rightLayout, stretch = 2)
-        
-        # dropdown box for file plot selection
-        self.fileComboBox = QComboBox()
-        self.fileComboBox.currentIndexChanged.connect(self.on_file_combobox_changed)
-        self.leftLayout.addWidget(self.fileComboBox)
-        
-        # label for left plot file selection
-        self.label = QLabel("Drag and Drop Drop Landing Trial(s) here:", self)
-        self.label.setFont(QFont("Arial bold", 10))
-        self.label.setAlignment(Qt.AlignLeft)
-        self.leftLayout.addWidget(self.label)
-        
-        # cmj plot
-        self.figure = plt.Figure(figsize = (12,16))
-        self.canvas = FigureCanvas(self.figure)
-        self.leftLayout.addWidget(self.canvas)
-        
-        # toolbar
-        self.toolbar = NavigationToolbar(self.canvas, self, coordinates = False)
-        self.addToolBar(Qt.BottomToolBarArea, self.toolbar)
-        
-        # define table for values
-        self.tableComboBox = QComboBox()
-        self.tableComboBox.addItems(["Full Results", "Average Results", "LSI Results"])
-        self.tableComboBox.currentIndexChanged.connect(self.on_tablecombobox_changed)
-        self.rightLayout.addWidget(self.tableComboBox)
-        self.table = QTableWidget(self)
-        self.rightLayout.addWidget(self.table)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.resizeRowsToContents()
-        self.table.verticalHeader().setVisible(False)
-        header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
-        
-        # buttons for things, save data, quit program, eventually add back in go to home screen button
-        self.buttonLayout = QVBoxLayout()
-        self.buttonLayout.setAlignment(Qt.AlignTop)
-        
-        # export data button
-        self.exportButton = QPushButton("Save Data", self)
-        self.exportButton.clicked.connect(self.exportData)
-        self.buttonLayout.addWidget(self.exportButton)
-        
-        # close program button
-        self.closeAppButton = QPushButton("Quit Program", self)
-        self.closeAppButton.clicked.connect(self.closeApp)
-        self.buttonLayout.addWidget(self.closeAppButton)
-        
-        self.homeButton = QPushButton('Return to Home', self)
-        self.homeButton.clicked.connect(self.returnToHome)
-        self.buttonLayout.addWidget(self.homeButton)
-        
-        self.topLayout.addLayout(self.buttonLayout)
-        
-        # column selection
-        self.columnSelectionPrompt()
-        
-        # for dropping
-        self.setAcceptDrops(True)
-    
-    # custom function for user inputs
-    def get_user_inputs(self):
-        # input for participant's body mass
-        pt_mass_lb, ok = QInputDialog.getDouble(self, "Input", "Enter Individual's Body Mass (pounds)- This must be accurate:", decimals = 2)
-        if ok:
-            pt_mass_kg = pt_mass_lb / 2.2046
-            self.pt_mass = pt_mass_kg
-        else:
-            self.close()
-        
-    def columnSelectionPrompt(self):
-        columnOptions = [chr(i) for i in range(65, 87)]
-        self.fz_left_col, ok1 = QInputDialog.getItem(self, 'Select Column', 'Select Fz Left Column from Excel file', columnOptions, 5, False)
-        self.fz_right_col, ok2 = QInputDialog.getItem(self, 'Select Column', 'Select Fz Right Column from Excel file', columnOptions, 16, False)
-        
-        if ok1 and ok2:
-            self.fz_left_col = ord(self.fz_left_col) - 65
-            self.fz_right_col = ord(self.fz_right_col) - 65
-        else:
-            self.close()
-            
-    def display_table(self, dataframe):
-        self.table.clear()
-        self.table.setRowCount(len(dataframe))
-        self.table.setColumnCount(dataframe.shape[1])
-        self.table.setHorizontalHeaderLabels(dataframe.columns)
-        
-        variable_font = QFont("Arial bold", 8)
-        value_font = QFont("Arial", 8)
-        
-        for i in range(dataframe.shape[0]):
-            for j in range(dataframe.shape[1]):
-                value = dataframe.iat[i,j]
-                if j == 0:
-                    item = QTableWidgetItem(str(value))
-                    item.setFont(variable_font)
-                else:
-                    numeric_value = float(value)
-                    item = QTableWidgetItem(f'{numeric_value:.2f}')
-                    item.setFont(value_font)
-                    item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
-                self.table.setItem(i , j, item)
-        self.table.setStyleSheet(TABLE_STYLE)
-        self.table.setAlternatingRowColors(True)
-        self.table.resizeColumnsToContents()
-    
-    # actions for changing what values are displayed in the table     
-    def on_tablecombobox_changed(self, index):
-        if index == 0:
-            self.display_table(self.outcome_dat)
-        if index == 1:
-            self.display_table(self.average_dat)
-        if index == 2:
-            self.display_table(self.lsi_data)
-    
-    # actions for changing what plot is displayed
-    def on_file_combobox_changed(self):
-        file_key = self.fileComboBox.currentText()
-        self.current_file = self.file_path_dict[file_key]
-        self.processdualDropfile(self.current_file)
-    
-    # functions for dropping new files    
-    def dragEnterEvent(self, event):
-        if event.mimeData().hasUrls():
-            event.acceptProposedAction()
-    
-    def dropEvent(self, event):
-        for url in event.mimeData().urls():
-            file_path = url.toLocalFile()
-            if file_path.endswith('.csv'):
-                file_name = os.path.basename(file_path)[:-4]
-                self.file_path_dict[file_name] = file_path
-                self.processdualDropfile(file_path) # processs the file
-                self.average_data(self.outcome_dat) # get averages
-                self.get_lsi(self.average_dat) # get LSIs
-                if self.fileComboBox.findText(file_name) == -1:
-                    self.fileComboBox.addItem(file_name)
-                self.fileComboBox.setCurrentText(file_name)
-                self.current_file = file_path
-                self.on_tablecombobox_changed(0)
-                self.drop_count = self.drop_count + 1
-                
-    
-    # processing a dual plate drop
-    def processdualDropfile(self, file_path):
-        sf = 1000
-        pt_mass = self.pt_mass
-        pt_weight = pt_mass * 9.81
-        bodymass = pt_mass
-        
-        outcome_dat = self.outcome_dat
-        export_dat = self.export_dat
-        file_name = os.path.basename(file_path)[:-4]
-        
-        # read in data
-        dat = pd.read_csv(file_path)
-        
-        # read force columns
-        fz_left = dat.iloc[:, self.fz_left_col]
-        fz_right = dat.iloc[:, self.fz_right_col]
-        fz_total = fz_left + fz_right
-        
-        # time
-        trial_len = len(fz_total)
-        trial_time = trial_len/sf
-        time_s = np.linspace(start = 0, stop = trial_time, num = trial_len)
-        
-        # determine indices
-        impact = 500
-        while fz_total[impact] < 30:
-            impact = impact + 1
-            
-        impact_time_s = time_s[impact]
-        
-        # for later, transfer vGRF into units of BW
-        fz_total_bwn = fz_total/pt_weight
-        fz_left_bwn = fz_left/pt_weight
-        fz_right_bwn = fz_right/pt_weight
-        
-        # identify peak values and their indices of time and index
-        total_peak_force_n = fz_total.max()
-        total_peak_force_nkg = total_peak_force_n/pt_mass
-        total_peak_force_bwn = fz_total_bwn.max()
-        total_peak_force_index = fz_total.argmax(axis = 0)
-        total_peak_force_time_s = time_s[total_peak_force_index]
-        
-        left_peak_force_n = fz_left.max()
-        left_peak_force_nkg = left_peak_force_n/pt_mass
-        left_peak_force_bwn = fz_left_bwn.max()
-        left_peak_force_index = fz_left.argmax(axis = 0)
-        left_peak_force_time_s = time_s[left_peak_force_index]
-        
-        right_peak_force_n = fz_right.max()
-        right_peak_force_nkg = right_peak_force_n/pt_mass
-        right_peak_force_bwn = fz_right_bwn.max()
-        right_peak_force_index = fz_right.argmax(axis = 0)
-        right_peak_force_time_s = time_s[right_peak_force_index]
-        
-        # calculate times for loding rates
-        time_to_total_peak_force_s = total_peak_force_time_s - impact_time_s
-        time_to_left_peak_force_s = left_peak_force_time_s - impact_time_s
-        time_to_right_peak_force_s = right_peak_force_time_s - impact_time_s
-        
-        # calculate loading rates
-        total_loading_rate_bw_s = total_peak_force_bwn / time_to_total_peak_force_s
-        left_loading_rate_bw_s = left_peak_force_bwn / time_to_left_peak_force_s
-        right_loading_rate_bw_s = right_peak_force_bwn / time_to_right_peak_force_s
-
-        
-        # combine into a list
-        values_dat = [bodymass, total_peak_force_n, total_peak_force_nkg,
-                      left_peak_force_n, left_peak_force_nkg, right_peak_force_n,
-                      right_peak_force_nkg, total_loading_rate_bw_s, left_loading_rate_bw_s,
-                      right_loading_rate_bw_s]
-        
-        values_dat_clean = [round(float(n), 3) for n in values_dat]
-
-        
-        self.display_table(outcome_dat)
-        outcome_dat[file_name] = values_dat_clean
-        
-        ##### Plotting
-        annotations = {'Impact': impact_time_s,
-                       'Peak Total Force': total_peak_force_time_s}
-        
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.axvline(x = impact_time_s, color = 'grey', ls = '--', lw = 0.4)
-        ax.axvline(x = total_peak_force_time_s, color = 'grey', ls = '--', lw = 0.4)
-        sns.lineplot(x = time_s[impact-500:], y = fz_total[impact-500:], label = 'Total', color = "#0072B2", lw = 2, ax = ax)
-        sns.lineplot(x = time_s[impact-500:], y = fz_left[impact-500:], label = 'Left', color = "#D55E00", lw = 1, ax = ax)
-        sns.lineplot(x = time_s[impact-500:], y = fz_right[impact-500:], label = 'Right', color = "#56B4E9", lw = 1, ax = ax)
-        ax.xaxis.set_major_locator(MaxNLocator(nbins = 'auto'))
-        ax.yaxis.set_major_locator(MaxNLocator(nbins = 'auto'))
-        ax.set_ylabel('Force (N)')
-        ax.set_xlabel('Time (seconds)')
-        ax.legend(loc = 'upper right', frameon = False)
-        
-        # add annotations to plot
-        y_pos = ax.get_ylim()[1]*0.95
-        for label, x_coord in annotations.items():
-            ax.annotate(label, xy = (x_coord, y_pos), xytext = (5,5),
-                        textcoords= 'offset points', ha = 'left', va = 'top',
-                        fontsize = 8, fontweight = 'bold', color = 'black', rotation = -90)
-        self.figure.tight_layout()
-        self.canvas.draw()
-        self.outcome_dat = outcome_dat
-        
-    def average_data(self, dataframe):
-        var_names = dataframe.iloc[:, 0]
-        values_dat = dataframe.iloc[:,1:]
-        values_dat_mean = values_dat.mean(axis = 1)
-        
-        average_dat = pd.DataFrame({'Variable': var_names,
-                                    'Average': values_dat_mean})
-        
-        self.average_dat = average_dat
-   
-    # function to get Limb symmetry indices 
-    def get_lsi(self, dataframe):
-        leg_data = dataframe[dataframe['Variable'].str.contains("Left|Right")].copy()
-        leg_data['leg'] = leg_data['Variable'].apply(lambda x: 'Left' if 'Left' in x else 'Right')
-        leg_data['Metric'] = leg_data['Variable'].apply(lambda x: x.split(' ', 1)[1])
-        leg_data_clean = leg_data[['Metric', 'leg', 'Average']]
-        leg_data_wide = leg_data_clean.pivot(index = 'Metric', columns = 'leg', values = 'Average').reset_index()
-        leg_data_wide["L/R LSI"]  = np.round(leg_data_wide['Left'] / leg_data_wide['Right'], 2)
-        leg_data_wide['R/L LSI'] = np.round(leg_data_wide['Right'] / leg_data_wide['Left'], 2)
-        
-        self.lsi_data = leg_data_wide  
-                     
-        
-    def exportData(self):
-        options = QFileDialog.Options()
-        save_path, _ = QFileDialog.getSaveFileName(self, "Save File", "", "XLSX Files (.xlsx);;All Files (*)", options = options)
-        
-        lsi_df = self.lsi_data
-        average_df = self.average_dat
-        outcome_df = self.outcome_dat
-        
-        if save_path:
-            if not save_path.endswith('.xlsx'):
-                save_path += ".xlsx"
-            with pd.ExcelWriter(save_path, engine = 'xlsxwriter') as writer:
-                lsi_df.to_excel(writer, sheet_name = "LSI Data", index = False)
-                average_df.to_excel(writer, sheet_name = "Average Data", index = False)
-                outcome_df.to_excel(writer, sheet_name = 'Individual Data', index = False)
-                
-    def returnToHome(self):
-        self.home = AnalysisSelector()
-        self.home.show()
-        self.close()    
-    
-    def closeApp(self):
-        self.close()
-        
-# Analysis of Dual Plate Drop Jumps
-class DualPlateDropJumpAnalysisWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.initUI()
-        self.showMaximized()
-        
-        # file dictionary to enable handling of multiple files
-        self.file_path_dict = {}
-        self.current_file = None
-        self.table_dat = pd.DataFrame()
-        
-        self.outcome_dat = pd.DataFrame({"Variable": dualplate_dropjump_vars_dict.values()})
-        full_export_vars = list(dualplate_dropjump_vars_dict.values())
-        full_export_vars.insert(0, 'Test Date')
-        self.full_export_vars = full_export_vars
-        self.export_dat = pd.DataFrame({'Variable': full_export_vars})
-        
-        # get user inputs (body mass and drop height)
-        self.pt_mass = ()
-        self.box_height = ()
-        self.get_user_inputs()
-        
-        # display default table
-        self.display_table(self.table_dat)
-        self.drop_count = 0
-    
-    def initUI(self):
-        self.setWindowTitle("Dual Plate Drop Jump Analysis")
-        self.setGeometry(100, 100, 1600, 800)
-                
-        self.centralWidget = QWidget(self)
-        self.setCentralWidget(self.centralWidget)
-        
-        self.layout = QVBoxLayout(self.centralWidget)
-        self.topLayout = QHBoxLayout()
-        self.layout.addLayout(self.topLayout)
-        self.leftLayout = QVBoxLayout() # plots
-        self.rightLayout = QVBoxLayout() # table
-        
-        self.topLayout.addLayout(self.leftLayout, stretch = 3)
-        self.topLayout.addLayout(self.rightLayout, stretch = 2)
-        
-        # dropdown box for file plot selection
-        self.fileComboBox = QComboBox()
-        self.fileComboBox.currentIndexChanged.connect(self.on_file_combobox_changed)
-        self.leftLayout.addWidget(self.fileComboBox)
-        
-        # label for left plot file selection
-        self.label = QLabel("Drag and Drop Drop Jump Trial(s) here:", self)
-        self.label.setFont(QFont("Arial bold", 10))
-        self.label.setAlignment(Qt.AlignLeft)
-        self.leftLayout.addWidget(self.label)
-        
-        # cmj plot
-        self.figure = plt.Figure(figsize = (12,16))
-        self.canvas = FigureCanvas(self.figure)
-        self.leftLayout.addWidget(self.canvas)
-        
-        # toolbar
-        self.toolbar = NavigationToolbar(self.canvas, self, coordinates = False)
-        self.addToolBar(Qt.BottomToolBarArea, self.toolbar)
-        
-        # define table for values
-        self.tableComboBox = QComboBox()
-        self.tableComboBox.addItems(["Full Results", "Average Results", "LSI Results"])
-        self.tableComboBox.currentIndexChanged.connect(self.on_tablecombobox_changed)
-        self.rightLayout.addWidget(self.tableComboBox)
-        self.table = QTableWidget(self)
-        self.rightLayout.addWidget(self.table)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.resizeRowsToContents()
-        self.table.verticalHeader().setVisible(False)
-        header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
-        
-        # buttons for things, save data, quit program, eventually add back in go to home screen button
-        self.buttonLayout = QVBoxLayout()
-        self.buttonLayout.setAlignment(Qt.AlignTop)
-        
-        # export data button
-        self.exportButton = QPushButton("Save Data", self)
-        self.exportButton.clicked.connect(self.exportData)
-        self.buttonLayout.addWidget(self.exportButton)
-        
-        # close program button
-        self.closeAppButton = QPushButton("Quit Program", self)
-        self.closeAppButton.clicked.connect(self.closeApp)
-        self.buttonLayout.addWidget(self.closeAppButton)
-        
-        self.homeButton = QPushButton('Return to Home', self)
-        self.homeButton.clicked.connect(self.returnToHome)
-        self.buttonLayout.addWidget(self.homeButton)
-        
-        self.topLayout.addLayout(self.buttonLayout)
-        
-        # column selection
-        self.columnSelectionPrompt()
-        
-        # for dropping
-        self.setAcceptDrops(True)
-    
-    # custom function for user inputs
-    def get_user_inputs(self):
-        # input for participant's body mass
-        pt_mass_lb, ok1 = QInputDialog.getDouble(self, "Input", "Enter Individual's Body Mass (pounds)- This must be accurate:", decimals = 2)
-        if ok1:
-            pt_mass_kg = pt_mass_lb / 2.2046
-            self.pt_mass = pt_mass_kg
-        else:
-            self.close()
-        # input for box height
-        # defaults and constants    
-        default_box_height_in = 16.0
-
-        drop_height_in, ok2 = QInputDialog.getDouble(self, "Input", "Enter Box Height (inches):", decimals = 2, value = default_box_height_in)
-        if ok2:
-            drop_height_cm = drop_height_in * 2.54
-            drop_height_m = drop_height_cm/100
-            self.drop_height = drop_height_m
-        else:
-            self.close()
-        
-    def columnSelectionPrompt(self):
-        columnOptions = [chr(i) for i in range(65, 87)]
-        self.fz_left_col, ok1 = QInputDialog.getItem(self, 'Select Column', 'Select Fz Left Column from Excel file', columnOptions, 5, False)
-        self.fz_right_col, ok2 = QInputDialog.getItem(self, 'Select Column', 'Select Fz Right Column from Excel file', columnOptions, 16, False)
-        
-        if ok1 and ok2:
-            self.fz_left_col = ord(self.fz_left_col) - 65
-            self.fz_right_col = ord(self.fz_right_col) - 65
-        else:
-            self.close()
-            
-    def display_table(self, dataframe):
-        self.table.clear()
-        self.table.setRowCount(len(dataframe))
-        self.table.setColumnCount(dataframe.shape[1])
-        self.table.setHorizontalHeaderLabels(dataframe.columns)
-        
-        variable_font = QFont("Arial bold", 8)
-        value_font = QFont("Arial", 8)
-        
-        for i in range(dataframe.shape[0]):
-            for j in range(dataframe.shape[1]):
-                value = dataframe.iat[i,j]
-                if j == 0:
-                    item = QTableWidgetItem(str(value))
-                    item.setFont(variable_font)
-                else:
-                    numeric_value = float(value)
-                    item = QTableWidgetItem(f'{numeric_value:.2f}')
-                    item.setFont(value_font)
-                    item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
-                self.table.setItem(i , j, item)
-        self.table.setStyleSheet(TABLE_STYLE)
-        self.table.setAlternatingRowColors(True)
-        self.table.resizeColumnsToContents()
-    
-    # actions for changing what values are displayed in the table     
-    def on_tablecombobox_changed(self, index):
-        if index == 0:
-            self.display_table(self.outcome_dat)
-        if index == 1:
-            self.average_data(self.outcome_dat)
-            self.display_table(self.average_dat)
-        if index == 2:
-            self.display_table(self.lsi_data)
-    
-    # actions for changing what plot is displayed
-    def on_file_combobox_changed(self):
-        file_key = self.fileComboBox.currentText()
-        self.current_file = self.file_path_dict[file_key]
-        self.processdualDropJumpfile(self.current_file)
-    
-    # functions for dropping new files    
-    def dragEnterEvent(self, event):
-        if event.mimeData().hasUrls():
-            event.acceptProposedAction()
-    
-    def dropEvent(self, event):
-        for url in event.mimeData().urls():
-            file_path = url.toLocalFile()
-            if file_path.endswith('.csv'):
-                file_name = os.path.basename(file_path)[:-4]
-                self.file_path_dict[file_name] = file_path
-                self.processdualDropJumpfile(file_path)
-                self.average_data(self.outcome_dat)
-                self.get_lsi(self.average_dat)
-                if self.fileComboBox.findText(file_name) == -1:
-                    self.fileComboBox.addItem(file_name)
-                self.fileComboBox.setCurrentText(file_name)
-                self.current_file = file_path
-                self.on_tablecombobox_changed(0)
-                self.drop_count = self.drop_count + 1
-                
-        if self.drop_count >0:
-            self.average_dat = self.average_data(self.outcome_dat)
-    
-    # now processing a dual plate drop jump file
-    def processdualDropJumpfile(self, file_path):
-        # constants
-        sf = 1000
-        pt_mass = self.pt_mass
-        pt_weight = pt_mass * 9.81
-        bodymass = pt_mass
-        drop_height = self.drop_height
-        box_height = drop_height
-        impact_velo = np.sqrt(2 * 9.81 * drop_height) * -1
-        outcome_dat = self.outcome_dat
-        
-        # pull file name and time of creation
-        file_name = os.path.basename(file_path)[:-4]
-        
-        # read in data and define force columns
-        dat = pd.read_csv(file_path)
-        fz_left = dat.iloc[:, self.fz_left_col]
-        fz_right =  dat.iloc[:, self.fz_right_col]
-        fz_total = fz_left + fz_right
-        
-        # calculate time
-        trial_len = len(fz_total)
-        trial_time = trial_len/sf
-        time_s = np.linspace(start = 0, stop = trial_time, num = trial_len)
-        
-        # find ground contact
-        ground_contact = 500
-        while fz_total[ground_contact] < 30:
-            ground_contact = ground_contact + 1
-        time_ground_contact_s = time_s[ground_contact]
-        
-        # takeoff calculation
-        takeoff = ground_contact + 1
-        while fz_total[takeoff] > 30:
-            takeoff = takeoff + 1
-        time_takeoff_s = time_s[takeoff]
-        
-        # land calculation
-        land = takeoff + 250
-        while fz_total[land] < 30:
-            land = land + 1
-        time_land_s = time_s[land]
-        
-        # end land calculation
-        end_land = land+200
-        while fz_total[end_land] > pt_weight:
-            end_land = end_land + 1
-        while fz_total[end_land] < pt_weight:
-            end_land = end_land -1
-        # sanity check
-        if end_land > land:
-            end_land = end_land
-        else:
-            end_land = land+500
-        time_end_land_s = time_s[end_land]
-        
-        # initial crop of arays from ground contact to end landing
-        fz_total_cropped = fz_total[ground_contact:end_land]
-        fz_net_cropped = fz_total_cropped - pt_weight # net (vGRF - pt weight)
-        time_cropped_s = time_s[ground_contact:end_land]
-        
-        # calculate acceleration
-        accel = np.array(fz_net_cropped / bodymass)
-        
-        # calculate velocity with a custom function, this is because
-        # int_cumptraz no longer takes an initial argument (e.g., impact velo)
-        # and we are not really interested in the drop phase velocity
-        velo = [0] * len(accel) # empty array of 0s length of accel array
-        velo[0] = impact_velo # set first value to impact velocity
-        # loop that performs cumulative integration on the cropped arays
-        for i in range(1, len(accel)):
-            velo[i] = accel[i] * (time_cropped_s[i] - time_cropped_s[i-1]) + velo[i-1]
-        # make sure velocity is an array and not a list
-       # print(velo)
-        velo = np.array(velo)
-        #print(len(velo))
-        
-        # now we can calculate phases
-        # concnetric based on when velocity crosses 0
-        start_concentric = 1
-        while velo[start_concentric] < 0:
-            start_concentric = start_concentric + 1
-        time_cropped_at_start_concentric_s = time_cropped_s[start_concentric]
-        
-        # get indices for time in the cropped array
-        time_cropped_takeoff_index = np.where(time_cropped_s == time_takeoff_s)[0][0]
-        time_cropped_land_index = np.where(time_cropped_s == time_land_s)[0][0]
-        time_cropped_end_land_index = len(velo) # for now, end of landing phase is the lenght of velo
-        
-        # lastly, full time array at start concentric
-        full_index_at_start_concentric = np.where(time_s == time_cropped_at_start_concentric_s)[0][0]
-        time_s_at_start_concentric = time_s[full_index_at_start_concentric]
-        
-        ##### Phase Calculations
-        # total force
-        ecc_fz_total = fz_total[ground_contact:full_index_at_start_concentric]
-        con_fz_total = fz_total[full_index_at_start_concentric:takeoff]
-        land_fz_total = fz_total[land:end_land]
-        positive_fz_total = fz_total[ground_contact:takeoff]
-        
-        # left force
-        ecc_fz_left = fz_left[ground_contact:full_index_at_start_concentric]
-        con_fz_left = fz_left[full_index_at_start_concentric:takeoff]
-        land_fz_left = fz_left[land:end_land]
-        positive_fz_left = fz_left[ground_contact:takeoff]
-        
-        # right force
-        ecc_fz_right = fz_right[ground_contact:full_index_at_start_concentric]
-        con_fz_right = fz_right[full_index_at_start_concentric:takeoff]
-        land_fz_right = fz_right[land:end_land]
-        positive_fz_right = fz_right[ground_contact:takeoff]    
-        
-        # velocity arrays
-        ecc_velo = velo[0:start_concentric]
-        con_velo = velo[start_concentric:time_cropped_takeoff_index]
-        land_velo = velo[time_cropped_land_index:time_cropped_end_land_index]
-        
-        # power arrays 
-        ecc_power = ecc_velo * ecc_fz_total
-        con_power = con_velo * con_fz_total
-        land_power = land_velo * land_fz_total
-        
-        ##### Outcomes start here
-        # power outcomes
-        ecc_peak_power = ecc_power.min()
-        ecc_mean_power = ecc_power.mean()
-        con_peak_power = con_power.max()
-        con_mean_power = con_power.mean()
-        land_peak_power = land_power.min()
-        land_mean_power = land_power.mean()
-        
-        # Total Kinetic Phase Specific Outcomes
-        # eccentric 
-        total_ecc_peak_force_n = ecc_fz_total.max()
-        total_ecc_peak_force_nkg = total_ecc_peak_force_n/bodymass
-        total_ecc_mean_force_n = ecc_fz_total.mean()
-        total_ecc_mean_force_nkg = total_ecc_mean_force_n/bodymass
-        total_ecc_impulse = int_trapz(ecc_fz_total)/sf
-            
-        # concentric
-        total_con_peak_force_n = con_fz_total.max()
-        total_con_peak_force_nkg = total_con_peak_force_n/bodymass
-        total_con_mean_force_n = con_fz_total.mean()
-        total_con_mean_force_nkg = total_con_mean_force_n/bodymass
-        total_con_impulse = int_trapz(con_fz_total)/sf
-        
-        # positive impulses
-        total_positive_impulse = int_trapz(positive_fz_total)/sf
-        left_positive_impulse = int_trapz(positive_fz_left)/sf
-        right_positive_impulse = int_trapz(positive_fz_right)/sf
-
-        # landing
-        total_land_peak_force_n = land_fz_total.max()
-        total_land_peak_force_nkg = total_land_peak_force_n/bodymass
-        total_land_mean_force_n = land_fz_total.mean()
-        total_land_mean_force_nkg = total_land_mean_force_n/bodymass
-        total_land_impulse = int_trapz(land_fz_total)/sf
-        
-        # Left Leg Phase Specific Outcomes
-        # eccentric 
-        left_ecc_peak_force_n = ecc_fz_left.max()
-        left_ecc_peak_force_nkg = left_ecc_peak_force_n/bodymass
-        left_ecc_mean_force_n = ecc_fz_left.mean()
-        left_ecc_mean_force_nkg = left_ecc_mean_force_n/bodymass
-        left_ecc_impulse = int_trapz(ecc_fz_left)/sf
-        
-        # concentric
-        left_con_peak_force_n = con_fz_left.max()
-        left_con_peak_force_nkg = left_con_peak_force_n/bodymass
-        left_con_mean_force_n = con_fz_left.mean()
-        left_con_mean_force_nkg = left_con_mean_force_n/bodymass
-        left_con_impulse = int_trapz(con_fz_left)/sf
-        
-        # landing
-        left_land_peak_force_n = land_fz_left.max()
-        left_land_peak_force_nkg = left_land_peak_force_n/bodymass
-        left_land_mean_force_n = land_fz_left.mean()
-        left_land_mean_force_nkg = left_land_mean_force_n/bodymass
-        left_land_impulse = int_trapz(land_fz_left)/sf
-        
-        # Right Leg Phase Specific Outcomes
-        # eccentric 
-        right_ecc_peak_force_n = ecc_fz_right.max()
-        right_ecc_peak_force_nkg = right_ecc_peak_force_n/bodymass
-        right_ecc_mean_force_n = ecc_fz_right.mean()
-        right_ecc_mean_force_nkg = right_ecc_mean_force_n/bodymass
-        right_ecc_impulse = int_trapz(ecc_fz_right)/sf
-        
-        # concentric
-        right_con_peak_force_n = con_fz_right.max()
-        right_con_peak_force_nkg = right_con_peak_force_n/bodymass
-        right_con_mean_force_n = con_fz_right.mean()
-        right_con_mean_force_nkg = right_con_mean_force_n/bodymass
-        right_con_impulse = int_trapz(con_fz_right)/sf
-            
-        # landing
-        right_land_peak_force_n = land_fz_right.max()
-        right_land_peak_force_nkg = right_land_peak_force_n/bodymass
-        right_land_mean_force_n = land_fz_right.mean()
-        right_land_mean_force_nkg = right_land_mean_force_n/bodymass
-        right_land_impulse = int_trapz(land_fz_right)/sf
-        
-        # time-constrained outcomes
-        groundcontact_time_s = time_s[takeoff] - time_s[ground_contact]
-        ecc_time_s = time_s_at_start_concentric - time_ground_contact_s
-        con_time_s = time_takeoff_s - time_s_at_start_concentric
-        flight_time_s = time_land_s - time_takeoff_s
-        land_time_s = time_end_land_s - time_land_s
-        
-        # RFD outcomes - later
-        # velocity outcomes
-        con_peak_velocity = con_velo.max()
-        con_mean_velocity = con_velo.mean()
-        ecc_mean_velocity = ecc_velo.mean()
-        land_peak_velocity = land_velo.min()
-        land_mean_velocity = land_velo.mean()
-    
-        # perforamnce outcomes
-        vto = velo[time_cropped_takeoff_index]
-        jh_m = ((vto ** 2))/(9.81 * 2)   
-        jh_cm = jh_m * 100
-        rsi = flight_time_s/groundcontact_time_s
-        
-        # concatenate into a list
-        values_dat = [bodymass, box_height*100, jh_cm, rsi,
-                  con_peak_power, ecc_peak_power, land_peak_power,
-                  con_mean_power, ecc_mean_power, land_mean_power, 
-                  total_con_peak_force_n, total_con_peak_force_nkg, total_ecc_peak_force_n, 
-                  total_ecc_peak_force_nkg, total_con_mean_force_n, total_con_mean_force_nkg,
-                  total_ecc_mean_force_n, total_ecc_mean_force_nkg, total_land_peak_force_n,
-                  total_land_peak_force_nkg,  total_land_mean_force_n, total_land_mean_force_nkg,
-                  total_con_impulse, total_ecc_impulse, total_positive_impulse,
-                  total_land_impulse, left_con_peak_force_n, left_con_peak_force_nkg,
-                  left_ecc_peak_force_n, left_ecc_peak_force_nkg, left_con_mean_force_n,
-                  left_con_mean_force_nkg, left_ecc_mean_force_n, left_ecc_mean_force_nkg,
-                  left_land_peak_force_n, left_land_peak_force_nkg, left_land_mean_force_n,
-                  left_land_mean_force_nkg, left_con_impulse, left_ecc_impulse,
-                  left_positive_impulse, left_land_impulse, right_con_peak_force_n,
-                  right_con_peak_force_nkg, right_ecc_peak_force_n, right_ecc_peak_force_nkg,
-                  right_con_mean_force_n, right_con_mean_force_nkg, right_ecc_mean_force_n,
-                  right_ecc_mean_force_nkg, right_land_peak_force_n, right_land_peak_force_nkg,
-                  right_land_mean_force_n, right_land_mean_force_nkg, right_con_impulse,
-                  right_ecc_impulse, right_positive_impulse, right_land_impulse,
-                  groundcontact_time_s, ecc_time_s, con_time_s, 
-                  flight_time_s, land_time_s, con_peak_velocity,
-                  land_peak_velocity, land_mean_velocity, con_mean_velocity, ecc_mean_velocity, vto]
-        
-        values_dat_clean = [round(float(n), 3) for n in values_dat]
-        values_dat_table = [round(float(n), 3) for n in values_dat]
-        
-        full_table_vars = list(dualplate_dropjump_vars_dict.values())
-        full_table_dat = pd.DataFrame({'Variable': full_table_vars,
-                                       file_name : values_dat_table})
-        
-        self.display_table(self.outcome_dat)
-        outcome_dat[file_name] = values_dat_clean
-        
-        ##### Plotting
-        time_at_ground_contact_s = time_s[ground_contact]
-        time_at_start_concentric_s = time_s_at_start_concentric
-        time_at_takeoff_s = time_s[takeoff]
-        time_at_land_s = time_s[land]
-        time_at_end_land_s = time_s[end_land]
-        
-        # for adding annotations
-        annotations = {'Ground Contact': time_at_ground_contact_s,
-                       'Concentric': time_at_start_concentric_s,
-                       'Flight': time_at_takeoff_s,
-                       'Landing': time_at_land_s+0.1}
-        
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.axvline(x = time_at_ground_contact_s, ls = ':', color = 'grey', lw = 0.4)
-        ax.axvline(x = time_at_start_concentric_s, ls = ':', color = 'grey', lw = 0.4)
-        ax.axvline(x = time_at_takeoff_s, ls = ":", color = 'grey', lw = 0.4)
-        ax.axvline(x = time_at_land_s, ls = ":", color = 'grey', lw = 0.4)
-        sns.lineplot(x = time_s[ground_contact-500:land+1000], y = fz_total[ground_contact-500:land+1000], label = 'Total', color = '#0072B2', lw = 2, ax = ax)
-        sns.lineplot(x = time_s[ground_contact-500:land+1000], y = fz_left[ground_contact-500:land+1000], label = 'Left', color = '#D55E00', lw = 1, ax = ax)
-        sns.lineplot(x = time_s[ground_contact-500:land+1000], y = fz_right[ground_contact-500:land+1000], label = 'Right', color = '#56B4E9', lw = 1, ax = ax)
-        ax.yaxis.set_major_locator(MaxNLocator(nbins = 'auto'))
-        ax.xaxis.set_major_locator(MaxNLocator(nbins = 'auto'))
-        ax.set_ylabel('Force (N)')
-        ax.set_xlabel('Time (seconds)')
-        ax.legend(loc = 'upper right', frameon = False)
-        
-        # add annotations to plot
-        y_pos = ax.get_ylim()[1]*0.95
-        for label, x_coord in annotations.items():
-            ax.annotate(label, xy = (x_coord, y_pos), xytext = (5,5),
-                        textcoords = 'offset points', ha = 'left', va = 'top',
-                        fontsize = 8, fontweight = 'bold', color = 'black', rotation = -90)
-        self.canvas.draw()
-        self.outcome_dat = outcome_dat
-        
-    # calculate averages
-    def average_data(self, dataframe):
-        var_names = dataframe.iloc[:, 0]
-        values_dat = dataframe.iloc[:,1:]
-        values_dat_mean = values_dat.mean(axis = 1)
-        average_dat = pd.DataFrame({'Variable': var_names,
-                                    'Average': values_dat_mean})
-        self.average_dat = average_dat
-   
-    # function to get Limb symmetry indices 
-    def get_lsi(self, dataframe):
-        leg_data = dataframe[dataframe['Variable'].str.contains("Left|Right")].copy()
-        leg_data['leg'] = leg_data['Variable'].apply(lambda x: 'Left' if 'Left' in x else 'Right')
-        leg_data['Metric'] = leg_data['Variable'].apply(lambda x: x.split(' ', 1)[1])
-        leg_data_clean = leg_data[['Metric', 'leg', 'Average']]
-        leg_data_wide = leg_data_clean.pivot(index = 'Metric', columns = 'leg', values = 'Average').reset_index()
-        leg_data_wide["L/R LSI"]  = np.round(leg_data_wide['Left'] / leg_data_wide['Right'], 2)
-        leg_data_wide['R/L LSI'] = np.round(leg_data_wide['Right'] / leg_data_wide['Left'], 2)
-        self.lsi_data = leg_data_wide  
-    
-    # function to export data
-    def exportData(self):
-        options = QFileDialog.Options()
-        save_path, _ = QFileDialog.getSaveFileName(self, "Save File", "", "XLSX Files (.xlsx);;All Files (*)", options = options)
-        lsi_df = self.lsi_data
-        average_df = self.average_dat
-        outcome_df = self.outcome_dat
-        if save_path:
-            if not save_path.endswith('.xlsx'):
-                save_path += ".xlsx"
-            with pd.ExcelWriter(save_path, engine = 'xlsxwriter') as writer:
-                lsi_df.to_excel(writer, sheet_name = "LSI Data", index = False)
-                average_df.to_excel(writer, sheet_name = "Average Data", index = False)
-                outcome_df.to_excel(writer, sheet_name = 'Individual Data', index = False)
-    
-    # function to return to home screen            
-    def returnToHome(self):
-        self.home = AnalysisSelector()
-        self.home.show()
-        self.close()    
-    # function to close app
-    def closeApp(self):
-        self.close()            
-        
-               
 # class for analysis selector (Home screen)
 class AnalysisSelector(QMainWindow):
     def __init__(self):
@@ -1,16 +1,20 @@
 import sys
 import os
 import numpy as np
-import pandas as pd
 import shutil
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                               QPushButton, QFileDialog, QTableWidget, QTableWidgetItem, QAbstractItemView, QMessageBox)
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 import qdarktheme
-from scipy.signal import butter, filtfilt
+
+# shared analysis code lives in the biomech package at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from biomech.windows import max_mean_window
+from biomech import llr, results_store
+from biomech.signal_io import write_signal
 
 ##### defining global constants
 custom_theme = {"axes.spines.right": False, "axes.spines.top": False,
@@ -63,12 +67,24 @@ class LLRAnalysis(QMainWindow):
         self.files_in_directory = []
         self.clicked = False  # Flag to prevent multiple clicks
         
-        # initialize dataframe for saving MVIC values to
-        self.mvic_dat = pd.DataFrame()
+        # MVIC values keyed by filename, so redoing a baseline replaces the old value
+        self.mvic_results = {}
+        # what each export file already holds (read from the file on the first export to it),
+        # so exports only add new/changed rows, also after a restart
+        self.exported = {}
 
         self.rect_width = 2000  # Fixed rectangle width (1 second at 2000Hz)
         self.save_directory = ''  # Directory for saving the corrected signals
 
+        # background loading/filtering of the next files in the list
+        self.prefetcher = llr.Prefetcher(sample_rate = self.sample_rate, depth = 2)
+
+        # folder batch running in worker processes, polled by batchTimer
+        self.batch = None
+        self.batchTimer = QTimer(self)
+        self.batchTimer.setInterval(100)
+        self.batchTimer.timeout.connect(self.on_batch_tick)
+
     def initUI(self):
         self.setWindowTitle("Baseline Correction")
         self.setGeometry(100, 100, 1600, 800)
@@ -87,6 +103,11 @@ class LLRAnalysis(QMainWindow):
         self.selectDirButton.clicked.connect(self.load_data)
         button_layout.addWidget(self.selectDirButton)
 
+        # Batch analysis button, only flagged files are left for review
+        self.batchButton = QPushButton("Batch Analyze Folder")
+        self.batchButton.clicked.connect(self.batch_analyze)
+        button_layout.addWidget(self.batchButton)
+
         # Add Save Directory Button
         self.saveDirButton = QPushButton("Select Output Folder")
         self.saveDirButton.clicked.connect(self.select_save_directory)
@@ -97,6 +118,11 @@ class LLRAnalysis(QMainWindow):
         self.saveButton.clicked.connect(self.save_corrected_signal)
         button_layout.addWidget(self.saveButton)
 
+        # Accept the automatically detected baseline instead of clicking
+        self.suggestButton = QPushButton("Use Suggested Baseline")
+        self.suggestButton.clicked.connect(self.use_suggested_baseline)
+        button_layout.addWidget(self.suggestButton)
+
         # Add Redo Selection Button
         self.redoButton = QPushButton("Redo Selection")
         self.redoButton.clicked.connect(self.redo_selection)
@@ -162,15 +188,74 @@ class LLRAnalysis(QMainWindow):
         folder = QFileDialog.getExistingDirectory(self, "Select Directory")
         if folder:
             # Filter files containing "LLR" in the filename
-            self.files_in_directory = [f for f in os.listdir(folder) if 'LLR' in f]
+            self.files_in_directory = llr.llr_files(folder)
             self.update_file_table()
 
             if self.files_in_directory:
-                self.filename = os.path.join(folder, self.files_in_directory[0])  # Load the first file
-                self.basename = self.files_in_directory[0]
-                self.signal = np.loadtxt(self.filename, usecols = 0) # Assuming signal data is in the first column
-                self.updated_signal = self.signal.copy()
-                self.plot_original_signal()
+                self.show_file(folder, self.files_in_directory[0])  # Load the first file
+
+    def batch_analyze(self):
+        # Run the automatic baseline/MVIC analysis over a whole folder, then queue
+        # only the flagged files so they can be reviewed and overridden by hand.
+        # The files are analysed in worker processes; a timer collects them so the
+        # window keeps responding and shows the progress
+        if self.batch is not None:
+            return
+        folder = QFileDialog.getExistingDirectory(self, "Select Directory for Batch Analysis")
+        if not folder:
+            return
+        if not self.save_directory:
+            self.save_directory = os.path.join(folder, "Baseline Corrected Automatic")
+        self.batch = llr.Batch(folder, self.save_directory, self.sample_rate)
+        self.batchButton.setEnabled(False)
+        self.statusBar().showMessage(f"Batch analysis: 0 of {self.batch.total} files")
+        self.batchTimer.start()
+
+    def on_batch_tick(self):
+        folder = self.batch.folder
+        try:
+            done = self.batch.poll()
+            self.statusBar().showMessage(f"Batch analysis: {done} of {self.batch.total} files")
+            if done < self.batch.total:
+                return
+            results = self.batch.finish()
+        except Exception as error:  # e.g. a file that can't be read; stop the batch instead of raising every tick
+            self.batch.cancel()
+            results = None
+            self.statusBar().showMessage(f"Batch analysis stopped: {error}")
+        self.batchTimer.stop()
+        self.batch = None
+        self.batchButton.setEnabled(True)
+        if results is None:
+            return
+        self.statusBar().clearMessage()
+
+        passed = results[results['Flag'] == '']
+        self.mvic_results.update(zip(passed['Filename'], passed['MVIC']))
+        self.files_in_directory = list(results.loc[results['Flag'] != '', 'Filename'])
+        self.update_file_table()
+
+        msg_box = QMessageBox(self)
+        msg_box.setIcon(QMessageBox.Icon.Information)
+        msg_box.setWindowTitle("Batch Analysis Completed")
+        msg_box.setText(f"Analyzed {len(results)} files, {len(self.files_in_directory)} flagged for review.")
+        msg_box.exec()
+
+        if self.files_in_directory:
+            self.show_file(folder, self.files_in_directory[0])
+
+    def show_file(self, folder, basename):
+        # Take the file from the prefetcher (loaded and filtered in the background when
+        # possible) and queue up the ones after it
+        self.filename = os.path.join(folder, basename)
+        self.basename = basename
+        prepared = self.prefetcher.get(self.filename)
+        self.signal = prepared['signal']
+        self.prefiltered_signal = prepared['filtered']
+        self.suggested_range = prepared['baseline_range']
+        self.updated_signal = self.signal.copy()
+        self.plot_original_signal()
+        self.prefetcher.schedule([os.path.join(folder, f) for f in self.files_in_directory[1:]])
 
     def select_save_directory(self):
         # Open file dialog to select a directory to save corrected files
@@ -200,6 +285,8 @@ class LLRAnalysis(QMainWindow):
         # Plot the original signal on canvas1
         time = np.linspace(0, len(self.signal) / self.sample_rate, len(self.signal))
         self.ax.plot(time, self.signal, color="red")
+        suggested_start, suggested_end = (idx / self.sample_rate for idx in self.suggested_range)
+        self.ax.axvspan(suggested_start, suggested_end, facecolor='none', edgecolor='grey', ls='--', lw=0.8)  # suggested baseline
         self.ax.set_title(f"Original Signal - {self.basename}")
         self.ax.set_xlabel("Time (s)")
         self.ax.set_ylabel("Force (N)")
@@ -225,9 +312,15 @@ class LLRAnalysis(QMainWindow):
         if event.inaxes != self.ax:
             return
         # Get the clicked x position and calculate the selected range (0.5 seconds wide)
-        x_click = event.xdata
-        x_start = x_click 
-        x_end = x_click + 0.5  # 0.5 second wide (based on sample rate of 2000Hz)
+        self.select_baseline(event.xdata)
+
+    def use_suggested_baseline(self):
+        if self.clicked or self.signal is None:
+            return
+        self.select_baseline(self.suggested_range[0] / self.sample_rate)
+
+    def select_baseline(self, x_start):
+        x_end = x_start + 0.5  # 0.5 second wide (based on sample rate of 2000Hz)
 
         # Ensure the selected range does not go out of bounds
         if x_end > len(self.signal) / self.sample_rate:
@@ -267,28 +360,17 @@ class LLRAnalysis(QMainWindow):
     
     def plot_corrected_signal(self):
         # Plot the baseline-corrected signal on canvas2
-        # filter parameters
-        fc = 10
-        nyf = 0.5 * self.sample_rate
-        order = 2 ## zero lag filter, applied twice so needs to be 2 to make a 4th order filter
-        cn = fc/nyf 
-        b, a = butter(N = order, Wn = cn, btype = 'low', analog = False)
-        self.filtered_signal = filtfilt(b, a, self.updated_signal)
+        # the raw signal was already low-passed (10 Hz, 4th order zero lag) when it was
+        # loaded; the filter is linear so subtracting the baseline afterwards is equivalent
+        self.filtered_signal = self.prefiltered_signal - self.baseline
         
         ## calculate MVIC
-        mvic_array = []
         epoch_dur = 0.25
         epoch_samples = int(epoch_dur * self.sample_rate)
         
-        # loop over the force array, calculating the mean of all 250 ms
-        for start_idx in range(len(self.filtered_signal) - epoch_samples):
-            end_idx = start_idx + epoch_samples
-            epoch_avg = np.mean(self.filtered_signal[start_idx:end_idx])
-            mvic_array.append(epoch_avg)
-            
-        mvic = max(mvic_array) # pull the max value of the possible mvics 
+        # highest mean of all 250 ms epochs, done with a single moving-average pass
+        mvic_idx, mvic = max_mean_window(self.filtered_signal, epoch_samples)
         self.mvic = mvic
-        mvic_idx = mvic_array.index(mvic)
         mvic_start_time = mvic_idx / self.sample_rate
         mvic_end_time = mvic_start_time + epoch_dur
         annotation_x = (mvic_start_time + mvic_end_time) / 2
@@ -313,16 +395,14 @@ class LLRAnalysis(QMainWindow):
         self.figure2.tight_layout()
         self.canvas2.draw()
         
-        new_dat = pd.DataFrame([{'Filename': self.basename,
-                                      'MVIC': mvic}])
-        self.mvic_dat = pd.concat([self.mvic_dat, new_dat], ignore_index=True)
-        #print(self.mvic_dat)
+        self.mvic_results[self.basename] = mvic
+        #print(self.mvic_results)
         
     def save_corrected_signal(self):
         # Save the corrected signal to a CSV file
         if self.save_directory:
             save_path = os.path.join(self.save_directory, f"{os.path.splitext(self.basename)[0]}_corrected.csv")
-            np.savetxt(save_path, self.updated_signal, delimiter=',', fmt = '%0.8f')
+            write_signal(save_path, self.updated_signal, sidecar = True)  # .npy copy for later analyses
            # print(f"Saved baseline corrected signal to: {save_path}")
 
             # Move the original (uncorrected) file to "0- Analyzed MVICs"
@@ -335,11 +415,7 @@ class LLRAnalysis(QMainWindow):
             # Load the next file from the list
             self.files_in_directory.pop(0)  # Remove the current file from the list
             if self.files_in_directory:
-                self.filename = os.path.join(os.path.dirname(self.filename), self.files_in_directory[0])  # Load the next file
-                self.basename = self.files_in_directory[0]
-                self.signal = np.loadtxt(self.filename, usecols = 0) # Load the next signal
-                self.updated_signal = self.signal.copy()
-                self.plot_original_signal()
+                self.show_file(os.path.dirname(self.filename), self.files_in_directory[0])  # Load the next file
                 self.update_file_table()
             else: # correction for in case all files are analyzed
                 msg_box = QMessageBox(self)
@@ -357,22 +433,33 @@ class LLRAnalysis(QMainWindow):
         save_path, _ = QFileDialog.getSaveFileName(self, 
                                                 "Save MVIC Data", 
                                                 "", 
-                                                "CSV Files (*.csv);;All Files (*)")
+                                                "CSV Files (*.csv);;SQLite Database (*.db *.sqlite);;All Files (*)")
         # Check if a save path is provided
         if save_path:
-            # Check if the file exists, and append if it does
-            if os.path.exists(save_path):
-                existing_data = pd.read_csv(save_path)
-                combined_data = pd.concat([existing_data, self.vmci_dat], ignore_index=True)
-                combined_data = combined_data.drop_duplicates(subset = 'Filename', keep = 'last')
-                combined_data.to_csv(save_path, mode='a', header=False, index=False)  # Append to CSV without header
-                print(f"Data appended to {save_path}")
+            rows = [{'Filename': name, 'MVIC': float(mvic)} for name, mvic in self.mvic_results.items()]
+            if results_store.is_sqlite_path(save_path):
+                # one row per file, a redone baseline overwrites the old MVIC
+                results_store.upsert_rows(save_path, 'mvic', 'Filename', rows)
+                print(f"Data saved to {save_path}")
             else:
-                self.mvic_dat = self.mvic_dat.drop_duplicates(subset = 'Filename', keep = 'last')
-                self.mvic_dat.to_csv(save_path, index=False)  # Save as new CSV if file doesn't exist
-                print(f"Data exported to {save_path}")
+                # only append rows that are new or changed since the last export to this file;
+                # if a file shows up more than once the last row is the latest MVIC
+                exported = self.exported.get(os.path.abspath(save_path))
+                if exported is None:
+                    exported = {name: float(row['MVIC'])
+                                for name, row in results_store.latest_csv_rows(save_path, 'Filename').items()}
+                    self.exported[os.path.abspath(save_path)] = exported
+                rows = [row for row in rows if exported.get(row['Filename']) != row['MVIC']]
+                results_store.append_csv_rows(save_path, rows, ['Filename', 'MVIC'])
+                exported.update((row['Filename'], row['MVIC']) for row in rows)
+                print(f"Appended {len(rows)} rows to {save_path}")
                 
     def closeApp(self):
+        self.prefetcher.shutdown()
+        if self.batch is not None:
+            self.batchTimer.stop()
+            self.batch.cancel()
+            self.batch = None
         self.exportData()
         self.close()
 
@@ -0,0 +1,273 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.integrate import cumulative_trapezoid
+
+from biomech import analyses, batch, forceplate, kernels, live, segment, session, simulator, streaming, synthetic
+from conftest import FZ_LEFT_COL, FZ_RIGHT_COL
+
+# Stage by stage timings of the CMJ processing used by the force plate programs
+# (ingest, body weight, integration, events, metrics) plus the table fill and plot.
+
+
+@pytest.mark.benchmark(group = "ingest")
+def bench_read_bundled(benchmark, bundled_paths):
+    benchmark(lambda: [forceplate.fz_column(forceplate.read_trial(p), 0) for p in bundled_paths])
+
+
+@pytest.mark.benchmark(group = "ingest")
+def bench_read_dual(benchmark, dual_trial_path):
+    def read():
+        dat = forceplate.read_trial(dual_trial_path)
+        return forceplate.fz_column(dat, FZ_LEFT_COL) + forceplate.fz_column(dat, FZ_RIGHT_COL)
+    benchmark(read)
+
+
+@pytest.mark.benchmark(group = "body weight")
+def bench_body_weight(benchmark, dual_fz):
+    benchmark(forceplate.body_weight, dual_fz)
+
+
+@pytest.mark.benchmark(group = "integrate")
+def bench_integrate(benchmark, dual_fz):
+    bw_mean, _, bodymass = forceplate.body_weight(dual_fz)
+    benchmark(forceplate.integrate, dual_fz, bw_mean, bodymass)
+
+
+@pytest.mark.benchmark(group = "events")
+def bench_detect_events(benchmark, dual_fz):
+    bw_mean, bw_sd, bodymass = forceplate.body_weight(dual_fz)
+    velo = forceplate.integrate(dual_fz, bw_mean, bodymass)["velo"]
+    benchmark(forceplate.detect_cmj_events, dual_fz, velo, bw_mean, bw_sd)
+
+
+@pytest.mark.benchmark(group = "events")
+def bench_stream_events(benchmark, dual_fz):
+    # the online detector fed 50 sample blocks finds exactly the offline events
+    offline = forceplate.process_cmj(dual_fz)["events"]
+    blocks = [dual_fz[i:i + 50] for i in range(0, len(dual_fz), 50)]
+    detector = benchmark(streaming.stream_events, blocks)
+    assert dict(detector.events) == dict(offline)
+
+
+@pytest.mark.benchmark(group = "metrics")
+def bench_metrics(benchmark, dual_fz):
+    trial = forceplate.process_cmj(dual_fz)
+    benchmark(forceplate.cmj_metrics, dual_fz, trial["kinematics"], trial["events"], trial["bodymass"])
+
+
+@pytest.mark.benchmark(group = "full trial")
+def bench_process_bundled(benchmark, bundled_forces):
+    benchmark(lambda: [forceplate.process_cmj(fz) for fz in bundled_forces])
+
+
+@pytest.mark.benchmark(group = "full trial")
+def bench_process_dual(benchmark, dual_fz):
+    benchmark(forceplate.process_cmj, dual_fz)
+
+
+@pytest.mark.benchmark(group = "full trial")
+def bench_process_synthetic(benchmark, synthetic_cmjs):
+    forces = [trial["data"].iloc[:, [FZ_LEFT_COL, FZ_RIGHT_COL]].to_numpy().sum(axis = 1) for trial in synthetic_cmjs]
+    results = benchmark(lambda: [forceplate.process_cmj(fz) for fz in forces])
+    # takeoff is detected at 30 N, a few samples before the force reaches zero
+    for trial, result in zip(synthetic_cmjs, results):
+        assert abs(result["events"]["land"] - trial["events"]["land"]) <= 1
+        assert abs(result["events"]["takeoff"] - trial["events"]["takeoff"]) <= 10
+        assert abs(result["metrics"]["jh_cm"] - trial["jump_height"] * 100) < 2
+
+
+def _assert_batch_matches(forces, result):
+    # process_cmj's events exactly, its metrics to the last digits (sums in sample order)
+    for fz, events, metrics in zip(forces, result["events"], result["metrics"]):
+        expected = forceplate.process_cmj(fz)
+        assert [int(index) for index in events] == [expected["events"][name] for name in batch.event_names]
+        np.testing.assert_allclose(metrics, [expected["metrics"][name] for name in batch.metric_names], rtol = 1e-12)
+
+
+@pytest.mark.benchmark(group = "full trial")
+def bench_batch_bundled(benchmark, bundled_forces):
+    # the trials of bench_process_bundled as one batch
+    result = benchmark(batch.process_cmjs, bundled_forces)
+    _assert_batch_matches(bundled_forces, result)
+
+
+@pytest.mark.benchmark(group = "full trial")
+def bench_batch_synthetic(benchmark, synthetic_cmjs):
+    forces = [trial["data"].iloc[:, [FZ_LEFT_COL, FZ_RIGHT_COL]].to_numpy().sum(axis = 1) for trial in synthetic_cmjs]
+    result = benchmark(batch.process_cmjs, forces)
+    _assert_batch_matches(forces, result)
+
+
+@pytest.fixture(params = sorted(kernels.backends))
+def kernel_backend(request):
+    previous = kernels.use(request.param)
+    yield request.param
+    kernels.use(previous)
+
+
+@pytest.fixture(scope = "module")
+def cmj_batch(synthetic_cmjs):
+    # 10,000 trials (the synthetic CMJs the rules can process, repeated) and their
+    # events from the NumPy kernels
+    forces = []
+    for trial in synthetic_cmjs:
+        fz = trial["data"].iloc[:, [FZ_LEFT_COL, FZ_RIGHT_COL]].to_numpy().sum(axis = 1)
+        try:
+            forceplate.process_cmj(fz)
+        except ValueError:
+            continue
+        forces.append(fz)
+    previous = kernels.use("numpy")
+    events = [_integrate_and_detect([fz])[0] for fz in forces]
+    kernels.use(previous)
+    repeat = -(-10000 // len(forces))
+    return (forces * repeat)[:10000], (events * repeat)[:10000]
+
+
+def _integrate_and_detect(forces):
+    events = []
+    for fz in forces:
+        bw_mean, bw_sd, bodymass = forceplate.body_weight(fz)
+        velo = forceplate.integrate(fz, bw_mean, bodymass)["velo"]
+        events.append(forceplate.detect_cmj_events(fz, velo, bw_mean, bw_sd))
+    return events
+
+
+@pytest.mark.benchmark(group = "kernels")
+def bench_kernels_batch(benchmark, kernel_backend, cmj_batch):
+    # integration and event detection for 10k trials; the compiled kernels must find
+    # exactly the NumPy event indices and scipy's velocities, bit for bit
+    forces, expected = cmj_batch
+    events = benchmark.pedantic(_integrate_and_detect, args = (forces,), rounds = 3, warmup_rounds = 1)
+    assert [dict(e) for e in events] == [dict(e) for e in expected]
+    for fz in forces[:200]:
+        bw_mean, _, bodymass = forceplate.body_weight(fz)
+        reference = cumulative_trapezoid((fz - bw_mean) / bodymass, dx = 1 / forceplate.sf)
+        assert forceplate.integrate(fz, bw_mean, bodymass)["velo"].tobytes() == reference.tobytes()
+
+
+@pytest.fixture(scope = "module")
+def saved_session(synthetic_cmjs, tmp_path_factory):
+    # 500 analysed dual plate CMJs (the synthetic ones, repeated) saved as one session
+    test = analyses.DualCMJ()
+    analysed = []
+    for trial in synthetic_cmjs:
+        fz = trial["data"].iloc[:, [FZ_LEFT_COL, FZ_RIGHT_COL]].to_numpy()
+        result = test.analyze(list(fz.T))
+        analysed.append({"fz": fz, "bodymass": None, "drop_height": None,
+                         "events": result["events"], "values": result["values"]})
+    trials = [{"name": f"CMJ-{i:03d}", **analysed[i % len(analysed)]} for i in range(500)]
+    path = str(tmp_path_factory.mktemp("sessions") / f"cmj{session.extension}")
+    session.save(path, test, trials, {"fz_columns": [FZ_LEFT_COL, FZ_RIGHT_COL]})
+    return path, trials
+
+
+@pytest.mark.benchmark(group = "session")
+def bench_open_session(benchmark, saved_session):
+    # what reopening shows first: the index and the values table, no signal is read
+    path, trials = saved_session
+
+    def open_values():
+        with session.Session(path) as stored:
+            return stored, stored.values()
+
+    stored, values = benchmark(open_values)
+    assert values.shape[0] == len(stored) == 500
+    assert stored.trial("CMJ-123")["events"] == dict(trials[123]["events"])
+
+
+@pytest.mark.benchmark(group = "session")
+def bench_review_stored_trial(benchmark, saved_session):
+    # one trial read from the session and analysed again, without its CSV
+    path, trials = saved_session
+    with session.Session(path) as stored:
+        result = benchmark(stored.analyze, "CMJ-123")
+        assert stored.signal("CMJ-123").tobytes() == trials[123]["fz"].tobytes()
+    assert dict(result["events"]) == dict(trials[123]["events"])
+    assert result["values"] == trials[123]["values"]
+
+
+@pytest.fixture(scope = "module")
+def continuous_cmjs():
+    # one athlete's 50 CMJs recorded back to back, with each jump's takeoff in the recording
+    trials = list(synthetic.random_trials(50, 'cmj', seed = 1, bodymass = 80.0))
+    fz = np.concatenate([trial["fz_total"] for trial in trials])
+    offsets = np.cumsum([0] + [len(trial["fz_total"]) for trial in trials[:-1]])
+    return fz, [offset + trial["events"]["takeoff"] for offset, trial in zip(offsets, trials)]
+
+
+@pytest.mark.benchmark(group = "segment")
+def bench_segment_recording(benchmark, continuous_cmjs):
+    fz, takeoffs = continuous_cmjs
+    slices = benchmark(segment.trial_slices, fz, 'cmj')
+    assert len(slices) == len(takeoffs)
+    for trial, takeoff, view in zip(slices, takeoffs, segment.split(fz, slices)):
+        assert trial.start < takeoff < trial.stop
+        assert np.shares_memory(view, fz)
+
+
+_ports = itertools.count(5105)
+
+
+def _acquire(sim):
+    # one playback over TCP through a Receiver into a RingBuffer, on a fresh local port;
+    # the receiver stops when the simulator closes the stream after the last packet
+    port = next(_ports)
+    ring = live.RingBuffer(len(sim.frames), 2)
+    sim.start('tcp', port)
+    receiver = live.Receiver(ring, port, protocol = 'tcp')
+    receiver.start()
+    receiver.join()
+    return ring, receiver
+
+
+@pytest.mark.benchmark(group = "acquisition")
+def bench_acquire_simulated(benchmark, bundled_paths):
+    # 20 bundled trials streamed as fast as possible, 10 frames per packet
+    frames = np.concatenate([simulator.load_channels(path) for path in bundled_paths[:20]])
+    ring, receiver = benchmark.pedantic(lambda: _acquire(simulator.Simulator(frames, speed = 0)), rounds = 5)
+    assert receiver.error is None and not receiver.lost
+    assert np.array_equal(ring.latest(ring.written), frames)
+
+
+@pytest.fixture(scope = "module")
+def qapp():
+    pytest.importorskip("PyQt5.QtWidgets")
+    import os
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.mark.benchmark(group = "display")
+def bench_fill_table(benchmark, qapp, bundled_forces):
+    from PyQt5.QtWidgets import QTableWidget
+    from biomech.qt_table import fill_table
+    # the 'Full Results' table after dropping every bundled trial
+    outcome_dat = pd.DataFrame({"Variable": list(forceplate.process_cmj(bundled_forces[0])["metrics"])})
+    for i, fz in enumerate(bundled_forces):
+        outcome_dat[f"trial {i}"] = [round(float(v), 3) for v in forceplate.process_cmj(fz)["metrics"].values()]
+    table = QTableWidget()
+    benchmark(fill_table, table, outcome_dat)
+
+
+@pytest.mark.benchmark(group = "display")
+def bench_plot_cmj(benchmark, dual_fz):
+    pytest.importorskip("seaborn")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from biomech import analyses
+    plot = analyses.CMJ().analyze(dual_fz)["plot"]
+    figure = Figure(figsize = (12, 16))
+    canvas = FigureCanvasAgg(figure)
+
+    def draw():
+        figure.clear()
+        ax = figure.add_subplot(111)
+        analyses.plot_trial(ax, plot)
+        figure.tight_layout()
+        canvas.draw()
+    benchmark(draw)
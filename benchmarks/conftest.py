@@ -0,0 +1,51 @@
+import glob
+import os
+import sys
+
+import pytest
+
+# shared analysis code lives in the biomech package at the repo root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_ROOT)
+from biomech import forceplate, synthetic
+
+BUNDLED_DIR = os.path.join(REPO_ROOT, "Misc", "SPM1D CMJ Data")
+FZ_LEFT_COL, FZ_RIGHT_COL = synthetic.fz_columns  # columns F and Q, the GUI defaults
+
+
+@pytest.fixture(scope = "session")
+def bundled_paths():
+    return sorted(glob.glob(os.path.join(BUNDLED_DIR, "*.csv")))
+
+
+@pytest.fixture(scope = "session")
+def bundled_forces(bundled_paths):
+    # single column Hawkin exports; skip trials the CMJ rules can't process (e.g. movement in the first 1.5 s)
+    forces = []
+    for path in bundled_paths:
+        fz = forceplate.fz_column(forceplate.read_trial(path), 0)
+        try:
+            forceplate.process_cmj(fz)
+        except ValueError:
+            continue
+        forces.append(fz)
+    return forces
+
+
+@pytest.fixture(scope = "session", params = [30, 120], ids = ["30s", "120s"])
+def dual_trial_path(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp("trials") / f"dual_cmj_{request.param}s.csv"
+    synthetic.write_trial(synthetic.make_trial('cmj', duration = request.param, seed = 0), path)
+    return str(path)
+
+
+@pytest.fixture(scope = "session")
+def dual_fz(dual_trial_path):
+    dat = forceplate.read_trial(dual_trial_path)
+    return forceplate.fz_column(dat, FZ_LEFT_COL) + forceplate.fz_column(dat, FZ_RIGHT_COL)
+
+
+@pytest.fixture(scope = "session")
+def synthetic_cmjs():
+    # randomised athletes and timing with known events and jump heights
+    return list(synthetic.random_trials(200, 'cmj', seed = 0))
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from biomech import batch, forceplate, synthetic
+from conftest import FZ_LEFT_COL, FZ_RIGHT_COL
+
+# process_cmjs against process_cmj one trial at a time, including trials that fail.
+
+
+@pytest.fixture(scope = "module")
+def cmj_forces():
+    return [trial["data"].iloc[:, [FZ_LEFT_COL, FZ_RIGHT_COL]].to_numpy().sum(axis = 1)
+            for trial in synthetic.random_trials(6, 'cmj', seed = 0)]
+
+
+def _expected(fz):
+    try:
+        return forceplate.process_cmj(fz), None
+    except ValueError as error:
+        return None, str(error)
+
+
+@pytest.mark.parametrize("chunk", [2, 64])
+def test_batch_mixed_lengths(cmj_forces, chunk):
+    # empty and short traces (NaN padding in the quiet stance) fail on their own, in any
+    # position of a chunk, and the trials around them are still processed
+    short = [np.empty(0), np.full(1, 800.0), np.full(1000, 800.0), np.full(1400, 800.0), np.full(1501, 800.0)]
+    traces = [short[0]] + cmj_forces[:3] + short[1:4] + cmj_forces[3:] + [short[4]]
+    result = batch.process_cmjs(traces, chunk = chunk)
+    for fz, events, metrics, error in zip(traces, result["events"], result["metrics"], result["errors"]):
+        if len(fz) < batch.quiet_samples + 2:
+            assert error == "trial shorter than the quiet stance"
+            assert (events == -1).all() and np.isnan(metrics).all()
+            continue
+        expected, expected_error = _expected(fz)
+        assert error == expected_error
+        assert [int(index) for index in events] == [expected["events"][name] for name in batch.event_names]
+        np.testing.assert_allclose(metrics, [expected["metrics"][name] for name in batch.metric_names], rtol = 1e-12)
+
+
+def test_batch_no_movement(cmj_forces):
+    # standing still the whole trial: no countermovement, like process_cmj
+    rng = np.random.default_rng(0)
+    still = 800 + rng.normal(0, 2, 5000)
+    result = batch.process_cmjs([still, cmj_forces[0]])
+    assert result["errors"] == [_expected(still)[1], None]
+    assert (result["events"][0] == -1).all() and (result["events"][1] >= 0).all()
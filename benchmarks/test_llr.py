@@ -0,0 +1,94 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from biomech import llr
+from biomech.signal_io import read_signal
+
+# Headless LLR MVIC analysis (biomech.llr) on signals with a known baseline and plateau.
+
+
+def _mvic_signal(seed = 0):
+    # 2 s at 50 N, a 0.2 s rise to 550 N held for 1 s, then rest; 2000 Hz
+    rng = np.random.default_rng(seed)
+    rise = 50 + 500 * np.sin(np.linspace(0, np.pi / 2, 400))
+    signal = np.concatenate((np.full(4000, 50.0), rise, np.full(2000, 550.0), np.full(2000, 50.0)))
+    return signal + rng.normal(0, 1, len(signal))
+
+
+def test_llr_mvic():
+    signal = _mvic_signal()
+    onset = llr.detect_force_onset(signal)
+    assert 4000 <= onset < 4400
+    start, end, flag = llr.detect_baseline(signal)
+    assert flag == "" and end - start == llr.baseline_dur * llr.sample_rate and end <= onset
+
+    result = llr.process_signal(signal)
+    assert result["flag"] == ""
+    assert result["baseline"] == pytest.approx(50, abs = 0.5)
+    assert result["mvic"] == pytest.approx(500, rel = 0.01)
+    assert 4400 <= result["mvic_idx"] <= 6400 - llr.epoch_dur * llr.sample_rate
+    # the GUI filters the raw signal once and subtracts the baseline after each click
+    np.testing.assert_allclose(llr.lowpass(signal) - result["baseline"], result["filtered"], atol = 1e-9)
+
+
+def test_llr_flags():
+    rng = np.random.default_rng(1)
+    assert llr.process_signal(rng.normal(0, 1, 8000) + np.r_[np.zeros(500), np.full(7500, 200.0)])["flag"] \
+        == "less than 0.5 s of data before force onset"
+    noisy = _mvic_signal() + np.r_[rng.normal(0, 40, 4000), np.zeros(4400)]
+    assert llr.process_signal(noisy)["flag"] == "noisy baseline"
+
+
+def test_llr_analyze_file(tmp_path):
+    path = tmp_path / "S01 LLR.txt"
+    np.savetxt(path, _mvic_signal(), fmt = '%0.6f')
+    row = llr.analyze_file(str(path), str(tmp_path))
+    assert row["Filename"] == path.name and row["Flag"] == ""
+    corrected = llr.corrected_path(str(tmp_path), path.name)
+    np.testing.assert_allclose(read_signal(corrected, use_sidecar = False), read_signal(corrected), atol = 1e-8)
+    assert llr.llr_files(str(tmp_path)) == [path.name, os.path.basename(corrected)]
+
+
+def test_llr_batch(tmp_path):
+    for i in range(3):
+        np.savetxt(tmp_path / f"S{i} LLR.txt", _mvic_signal(i), fmt = '%0.6f')
+    np.savetxt(tmp_path / "S3 LLR.txt", np.r_[np.zeros(500), np.full(7900, 200.0)], fmt = '%0.6f')
+    batch = llr.Batch(str(tmp_path), workers = 2)
+    assert batch.total == 4
+    while batch.poll() < batch.total:
+        time.sleep(0.01)
+    results = batch.finish()
+    assert list(results["Filename"]) == [f"S{i} LLR.txt" for i in range(4)]
+    assert list(results["Flag"] != "") == [False, False, False, True]
+    np.testing.assert_allclose(results["MVIC"][:3], [llr.process_signal(_mvic_signal(i))["mvic"] for i in range(3)],
+                               rtol = 1e-6)  # read back from 6 decimal text
+    assert llr.llr_files(str(tmp_path)) == ["S3 LLR.txt"]  # the others moved to ANALYZED_DIR
+    assert len(os.listdir(tmp_path / llr.ANALYZED_DIR)) == 3
+    assert pd.read_csv(tmp_path / "Baseline Corrected Automatic" / llr.RESULTS_FILE).shape == (4, 5)
+
+
+def test_prefetcher(tmp_path):
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / f"S{i} LLR.txt"))
+        np.savetxt(paths[-1], _mvic_signal(i), fmt = '%0.6f')
+    prepared = llr.prepare_file(paths[0])
+    signal = read_signal(paths[0])
+    assert np.array_equal(prepared["signal"], signal)
+    np.testing.assert_allclose(prepared["filtered"], llr.lowpass(signal))
+    assert prepared["baseline_range"] == llr.detect_baseline(signal)[:2] and prepared["flag"] == ""
+
+    prefetcher = llr.Prefetcher(depth = 2)
+    try:
+        prefetcher.schedule(paths[1:])
+        for path in paths[::-1]:  # the last one was scheduled, the first is loaded on demand
+            fetched = prefetcher.get(path)
+            expected = llr.prepare_file(path)
+            assert np.array_equal(fetched["filtered"], expected["filtered"])
+            assert fetched["baseline_range"] == expected["baseline_range"]
+    finally:
+        prefetcher.shutdown()
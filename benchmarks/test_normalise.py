@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from biomech import normalise
+
+# Time normalisation and trial name parsing for SPM (biomech.normalise).
+
+
+def test_time_normalise():
+    rng = np.random.default_rng(0)
+    segments = [rng.normal(size = n) for n in (1, 2, 3, 50, 101, 1234)]
+    expected = [np.interp(np.linspace(0, len(s) - 1, 101), np.arange(len(s)), s) for s in segments]
+    np.testing.assert_allclose(normalise.time_normalise(segments), expected, rtol = 0, atol = 1e-12)
+    assert normalise.time_normalise([]).shape == (0, 101)
+    with pytest.raises(ValueError):
+        normalise.time_normalise([np.ones(3), np.empty(0)])
+
+
+def test_trial_names():
+    assert normalise.parse_trial("Data/001-PRE.csv") == ("001", "PRE")
+    assert normalise.parse_trial("smith_02 post.csv") == ("SMITH-02", "POST")
+    assert normalise.parse_trial("001-BASE.csv") == ("001-BASE", None)
+    assert normalise.group_by_condition(["1-POST.csv", "1-PRE.csv", "x.csv", "2-PRE.csv"]) == {"PRE": [1, 3], "POST": [0]}
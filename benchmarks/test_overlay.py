@@ -0,0 +1,101 @@
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from biomech.overlay import TrialOverlay, min_max_decimate
+from biomech.ragged import RaggedBuffer
+
+# Multi-trial overlay (biomech.overlay) and its ragged trial buffer, drawn with Agg.
+
+
+def test_ragged_buffer():
+    rng = np.random.default_rng(0)
+    buffer = RaggedBuffer(capacity = 8)
+    rows = [rng.normal(size = n) for n in (5, 0, 7, 20, 3)]
+    assert [buffer.append(row) for row in rows] == list(range(5))
+    assert len(buffer) == 5 and buffer.size == 35 and len(buffer.data) >= 35  # grown from 8
+    assert list(buffer.lengths()) == [5, 0, 7, 20, 3]
+    for i, row in enumerate(rows):
+        assert np.array_equal(buffer[i], row)
+        assert np.shares_memory(buffer[i], buffer.data) or not len(row)
+    assert np.array_equal(buffer[-1], rows[-1])
+    buffer[2][:] = 0  # rows are views
+    assert not buffer[2].any()
+    buffer.clear()
+    assert len(buffer) == 0 and buffer.append([1.0, 2.0]) == 0
+
+
+def test_min_max_decimate():
+    rng = np.random.default_rng(1)
+    y = rng.normal(size = 1003)
+    index = min_max_decimate(y, 100)
+    assert len(index) <= 100 + 2 and np.all(np.diff(index) > 0)
+    size = len(y) // 50
+    for start in range(0, 50 * size, size):  # every bin keeps its lowest and highest sample
+        block = y[start:start + size]
+        assert start + block.argmin() in index and start + block.argmax() in index
+    tail = y[50 * size:]  # and so does the tail past the last whole bin
+    assert 50 * size + tail.argmin() in index and 50 * size + tail.argmax() in index
+    assert np.array_equal(min_max_decimate(y[:80], 100), np.arange(80))
+
+
+@pytest.fixture
+def overlay():
+    figure, ax = plt.subplots()
+    trials = TrialOverlay(sf = 1000)
+    yield trials, ax
+    trials.detach()
+    plt.close(figure)
+
+
+def _trace(overlay, name):
+    trials, _ = overlay
+    trial = trials.trials[name]
+    return trial["line"].get_xdata(), trials.buffer[trial["row"]]
+
+
+def test_overlay_add_and_align(overlay):
+    trials, ax = overlay
+    fz = np.arange(3000.0)
+    assert trials.add("A", fz, 100, 2000, {"takeoff": 1000, "land": 1500})
+    trials.attach(ax, "takeoff")
+    x, y = _trace(overlay, "A")
+    assert np.array_equal(y, fz[100:2000])
+    assert x[0] == pytest.approx((100 - 1000) / 1000)
+    trials.set_align("land")
+    assert _trace(overlay, "A")[0][0] == pytest.approx((100 - 1500) / 1000)
+    assert trials.add("B", fz, 0, None, {"impact": 10})  # cached but not drawn without the event
+    assert trials.trials["B"]["line"] is None and "B" in trials
+
+
+def test_overlay_replace(overlay):
+    trials, ax = overlay
+    fz = np.arange(3000.0)
+    trials.add("A", fz, 100, 2000, {"takeoff": 1000})
+    trials.attach(ax, "takeoff")
+    row = trials.trials["A"]["row"]
+    line = trials.trials["A"]["line"]
+
+    # unchanged: nothing to do
+    assert not trials.add("A", fz, 100, 2000, {"takeoff": 1000})
+    assert trials.trials["A"]["line"] is line and len(trials.buffer) == 1
+
+    # same length, new data and events: the row is rewritten in place and the line replaced
+    assert trials.add("A", fz * 2, 100, 2000, {"takeoff": 1200})
+    assert trials.trials["A"]["row"] == row and len(trials.buffer) == 1
+    assert np.array_equal(trials.buffer[row], fz[100:2000] * 2)
+    x, _ = _trace(overlay, "A")
+    assert x[0] == pytest.approx((100 - 1200) / 1000)
+    assert line not in ax.lines and trials.trials["A"]["line"] in ax.lines
+    assert len(ax.lines) == 2  # the zero line and one trace
+
+    # different length: a new row
+    assert trials.add("A", fz, 100, 2500, {"takeoff": 1200})
+    assert len(trials.buffer) == 2 and np.array_equal(_trace(overlay, "A")[1], fz[100:2500])
+    assert len(ax.lines) == 2
+
+    # without the aligned event the old line goes and none is drawn
+    assert trials.add("A", fz, 100, 2500, {"impact": 1200})
+    assert trials.trials["A"]["line"] is None and len(ax.lines) == 1
@@ -0,0 +1,73 @@
+import itertools
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from biomech import permutation
+
+# Sign-flip permutation inference (biomech.permutation) against scipy and every sign pattern.
+
+
+def test_paired_t():
+    rng = np.random.default_rng(1)
+    pre = rng.normal(size = (8, 30))
+    post = pre + rng.normal(0.5, 1, size = (8, 30))
+    diffs = pre - post
+    signs = rng.choice([-1.0, 1.0], size = (5, 8))
+    expected = [stats.ttest_rel(pre * s[:, None], post * s[:, None]).statistic for s in signs]
+    np.testing.assert_allclose(permutation.paired_t(diffs, signs), expected, rtol = 1e-10)
+
+
+def test_permutation_exact():
+    # 2**8 sign patterns <= iterations: every pattern is used, so the threshold is known
+    rng = np.random.default_rng(2)
+    pre = rng.normal(size = (8, 40)).cumsum(axis = 1)
+    post = pre + rng.normal(0.4, 1, size = (8, 40)).cumsum(axis = 1) * 0.3
+    result = permutation.paired_ttest_nonparam(pre, post, workers = 1)
+    diffs = pre - post
+    max_t = [np.abs(permutation.paired_t(diffs, np.array([s]))).max() for s in itertools.product((1.0, -1.0), repeat = 8)]
+    assert result.iterations == 256
+    assert result.zstar == pytest.approx(np.quantile(max_t, 0.95), rel = 1e-12)
+    np.testing.assert_allclose(result.z, stats.ttest_rel(pre, post).statistic, rtol = 1e-10)
+    found = permutation.clusters(result.z, result.zstar)
+    assert [c.endpoints for c in result.clusters] == [(start, end) for start, end, _ in found]
+    assert permutation.cluster_mass(result.z, result.zstar)[0] == pytest.approx(max([m for *_, m in found], default = 0))
+    assert all(1 / 256 <= c.P <= 1 for c in result.clusters)
+
+
+def test_permutation_workers():
+    # random sign flips: the result depends on the seed and chunk size only
+    rng = np.random.default_rng(3)
+    pre = rng.normal(size = (16, 60)).cumsum(axis = 1)
+    post = pre + rng.normal(0.3, 1, size = (16, 60)).cumsum(axis = 1) * 0.3
+    runs = [permutation.paired_ttest_nonparam(pre, post, iterations = 2000, workers = workers, chunk_size = 500)
+            for workers in (1, 2)]
+    assert runs[0].iterations == 2000
+    assert runs[0].zstar == runs[1].zstar
+    assert [(c.endpoints, c.P) for c in runs[0].clusters] == [(c.endpoints, c.P) for c in runs[1].clusters]
+    other = permutation.paired_ttest_nonparam(pre, post, iterations = 2000, workers = 1, chunk_size = 500, seed = 1)
+    assert other.zstar != runs[0].zstar
+
+
+def test_paired_t2():
+    # Hotelling's T2 at a node: n * mean' S^-1 mean with the sample covariance S
+    rng = np.random.default_rng(4)
+    diffs = rng.normal(0.3, 1, size = (10, 30, 2))
+    signs = np.vstack([np.ones(10), rng.choice([-1.0, 1.0], size = 10)])
+    t2 = permutation.paired_t2(diffs, signs)
+    for row, s in enumerate(signs):
+        for node in (0, 17):
+            d = diffs[:, node] * s[:, None]
+            mean = d.mean(axis = 0)
+            assert t2[row, node] == pytest.approx(10 * mean @ np.linalg.solve(np.cov(d.T), mean), rel = 1e-10)
+
+
+def test_hotelling_matches_spm1d():
+    spm1d = pytest.importorskip("spm1d")
+    rng = np.random.default_rng(5)
+    pre = rng.normal(size = (10, 30, 2))
+    post = pre + rng.normal(0.4, 1, size = (10, 30, 2))
+    result = permutation.paired_hotelling_nonparam(pre, post, iterations = 1000, workers = 1)
+    np.testing.assert_allclose(result.z, spm1d.stats.hotellings_paired(pre, post).z, rtol = 1e-10)
+    assert result.stat == 'T2' and not result.two_tailed
@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from biomech import registry, results_store
+
+# Athlete registry (biomech.registry): latest body mass and box height from CSV and SQLite files.
+
+
+def test_registry_latest_values():
+    rows = [{"athlete": "smith01", "date": "2024-06-01", "body_mass_kg": 80.0, "box_height_cm": 30},
+            {"athlete": "SMITH01", "date": "2024-05-01", "body_mass_kg": 75.0, "box_height_cm": 40},
+            {"athlete": "JONES02", "date": "2024-06-01", "body_mass_lb": 176.368},
+            {"athlete": "SMITH01", "date": "2024-06-08", "body_mass_kg": None, "box_height_in": 12}]
+    latest = registry.latest_values(rows)
+    assert latest["SMITH01"]["bodymass"] == 80.0
+    assert latest["SMITH01"]["drop_height"] == pytest.approx(12 * registry.m_per_in)
+    assert latest["JONES02"] == {"bodymass": pytest.approx(80.0, rel = 1e-4), "drop_height": None}
+    assert registry.subject_token("smith01-DJ-LEFT.csv") == "SMITH01"
+
+
+@pytest.mark.parametrize("extension", [".csv", ".db"])
+def test_registry_lookup(tmp_path, extension):
+    path = str(tmp_path / f"athletes{extension}")
+    rows = [{"athlete": "SMITH01", "date": "2024-06-01", "body_mass_kg": 80.0, "box_height_cm": 30.0}]
+    if extension == ".csv":
+        pd.DataFrame(rows).to_csv(path, index = False)
+    else:
+        results_store.upsert_rows(path, 'athletes', 'athlete', rows)
+    athletes = registry.AthleteRegistry(path)
+    assert athletes.lookup("SMITH01-DJ-03.csv") == ("SMITH01", {"bodymass": 80.0, "drop_height": 0.3})
+    assert athletes.lookup("DOE03-DJ.csv") == ("DOE03", {"bodymass": None, "drop_height": None})
+    athletes.remember("DOE03", bodymass = 70.0)
+    athletes.remember("SMITH01", bodymass = 90.0)  # the file wins over values typed in
+    assert athletes.lookup("DOE03-DJ.csv")[1] == {"bodymass": 70.0, "drop_height": None}
+    assert athletes.lookup("SMITH01-DJ.csv")[1]["bodymass"] == 80.0
+    assert registry.AthleteRegistry(str(tmp_path / "missing.csv")).lookup("SMITH01.csv")[1]["bodymass"] is None
@@ -0,0 +1,26 @@
+import os
+
+import pandas as pd
+
+from biomech import results_store
+
+# Incremental result saving (biomech.results_store): SQLite upserts and appended CSVs.
+
+
+def test_results_store(tmp_path):
+    db = str(tmp_path / "results.db")
+    assert results_store.is_sqlite_path(db) and not results_store.is_sqlite_path("results.csv")
+    results_store.upsert_rows(db, 'mvic', 'Filename', [{"Filename": "a", "MVIC": 1.5}, {"Filename": "b", "MVIC": 2.0}])
+    results_store.upsert_rows(db, 'mvic', 'Filename', [{"Filename": "a", "MVIC": 3.0, "Flag": "redone"}])
+    assert results_store.read_table(db, 'mvic') == [{"Filename": "a", "MVIC": 3.0, "Flag": "redone"},
+                                                    {"Filename": "b", "MVIC": 2.0, "Flag": None}]
+    os.remove(db)  # no connection left open
+
+    csv_path = str(tmp_path / "results.csv")
+    results_store.append_csv_rows(csv_path, [{"Filename": "a", "MVIC": 0.1 + 0.2}], ["Filename", "MVIC"])
+    results_store.append_csv_rows(csv_path, [{"Filename": "b", "MVIC": 1.0}, {"Filename": "a", "MVIC": 2.0}],
+                                  ["Filename", "MVIC"])
+    assert pd.read_csv(csv_path).shape == (3, 2)  # one header
+    latest = results_store.latest_csv_rows(csv_path, "Filename")
+    assert {name: float(row["MVIC"]) for name, row in latest.items()} == {"a": 2.0, "b": 1.0}
+    assert results_store.latest_csv_rows(str(tmp_path / "missing.csv"), "Filename") == {}
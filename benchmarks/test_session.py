@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+import pytest
+
+from biomech import analyses, session, synthetic
+from conftest import FZ_LEFT_COL, FZ_RIGHT_COL
+
+# Session files (biomech.session): saved and reopened trials, analysed again from the file alone.
+
+
+def _analysed_trials():
+    cmj, drop_jump = analyses.DualCMJ(), analyses.DualDropJump()
+    trials = []
+    for i, (kind, test) in enumerate((('cmj', cmj), ('drop_jump', drop_jump))):
+        trial = synthetic.make_trial(kind, seed = i, bodymass = 75.0, drop_height = 0.4)
+        fz = trial["data"].iloc[:, [FZ_LEFT_COL, FZ_RIGHT_COL]].to_numpy()
+        inputs = (75.0, 0.4) if test.needs_mass else (None, None)
+        result = test.analyze(list(fz.T), bodymass = inputs[0], drop_height = inputs[1])
+        trials.append((test, {"name": f"ATH-{kind}", "fz": fz, "bodymass": inputs[0], "drop_height": inputs[1],
+                              "events": result["events"], "values": result["values"]}))
+    return trials
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_session_round_trip(tmp_path, compress):
+    path = str(tmp_path / f"day{session.extension}")
+    for test, trial in _analysed_trials():
+        session.save(path, test, [trial], {"fz_columns": [FZ_LEFT_COL, FZ_RIGHT_COL]}, compress = compress)
+        assert not os.path.exists(path + ".partial")
+        with session.Session(path) as stored:
+            assert stored.test_name == type(test).__name__ and stored.names == [trial["name"]]
+            assert stored.params == {"fz_columns": [FZ_LEFT_COL, FZ_RIGHT_COL]}
+            entry = stored.trial(trial["name"])
+            assert (entry["bodymass"], entry["drop_height"]) == (trial["bodymass"], trial["drop_height"])
+            assert entry["events"] == dict(trial["events"])
+            signal = stored.signal(trial["name"])
+            assert signal.dtype == np.float64 and np.array_equal(signal, trial["fz"])
+            assert np.shares_memory(signal, stored._data) != compress  # raw blocks are views of the map
+            assert stored.values().loc[trial["name"]].to_dict() == pytest.approx(trial["values"], nan_ok = True)
+            # analysed again from the file alone
+            result = stored.analyze(trial["name"])
+            assert dict(result["events"]) == dict(trial["events"])
+            assert result["values"] == pytest.approx(trial["values"], rel = 1e-12, nan_ok = True)
+
+
+def test_session_errors(tmp_path):
+    path = str(tmp_path / f"day{session.extension}")
+    test, trial = _analysed_trials()[0]
+    session.save(path, test, [trial])
+
+    def failing():
+        yield trial
+        raise RuntimeError("export interrupted")
+
+    with pytest.raises(RuntimeError):
+        session.save(path, test, failing())
+    assert not os.path.exists(path + ".partial")
+    with session.Session(path) as stored:  # the previous file is untouched
+        assert stored.names == [trial["name"]]
+
+    other = tmp_path / "trial.csv"
+    other.write_text("not a session")
+    with pytest.raises(ValueError):
+        session.Session(str(other))
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from biomech import normalise, spm, synthetic
+from conftest import FZ_LEFT_COL, FZ_RIGHT_COL
+
+# SPM1D CMJ pipeline (biomech.spm) against synthetic CMJs with known events and takeoff velocity.
+
+
+def _cmj_force(seed, **params):
+    trial = synthetic.make_trial('cmj', seed = seed, **params)
+    return trial, trial["data"].iloc[:, [FZ_LEFT_COL, FZ_RIGHT_COL]].to_numpy().sum(axis = 1)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_spm_cmj_phase(seed):
+    trial, fz = _cmj_force(seed, bodymass = 60 + 10 * seed, jump_height = 0.2 + 0.05 * seed)
+    phase = spm.cmj_phase(fz)
+    # movement is found once force is 5 SD below body weight, takeoff at 30 N during the offload
+    assert 0 <= phase["start_move"] - trial["events"]["start_move"] <= 30
+    assert -10 <= phase["takeoff"] - trial["events"]["takeoff"] <= 0
+    assert phase["bw_mean"] / spm.gravity == pytest.approx(trial["bodymass"], rel = 1e-3)
+    with pytest.raises(ValueError):
+        spm.cmj_phase(fz[:trial["events"]["start_move"]])  # no countermovement
+
+
+def test_spm_load_and_pair(tmp_path):
+    for subject, seed in (("001", 0), ("002", 1)):
+        for condition, height in (("PRE", 0.25), ("POST", 0.3)):
+            _, fz = _cmj_force(seed, jump_height = height)
+            pd.DataFrame({"Fz": fz}).to_csv(tmp_path / f"{subject}-{condition}.csv", index = False)
+    paths = spm.trial_files(str(tmp_path))
+    cache_path = str(tmp_path / spm.CACHE_FILE)
+    cache = spm.CurveCache(cache_path)
+    names, curves, computed = spm.load_curves(paths, cache)
+    cache.save()
+    assert computed == 4 and curves.shape == (4, len(spm.all_variables), normalise.n_points)
+    for name, curve in zip(names, curves):
+        reference = spm.cmj_curves(spm.read_force(str(tmp_path / f"{name}.csv")))
+        np.testing.assert_allclose(curve, normalise.time_normalise(reference), atol = 1e-12)
+
+    # a rerun reuses every cached curve
+    again, cached, computed = spm.load_curves(paths, spm.CurveCache(cache_path))
+    assert computed == 0 and again == names and np.array_equal(cached, curves)
+
+    subjects, pre, post = spm.pair_by_subject(names, curves)
+    assert subjects == ["001", "002"]
+    assert np.array_equal(pre[0], curves[names.index("001-PRE")])
+    assert np.array_equal(post[1], curves[names.index("002-POST")])
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_spm_cmj_curves(seed):
+    trial, fz = _cmj_force(seed, bodymass = 60 + 10 * seed, jump_height = 0.2 + 0.05 * seed)
+    phase = spm.cmj_phase(fz)
+    curves = spm.cmj_curves(fz)
+    assert curves.shape == (len(spm.all_variables), phase["takeoff"] - phase["start_move"])
+    assert curves[0, 0] == pytest.approx(spm.gravity, rel = 0.05)  # body weight in N/kg at the start
+    assert curves[1, -1] == pytest.approx(trial["takeoff_velocity"], rel = 0.03)
+    assert curves[2, -1] > curves[2].min()  # rising from the bottom of the countermovement
+    np.testing.assert_allclose(curves[3], curves[0] * curves[1])
@@ -0,0 +1,71 @@
+import os
+import sqlite3
+import time
+
+from biomech import synthetic, watch
+
+# Watch-folder processing (biomech.watch): routing, settled files and a session through its process pool.
+
+
+def test_watch_route():
+    routes = watch.routes[2]
+    assert watch.route("SMITH01-DJ-03.csv", routes) is routes["DJ"]
+    assert watch.route("smith01_cmj.csv", routes) is routes["CMJ"]
+    assert watch.route("SMITH01-03.csv", routes, default = routes["CMJ"]) is routes["CMJ"]
+    assert watch.route("SMITH01-03.csv", routes) is None
+    assert watch.leg_of("SMITH01-DL-LEFT.csv") == "LEFT" and watch.leg_of("SMITH01-DL.csv") is None
+
+
+def test_folder_watcher(tmp_path):
+    (tmp_path / "old.csv").write_text("1\n")
+    watcher = watch.FolderWatcher(str(tmp_path), settle = 1.0)
+    path = tmp_path / "A-CMJ.csv"
+    path.write_text("1\n")
+    (tmp_path / "notes.txt").write_text("x")
+    assert watcher.ready(now = 0) == []  # first seen
+    assert watcher.ready(now = 0.5) == []  # not settled yet
+    assert watcher.ready(now = 1.0) == [os.path.abspath(path)]
+    assert watcher.ready(now = 5.0) == []  # returned once
+    path.write_text("1\n2\n")  # rewritten
+    assert watcher.ready(now = 6.0) == []
+    assert watcher.ready(now = 7.0) == [os.path.abspath(path)]
+    assert watch.FolderWatcher(str(tmp_path), settle = 0, existing = True).ready(now = 0) == []
+
+
+def test_watch_session(tmp_path):
+    folder = tmp_path / "exports"
+    folder.mkdir()
+    store = str(tmp_path / "watched.db")
+    trials = {"ATH01-CMJ-01.csv": synthetic.make_trial('cmj', seed = 0),
+              "ATH02-DJ-01.csv": synthetic.make_trial('drop_jump', seed = 1, bodymass = 70.0, drop_height = 0.4)}
+    watched = watch.WatchSession(str(folder), watch.routes[2], watch.fz_columns[2], store = store, workers = 1,
+                                 settle = 0, inputs = lambda name, test: (70.0, 0.4))
+    try:
+        for name, trial in trials.items():
+            synthetic.write_trial(trial, folder / name)
+        (folder / "ATH03-CMJ-01.csv").write_text("not a trial\n")
+        done = []
+        deadline = time.monotonic() + 60
+        while len(done) < 3 and time.monotonic() < deadline:
+            done += watched.poll()
+            time.sleep(0.05)
+    finally:
+        watched.shutdown(wait = True)
+
+    entries = {os.path.basename(entry["file"]): entry for entry in done}
+    assert sorted(entries) == ["ATH01-CMJ-01.csv", "ATH02-DJ-01.csv", "ATH03-CMJ-01.csv"]
+    assert entries["ATH03-CMJ-01.csv"]["error"] and entries["ATH03-CMJ-01.csv"]["row"] is None
+    for name in trials:
+        entry = entries[name]
+        assert entry["error"] is None
+        expected = watch.process_trial(str(folder / name), entry["test"], watch.fz_columns[2], *entry["inputs"])
+        assert dict(entry["result"]["events"]) == dict(expected["events"])
+        assert entry["result"]["values"] == expected["values"]
+    assert entries["ATH01-CMJ-01.csv"]["inputs"] == (None, None)
+    assert entries["ATH02-DJ-01.csv"]["inputs"] == (70.0, 0.4)
+    takeoff = entries["ATH01-CMJ-01.csv"]["result"]["events"]["takeoff"]
+    assert abs(takeoff - trials["ATH01-CMJ-01.csv"]["events"]["takeoff"]) <= 10
+
+    with sqlite3.connect(store) as con:
+        stored = dict(con.execute("SELECT trial, athlete FROM trials").fetchall())
+    assert stored == {"ATH01-CMJ-01": "ATH01", "ATH02-DJ-01": "ATH02"}
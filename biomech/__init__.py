@@ -0,0 +1,2 @@
+# Shared analysis code for the force plate, LLR and SPM programs in this repo.
+# The GUI scripts and notebooks add the repo root to sys.path and import from here.
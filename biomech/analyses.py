@@ -0,0 +1,620 @@
+import numpy as np
+
+from biomech import forceplate, profiling
+from biomech.forceplate import first_above, first_below, gravity, last_above, sf
+from biomech.timeline import EventTimeline
+
+# The tests run by ForcePlatePrograms/Bertec_Full_Programs. Each TestType turns the Fz
+# trace(s) of one trial into its outcome values (keyed like its vars dict, the table
+# rows) and a plot spec; the program's AnalysisWindow only reads files, fills tables
+# and draws, so a change to an analysis is made once for every window that runs it.
+
+contact_threshold = 30  # N, below this nobody is on the plate
+first_contact_search = 500  # samples, drop landings/jumps look for contact from here
+dj_land_delay = 250  # samples after a drop jump takeoff before landing is searched
+dj_end_land_delay = 200
+dual_end_land_delay = 500  # dual plate CMJ searches the end of landing later than single
+
+# plot colours: one trace per window (by leg for single leg tests), or total/left/right
+leg_colors = {"LEFT": 'blue', "RIGHT": 'red'}
+trace_styles = {"Total": ("#0072B2", 2), "Left": ("#D55E00", 1), "Right": ("#56B4E9", 1)}
+
+# dictionary for single leg jump variables
+singleplate_slj_vars_dict = { 
+    "bodymass": "Body Mass (kg)", 
+    "jh_cm": "Jump Height (cm)", 
+    "mrsi": "Modified Reactive Strength Index (AU)",
+    "con_peak_power": "Concentric Peak Power (W)", 
+    "ecc_peak_power": "Eccentric Peak Power (W)",
+    "land_peak_power": "Landing Peak Power (W)",
+    "con_mean_power":"Concentric Mean Power (W)",
+    "ecc_mean_power": "Eccentric Mean Power (W)",
+    "land_mean_power": "Landing Mean Power (W)", 
+    "con_peak_force_n": "Concentric Peak Force (N)", 
+    "con_peak_force_nkg": 'Concentric Peak Force (N\u2022kg\u207B\u00B9)',
+    "ecc_peak_force_n": "Eccentric Peak Force (N)",
+    "ecc_peak_force_nkg": "Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "con_mean_force_n": "Concentric Mean Force (N)",
+    "con_mean_force_nkg": "Concentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "ecc_mean_force_n": "Eccentric Mean Force (N)",
+    "ecc_mean_force_nkg": "Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "land_peak_force_n": "Landing Peak Force (N)",
+    "land_peak_force_nkg": "Landing Peak Force (N\u2022kg\u207B\u00B9)",
+    "land_mean_force_n": "Landing Mean Force (N)",
+    "land_mean_force_nkg": "Landing Mean Force (N\u2022kg\u207B\u00B9)",
+    "con_impulse": "Concentric Impulse (Ns)",
+    "ecc_impulse": "Eccentric Impulse (Ns)",
+    "positive_impulse": "Positive Impulse (Ns)",
+    "land_impulse": "Landing Impulse (Ns)",
+    "con_rfd": "Concentric Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "ecc_rfd": "Eccentric Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "land_rfd": "Landing Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "unweigh_dur": "Unweighing Phase Duration (s)",
+    "ecc_time_s": "Eccentric Phase Duration (s)",
+    "con_time_s": "Concentric Phase Duration (s)",
+    "contraction_time_s": "Contraction Duration (s)",
+    "flight_time_s": "Flight Time (s)",
+    "land_time_s": "Landing Phase Duration (s)",
+    "con_peak_velocity": "Concentric Peak Velocity (m\u2022s\u207B\u00B9)",
+    "ecc_peak_velocity": "Eccentric Peak Velocity (m\u2022s\u207B\u00B9)",
+    "land_peak_velocity": "Landing Peak Velocity (m\u2022s\u207B\u00B9)",
+    "con_mean_velocity": "Concentric Mean Velocity (m\u2022s\u207B\u00B9)",
+    "ecc_mean_velocity": "Eccentric Mean Velocity (m\u2022s\u207B\u00B9)",
+    "vto": "Takeoff Velocity (m\u2022s\u207B\u00B9)",  
+    "cm_depth": "Countermovement depth (cm)"      
+}
+
+# single plate drop landing vars dictionary
+singleplate_droplanding_vars_dict = {
+    "bodymass": "Body Mass (kg)",
+    "peak_force_n": "Peak Landing Force (N)",
+    "peak_force_nkg": "Peak Landing Force (N\u2022kg\u207B\u00B9)",
+    "loading_rate_bw_s": "Loading Rate (BW/s)"
+}
+
+# single plate drop jump vars dictionary
+singleplate_dropjump_vars_dict = {
+    "bodymass": "Body Mass (kg)",
+    "box_height": "Box Height (cm)",
+    "jh_cm": "Jump Height (cm)",
+    "rsi": "Reactive Strength Index (AU)",
+    "con_peak_power": "Concentric Peak Power (W)",
+    "ecc_peak_power": "Eccentric Peak Power (W)",
+    "land_peak_power": "Landing Peak Power (W)",
+    "con_mean_power": "Concentric Mean Power (W)",
+    "ecc_mean_power": "Eccentric Mean Power (W)",
+    "land_mean_power": "Landing Mean Power (W)",
+    "con_peak_force_n": "Total Concentric Peak Force (N)",
+    "con_peak_force_nkg": "Total Concentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "ecc_peak_force_n": "Total Eccentric Peak Force (N)",
+    "ecc_peak_force_nkg": "Total Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "con_mean_force_n": "Total Concentric Mean Force (N)",
+    "con_mean_force_nkg": "Total Concentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "ecc_mean_force_n": "Total Eccentric Mean Force (N)",
+    "ecc_mean_force_nkg": "Total Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "land_peak_force_n": "Total Landing Peak Force (N)",
+    "land_peak_force_nkg": "Total Landing Peak Force (N\u2022kg\u207B\u00B9)",
+    "land_mean_force_n": "Total Landing Mean Force (N)",
+    "land_mean_force_nkg": "Total Landing Mean Force (N\u2022kg\u207B\u00B9)",
+    "con_impulse": "Total Concentric Impulse (Ns)",
+    "ecc_impulse": "Total Eccentric Impulse (Ns)",
+    "positive_impulse": "Total Positive Impulse (Ns)",
+    "land_impulse": "Total Landing Impulse (Ns)",
+    "groundcontact_time_s": "Ground Contact Phase Duration (s)",
+    "ecc_time_s": "Eccentric Phase Duration (s)",
+    "con_time_s": "Concentric Phase Duration (s)",
+    "flight_time_s": "Flight Time (s)",
+    "land_time_s": "Landing Phase Duration (s)",
+    "con_peak_velocity": "Concentric Peak Velocity (m\u2022s\u207B\u00B9)",
+    "land_peak_velocity": "Landing Peak Velocity (m\u2022s\u207B\u00B9)",
+    "land_mean_velocity": "Landing Mean Velocity (m\u2022s\u207B\u00B9)",
+    "con_mean_velocity": "Concentric Mean Velocity (m\u2022s\u207B\u00B9)",
+    "ecc_mean_velocity": "Eccentric Mean Velocity (m\u2022s\u207B\u00B9)",
+    "vto": "Takeoff Velocity (m\u2022s\u207B\u00B9)",   
+}
+
+
+# single plate CMJ vars dictionary
+singleplate_cmj_vars_dict = {
+    "bodymass": "Body Mass (kg)", 
+    "jh_cm": "Jump Height (cm)", 
+    "mrsi": "Modified Reactive Strength Index (AU)",
+    "con_peak_power": "Concentric Peak Power (W)", # start of total variables
+    "ecc_peak_power": "Eccentric Peak Power (W)",
+    "land_peak_power": "Landing Peak Power (W)",
+    "con_mean_power":"Concentric Mean Power (W)",
+    "ecc_mean_power": "Eccentric Mean Power (W)",
+    "land_mean_power": "Landing Mean Power (W)", 
+    "con_peak_force_n": "Concentric Peak Force (N)", 
+    "con_peak_force_nkg": "Concentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "ecc_peak_force_n": "Eccentric Peak Force (N)",
+    "ecc_peak_force_nkg": "Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "con_mean_force_n": "Concentric Mean Force (N)",
+    "con_mean_force_nkg": "Concentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "ecc_mean_force_n": "Eccentric Mean Force (N)",
+    "ecc_mean_force_nkg": "Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "land_peak_force_n": "Landing Peak Force (N)",
+    "land_peak_force_nkg": "Landing Peak Force (N\u2022kg\u207B\u00B9)",
+    "land_mean_force_n": "Landing Mean Force (N)",
+    "land_mean_force_nkg": "Landing Mean Force (N\u2022kg\u207B\u00B9)",
+    "con_impulse": "Concentric Impulse (Ns)",
+    "ecc_impulse": "Eccentric Impulse (Ns)",
+    "positive_impulse": "Positive Impulse (Ns)",
+    "land_impulse": "Landing Impulse (Ns)",
+    "con_rfd": "Concentric Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "ecc_rfd": "Eccentric Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "land_rfd": "Landing Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "unweigh_dur": "Unweighing Phase Duration (s)",
+    "ecc_time_s": "Eccentric Phase Duration (s)",
+    "con_time_s": "Concentric Phase Duration (s)",
+    "contraction_time_s": "Contraction Duration (s)",
+    "flight_time_s": "Flight Time (s)",
+    "land_time_s": "Landing Phase Duration (s)",
+    "con_peak_velocity": "Concentric Peak Velocity (m\u2022s\u207B\u00B9)",
+    "ecc_peak_velocity": "Eccentric Peak Velocity (m\u2022s\u207B\u00B9)",
+    "land_peak_velocity": "Landing Peak Velocity (m\u2022s\u207B\u00B9)",
+    "con_mean_velocity": "Concentric Mean Velocity (m\u2022s\u207B\u00B9)",
+    "ecc_mean_velocity": "Eccentric Mean Velocity (m\u2022s\u207B\u00B9)",
+    "vto": "Takeoff Velocity (m\u2022s\u207B\u00B9)",  
+    "cm_depth": "Countermovement depth (cm)"      
+}
+
+# Double Plate Vars
+dualplate_cmj_vars_dict = {
+    "bodymass": "Body Mass (kg)", 
+    "jh_cm": "Jump Height (cm)", 
+    "mrsi": "Modified Reactive Strength Index (AU)",
+    "con_peak_power": "Concentric Peak Power (W)", # start of total variables
+    "ecc_peak_power": "Eccentric Peak Power (W)",
+    "land_peak_power": "Landing Peak Power (W)",
+    "con_mean_power":"Concentric Mean Power (W)",
+    "ecc_mean_power": "Eccentric Mean Power (W)",
+    "land_mean_power": "Landing Mean Power (W)", 
+    "total_con_peak_force_n": "Total Concentric Peak Force (N)", 
+    "total_con_peak_force_nkg": "Total Concentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "total_ecc_peak_force_n": "Total Eccentric Peak Force (N)",
+    "total_ecc_peak_force_nkg": "Total Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "total_con_mean_force_n": "Total Concentric Mean Force (N)",
+    "total_con_mean_force_nkg": "Total Concentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "total_ecc_mean_force_n": "Total Eccentric Mean Force (N)",
+    "total_ecc_mean_force_nkg": "Total Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "total_land_peak_force_n": "Total Landing Peak Force (N)",
+    "total_land_peak_force_nkg": "Total Landing Peak Force (N\u2022kg\u207B\u00B9)",
+    "total_land_mean_force_n": "Total Landing Mean Force (N)",
+    "total_land_mean_force_nkg": "Total Landing Mean Force (N\u2022kg\u207B\u00B9)",
+    "total_con_impulse": "Total Concentric Impulse (Ns)",
+    "total_ecc_impulse": "Total Eccentric Impulse (Ns)",
+    "total_positive_impulse": "Total Positive Impulse (Ns)",
+    "total_land_impulse": "Total Landing Impulse (Ns)",
+    "total_con_rfd": "Total Concentric Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "total_ecc_rfd": "Total Eccentric Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "total_land_rfd": "Total Landing Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "left_con_peak_force_n": "Left Concentric Peak Force (N)", # start of left leg variables 
+    "left_con_peak_force_nkg": "Left Concentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "left_ecc_peak_force_n": "Left Eccentric Peak Force (N)",
+    "left_ecc_peak_force_nkg": "Left Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "left_con_mean_force_n": "Left Concentric Mean Force (N)",
+    "left_con_mean_force_nkg": "Left Concentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "left_ecc_mean_force_n": "Left Eccentric Mean Force (N)",
+    "left_ecc_mean_force_nkg": "Left Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "left_land_peak_force_n": "Left Landing Peak Force (N)",
+    "left_land_peak_force_nkg": "Left Landing Peak Force (N\u2022kg\u207B\u00B9)",
+    "left_land_mean_force_n": "Left Landing Mean Force (N)",
+    "left_land_mean_force_nkg": "Left Landing Mean Force (N\u2022kg\u207B\u00B9)",
+    "left_con_impulse": "Left Concentric Impulse (Ns)",
+    "left_ecc_impulse":"Left Eccentric Impulse (Ns)",
+    "left_positive_impulse": "Left Positive Impulse (Ns)",
+    "left_land_impulse": "Left Landing Impulse (Ns)",
+    "left_con_rfd": "Left Concentric Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "left_ecc_rfd": "Left Eccentric Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "left_land_rfd": "Left Landing Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "right_con_peak_force_n": "Right Concentric Peak Force (N)", # start of right leg variables 
+    "right_con_peak_force_nkg": "Right Concentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "right_ecc_peak_force_n": "Right Eccentric Peak Force (N)",
+    "right_ecc_peak_force_nkg": "Right Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "right_con_mean_force_n": "Right Concentric Mean Force (N)",
+    "right_con_mean_force_nkg": "Right Concentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "right_ecc_mean_force_n": "Right Eccentric Mean Force (N)",
+    "right_ecc_mean_force_nkg": "Right Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "right_land_peak_force_n": "Right Landing Peak Force (N)",
+    "right_land_peak_force_nkg": "Right Landing Peak Force (N\u2022kg\u207B\u00B9)",
+    "right_land_mean_force_n": "Right Landing Mean Force (N)",
+    "right_land_mean_force_nkg": "Right Landing Mean Force (N\u2022kg\u207B\u00B9)",
+    "right_con_impulse": "Right Concentric Impulse (Ns)",
+    "right_ecc_impulse": "Right Eccentric Impulse (Ns)",
+    "right_positive_impulse": "Right Positive Impulse (Ns)",
+    "right_land_impulse": "Right Landing Impulse (Ns)",
+    "right_con_rfd": "Right Concentric Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "right_ecc_rfd": "Right Eccentric Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "right_land_rfd": "Right Landing Rate of Force Development (N\u2022s\u207B\u00B9)",
+    "unweigh_dur": "Unweighing Phase Duration (s)",
+    "ecc_time_s": "Eccentric Phase Duration (s)",
+    "con_time_s": "Concentric Phase Duration (s)",
+    "contraction_time_s": "Contraction Duration (s)",
+    "flight_time_s": "Flight Time (s)",
+    "land_time_s": "Landing Phase Duration (s)",
+    "con_peak_velocity": "Concentric Peak Velocity (m\u2022s\u207B\u00B9)",
+    "ecc_peak_velocity": "Eccentric Peak Velocity (m\u2022s\u207B\u00B9)",
+    "land_peak_velocity": "Landing Peak Velocity (m\u2022s\u207B\u00B9)",
+    "con_mean_velocity": "Concentric Mean Velocity (m\u2022s\u207B\u00B9)",
+    "ecc_mean_velocity": "Eccentric Mean Velocity (m\u2022s\u207B\u00B9)",
+    "vto": "Takeoff Velocity (m\u2022s\u207B\u00B9)",  
+    "cm_depth": "Countermovement depth (cm)"      
+}
+
+# dual plate drop landing vars dictionary
+dualplate_droplanding_vars_dict = {
+    "bodymass": "Body Mass (kg)",
+    "total_peak_force_n": "Total Peak Landing Force (N)",
+    "total_peak_force_nkg": "Total Peak Landing Force (N\u2022kg\u207B\u00B9)",
+    "left_peak_force_n": "Left Peak Landing Force (N)",
+    "left_peak_force_nkg": "Left Peak Landing Force (N\u2022kg\u207B\u00B9)",
+    "right_peak_force_n": "Right Peak Landing Force (N)",
+    "right_peak_force_nkg": "Right Peak Landing Force (N\u2022kg\u207B\u00B9)",
+    "total_loading_rate_bw_s": "Total Loading Rate (BW/s)",
+    "left_loading_rate_bw_s": "Left Loading Rate (BW/s)",
+    "right_loading_rate_bw_s": "Right Loading Rate (BW/s)",
+}
+
+# dual plate drop jump vars
+dualplate_dropjump_vars_dict = {
+    "bodymass": "Body Mass (kg)",
+    "box_height": "Box Height (cm)",
+    "jh_cm": "Jump Height (cm)",
+    "rsi": "Reactive Strength Index (AU)",
+    "con_peak_power": "Concentric Peak Power (W)",
+    "ecc_peak_power": "Eccentric Peak Power (W)",
+    "land_peak_power": "Landing Peak Power (W)",
+    "con_mean_power": "Concentric Mean Power (W)",
+    "ecc_mean_power": "Eccentric Mean Power (W)",
+    "land_mean_power": "Landing Mean Power (W)",
+    "total_con_peak_force_n": "Total Concentric Peak Force (N)",
+    "total_con_peak_force_nkg": "Total Concentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "total_ecc_peak_force_n": "Total Eccentric Peak Force (N)",
+    "total_ecc_peak_force_nkg": "Total Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "total_con_mean_force_n": "Total Concentric Mean Force (N)",
+    "total_con_mean_force_nkg": "Total Concentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "total_ecc_mean_force_n": "Total Eccentric Mean Force (N)",
+    "total_ecc_mean_force_nkg": "Total Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "total_land_peak_force_n": "Total Landing Peak Force (N)",
+    "total_land_peak_force_nkg": "Total Landing Peak Force (N\u2022kg\u207B\u00B9)",
+    "total_land_mean_force_n": "Total Landing Mean Force (N)",
+    "total_land_mean_force_nkg": "Total Landing Mean Force (N\u2022kg\u207B\u00B9)",
+    "total_con_impulse": "Total Concentric Impulse (Ns)",
+    "total_ecc_impulse": "Total Eccentric Impulse (Ns)",
+    "total_positive_impulse": "Total Positive Impulse (Ns)",
+    "total_land_impulse": "Total Landing Impulse (Ns)",
+    "left_con_peak_force_n": "Left Concentric Peak Force (N)", # start of left leg variables 
+    "left_con_peak_force_nkg": "Left Concentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "left_ecc_peak_force_n": "Left Eccentric Peak Force (N)",
+    "left_ecc_peak_force_nkg": "Left Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "left_con_mean_force_n": "Left Concentric Mean Force (N)",
+    "left_con_mean_force_nkg": "Left Concentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "left_ecc_mean_force_n": "Left Eccentric Mean Force (N)",
+    "left_ecc_mean_force_nkg": "Left Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "left_land_peak_force_n": "Left Landing Peak Force (N)",
+    "left_land_peak_force_nkg": "Left Landing Peak Force (N\u2022kg\u207B\u00B9)",
+    "left_land_mean_force_n": "Left Landing Mean Force (N)",
+    "left_land_mean_force_nkg": "Left Landing Mean Force (N\u2022kg\u207B\u00B9)",
+    "left_con_impulse": "Left Concentric Impulse (Ns)",
+    "left_ecc_impulse":"Left Eccentric Impulse (Ns)",
+    "left_positive_impulse": "Left Positive Impulse (Ns)",
+    "left_land_impulse": "Left Landing Impulse (Ns)",
+    "right_con_peak_force_n": "Right Concentric Peak Force (N)", # start of right leg variables 
+    "right_con_peak_force_nkg": "Right Concentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "right_ecc_peak_force_n": "Right Eccentric Peak Force (N)",
+    "right_ecc_peak_force_nkg": "Right Eccentric Peak Force (N\u2022kg\u207B\u00B9)",
+    "right_con_mean_force_n": "Right Concentric Mean Force (N)",
+    "right_con_mean_force_nkg": "Right Concentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "right_ecc_mean_force_n": "Right Eccentric Mean Force (N)",
+    "right_ecc_mean_force_nkg": "Right Eccentric Mean Force (N\u2022kg\u207B\u00B9)",
+    "right_land_peak_force_n": "Right Landing Peak Force (N)",
+    "right_land_peak_force_nkg": "Right Landing Peak Force (N\u2022kg\u207B\u00B9)",
+    "right_land_mean_force_n": "Right Landing Mean Force (N)",
+    "right_land_mean_force_nkg": "Right Landing Mean Force (N\u2022kg\u207B\u00B9)",
+    "right_con_impulse": "Right Concentric Impulse (Ns)",
+    "right_ecc_impulse": "Right Eccentric Impulse (Ns)",
+    "right_positive_impulse": "Right Positive Impulse (Ns)",
+    "right_land_impulse": "Right Landing Impulse (Ns)",
+    "groundcontact_time_s": "Ground Contact Phase Duration (s)",
+    "ecc_time_s": "Eccentric Phase Duration (s)",
+    "con_time_s": "Concentric Phase Duration (s)",
+    "flight_time_s": "Flight Time (s)",
+    "land_time_s": "Landing Phase Duration (s)",
+    "con_peak_velocity": "Concentric Peak Velocity (m\u2022s\u207B\u00B9)",
+    "land_peak_velocity": "Landing Peak Velocity (m\u2022s\u207B\u00B9)",
+    "land_mean_velocity": "Landing Mean Velocity (m\u2022s\u207B\u00B9)",
+    "con_mean_velocity": "Concentric Mean Velocity (m\u2022s\u207B\u00B9)",
+    "ecc_mean_velocity": "Eccentric Mean Velocity (m\u2022s\u207B\u00B9)",
+    "vto": "Takeoff Velocity (m\u2022s\u207B\u00B9)",
+}
+
+
+def _prefixed(values, label):
+    # per-plate outcomes are named total_..., left_..., right_...; a single trace keeps the plain names
+    if label is None:
+        return dict(values)
+    return {f"{label.lower()}_{key}": value for key, value in values.items()}
+
+
+def landing_metrics(fz, impact, bodymass, sf = sf):
+    """Peak force and loading rate (body weights per second from impact to the peak)."""
+    peak = int(np.argmax(fz))
+    return {"peak_force_n": fz[peak],
+            "peak_force_nkg": fz[peak] / bodymass,
+            "loading_rate_bw_s": fz[peak] / (bodymass * gravity) / ((peak - impact) / sf)}
+
+
+def detect_drop_jump_events(fz, weight, sf = sf):
+    """EventTimeline of the ground_contact, takeoff, land and end_land of a drop jump from the total force."""
+    ground_contact = first_above(fz, contact_threshold, first_contact_search, "ground contact")
+    takeoff = first_below(fz, contact_threshold, ground_contact + 1, "takeoff")
+    land = first_above(fz, contact_threshold, takeoff + dj_land_delay, "landing")
+    # first sample back at/below body weight, then the last one at/above it
+    end_land = first_below(fz, weight, land + dj_end_land_delay, "end of landing")
+    end_land = last_above(fz, weight, end_land, "end of landing")
+    if end_land <= land:
+        end_land = land + 500
+    return EventTimeline({"ground_contact": ground_contact, "takeoff": takeoff, "land": land, "end_land": end_land}, sf)
+
+
+def drop_jump_velocity(fz, events, bodymass, drop_height, sf = sf):
+    """COM velocity from ground contact to the end of landing, starting at the impact velocity.
+
+    velo[i] is at sample ground_contact + i. Summed in sample order like the original
+    loop (np.cumsum is sequential), so the values are the same.
+    """
+    ground_contact, end_land = events["ground_contact"], events["end_land"]
+    accel = (fz[ground_contact:end_land] - bodymass * gravity) / bodymass
+    steps = accel[1:] / sf
+    impact_velo = np.sqrt(2 * gravity * drop_height) * -1
+    return np.cumsum(np.concatenate(([impact_velo], steps)))
+
+
+def drop_jump_metrics(traces, velo, events, bodymass, drop_height, sf = sf):
+    """Drop jump outcomes, traces is [(label, fz)] with the total force first."""
+    fz = traces[0][1]
+    events = EventTimeline(events, sf)
+    ground_contact, start_con, takeoff = events["ground_contact"], events["start_con"], events["takeoff"]
+    land, end_land = events["land"], events["end_land"]
+    # velo starts at ground contact
+    in_velo = events.cropped(ground_contact)
+
+    ecc_velo = velo[:in_velo["start_con"]]
+    con_velo = velo[in_velo["start_con"]:in_velo["takeoff"]]
+    land_velo = velo[in_velo["land"]:]
+    ecc_power = ecc_velo * fz[ground_contact:start_con]
+    con_power = con_velo * fz[start_con:takeoff]
+    land_power = land_velo * fz[land:end_land]
+
+    groundcontact_time_s = events.duration("ground_contact", "takeoff")
+    flight_time_s = events.duration("takeoff", "land")
+    vto = velo[in_velo["takeoff"]]
+    values = {"bodymass": bodymass,
+              "box_height": drop_height * 100,
+              "jh_cm": (vto ** 2) / (gravity * 2) * 100,
+              "rsi": flight_time_s / groundcontact_time_s,
+              "con_peak_power": con_power.max(),
+              "ecc_peak_power": ecc_power.min(),
+              "land_peak_power": land_power.min(),
+              "con_mean_power": con_power.mean(),
+              "ecc_mean_power": ecc_power.mean(),
+              "land_mean_power": land_power.mean(),
+              "groundcontact_time_s": groundcontact_time_s,
+              "ecc_time_s": events.duration("ground_contact", "start_con"),
+              "con_time_s": events.duration("start_con", "takeoff"),
+              "flight_time_s": flight_time_s,
+              "land_time_s": events.duration("land", "end_land"),
+              "con_peak_velocity": con_velo.max(),
+              "land_peak_velocity": land_velo.min(),
+              "land_mean_velocity": land_velo.mean(),
+              "con_mean_velocity": con_velo.mean(),
+              "ecc_mean_velocity": ecc_velo.mean(),
+              "vto": vto}
+    # the eccentric phase of a drop jump starts at ground contact
+    phases = {**events, "start_ecc": ground_contact}
+    for label, force in traces:
+        values.update(_prefixed(forceplate.phase_force_metrics(force, phases, bodymass, sf), label))
+    return values
+
+
+class TestType:
+    """One kind of test. Subclasses set the attributes below and implement analyze()."""
+    name = None  # window title
+    trial_label = "Trial(s)"  # "Drag and Drop <trial_label> here:"
+    variables = {}  # outcome key -> table row label, in table order
+    plates = 1  # Fz columns per trial: 1, or 2 for the left and right plates
+    unilateral = False  # single leg trials, LEFT or RIGHT in the file name says which
+    needs_mass = False  # body mass (and drop height) are entered rather than measured
+    needs_drop_height = False
+    overlay_events = {}  # events trials can be overlaid on: event name -> label
+    recording_kind = None  # how biomech.segment splits a continuous recording ('cmj' or 'drop')
+    average_label = "Average"  # value column of the two-legged tests' "Average Results" table
+
+    def traces(self, fz):
+        """[(label, force)] with the total force first: the trace itself for one plate,
+        total/left/right for two (fz is then (left, right))."""
+        if self.plates == 1:
+            return [(None, np.asarray(fz, dtype = np.float64))]
+        left, right = (np.asarray(f, dtype = np.float64) for f in fz)
+        return [("Total", left + right), ("Left", left), ("Right", right)]
+
+    def analyze(self, fz, sf = sf, bodymass = None, drop_height = None):
+        """Outcomes of one trial: {"values": {key: value}, "events": EventTimeline, "plot": spec}.
+
+        bodymass (kg) and drop_height (m) are the entered values for tests that need them.
+        """
+        raise NotImplementedError
+
+    def table_values(self, values):
+        """Values in table order, rounded like the results tables."""
+        return [round(float(values[key]), 3) for key in self.variables]
+
+
+class CMJ(TestType):
+    name = "CMJ Analysis- Single Plate"
+    trial_label = "CMJ Trial(s)"
+    variables = singleplate_cmj_vars_dict
+    overlay_events = {"takeoff": "Takeoff", "start_move": "Start of Movement"}
+    recording_kind = 'cmj'
+    end_land_delay = forceplate.end_land_delay
+    average_label = "Value"
+
+    def analyze(self, fz, sf = sf, bodymass = None, drop_height = None):
+        # body mass comes from the quiet stance, not the entered value
+        traces = self.traces(fz)
+        total = traces[0][1]
+        bw_mean, bw_sd, bodymass = forceplate.body_weight(total)
+        profiling.lap("body weight")
+        kinematics = forceplate.integrate(total, bw_mean, bodymass, sf)
+        profiling.lap("integrate")
+        events = forceplate.detect_cmj_events(total, kinematics["velo"], bw_mean, bw_sd, self.end_land_delay, sf)
+        profiling.lap("events")
+        values = forceplate.cmj_metrics(total, kinematics, events, bodymass, sf)
+        if len(traces) > 1:
+            for label, force in traces:
+                values.update(_prefixed(forceplate.phase_force_metrics(force, events, bodymass, sf), label))
+
+        event_s = events.times()
+        plot = {"sf": sf, "traces": traces, "start": 0, "stop": events["end_land"] + 500,
+                "bw": bw_mean, "events": list(event_s.values()), "integer_ticks": True,
+                "annotations": {"Unweigh": event_s["start_move"],
+                                "Eccentric": event_s["start_ecc"],
+                                "Concentric": event_s["start_con"],
+                                "Flight": event_s["takeoff"],
+                                "Landing": event_s["land"] + 0.1}}
+        return {"values": values, "events": events, "plot": plot}
+
+
+class SingleLegJump(CMJ):
+    name = "SLJ Analysis"
+    trial_label = "Leg Trial(s)"
+    variables = singleplate_slj_vars_dict
+    unilateral = True
+
+
+class DualCMJ(CMJ):
+    name = "Dual Plate CMJ Analysis"
+    variables = dualplate_cmj_vars_dict
+    plates = 2
+    end_land_delay = dual_end_land_delay
+    average_label = "Average"
+
+
+class DropLanding(TestType):
+    name = "Single Plate Drop Landing Analysis"
+    trial_label = "Leg Trial(s)"
+    variables = singleplate_droplanding_vars_dict
+    unilateral = True
+    needs_mass = True
+    overlay_events = {"impact": "Impact"}
+    recording_kind = 'drop'
+    plot_lead = 250  # samples shown before impact
+    integer_ticks = True
+
+    def analyze(self, fz, sf = sf, bodymass = None, drop_height = None):
+        traces = self.traces(fz)
+        total = traces[0][1]
+        events = EventTimeline({"impact": first_above(total, contact_threshold, first_contact_search, "impact"),
+                                "peak_force": int(np.argmax(total))}, sf)
+        profiling.lap("events")
+        values = {"bodymass": bodymass}
+        for label, force in traces:
+            values.update(_prefixed(landing_metrics(force, events["impact"], bodymass, sf), label))
+
+        event_s = events.times()
+        plot = {"sf": sf, "traces": traces, "start": events["impact"] - self.plot_lead, "stop": None,
+                "bw": None, "events": list(event_s.values()), "integer_ticks": self.integer_ticks,
+                "annotations": {"Impact": event_s["impact"], "Peak Force": event_s["peak_force"]}}
+        return {"values": values, "events": events, "plot": plot}
+
+
+class DualDropLanding(DropLanding):
+    name = "Dual Plate Drop Landing Analysis"
+    trial_label = "Drop Landing Trial(s)"
+    variables = dualplate_droplanding_vars_dict
+    plates = 2
+    unilateral = False
+    plot_lead = 500
+    integer_ticks = False
+
+
+class DropJump(TestType):
+    name = "Single Plate Drop Jump Analysis"
+    trial_label = "Leg Trial(s)"
+    variables = singleplate_dropjump_vars_dict
+    unilateral = True
+    needs_mass = True
+    needs_drop_height = True
+    overlay_events = {"takeoff": "Takeoff", "ground_contact": "Ground Contact"}
+    recording_kind = 'drop'
+
+    def analyze(self, fz, sf = sf, bodymass = None, drop_height = None):
+        traces = self.traces(fz)
+        total = traces[0][1]
+        events = detect_drop_jump_events(total, bodymass * gravity, sf)
+        profiling.lap("events")
+        velo = drop_jump_velocity(total, events, bodymass, drop_height, sf)
+        profiling.lap("integrate")
+        # concentric phase from the first sample moving upwards
+        events["start_con"] = events["ground_contact"] + first_above(velo, 0, 1, "start of concentric phase")
+        profiling.lap("events")
+        values = drop_jump_metrics(traces, velo, events, bodymass, drop_height, sf)
+
+        event_s = events.times()
+        plot = {"sf": sf, "traces": traces,
+                "start": events["ground_contact"] - 500, "stop": events["land"] + 1000,
+                "bw": None, "integer_ticks": False,
+                "events": [event_s[name] for name in ("ground_contact", "start_con", "takeoff", "land")],
+                "annotations": {"Ground Contact": event_s["ground_contact"],
+                                "Concentric": event_s["start_con"],
+                                "Flight": event_s["takeoff"],
+                                "Landing": event_s["land"] + 0.1}}
+        return {"values": values, "events": events, "plot": plot}
+
+
+class DualDropJump(DropJump):
+    name = "Dual Plate Drop Jump Analysis"
+    trial_label = "Drop Jump Trial(s)"
+    variables = dualplate_dropjump_vars_dict
+    plates = 2
+    unilateral = False
+
+
+def plot_trial(ax, plot, color = 'black'):
+    """Draw the plot spec from TestType.analyze: the force trace(s) with the events marked.
+
+    A single trace is drawn in `color`, total/left/right traces in trace_styles.
+    """
+    import seaborn as sns
+    from matplotlib.ticker import MaxNLocator
+    n = len(plot["traces"][0][1])
+    shown = slice(*slice(max(plot["start"], 0), plot["stop"]).indices(n)[:2])
+    time_s = np.arange(shown.start, shown.stop) / plot["sf"]  # only the plotted samples
+    marker_color = 'black' if len(plot["traces"]) == 1 else 'grey'
+    if plot["bw"] is not None:
+        ax.axhline(y = plot["bw"], color = marker_color, ls = "--", lw = 0.4)
+    for x in plot["events"]:
+        ax.axvline(x = x, ls = ":", color = marker_color, lw = 0.4)
+    for label, fz in plot["traces"]:
+        if label is None:
+            sns.lineplot(x = time_s, y = fz[shown], color = color, ax = ax)
+        else:
+            trace_color, lw = trace_styles[label]
+            sns.lineplot(x = time_s, y = fz[shown], label = label, color = trace_color, lw = lw, ax = ax)
+    if plot["integer_ticks"]:
+        ax.xaxis.set_major_locator(MaxNLocator(integer = True, prune = 'both'))
+        ax.yaxis.set_major_locator(MaxNLocator(nbins = 'auto', prune = 'both'))
+    else:
+        ax.xaxis.set_major_locator(MaxNLocator(nbins = 'auto'))
+        ax.yaxis.set_major_locator(MaxNLocator(nbins = 'auto'))
+    ax.set_ylabel("Force (N)")
+    ax.set_xlabel("Time (seconds)")
+    if len(plot["traces"]) > 1:
+        ax.legend(loc = 'upper right', frameon = False)
+
+    y_pos = ax.get_ylim()[1] * 0.95
+    for label, x_coord in plot["annotations"].items():
+        ax.annotate(label, xy = (x_coord, y_pos), xytext = (5, 5),
+                    textcoords = 'offset points', ha = 'left', va = 'top',
+                    fontsize = 8, fontweight = 'bold', color = 'black', rotation = -90)
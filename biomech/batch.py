@@ -0,0 +1,316 @@
+import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from biomech import forceplate
+from biomech.forceplate import end_land_delay, gravity, land_delay, quiet_samples, sf, takeoff_threshold
+
+# Single plate CMJ processing for many trials at once (archives like Misc/SPM1D CMJ
+# Data). Trials are packed into a NaN-padded (trials x samples) matrix and every stage of
+# forceplate.process_cmj runs on the whole matrix: body weight from the first
+# quiet_samples columns, each event rule as a masked first/last crossing per row, and
+# integration with cumsum along the rows. The force only events are found first, so
+# velocity is integrated up to the last landing of the chunk and position up to the last
+# takeoff. The phase peaks, means and impulses are ufunc.reduceat over each row's phase
+# samples, gathered back to back (_Segments), so nothing outside the phases is reduced.
+# NaN padding never crosses a threshold, so nothing past a trial's end is found.
+#
+# Events, body weight, durations, velocities and peaks are the same as process_cmj's;
+# means and impulses are summed in sample order rather than pairwise, so they (and the
+# jump height) can differ in the last digit. Trials are done in chunks of chunk_trials
+# to keep the temporaries in cache, optionally spread over a process pool.
+#
+# For 4-8 s trials the time goes on the samples rather than on the calls: cumsum alone
+# costs a few ns a sample however the matrix is laid out, so this is about twice as fast
+# as process_cmj trial by trial with the NumPy kernels and on par with the Numba ones.
+
+event_names = ("start_move", "start_ecc", "start_con", "takeoff", "land", "end_land")
+# forceplate.cmj_metrics keys, in its order
+metric_names = ("bodymass", "jh_cm", "mrsi",
+                "con_peak_power", "ecc_peak_power", "land_peak_power",
+                "con_mean_power", "ecc_mean_power", "land_mean_power",
+                "con_peak_force_n", "con_peak_force_nkg", "ecc_peak_force_n", "ecc_peak_force_nkg",
+                "con_mean_force_n", "con_mean_force_nkg", "ecc_mean_force_n", "ecc_mean_force_nkg",
+                "land_peak_force_n", "land_peak_force_nkg", "land_mean_force_n", "land_mean_force_nkg",
+                "con_impulse", "ecc_impulse", "positive_impulse", "land_impulse",
+                "con_rfd", "ecc_rfd", "land_rfd",
+                "unweigh_dur", "ecc_time_s", "con_time_s", "contraction_time_s", "flight_time_s", "land_time_s",
+                "con_peak_velocity", "ecc_peak_velocity", "land_peak_velocity",
+                "con_mean_velocity", "ecc_mean_velocity", "vto", "cm_depth")
+chunk_trials = 64  # trials per matrix, small enough for its temporaries to stay in cache
+
+
+def pad(traces, width = None, fill = np.nan):
+    """(trials x width) float64 matrix of 1-D traces padded with fill, and their lengths."""
+    traces = [np.asarray(trace, dtype = np.float64).ravel() for trace in traces]
+    lengths = np.array([len(trace) for trace in traces], dtype = np.intp)
+    width = lengths.max(initial = 0) if width is None else width
+    stack = np.empty((len(traces), width))
+    for row, trace in zip(stack, traces):
+        row[:len(trace)] = trace
+        row[len(trace):] = fill
+    return stack, lengths
+
+
+def _column(start):
+    return np.reshape(start, (-1, 1))
+
+
+def _first(x, level, start, above = False):
+    """First column >= start where each row of x is <= level (>= if above), -1 where there is none.
+
+    Only the columns from the earliest start on are compared.
+    """
+    first = max(int(start.min(initial = 0)), 0)
+    tail = x[:, first:]
+    mask = (tail >= level) if above else (tail <= level)
+    mask &= np.arange(first, x.shape[1]) >= _column(start)
+    index = mask.argmax(axis = 1)
+    return np.where(mask[np.arange(len(x)), index], index + first, -1)
+
+
+def _last(x, level, stop, above = True):
+    """Last column <= stop where each row of x is >= level (<= if not above), -1 where there is none."""
+    head = x[:, :max(int(stop.max(initial = 0)) + 1, 1)]
+    mask = (head >= level) if above else (head <= level)
+    mask &= np.arange(head.shape[1]) <= _column(stop)
+    index = head.shape[1] - 1 - mask[:, ::-1].argmax(axis = 1)
+    return np.where(mask[np.arange(len(x)), index], index, -1)
+
+
+def _velocity(fz, bw_mean, bodymass, dx):
+    # cumulative_trapezoid((fz - bw_mean) / bodymass) along each row, in place where it can be
+    accel = fz - _column(bw_mean)
+    accel /= _column(bodymass)
+    return _trapezoid(accel, dx)
+
+
+def _trapezoid(y, dx):
+    terms = y[:, 1:] + y[:, :-1]
+    terms *= dx  # dx * (y[1:] + y[:-1]) / 2.0, in the same order
+    terms /= 2.0
+    return np.cumsum(terms, axis = 1, out = terms)
+
+
+class _Segments:
+    """x[i, start[i]:stop[i]] of every row i, gathered back to back into one flat array.
+
+    The phase peaks, means and impulses are then ufunc.reduceat over the segments, which
+    touches only the samples in the phases (stop > start for every row).
+    """
+
+    def __init__(self, start, stop):
+        self.lengths = stop - start
+        self.offsets = np.cumsum(self.lengths) - self.lengths
+        self.rows = np.repeat(np.arange(len(start)), self.lengths)
+        self.columns = np.arange(self.lengths.sum()) + np.repeat(start - self.offsets, self.lengths)
+
+    def take(self, x, shift = 0):
+        return x[self.rows, self.columns + shift]
+
+    def peak(self, values):
+        return np.maximum.reduceat(values, self.offsets)
+
+    def low(self, values):
+        return np.minimum.reduceat(values, self.offsets)
+
+    def mean(self, values):
+        return np.add.reduceat(values, self.offsets) / self.lengths
+
+    def argmin(self, values):
+        """Column of the (first) lowest value of each segment, like np.argmin (the first NaN
+        of a segment with NaNs)."""
+        low = np.repeat(self.low(values), self.lengths)
+        hits = np.flatnonzero((values == low) | np.isnan(low))
+        return self.columns[hits[np.searchsorted(hits, self.offsets)]]
+
+    def trapezoid(self, values):
+        """trapezoid(values) of each segment, 0 for a single sample."""
+        terms = np.empty(len(values))
+        terms[:-1] = (values[1:] + values[:-1]) / 2.0
+        terms[self.offsets + self.lengths - 1] = 0.0  # the pairs across two segments
+        return np.add.reduceat(terms, self.offsets)
+
+
+def _chunk(fz, lengths, sf, end_land_delay):
+    # events (trials x 6, -1 for failed trials), metrics (trials x len(metric_names)) and errors
+    rows = np.arange(len(fz))
+    errors = np.full(len(fz), None, dtype = object)
+    failed = lengths < quiet_samples + 2
+    errors[failed] = "trial shorter than the quiet stance"
+
+    quiet = fz[:, :quiet_samples]
+    bw_mean = quiet.mean(axis = 1)
+    bw_sd = quiet.std(axis = 1, ddof = 1)
+    bodymass = bw_mean / gravity
+    dx = 1 / sf
+    bw = _column(bw_mean)
+
+    # the event rules of forceplate.detect_cmj_events, the force only ones first so the
+    # integration can stop at the last landing (velo[:, i] is at sample i + 1)
+    found = {}
+    start_move = _first(fz, bw - _column(bw_sd) * 5, np.full(len(fz), 20))
+    found["start of movement"] = start_move = _last(fz, bw, start_move)
+    found["takeoff"] = takeoff = _first(fz, takeoff_threshold, start_move)
+    land = _first(fz, takeoff_threshold, takeoff + land_delay, above = True)
+    end_land = _first(fz, bw, land + end_land_delay)
+    end_land = _last(fz, bw, end_land)
+    # short trials have NaN padding in their quiet stance, so their velocity is all NaN
+    moved = ~failed & (start_move >= 0) & (takeoff > start_move)
+    # failed trials get placeholder events 0..5 below, so keep at least those columns
+    velo = _velocity(fz[:, :max(takeoff.max(initial = 0), end_land.max(initial = 0), len(event_names)) + 2],
+                     bw_mean, bodymass, dx)
+    unweighting = _Segments(np.where(moved, start_move, 0), np.where(moved, takeoff, 1))
+    start_ecc = unweighting.argmin(unweighting.take(velo))
+    start_con = _first(velo, 0, start_ecc, above = True)
+    if velo.shape[1] < fz.shape[1] - 1 and (moved & (start_con < 0)).any():
+        # a velocity still below zero at the last landing, look for the crossing in the rest
+        velo = _velocity(fz, bw_mean, bodymass, dx)
+        start_con = _first(velo, 0, start_ecc, above = True)
+    found["start of concentric phase"] = start_con
+    found["landing"] = land
+    found["end of landing"] = end_land
+    phases = {"unweighting": (start_move, takeoff), "eccentric": (start_ecc, start_con),
+              "concentric": (start_con, takeoff), "landing": (land, end_land)}
+    problems = [(f"no {what} found", index < 0) for what, index in found.items()]
+    problems += [(f"empty {phase} phase", stop <= start) for phase, (start, stop) in phases.items()]
+    for error, rows_with in problems:  # the first problem of each trial
+        errors[rows_with & ~failed] = error
+        failed |= rows_with
+
+    events = np.column_stack([start_move, start_ecc, start_con, takeoff, land, end_land])
+    events[failed] = np.arange(len(event_names))  # any valid, non-empty phases; cleared after
+    start_move, start_ecc, start_con, takeoff, land, end_land = events.T
+    position = _trapezoid(velo[:, :takeoff.max() + 1], dx)
+
+    def duration(start, stop):
+        return (stop - start) / sf
+
+    con, ecc, landing = _Segments(start_con, takeoff), _Segments(start_ecc, start_con), _Segments(land, end_land)
+    con_fz, ecc_fz, land_fz = con.take(fz), ecc.take(fz), landing.take(fz)
+    con_velo, ecc_velo, land_velo = con.take(velo), ecc.take(velo), landing.take(velo)
+    # power[i] = fz[i + 1] * velo[i]
+    con_power, ecc_power, land_power = con.take(fz, 1) * con_velo, ecc.take(fz, 1) * ecc_velo, landing.take(fz, 1) * land_velo
+    vto = velo[rows, takeoff]
+    jh = (vto ** 2) / (gravity * 2)
+    contraction_time_s = duration(start_move, takeoff)
+    con_peak_force_n, ecc_peak_force_n, land_peak_force_n = con.peak(con_fz), ecc.peak(ecc_fz), landing.peak(land_fz)
+    con_mean_force_n, ecc_mean_force_n, land_mean_force_n = con.mean(con_fz), ecc.mean(ecc_fz), landing.mean(land_fz)
+    positive = _Segments(start_ecc, takeoff)
+    unweighting = _Segments(start_move, takeoff)
+    metrics = {"bodymass": bodymass,
+               "jh_cm": jh * 100,
+               "mrsi": jh / contraction_time_s,
+               "con_peak_power": con.peak(con_power),
+               "ecc_peak_power": ecc.low(ecc_power),
+               "land_peak_power": landing.peak(land_power),
+               "con_mean_power": con.mean(con_power),
+               "ecc_mean_power": ecc.mean(ecc_power),
+               "land_mean_power": landing.mean(land_power),
+               "con_peak_force_n": con_peak_force_n,
+               "con_peak_force_nkg": con_peak_force_n / bodymass,
+               "ecc_peak_force_n": ecc_peak_force_n,
+               "ecc_peak_force_nkg": ecc_peak_force_n / bodymass,
+               "con_mean_force_n": con_mean_force_n,
+               "con_mean_force_nkg": con_mean_force_n / bodymass,
+               "ecc_mean_force_n": ecc_mean_force_n,
+               "ecc_mean_force_nkg": ecc_mean_force_n / bodymass,
+               "land_peak_force_n": land_peak_force_n,
+               "land_peak_force_nkg": land_peak_force_n / bodymass,
+               "land_mean_force_n": land_mean_force_n,
+               "land_mean_force_nkg": land_mean_force_n / bodymass,
+               "con_impulse": con.trapezoid(con_fz) / sf,
+               "ecc_impulse": ecc.trapezoid(ecc_fz) / sf,
+               "positive_impulse": positive.trapezoid(positive.take(fz)) / sf,
+               "land_impulse": landing.trapezoid(land_fz) / sf,
+               "con_rfd": (fz[rows, start_con] - fz[rows, takeoff]) / duration(start_con, takeoff),
+               "ecc_rfd": (fz[rows, start_con] - fz[rows, start_ecc]) / duration(start_ecc, start_con),
+               "land_rfd": (fz[rows, end_land] - fz[rows, land]) / duration(land, end_land),
+               "unweigh_dur": duration(start_move, start_ecc),
+               "ecc_time_s": duration(start_ecc, start_con),
+               "con_time_s": duration(start_con, takeoff),
+               "contraction_time_s": contraction_time_s,
+               "flight_time_s": duration(takeoff, land),
+               "land_time_s": duration(land, end_land),
+               "con_peak_velocity": con.peak(con_velo),
+               "ecc_peak_velocity": ecc.low(ecc_velo),
+               "land_peak_velocity": landing.low(land_velo),
+               "con_mean_velocity": con.mean(con_velo),
+               "ecc_mean_velocity": ecc.mean(ecc_velo),
+               "vto": vto,
+               "cm_depth": unweighting.low(unweighting.take(position)) * 100}
+    matrix = np.column_stack([metrics[name] for name in metric_names])
+    events[failed] = -1
+    matrix[failed] = np.nan
+    return events, matrix, list(errors)
+
+
+def _process_chunk(traces, sf, end_land_delay):
+    # one padding column, so every phase ends inside its row, and room for the placeholder
+    # events of failed trials when the chunk has only short ones
+    fz, lengths = pad(traces, max([len(trace) for trace in traces] + [len(event_names) + 1]) + 1)
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        return _chunk(fz, lengths, sf, end_land_delay)
+
+
+def process_cmjs(traces, sf = sf, end_land_delay = end_land_delay, chunk = chunk_trials, workers = 1):
+    """Single plate CMJ outcomes of many force traces (1-D arrays of any lengths).
+
+    Returns {"names": metric_names, "metrics": (trials x metrics) array, "events":
+    (trials x event_names) sample indices, "errors": [None or why the trial failed]}.
+    Failed trials have NaN metrics and -1 events. With workers other than 1 the chunks
+    are spread over a process pool (None for one per CPU).
+    """
+    parts = [traces[first:first + chunk] for first in range(0, len(traces), chunk)]
+    options = ([sf] * len(parts), [end_land_delay] * len(parts))
+    if workers == 1:
+        results = list(map(_process_chunk, parts, *options))
+    else:
+        with ProcessPoolExecutor(max_workers = workers) as pool:
+            results = list(pool.map(_process_chunk, parts, *options))
+    events = np.full((len(traces), len(event_names)), -1, dtype = np.intp)
+    metrics = np.full((len(traces), len(metric_names)), np.nan)
+    errors = []
+    for first, (chunk_events, chunk_metrics, chunk_errors) in zip(range(0, len(traces), chunk), results):
+        events[first:first + len(chunk_events)] = chunk_events
+        metrics[first:first + len(chunk_metrics)] = chunk_metrics
+        errors += chunk_errors
+    return {"names": metric_names, "metrics": metrics, "events": events, "errors": errors}
+
+
+def results_frame(result, trial_names):
+    """The metrics as a DataFrame, one row per trial, plus an error column."""
+    frame = pd.DataFrame(result["metrics"], index = pd.Index(trial_names, name = "trial"), columns = result["names"])
+    frame["error"] = result["errors"]
+    return frame
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Process a folder (or list) of single plate CMJ CSVs in one batch.")
+    parser.add_argument("inputs", nargs = '+', help = "CSV files or folders of them")
+    parser.add_argument("--column", default = 'A', help = "Fz column letter (A for single column exports)")
+    parser.add_argument("--sample-rate", type = float, default = sf)
+    parser.add_argument("--workers", type = int, default = 1, help = "processes, 0 for one per CPU")
+    parser.add_argument("--out", default = "cmj_batch_results.csv")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for item in args.inputs:
+        paths += sorted(glob.glob(os.path.join(item, "*.csv"))) if os.path.isdir(item) else [item]
+    column = ord(args.column.upper()) - 65
+    traces = [forceplate.fz_column(forceplate.read_trial(path), column) for path in paths]
+    result = process_cmjs(traces, args.sample_rate, workers = args.workers or None)
+    frame = results_frame(result, [os.path.splitext(os.path.basename(path))[0] for path in paths])
+    frame.to_csv(args.out)
+    failed = frame["error"].notna()
+    print(f"Processed {len(frame)} trials ({failed.sum()} failed), results in {args.out}")
+    for trial, error in frame.loc[failed, "error"].items():
+        print(f"  {trial}: {error}")
+
+
+if __name__ == "__main__":
+    main()
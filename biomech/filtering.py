@@ -0,0 +1,42 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.signal import butter, sosfiltfilt
+
+# Zero-lag Butterworth filtering shared by the LLR and force plate programs.
+# Designs are cached by (cutoff, order, rate, type) and run as second-order
+# sections, which stay numerically stable where the (b, a) form does not
+# (high orders or cutoffs that are tiny compared with the sampling rate).
+
+
+@lru_cache(maxsize = None)
+def butter_sos(cutoff, order, sample_rate, btype = 'low'):
+    """Cached Butterworth design in SOS form. cutoff is in Hz (a (low, high) tuple for band filters)."""
+    nyf = 0.5 * sample_rate
+    wn = np.asarray(cutoff, dtype = np.float64) / nyf
+    # the array is shared by every caller with the same design, don't modify it in place
+    return butter(N = order, Wn = wn, btype = btype, analog = False, output = 'sos')
+
+
+def zero_lag_filter(signals, cutoff, sample_rate, order = 2, btype = 'low', axis = -1):
+    """Forward-backward filter along `axis`.
+
+    Like filtfilt, the effective order is twice `order` (order = 2 gives the usual
+    4th order zero lag filter). `signals` may be a single signal or a 2-D stack with
+    one trial per row, which is filtered in a single call.
+    """
+    if np.ndim(cutoff) > 0:
+        cutoff = tuple(float(c) for c in cutoff)
+    else:
+        cutoff = float(cutoff)
+    sos = butter_sos(cutoff, int(order), float(sample_rate), btype)
+    return sosfiltfilt(sos, np.asarray(signals, dtype = np.float64), axis = axis)
+
+
+def lowpass(signals, cutoff, sample_rate, order = 2, axis = -1):
+    return zero_lag_filter(signals, cutoff, sample_rate, order, 'low', axis)
+
+
+def lowpass_stack(signals, cutoff, sample_rate, order = 2):
+    """Low-pass a list (or 2-D array) of equal-length signals, one per row, in one call."""
+    return lowpass(np.vstack(signals), cutoff, sample_rate, order, axis = 1)
@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+from scipy.integrate import trapezoid
+
+from biomech import kernels
+from biomech.timeline import EventTimeline
+
+# Countermovement jump processing from ForcePlatePrograms/Bertec_Full_Programs (single
+# plate CMJ), split into stages that can be reused and timed on their own:
+# read -> body weight -> integrate -> events -> metrics. Event rules are the GUI's
+# while loops written as vectorised searches, so the indices are the same. Events are
+# kept as sample indices in an EventTimeline and times are index / sf, so no time array
+# is built per trial. The searches and the integration run in biomech.kernels (compiled
+# loops when Numba is installed). The other tests and the plots are in biomech.analyses.
+
+sf = 1000  # Hz
+gravity = 9.81
+quiet_samples = 1500  # quiet stance used for body weight
+takeoff_threshold = 30  # N, below this the athlete is in the air
+land_delay = 150  # samples after takeoff before a landing can be detected
+end_land_delay = 100  # samples after landing before the end of landing is searched
+
+
+def read_trial(file_path):
+    return pd.read_csv(file_path)
+
+
+def fz_column(dat, column):
+    """One force column of a trial as a float64 array."""
+    return dat.iloc[:, column].to_numpy(dtype = np.float64)
+
+
+def body_weight(fz, quiet_samples = quiet_samples):
+    """(mean, sd, body mass in kg) from the quiet stance at the start of the trial."""
+    quiet = np.asarray(fz[:quiet_samples], dtype = np.float64)
+    bw_mean = quiet.mean()
+    return bw_mean, quiet.std(ddof = 1), bw_mean / gravity
+
+
+def integrate(fz, bw_mean, bodymass, sf = sf):
+    """COM velocity, position and power like the GUI (velocity[i] is at sample i + 1)."""
+    fz = np.asarray(fz, dtype = np.float64)
+    velo = kernels.velocity(fz, bw_mean, bodymass, 1 / sf)
+    position = kernels.cumulative_trapezoid(velo, 1 / sf)
+    return {"velo": velo, "position": position, "power": fz[1:] * velo}
+
+
+def first_where(mask, start, what):
+    """First index >= start where mask is True (`what` names the event in the error)."""
+    hits = np.flatnonzero(mask[start:])
+    if hits.size == 0:
+        raise ValueError(f"no {what} found")
+    return start + int(hits[0])
+
+
+def last_where(mask, stop, what):
+    """Last index <= stop where mask is True."""
+    hits = np.flatnonzero(mask[:stop + 1])
+    if hits.size == 0:
+        raise ValueError(f"no {what} found")
+    return int(hits[-1])
+
+
+def _found(index, what):
+    if index < 0:
+        raise ValueError(f"no {what} found")
+    return index
+
+
+def first_below(x, level, start, what):
+    """First index >= start where x <= level, like first_where(x <= level, start, what)."""
+    return _found(kernels.first_crossing(x, level, start), what)
+
+
+def first_above(x, level, start, what):
+    """First index >= start where x >= level."""
+    return _found(kernels.first_crossing(x, level, start, above = True), what)
+
+
+def last_above(x, level, stop, what):
+    """Last index <= stop where x >= level."""
+    return _found(kernels.last_crossing(x, level, stop), what)
+
+
+def detect_cmj_events(fz, velo, bw_mean, bw_sd, end_land_delay = end_land_delay, sf = sf):
+    """EventTimeline of the start_move, start_ecc, start_con, takeoff, land and end_land samples."""
+    fz = np.asarray(fz, dtype = np.float64)
+    velo = np.asarray(velo)
+    # first drop 5 SD below body weight, then back to the last sample at body weight
+    start_move = first_below(fz, bw_mean - bw_sd * 5, 20, "start of movement")
+    start_move = last_above(fz, bw_mean, start_move, "start of movement")
+    takeoff = first_below(fz, takeoff_threshold, start_move, "takeoff")
+    start_ecc = start_move + int(np.argmin(velo[start_move:takeoff]))
+    start_con = first_above(velo, 0, start_ecc, "start of concentric phase")
+    land = first_above(fz, takeoff_threshold, takeoff + land_delay, "landing")
+    # first sample back at/below body weight, then the last one at/above it
+    end_land = first_below(fz, bw_mean, land + end_land_delay, "end of landing")
+    end_land = last_above(fz, bw_mean, end_land, "end of landing")
+    return EventTimeline({"start_move": start_move, "start_ecc": start_ecc, "start_con": start_con,
+                          "takeoff": takeoff, "land": land, "end_land": end_land}, sf)
+
+
+def phase_force_metrics(fz, events, bodymass, sf = sf):
+    """Force, impulse and RFD of the eccentric, concentric and landing phases.
+
+    Used for the total force and for each plate of a dual plate trial; events needs
+    start_ecc, start_con, takeoff, land and end_land (sample indices).
+    """
+    start_ecc, start_con, takeoff = events["start_ecc"], events["start_con"], events["takeoff"]
+    land, end_land = events["land"], events["end_land"]
+    ecc_fz = fz[start_ecc:start_con]
+    con_fz = fz[start_con:takeoff]
+    land_fz = fz[land:end_land]
+    return {"con_peak_force_n": con_fz.max(),
+            "con_peak_force_nkg": con_fz.max() / bodymass,
+            "ecc_peak_force_n": ecc_fz.max(),
+            "ecc_peak_force_nkg": ecc_fz.max() / bodymass,
+            "con_mean_force_n": con_fz.mean(),
+            "con_mean_force_nkg": con_fz.mean() / bodymass,
+            "ecc_mean_force_n": ecc_fz.mean(),
+            "ecc_mean_force_nkg": ecc_fz.mean() / bodymass,
+            "land_peak_force_n": land_fz.max(),
+            "land_peak_force_nkg": land_fz.max() / bodymass,
+            "land_mean_force_n": land_fz.mean(),
+            "land_mean_force_nkg": land_fz.mean() / bodymass,
+            "con_impulse": trapezoid(con_fz) / sf,
+            "ecc_impulse": trapezoid(ecc_fz) / sf,
+            "positive_impulse": trapezoid(fz[start_ecc:takeoff]) / sf,
+            "land_impulse": trapezoid(land_fz) / sf,
+            "con_rfd": (fz[start_con] - fz[takeoff]) / ((takeoff - start_con) / sf),
+            "ecc_rfd": (fz[start_con] - fz[start_ecc]) / ((start_con - start_ecc) / sf),
+            "land_rfd": (fz[end_land] - fz[land]) / ((end_land - land) / sf)}
+
+
+def cmj_metrics(fz, kinematics, events, bodymass, sf = sf):
+    """Single plate CMJ outcomes keyed like singleplate_cmj_vars_dict."""
+    fz = np.asarray(fz, dtype = np.float64)
+    events = EventTimeline(events, sf)
+    velo = kinematics["velo"]
+    position, power = kinematics["position"], kinematics["power"]
+    start_move, start_ecc, start_con = events["start_move"], events["start_ecc"], events["start_con"]
+    takeoff, land, end_land = events["takeoff"], events["land"], events["end_land"]
+
+    ecc_velo = velo[start_ecc:start_con]
+    con_velo = velo[start_con:takeoff]
+    land_velo = velo[land:end_land]
+    ecc_power = power[start_ecc:start_con]
+    con_power = power[start_con:takeoff]
+    land_power = power[land:end_land]
+
+    contraction_time_s = events.duration("start_move", "takeoff")
+    vto = velo[takeoff]
+    jh = (vto ** 2) / (gravity * 2)
+
+    return {"bodymass": bodymass,
+            "jh_cm": jh * 100,
+            "mrsi": jh / contraction_time_s,
+            "con_peak_power": con_power.max(),
+            "ecc_peak_power": ecc_power.min(),
+            "land_peak_power": land_power.max(),
+            "con_mean_power": con_power.mean(),
+            "ecc_mean_power": ecc_power.mean(),
+            "land_mean_power": land_power.mean(),
+            **phase_force_metrics(fz, events, bodymass, sf),
+            "unweigh_dur": events.duration("start_move", "start_ecc"),
+            "ecc_time_s": events.duration("start_ecc", "start_con"),
+            "con_time_s": events.duration("start_con", "takeoff"),
+            "contraction_time_s": contraction_time_s,
+            "flight_time_s": events.duration("takeoff", "land"),
+            "land_time_s": events.duration("land", "end_land"),
+            "con_peak_velocity": con_velo.max(),
+            "ecc_peak_velocity": ecc_velo.min(),
+            "land_peak_velocity": land_velo.min(),
+            "con_mean_velocity": con_velo.mean(),
+            "ecc_mean_velocity": ecc_velo.mean(),
+            "vto": vto,
+            "cm_depth": position[start_move:takeoff].min() * 100}
+
+
+def process_cmj(fz, sf = sf, end_land_delay = end_land_delay):
+    """All stages for one force trace: body weight, kinematics, events and metrics."""
+    fz = np.asarray(fz, dtype = np.float64)
+    bw_mean, bw_sd, bodymass = body_weight(fz)
+    kinematics = integrate(fz, bw_mean, bodymass, sf)
+    events = detect_cmj_events(fz, kinematics["velo"], bw_mean, bw_sd, end_land_delay, sf)
+    return {"bw_mean": bw_mean,
+            "bw_sd": bw_sd,
+            "bodymass": bodymass,
+            "kinematics": kinematics,
+            "events": events,
+            "metrics": cmj_metrics(fz, kinematics, events, bodymass, sf)}
@@ -0,0 +1,132 @@
+import os
+
+import numpy as np
+
+# The sequential inner loops of trial processing: the first/last crossing searches of
+# the event rules (as NumPy masks they compare the whole trial to find one index near
+# its start) and trapezoidal integration with an initial value. With Numba installed
+# they are compiled loops that stop at the crossing and make no temporaries; without it,
+# or with BIOMECH_KERNELS=numpy, the NumPy versions are used. Both backends give the
+# same indices and bit-identical integrals: the loops add the same terms in the same
+# order as np.cumsum (and so scipy's cumulative_trapezoid), without fastmath.
+#
+# Searches return -1 when there is no crossing, forceplate.first_below() and friends
+# turn that into the usual ValueError.
+
+BACKEND_ENV = "BIOMECH_KERNELS"
+
+
+def _first_crossing_numpy(x, level, start, above):
+    tail = x[start:]
+    hits = np.flatnonzero(tail >= level if above else tail <= level)
+    return start + int(hits[0]) if hits.size else -1
+
+
+def _last_crossing_numpy(x, level, stop, above):
+    head = x[:stop + 1]
+    hits = np.flatnonzero(head >= level if above else head <= level)
+    return int(hits[-1]) if hits.size else -1
+
+
+def _trapezoid_numpy(y, dx, initial, has_initial):
+    terms = dx * (y[1:] + y[:-1]) / 2.0
+    if has_initial:
+        # the running total goes in first so the additions happen in the same order
+        return np.cumsum(np.concatenate(([initial], terms)))[1:]
+    return np.cumsum(terms)
+
+
+def _velocity_numpy(fz, bw_mean, bodymass, dx, initial, has_initial):
+    return _trapezoid_numpy((fz - bw_mean) / bodymass, dx, initial, has_initial)
+
+
+def _numba_kernels():
+    try:
+        import numba
+    except ImportError:
+        return None
+    jit = numba.njit(cache = True, nogil = True)
+
+    @jit
+    def first_crossing(x, level, start, above):
+        for i in range(start, len(x)):
+            if (x[i] >= level) if above else (x[i] <= level):
+                return i
+        return -1
+
+    @jit
+    def last_crossing(x, level, stop, above):
+        for i in range(min(stop, len(x) - 1), -1, -1):
+            if (x[i] >= level) if above else (x[i] <= level):
+                return i
+        return -1
+
+    @jit
+    def trapezoid(y, dx, initial, has_initial):
+        out = np.empty(max(len(y) - 1, 0))
+        total = initial
+        for i in range(len(out)):
+            term = dx * (y[i + 1] + y[i]) / 2.0
+            total = total + term if has_initial or i > 0 else term
+            out[i] = total
+        return out
+
+    @jit
+    def velocity(fz, bw_mean, bodymass, dx, initial, has_initial):
+        # trapezoid() of the acceleration, computed as it goes
+        out = np.empty(max(len(fz) - 1, 0))
+        total = initial
+        previous = (fz[0] - bw_mean) / bodymass if len(fz) else 0.0
+        for i in range(len(out)):
+            accel = (fz[i + 1] - bw_mean) / bodymass
+            term = dx * (accel + previous) / 2.0
+            total = total + term if has_initial or i > 0 else term
+            out[i] = total
+            previous = accel
+        return out
+
+    return {"first_crossing": first_crossing, "last_crossing": last_crossing,
+            "trapezoid": trapezoid, "velocity": velocity}
+
+
+backends = {"numpy": {"first_crossing": _first_crossing_numpy, "last_crossing": _last_crossing_numpy,
+                      "trapezoid": _trapezoid_numpy, "velocity": _velocity_numpy}}
+_numba = _numba_kernels()
+if _numba is not None:
+    backends["numba"] = _numba
+backend = None
+_active = None
+
+
+def use(name):
+    """Switch backend ('numba' or 'numpy'); returns the previous one."""
+    global backend, _active
+    if name not in backends:
+        raise ValueError(f"kernel backend '{name}' is not available, choose from {sorted(backends)}")
+    previous = backend
+    backend, _active = name, backends[name]
+    return previous
+
+
+use(os.environ.get(BACKEND_ENV, "numba" if "numba" in backends else "numpy"))
+
+
+def first_crossing(x, level, start = 0, above = False):
+    """First index >= start where x <= level (x >= level if above), -1 if there is none."""
+    return _active["first_crossing"](x, float(level), int(start), bool(above))
+
+
+def last_crossing(x, level, stop, above = True):
+    """Last index <= stop where x >= level (x <= level if not above), -1 if there is none."""
+    return _active["last_crossing"](x, float(level), int(stop), bool(above))
+
+
+def cumulative_trapezoid(y, dx, initial = None):
+    """scipy.integrate.cumulative_trapezoid(y, dx = dx), plus `initial` when given."""
+    return _active["trapezoid"](y, float(dx), 0.0 if initial is None else float(initial), initial is not None)
+
+
+def velocity(fz, bw_mean, bodymass, dx, initial = None):
+    """cumulative_trapezoid((fz - bw_mean) / bodymass, dx, initial) without the temporaries."""
+    return _active["velocity"](fz, float(bw_mean), float(bodymass), float(dx),
+                               0.0 if initial is None else float(initial), initial is not None)
@@ -0,0 +1,236 @@
+import socket
+import struct
+import threading
+
+import numpy as np
+
+from biomech import segment
+from biomech.forceplate import sf
+from biomech.overlay import min_max_decimate
+
+# Live acquisition for the force plate programs: a receiver thread writes Fz samples from
+# a UDP or TCP source into a preallocated ring buffer, a blitted plot scrolls the last
+# few seconds of it, and LiveCapture hands every finished jump to the analyses as soon
+# as the landing has settled, without writing a file.
+#
+# The ring buffer has one writer (the receiver) and any number of readers and needs no
+# lock: the writer fills in a block and only then advances `written`, and readers only
+# look at samples below the `written` they read. Every sample is stored twice, capacity
+# apart, so the last n samples are always one contiguous view however the buffer has
+# wrapped.
+#
+# Packets (both transports) are a little-endian header, packet sequence number (uint32)
+# and number of frames (uint16), then frames x channels float32 values, one frame per
+# sample. Gaps in the sequence numbers are counted as lost packets.
+
+header = struct.Struct("<IH")
+max_frames = 4096  # per packet
+buffer_seconds = 120.0  # ring buffer length
+view_seconds = 10.0  # shown by the scrolling plot
+capture_window = 30.0  # s searched for finished trials
+settle = {'cmj': 1.0, 'drop': 2.5}  # s after the landing (CMJ) or contact (drop) before a trial is captured
+
+
+def pack(sequence, frames):
+    """One packet of frames (samples x channels)."""
+    frames = np.ascontiguousarray(frames, dtype = '<f4')
+    return header.pack(sequence & 0xFFFFFFFF, len(frames)) + frames.tobytes()
+
+
+def unpack(packet, channels):
+    """(sequence number, frames) from a packet."""
+    sequence, n_frames = header.unpack_from(packet)
+    frames = np.frombuffer(packet, dtype = '<f4', count = n_frames * channels, offset = header.size)
+    return sequence, frames.reshape(n_frames, channels)
+
+
+class RingBuffer:
+    def __init__(self, capacity, channels = 2, dtype = np.float32):
+        self.capacity = capacity
+        self.channels = channels
+        self.data = np.zeros((2 * capacity, channels), dtype = dtype)  # mirrored halves
+        self.written = 0  # samples written since the start (not wrapped)
+
+    def write(self, frames):
+        frames = np.asarray(frames, dtype = self.data.dtype).reshape(-1, self.channels)
+        if len(frames) > self.capacity:
+            self.written += len(frames) - self.capacity
+            frames = frames[-self.capacity:]
+        n = len(frames)
+        pos = self.written % self.capacity
+        first = min(n, self.capacity - pos)
+        for offset in (0, self.capacity):
+            self.data[offset + pos:offset + pos + first] = frames[:first]
+            self.data[offset:offset + n - first] = frames[first:]
+        self.written += n  # publish after the data is in place
+
+    def latest(self, n, written = None):
+        """View of the last n samples (up to `written`, default now), oldest first."""
+        written = self.written if written is None else written
+        n = min(n, written, self.capacity)
+        stop = written % self.capacity + self.capacity
+        return self.data[stop - n:stop]
+
+    def since(self, start):
+        """View of the samples from absolute sample `start` (or the oldest still kept) to now."""
+        written = self.written
+        return self.latest(written - start, written)
+
+
+class Receiver(threading.Thread):
+    """Reads packets from a UDP port (bound locally) or a TCP server into a RingBuffer."""
+
+    def __init__(self, ring, port, host = "127.0.0.1", protocol = 'udp', timeout = 0.2):
+        super().__init__(daemon = True)
+        if protocol not in ('udp', 'tcp'):
+            raise ValueError(f"unknown protocol '{protocol}', use 'udp' or 'tcp'")
+        self.ring = ring
+        self.address = (host, port)
+        self.protocol = protocol
+        self.timeout = timeout
+        self.packets = 0
+        self.lost = 0
+        self.error = None
+        self._expected = None
+        self._stop_event = threading.Event()
+
+    def stop(self, wait = True):
+        self._stop_event.set()
+        if wait and self.is_alive():
+            self.join()
+
+    def _received(self, packet):
+        sequence, frames = unpack(packet, self.ring.channels)
+        if self._expected is not None and sequence > self._expected:
+            self.lost += sequence - self._expected
+        self._expected = sequence + 1
+        self.packets += 1
+        self.ring.write(frames)
+
+    def run(self):
+        try:
+            if self.protocol == 'udp':
+                self._run_udp()
+            else:
+                self._run_tcp()
+        except OSError as error:
+            self.error = error
+
+    def _run_udp(self):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+            sock.bind(self.address)
+            sock.settimeout(self.timeout)
+            while not self._stop_event.is_set():
+                try:
+                    packet = sock.recv(header.size + max_frames * self.ring.channels * 4)
+                except socket.timeout:
+                    continue
+                self._received(packet)
+
+    def _run_tcp(self):
+        with socket.create_connection(self.address, timeout = self.timeout) as sock:
+            pending = bytearray()
+            while not self._stop_event.is_set():
+                try:
+                    chunk = sock.recv(1 << 16)
+                except socket.timeout:
+                    continue
+                if not chunk:
+                    return  # server closed the stream
+                pending += chunk
+                # whole packets only, the rest waits for the next chunk
+                while len(pending) >= header.size:
+                    _, n_frames = header.unpack_from(pending)
+                    size = header.size + n_frames * self.ring.channels * 4
+                    if len(pending) < size:
+                        break
+                    self._received(bytes(pending[:size]))
+                    del pending[:size]
+
+
+class LiveView:
+    """Scrolling plot of the last `seconds` of a RingBuffer on a matplotlib Axes.
+
+    The lines are animated and blitted over a cached background at each update(); the
+    Axes is only redrawn when the force goes off the top of the y axis.
+    """
+
+    def __init__(self, ax, ring, seconds = view_seconds, sf = sf, colors = None, labels = None):
+        self.ax = ax
+        self.ring = ring
+        self.n = int(seconds * sf)
+        self.sf = sf
+        self.lines = [ax.plot([], [], animated = True, lw = 1,
+                              color = None if colors is None else colors[i],
+                              label = None if labels is None else labels[i])[0]
+                      for i in range(ring.channels)]
+        ax.set_xlim(-seconds, 0)
+        ax.set_ylim(-50, 1000)
+        ax.set_xlabel("Time (seconds)")
+        ax.set_ylabel("Force (N)")
+        if labels is not None:
+            ax.legend(loc = 'upper left', frameon = False)
+        self._background = None
+        self._draw_cid = ax.figure.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def close(self):
+        self.ax.figure.canvas.mpl_disconnect(self._draw_cid)
+
+    def _on_draw(self, event):
+        self._background = self.ax.figure.canvas.copy_from_bbox(self.ax.bbox)
+        for line in self.lines:
+            self.ax.draw_artist(line)
+
+    def update(self):
+        view = self.ring.latest(self.n)  # no copy, only the decimated points are
+        if not len(view):
+            return
+        max_points = max(int(self.ax.bbox.width * 2), 500)
+        top = 0.0
+        for channel, line in enumerate(self.lines):
+            y = view[:, channel]
+            index = min_max_decimate(y, max_points)
+            line.set_data((index - len(y)) / self.sf, y[index])
+            top = max(top, float(y[index].max()))
+        canvas = self.ax.figure.canvas
+        if self._background is None or top > self.ax.get_ylim()[1]:
+            self.ax.set_ylim(-50, max(top * 1.2, 1000))
+            canvas.draw()  # new background, _on_draw puts the lines back
+            canvas.blit(self.ax.bbox)
+            return
+        canvas.restore_region(self._background)
+        for line in self.lines:
+            self.ax.draw_artist(line)
+        canvas.blit(self.ax.bbox)
+
+
+class LiveCapture:
+    """Finds finished trials in a RingBuffer with biomech.segment.
+
+    poll() returns each new trial once (a copy of its samples for the first `plates`
+    channels), `settle` seconds after its landing or contact.
+    """
+
+    def __init__(self, ring, kind, plates = 2, sf = sf, window = capture_window):
+        self.ring = ring
+        self.kind = kind
+        self.plates = plates
+        self.sf = sf
+        self.window = int(window * sf)
+        self.settle = int(settle[kind] * sf)
+        self.captured_until = 0  # absolute sample, trials starting before it are done
+
+    def poll(self):
+        written = self.ring.written
+        view = self.ring.latest(self.window, written)[:, :self.plates]
+        origin = written - len(view)
+        starts, anchors, stops = segment.trial_bounds(view.sum(axis = 1), self.kind, self.sf)
+        trials = []
+        for start, anchor, stop in zip(starts, anchors, stops):
+            if origin + start < self.captured_until or anchor + self.settle > len(view):
+                continue
+            stop = min(stop, anchor + self.settle)
+            trials.append(np.array(view[start:stop], dtype = np.float64))  # the ring will overwrite it
+            self.captured_until = origin + stop
+        return trials
@@ -0,0 +1,248 @@
+import argparse
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from biomech import filtering
+from biomech.signal_io import read_signal, write_signal
+from biomech.windows import max_mean_window, min_variance_window, moving_average
+
+# Headless version of the LLR MVIC workflow (LLR/LLR Analysis v1.py). The baseline is
+# picked automatically as the quietest 0.5 s before force onset instead of by a click,
+# so a whole folder can be processed at once and only flagged files need the GUI.
+
+sample_rate = 2000  # Hz
+baseline_dur = 0.5  # s, same width as the GUI selection
+epoch_dur = 0.25  # s, MVIC epoch
+filter_cutoff = 10  # Hz
+filter_order = 2  # zero lag filter, applied twice so 2 makes a 4th order filter
+onset_fraction = 0.1  # onset = first rise above 10% of the way from the floor to the peak
+max_baseline_noise = 0.02  # flag baselines whose SD is > 2% of the MVIC
+
+ANALYZED_DIR = "0- Analyzed MVICs"
+RESULTS_FILE = "MVIC Batch Results.csv"
+
+
+def detect_force_onset(signal, sample_rate = sample_rate):
+    """Index where force starts rising towards the peak, from a 50 ms smoothed signal."""
+    smooth_samples = max(int(0.05 * sample_rate), 1)
+    smoothed = moving_average(signal, smooth_samples)
+    peak = int(np.argmax(smoothed))
+    floor = smoothed[:peak + 1].min()
+    threshold = floor + onset_fraction * (smoothed[peak] - floor)
+    below = np.flatnonzero(smoothed[:peak + 1] < threshold)
+    if below.size == 0:
+        return 0
+    # last epoch below threshold before the peak; shift to the end of that epoch
+    return int(below[-1]) + smooth_samples
+
+
+def detect_baseline(signal, sample_rate = sample_rate):
+    """Quietest baseline_dur window before force onset.
+
+    Returns (start_idx, end_idx, flag) where flag is '' when the baseline looks fine.
+    """
+    window = int(baseline_dur * sample_rate)
+    onset = detect_force_onset(signal, sample_rate)
+    if onset < window:
+        return 0, window, "less than 0.5 s of data before force onset"
+    start_idx, _ = min_variance_window(signal[:onset], window)
+    return start_idx, start_idx + window, ""
+
+
+def lowpass(signal, sample_rate = sample_rate):
+    return filtering.lowpass(signal, filter_cutoff, sample_rate, filter_order)
+
+
+def process_signal(signal, sample_rate = sample_rate, baseline_range = None):
+    """Baseline-correct, filter and find the MVIC of one LLR signal.
+
+    baseline_range is an optional (start_idx, end_idx) chosen by hand; otherwise the
+    baseline is detected automatically.
+    """
+    signal = np.asarray(signal, dtype = np.float64)
+    flag = ""
+    if baseline_range is None:
+        start_idx, end_idx, flag = detect_baseline(signal, sample_rate)
+    else:
+        start_idx, end_idx = baseline_range
+    baseline = signal[start_idx:end_idx].mean()
+    corrected = signal - baseline
+    filtered = lowpass(corrected, sample_rate)
+    mvic_idx, mvic = max_mean_window(filtered, int(epoch_dur * sample_rate))
+
+    baseline_sd = corrected[start_idx:end_idx].std()
+    if not flag and mvic <= 0:
+        flag = "no force above baseline"
+    elif not flag and baseline_sd > max_baseline_noise * mvic:
+        flag = "noisy baseline"
+
+    return {"baseline_start": start_idx,
+            "baseline_end": end_idx,
+            "baseline": baseline,
+            "corrected": corrected,
+            "filtered": filtered,
+            "mvic": mvic,
+            "mvic_idx": mvic_idx,
+            "flag": flag}
+
+
+def corrected_path(save_directory, basename):
+    return os.path.join(save_directory, f"{os.path.splitext(basename)[0]}_corrected.csv")
+
+
+def analyze_file(file_path, save_directory, sample_rate = sample_rate):
+    """Process one file and write its corrected signal. Returns a row for the MVIC table."""
+    basename = os.path.basename(file_path)
+    signal = read_signal(file_path, use_sidecar = False)
+    result = process_signal(signal, sample_rate)
+    if not result["flag"]:
+        write_signal(corrected_path(save_directory, basename), result["corrected"], sidecar = True)
+    return {"Filename": basename,
+            "MVIC": result["mvic"],
+            "Baseline": result["baseline"],
+            "Baseline Start (s)": result["baseline_start"] / sample_rate,
+            "Flag": result["flag"]}
+
+
+def llr_files(folder):
+    # .npy files are binary sidecars of corrected signals, not inputs
+    return sorted(f for f in os.listdir(folder)
+                  if 'LLR' in f and not f.endswith('.npy') and os.path.isfile(os.path.join(folder, f)))
+
+
+class Batch:
+    """A folder of *LLR* files analysed in a process pool, collected as they finish.
+
+    poll() gathers the files done so far without blocking, so a GUI can show progress
+    and stay responsive; finish() waits for the rest, moves the files that passed into
+    '0- Analyzed MVICs' (like the GUI does; flagged files are left for manual review)
+    and writes the MVIC table. Corrected signals and the table go to save_directory
+    (defaults to the GUI's 'Baseline Corrected Automatic' folder).
+    """
+
+    def __init__(self, folder, save_directory = None, sample_rate = sample_rate, workers = None):
+        if save_directory is None:
+            save_directory = os.path.join(folder, "Baseline Corrected Automatic")
+        os.makedirs(save_directory, exist_ok = True)
+        self.folder = folder
+        self.save_directory = save_directory
+        self.paths = [os.path.join(folder, f) for f in llr_files(folder)]
+        self.rows = [None] * len(self.paths)
+        self._pool = ProcessPoolExecutor(max_workers = workers)
+        self._running = {self._pool.submit(analyze_file, path, save_directory, sample_rate): i
+                         for i, path in enumerate(self.paths)}
+
+    @property
+    def total(self):
+        return len(self.paths)
+
+    @property
+    def done(self):
+        return self.total - len(self._running)
+
+    def poll(self):
+        """Collect the files finished since the last call; returns how many are done in all."""
+        for future in [future for future in self._running if future.done()]:
+            self.rows[self._running.pop(future)] = future.result()
+        return self.done
+
+    def finish(self, move_analyzed = True):
+        """Wait for the remaining files and return the MVIC table (one row per file, in name order)."""
+        for future, i in list(self._running.items()):
+            self.rows[i] = future.result()
+        self._running.clear()
+        self._pool.shutdown()
+        results = pd.DataFrame(self.rows, columns = ["Filename", "MVIC", "Baseline", "Baseline Start (s)", "Flag"])
+
+        if move_analyzed:
+            analyzed_dir = os.path.join(self.folder, ANALYZED_DIR)
+            os.makedirs(analyzed_dir, exist_ok = True)
+            for path, flag in zip(self.paths, results["Flag"]):
+                if not flag:
+                    shutil.move(path, os.path.join(analyzed_dir, os.path.basename(path)))
+
+        results.to_csv(os.path.join(self.save_directory, RESULTS_FILE), index = False)
+        return results
+
+    def cancel(self):
+        self._running.clear()
+        self._pool.shutdown(wait = False, cancel_futures = True)
+
+
+def run_batch(folder, save_directory = None, sample_rate = sample_rate, workers = None, move_analyzed = True):
+    """Analyse every *LLR* file in folder in parallel (see Batch) and return the MVIC table."""
+    return Batch(folder, save_directory, sample_rate, workers).finish(move_analyzed)
+
+
+def prepare_file(file_path, sample_rate = sample_rate):
+    """Everything the GUI needs before the operator clicks: the raw signal, the filtered
+    raw signal and the suggested baseline range.
+
+    The zero lag filter is linear and has unit gain at DC, so filtering the raw signal once and
+    subtracting the baseline afterwards gives the same result as filtering the
+    corrected signal after every click.
+    """
+    signal = read_signal(file_path, use_sidecar = False)
+    start_idx, end_idx, flag = detect_baseline(signal, sample_rate)
+    return {"signal": signal,
+            "filtered": lowpass(signal, sample_rate),
+            "baseline_range": (start_idx, end_idx),
+            "flag": flag}
+
+
+class Prefetcher:
+    """Loads and pre-filters the next `depth` files on a background thread.
+
+    Call schedule() with the upcoming paths whenever the queue changes and get() when a
+    file is needed; get() blocks only if the file hasn't finished loading yet.
+    """
+
+    def __init__(self, sample_rate = sample_rate, depth = 2):
+        self.sample_rate = sample_rate
+        self.depth = depth
+        self._pool = ThreadPoolExecutor(max_workers = 1)
+        self._futures = {}
+
+    def schedule(self, paths):
+        upcoming = list(paths)[:self.depth]
+        for path in list(self._futures):
+            if path not in upcoming:
+                self._futures.pop(path).cancel()
+        for path in upcoming:
+            if path not in self._futures:
+                self._futures[path] = self._pool.submit(prepare_file, path, self.sample_rate)
+
+    def get(self, path):
+        future = self._futures.pop(path, None)
+        if future is None or future.cancelled():
+            return prepare_file(path, self.sample_rate)
+        return future.result()
+
+    def shutdown(self):
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._pool.shutdown(wait = False)
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Batch LLR MVIC analysis with automatic baseline detection.")
+    parser.add_argument("folder", help = "folder containing the *LLR* files")
+    parser.add_argument("--out", default = None, help = "folder for corrected signals and the MVIC table")
+    parser.add_argument("--sample-rate", type = float, default = sample_rate)
+    parser.add_argument("--workers", type = int, default = None)
+    parser.add_argument("--keep-files", action = "store_true", help = "don't move analyzed files")
+    args = parser.parse_args(argv)
+
+    results = run_batch(args.folder, args.out, args.sample_rate, args.workers, not args.keep_files)
+    flagged = results[results["Flag"] != ""]
+    print(f"Analyzed {len(results)} files, {len(flagged)} flagged for review.")
+    for _, row in flagged.iterrows():
+        print(f"  {row['Filename']}: {row['Flag']}")
+
+
+if __name__ == "__main__":
+    main()
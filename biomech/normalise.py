@@ -0,0 +1,74 @@
+import os
+import re
+
+import numpy as np
+
+# Time normalisation of cropped trials (e.g. start of movement to takeoff) to a fixed
+# number of points (101 = 0-100% of the phase) for SPM, plus helpers for grouping
+# trials by the tokens in their file names ('001-PRE.csv', '001-POST.csv', ...).
+
+n_points = 101
+conditions = ('PRE', 'POST')
+
+
+def time_normalise(segments, n_points = n_points):
+    """Linearly resample variable-length segments to n_points each, in one pass.
+
+    Returns an (n_segments x n_points) array; row i matches
+    np.interp(np.linspace(0, len(s) - 1, n_points), np.arange(len(s)), s) for s = segments[i].
+    """
+    segments = [np.asarray(s, dtype = np.float64).ravel() for s in segments]
+    if not segments:
+        return np.empty((0, n_points))
+    lengths = np.array([len(s) for s in segments])
+    if lengths.min() < 1:
+        raise ValueError("cannot time normalise an empty segment")
+
+    # all segments back to back in one buffer, indexed through each segment's offset
+    flat = np.concatenate(segments)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    # same sample positions as np.linspace(0, len - 1, n_points) for every segment
+    last = (lengths - 1).astype(np.float64)
+    positions = np.arange(n_points) * (last / max(n_points - 1, 1))[:, None]
+    positions[:, -1] = last
+
+    # left neighbour of each position (the last one uses the final interval) and the weight on the right one
+    left = np.minimum(positions.astype(np.intp), np.maximum(lengths - 2, 0)[:, None])
+    frac = positions - left
+    left += offsets[:, None]
+    right = left + (lengths > 1)[:, None]
+    return flat[left] + (flat[right] - flat[left]) * frac
+
+
+def trial_name(file_name):
+    """File name without folder or extension, e.g. 'Data/001-PRE.csv' -> '001-PRE'."""
+    return os.path.splitext(os.path.basename(file_name))[0]
+
+
+def name_tokens(file_name):
+    """Upper-case tokens of a trial name split on '-', '_', spaces and dots."""
+    return [token for token in re.split(r'[-_ .]+', trial_name(file_name).upper()) if token]
+
+
+def parse_trial(file_name, conditions = conditions):
+    """(subject, condition) from a file name such as '001-PRE.csv'.
+
+    The condition is the token that matches one of `conditions` and the subject is
+    whatever is left. condition is None if no token matches.
+    """
+    wanted = [c.upper() for c in conditions]
+    tokens = name_tokens(file_name)
+    condition = next((c for c in tokens if c in wanted), None)
+    subject = "-".join(t for t in tokens if t != condition)
+    return subject, condition
+
+
+def group_by_condition(file_names, conditions = conditions):
+    """Row indices of the trials in each condition, e.g. {'PRE': [1, 3], 'POST': [0, 2]}."""
+    groups = {c.upper(): [] for c in conditions}
+    for i, file_name in enumerate(file_names):
+        _, condition = parse_trial(file_name, conditions)
+        if condition is not None:
+            groups[condition].append(i)
+    return groups
@@ -0,0 +1,158 @@
+import numpy as np
+
+from biomech.forceplate import sf
+from biomech.ragged import RaggedBuffer
+
+# Every trial of a session on one Axes, aligned on an event (takeoff, start of movement,
+# impact...). The force around each trial is cached once in a RaggedBuffer when the
+# trial is processed, so the overlay never re-reads or re-analyses a file. A new trial
+# adds one min/max decimated Line2D and is blitted over the cached image of the lines
+# already drawn; the whole Axes is only redrawn when the new line doesn't fit the
+# current limits, the alignment changes or the canvas is resized.
+
+points_per_pixel = 2  # decimated points per horizontal pixel of the Axes
+min_points = 500
+
+
+def min_max_decimate(y, max_points):
+    """Sorted indices of the minimum and maximum of y in max_points // 2 equal bins.
+
+    Keeps the peaks (unlike taking every nth sample) with at most max_points points.
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    bins = max(max_points // 2, 1)
+    size = n // bins
+    blocks = np.asarray(y[:bins * size]).reshape(bins, size)
+    first = np.arange(bins) * size
+    picks = [first + blocks.argmin(axis = 1), first + blocks.argmax(axis = 1)]
+    if bins * size < n:
+        tail = np.asarray(y[bins * size:])
+        picks.append(bins * size + np.array([tail.argmin(), tail.argmax()]))
+    return np.unique(np.concatenate(picks))
+
+
+class TrialOverlay:
+    def __init__(self, buffer = None, sf = sf):
+        self.buffer = RaggedBuffer() if buffer is None else buffer  # may be shared between overlays
+        self.sf = sf
+        self.trials = {}  # name -> {"row", "start", "events", "color", "index", "line"}
+        self.ax = None
+        self.align = None
+        self.highlighted = None
+        self._background = None
+        self._draw_cid = None
+
+    def __contains__(self, name):
+        return name in self.trials
+
+    def add(self, name, fz, start, stop, events, color = 'black'):
+        """Cache fz[start:stop] of a trial (events are sample indices in fz) and draw it if shown.
+
+        A trial already in the overlay is replaced (it was processed again, e.g. with new
+        inputs); returns False when nothing about it changed.
+        """
+        start = max(start, 0)
+        stop = len(fz) if stop is None else min(stop, len(fz))
+        events = dict(events)
+        old = self.trials.get(name)
+        if old is not None:
+            row = self.buffer[old["row"]]
+            if old["start"] == start and old["events"] == events and old["color"] == color \
+                    and np.array_equal(row, fz[start:stop]):
+                return False
+            if len(row) == stop - start:
+                row[:] = fz[start:stop]  # same length, rewrite the row in place
+            else:
+                old["row"] = self.buffer.append(fz[start:stop])
+            old.update(start = start, events = events, color = color, index = None)
+            if old["line"] is not None:
+                old["line"].remove()
+                old["line"] = None
+                if self.align in events:
+                    self._add_line(old)
+                self.redraw()  # the old line is in the blit background
+            elif self.ax is not None and self.align in events:
+                self._blit(self._add_line(old))
+            return True
+        trial = {"row": self.buffer.append(fz[start:stop]), "start": start, "events": events,
+                 "color": color, "index": None, "line": None}
+        self.trials[name] = trial
+        if self.ax is not None and self.align in trial["events"]:
+            self._blit(self._add_line(trial))
+        return True
+
+    def attach(self, ax, align):
+        """Draw every cached trial on ax aligned on the event `align`."""
+        self.detach()
+        self.ax = ax
+        self.align = align
+        self._draw_cid = ax.figure.canvas.mpl_connect('draw_event', self._on_draw)
+        ax.axvline(x = 0, ls = ":", color = 'grey', lw = 0.4)
+        ax.set_ylabel("Force (N)")
+        ax.set_xlabel("Time from event (seconds)")
+        ax.margins(x = 0.02, y = 0.1)  # headroom so most new trials can be blitted
+        for trial in self.trials.values():
+            if align in trial["events"]:
+                self._add_line(trial)
+        self.redraw()
+
+    def detach(self):
+        if self.ax is not None and self._draw_cid is not None:
+            self.ax.figure.canvas.mpl_disconnect(self._draw_cid)
+        for trial in self.trials.values():
+            trial["line"] = None
+        self.ax = None
+        self._background = None
+        self._draw_cid = None
+
+    def set_align(self, align):
+        """Re-align the lines on another event (just shifts their x data)."""
+        self.align = align
+        for trial in self.trials.values():
+            if trial["line"] is not None:
+                trial["line"].set_xdata(self._x(trial))
+        self.redraw()
+
+    def highlight(self, name):
+        self.highlighted = name
+        for trial_name, trial in self.trials.items():
+            if trial["line"] is not None:
+                trial["line"].set_linewidth(2 if trial_name == name else 0.8)
+                trial["line"].set_alpha(1 if trial_name == name else 0.6)
+        if self.ax is not None:
+            self.ax.figure.canvas.draw_idle()
+
+    def redraw(self):
+        if self.ax is None:
+            return
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.ax.figure.canvas.draw()
+
+    def _x(self, trial):
+        return (trial["start"] + trial["index"] - trial["events"][self.align]) / self.sf
+
+    def _add_line(self, trial):
+        y = self.buffer[trial["row"]]
+        max_points = max(int(self.ax.bbox.width * points_per_pixel), min_points)
+        trial["index"] = min_max_decimate(y, max_points)
+        trial["line"], = self.ax.plot(self._x(trial), y[trial["index"]], color = trial["color"], lw = 0.8, alpha = 0.6)
+        return trial["line"]
+
+    def _blit(self, line):
+        canvas = self.ax.figure.canvas
+        x, y = line.get_data()
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        if self._background is None or x.min() < x0 or x.max() > x1 or y.min() < y0 or y.max() > y1:
+            self.redraw()
+            return
+        canvas.restore_region(self._background)
+        self.ax.draw_artist(line)
+        canvas.blit(self.ax.bbox)
+        self._background = canvas.copy_from_bbox(self.ax.bbox)
+
+    def _on_draw(self, event):
+        # a full draw (resize, redraw...) already has every line, keep it as the background
+        self._background = self.ax.figure.canvas.copy_from_bbox(self.ax.bbox)
@@ -0,0 +1,218 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Non-parametric (sign-flip permutation) inference for paired SPM{t} and SPM{T2}.
+# Under H0 each subject's POST - PRE difference curve is equally likely to have
+# either sign, so every permutation flips the signs of some subjects' curves.
+# The sums of squares (and cross products) don't change with the signs, so a whole
+# batch of permutations is one (batch x n) @ (n x nodes) product. Batches are spread over
+# a process pool and each gets its own child of one SeedSequence, so the result
+# depends on the seed and chunk_size but not on the number of workers.
+
+iterations = 10000
+chunk_size = 1000
+parallel_work = 5e7  # below this many multiply-adds starting worker processes costs more than it saves
+
+
+def paired_t(diffs, signs):
+    """t statistic at every node for each row of signs (+1/-1 per subject).
+
+    diffs is (n_subjects x n_nodes), signs is (n_permutations x n_subjects);
+    returns (n_permutations x n_nodes).
+    """
+    diffs = np.asarray(diffs, dtype = np.float64)
+    n = diffs.shape[0]
+    mean = (np.asarray(signs, dtype = np.float64) @ diffs) / n
+    sum_sq = np.einsum('ij,ij->j', diffs, diffs)
+    var = (sum_sq - n * mean ** 2) / (n - 1)
+    return mean / np.sqrt(var / n)
+
+
+def paired_t2(diffs, signs):
+    """Hotelling's T2 at every node for each row of signs, for several variables at once.
+
+    diffs is (n_subjects x n_nodes x n_variables); returns (n_permutations x n_nodes).
+    The covariance is the cross product matrix minus a rank one term for the mean,
+    so only the cross product matrix is inverted (once) and every permutation
+    reuses it (Sherman-Morrison).
+    """
+    diffs = np.asarray(diffs, dtype = np.float64)
+    n, nodes, n_vars = diffs.shape
+    signs = np.asarray(signs, dtype = np.float64)
+    mean = (signs @ diffs.reshape(n, -1)).reshape(len(signs), nodes, n_vars) / n
+    cross_inv = np.linalg.inv(np.einsum('jqi,jqk->qik', diffs, diffs) / (n - 1))
+    q = np.einsum('bqi,qik,bqk->bq', mean, cross_inv, mean)
+    return n * q / (1 - n * q / (n - 1))
+
+
+def _statistic(diffs, signs):
+    return paired_t2(diffs, signs) if diffs.ndim == 3 else paired_t(diffs, signs)
+
+
+def cluster_mass(t, threshold, two_tailed = True):
+    """Largest suprathreshold cluster mass (sum of t - threshold over a run of nodes) per row."""
+    t = np.atleast_2d(t)
+    excess = (np.abs(t) if two_tailed else t) - threshold
+    above = excess > 0
+    # a node continues a cluster if the previous node was above threshold (on the same side)
+    continues = np.zeros_like(above)
+    continues[:, 1:] = above[:, :-1]
+    if two_tailed:
+        continues[:, 1:] &= np.sign(t[:, 1:]) == np.sign(t[:, :-1])
+    starts = above & ~continues
+    labels = np.cumsum(starts.ravel()) * above.ravel()
+    mass = np.bincount(labels, weights = np.where(above, excess, 0).ravel())
+    mass[0] = 0
+    # row of every cluster label, then the biggest cluster in each row
+    rows = np.repeat(np.arange(t.shape[0]), t.shape[1])
+    best = np.zeros(t.shape[0])
+    np.maximum.at(best, rows[starts.ravel()], mass[labels[starts.ravel()]])
+    return best
+
+
+def clusters(t, threshold, two_tailed = True):
+    """(start_node, end_node, mass) of every suprathreshold cluster in one SPM{t}."""
+    t = np.asarray(t, dtype = np.float64)
+    excess = (np.abs(t) if two_tailed else t) - threshold
+    found = []
+    start = None
+    for i, value in enumerate(excess):
+        sign_change = start is not None and two_tailed and np.sign(t[i]) != np.sign(t[start])
+        if start is not None and (value <= 0 or sign_change):
+            found.append((start, i - 1, float(excess[start:i].sum())))
+            start = None
+        if start is None and value > 0:
+            start = i
+    if start is not None:
+        found.append((start, len(t) - 1, float(excess[start:].sum())))
+    return found
+
+
+def _all_signs(n):
+    # every sign pattern, starting with all +1 (the observed data)
+    bits = (np.arange(2 ** n)[:, None] >> np.arange(n)) & 1
+    return 1 - 2 * bits.astype(np.float64)
+
+
+def _chunk_statistic(diffs, seed, size):
+    rng = np.random.default_rng(seed)
+    signs = rng.choice([-1.0, 1.0], size = (size, diffs.shape[0]))
+    return _statistic(diffs, signs)
+
+
+def _run(diffs, iterations, workers, seed, chunk_size):
+    """Statistic curves (permutations x nodes) of the observed data and its sign flips."""
+    n = diffs.shape[0]
+    if 2 ** n <= iterations:
+        # few enough subjects to use every sign pattern exactly
+        return _statistic(diffs, _all_signs(n))
+
+    # observed data plus iterations - 1 random sign flips, in fixed size chunks
+    sizes = [chunk_size] * ((iterations - 1) // chunk_size)
+    if (iterations - 1) % chunk_size:
+        sizes.append((iterations - 1) % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers == 1 or len(sizes) == 1:
+        parts = [_chunk_statistic(diffs, s, size) for s, size in zip(seeds, sizes)]
+    else:
+        with ProcessPoolExecutor(max_workers = workers) as pool:
+            parts = list(pool.map(_chunk_statistic, [diffs] * len(sizes), seeds, sizes))
+    return np.concatenate([_statistic(diffs, np.ones((1, n)))] + parts)
+
+
+class Cluster:
+    def __init__(self, start, end, mass, p):
+        self.endpoints = (start, end)
+        self.mass = mass
+        self.P = p
+
+
+class PermutationResult:
+    """Same attributes the CLI and plots use from spm1d's SPM inference objects."""
+
+    def __init__(self, z, zstar, clusters, alpha, two_tailed, iterations, stat = 't'):
+        self.stat = stat
+        self.z = z
+        self.zstar = zstar
+        self.clusters = clusters
+        self.alpha = alpha
+        self.two_tailed = two_tailed
+        self.iterations = iterations
+        self.h0reject = any(c.P < alpha for c in clusters)
+
+    def plot(self, ax = None):
+        import matplotlib.pyplot as plt
+        ax = ax or plt.gca()
+        nodes = np.arange(len(self.z))
+        ax.plot(nodes, self.z, color = 'black', linewidth = 2)
+        ax.axhline(0, color = 'black', linestyle = ':')
+        for thresh in ([self.zstar, -self.zstar] if self.two_tailed else [self.zstar]):
+            ax.axhline(thresh, color = 'red', linestyle = '--')
+        for c in self.clusters:
+            start, end = c.endpoints
+            ax.fill_between(nodes[start:end + 1], self.z[start:end + 1],
+                            np.sign(self.z[start]) * self.zstar, color = 'gray', alpha = 0.5)
+        ax.set_xlim(0, len(self.z) - 1)
+        ax.set_ylabel(f'SPM{{{self.stat}}}')
+
+    def plot_threshold_label(self, ax = None):
+        import matplotlib.pyplot as plt
+        ax = ax or plt.gca()
+        ax.text(0.02, 0.95, f"α = {self.alpha}, {self.stat}* = {self.zstar:.3f} ({self.iterations} permutations)",
+                transform = ax.transAxes, color = 'red', va = 'top')
+
+
+def _permutation_test(diffs, alpha, iterations, two_tailed, workers, seed, chunk_size, stat):
+    if diffs.shape[0] < 2:
+        raise ValueError("need at least 2 subjects")
+    if workers is None:
+        workers = os.cpu_count() if iterations * diffs.size > parallel_work else 1
+    z = _statistic(diffs, np.ones((1, diffs.shape[0])))[0]
+
+    # one pass over the permutations: the critical threshold comes from their maxima and
+    # the cluster p values from the same curves at that threshold
+    t = _run(diffs, iterations, workers, seed, chunk_size)
+    max_t = np.abs(t).max(axis = 1) if two_tailed else t.max(axis = 1)
+    zstar = float(np.quantile(max_t, 1 - alpha))
+    max_mass = cluster_mass(t, zstar, two_tailed)
+
+    # isclose so the observed cluster always counts itself despite rounding in the two sums
+    found = [Cluster(start, end, mass, float(np.mean((max_mass >= mass) | np.isclose(max_mass, mass))))
+             for start, end, mass in clusters(z, zstar, two_tailed)]
+    return PermutationResult(z, zstar, found, alpha, two_tailed, len(max_t), stat)
+
+
+def paired_ttest_nonparam(pre, post, alpha = 0.05, iterations = iterations, two_tailed = True,
+                          workers = None, seed = 0, chunk_size = chunk_size):
+    """Permutation paired t-test on (n_subjects x n_nodes) curves.
+
+    The critical t is the (1 - alpha) quantile of the maximum |t| over nodes across
+    permutations; each suprathreshold cluster gets a p value from the distribution of
+    the largest cluster mass. With 2**n_subjects <= iterations every sign pattern is
+    used and the result is exact. workers = None uses every core for large jobs and
+    stays in this process for small ones.
+    """
+    pre = np.asarray(pre, dtype = np.float64)
+    post = np.asarray(post, dtype = np.float64)
+    if pre.shape != post.shape or pre.ndim != 2:
+        raise ValueError(f"pre and post must be matching (subjects x nodes) arrays, got {pre.shape} and {post.shape}")
+    # same direction as spm1d.stats.ttest_paired(pre, post)
+    return _permutation_test(pre - post, alpha, iterations, two_tailed, workers, seed, chunk_size, 't')
+
+
+def paired_hotelling_nonparam(pre, post, alpha = 0.05, iterations = iterations,
+                              workers = None, seed = 0, chunk_size = chunk_size):
+    """Permutation paired Hotelling's T2 on (n_subjects x n_nodes x n_variables) curves.
+
+    Same layout as spm1d.stats.hotellings_paired and the same inference as
+    paired_ttest_nonparam (T2 is never negative, so it is one tailed).
+    """
+    pre = np.asarray(pre, dtype = np.float64)
+    post = np.asarray(post, dtype = np.float64)
+    if pre.shape != post.shape or pre.ndim != 3:
+        raise ValueError(f"pre and post must be matching (subjects x nodes x variables) arrays, got {pre.shape} and {post.shape}")
+    if pre.shape[0] <= pre.shape[2]:
+        raise ValueError("Hotelling's T2 needs more subjects than variables")
+    return _permutation_test(pre - post, alpha, iterations, False, workers, seed, chunk_size, 'T2')
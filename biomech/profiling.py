@@ -0,0 +1,179 @@
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import pstats
+import time
+from datetime import datetime
+
+# Per-trial stage timings for the force plate programs. A process*file method wrapped
+# in @profiled(log_path) gets a TrialProfile; inside it each stage either runs in
+# `with profiling.stage("name"):` or ends with `profiling.lap("name")` (the time since
+# the previous stage), so long methods don't have to be re-indented. When the trial is
+# done the profile is appended to a JSON lines log and shown in the window's status
+# bar (hover for the stage breakdown).
+#
+# BIOMECH_PROFILE=<trial name> (or 'first') also dumps a full profiler report for that
+# trial next to the log: cProfile by default (.prof plus a .txt summary), or an HTML
+# pyinstrument report with BIOMECH_PROFILER=pyinstrument if it is installed.
+
+PROFILE_ENV = "BIOMECH_PROFILE"
+PROFILER_ENV = "BIOMECH_PROFILER"
+LOG_ENV = "BIOMECH_TIMING_LOG"  # overrides the log path given to @profiled
+report_lines = 40
+
+_active = []  # profiles of the trials being processed (innermost last)
+_first_done = False
+
+
+class TrialProfile:
+    def __init__(self, trial, program = None):
+        self.trial = trial
+        self.program = program
+        self.stages = {}  # stage name -> seconds, in the order the stages first ran
+        self.total = None
+        self.started = time.perf_counter()
+        self._mark = self.started
+
+    def _add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._mark = time.perf_counter()
+            self._add(name, self._mark - start)
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self._add(name, now - self._mark)
+        self._mark = now
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+        return self
+
+    def record(self):
+        return {"time": datetime.now().isoformat(timespec = 'seconds'),
+                "program": self.program,
+                "trial": self.trial,
+                "total_ms": round(self.total * 1000, 3),
+                "stages_ms": {name: round(s * 1000, 3) for name, s in self.stages.items()}}
+
+    def summary(self):
+        """One line per stage plus the total, e.g. for a tooltip."""
+        width = max([len(name) for name in self.stages] + [len("total")])
+        lines = [f"{name:<{width}}  {s * 1000:8.1f} ms" for name, s in self.stages.items()]
+        lines.append(f"{'total':<{width}}  {self.total * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+def current():
+    """Profile of the trial being processed, or None outside a @profiled call."""
+    return _active[-1] if _active else None
+
+
+@contextlib.contextmanager
+def stage(name):
+    profile = current()
+    if profile is None:
+        yield
+    else:
+        with profile.stage(name):
+            yield
+
+
+def lap(name):
+    profile = current()
+    if profile is not None:
+        profile.lap(name)
+
+
+def write_log(profile, log_path):
+    with open(log_path, "a") as f:
+        f.write(json.dumps(profile.record()) + "\n")
+
+
+def show(window, profile):
+    """Total time in a QMainWindow's status bar with the stage breakdown as its tooltip."""
+    if not hasattr(window, "statusBar"):
+        return
+    status = window.statusBar()
+    status.showMessage(f"{profile.trial}: {profile.total * 1000:.0f} ms")
+    status.setToolTip(profile.summary())
+
+
+def _wants_report(trial):
+    global _first_done
+    wanted = os.environ.get(PROFILE_ENV)
+    if not wanted:
+        return False
+    if wanted.lower() == "first":
+        if _first_done:
+            return False
+        _first_done = True
+        return True
+    return wanted.lower() == trial.lower()
+
+
+@contextlib.contextmanager
+def _report(trial, folder):
+    if not _wants_report(trial):
+        yield
+        return
+    base = os.path.join(folder, f"{trial}_profile")
+    if os.environ.get(PROFILER_ENV, "cprofile").lower() == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            Profiler = None
+        if Profiler is not None:
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                with open(base + ".html", "w") as f:
+                    f.write(profiler.output_html())
+            return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(base + ".prof")
+        with open(base + ".txt", "w") as f:
+            pstats.Stats(profiler, stream = f).sort_stats("cumulative").print_stats(report_lines)
+
+
+def profiled(log_path = None):
+    """Decorator for window methods called as method(self, file_path).
+
+    log_path (or $BIOMECH_TIMING_LOG) is the JSON lines log, None for no log.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(window, file_path, *args, **kwargs):
+            trial = os.path.splitext(os.path.basename(file_path))[0]
+            profile = TrialProfile(trial, type(window).__name__)
+            log = os.environ.get(LOG_ENV, log_path)
+            _active.append(profile)
+            try:
+                with _report(trial, os.path.dirname(os.path.abspath(log)) if log else os.getcwd()):
+                    result = method(window, file_path, *args, **kwargs)
+            finally:
+                _active.pop()
+            profile.finish()
+            if log:
+                write_log(profile, log)
+            show(window, profile)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,45 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QHeaderView, QTableWidgetItem
+
+# Results table fill shared by the force plate programs (PyQt5): first column is the
+# variable name in bold, every other column a value shown to 2 decimals.
+
+
+def fill_table(table, dataframe, style_sheet = None, resize_mode = QHeaderView.ResizeToContents):
+    # resize_mode is the header's mode once the table is filled
+    table.clear()
+    table.setRowCount(len(dataframe))
+    table.setColumnCount(dataframe.shape[1])
+    # a ResizeToContents header measures every column again for each change, which takes
+    # minutes with a few hundred trials; the columns are sized once at the end instead
+    header = table.horizontalHeader()
+    header.setSectionResizeMode(QHeaderView.Interactive)
+    table.setHorizontalHeaderLabels([str(col) for col in dataframe.columns])
+
+    variable_font = QFont()
+    variable_font.setBold(True)
+    variable_font.setFamily("Arial")
+    variable_font.setPointSize(8)
+    value_font = QFont()
+    value_font.setFamily("Arial")
+    value_font.setPointSize(8)
+
+    cells = dataframe.to_numpy(dtype = object)  # one conversion, not a lookup per cell
+    for i in range(dataframe.shape[0]):
+        for j in range(dataframe.shape[1]):
+            value = cells[i, j]
+            if j == 0:  # First column (strings)
+                item = QTableWidgetItem(str(value))
+                item.setFont(variable_font)
+            else:  # Second and subsequent columns (floats)
+                item = QTableWidgetItem(f"{float(value):.2f}")
+                item.setFont(value_font)
+                item.setTextAlignment(Qt.AlignCenter | Qt.AlignVCenter)
+            table.setItem(i, j, item)
+
+    if style_sheet is not None:
+        table.setStyleSheet(style_sheet)
+    table.setAlternatingRowColors(True)
+    table.resizeColumnsToContents()
+    header.setSectionResizeMode(resize_mode)
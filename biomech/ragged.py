@@ -0,0 +1,45 @@
+import numpy as np
+
+# Variable length rows (e.g. the cropped force of every trial in a session) stored back
+# to back in one contiguous array, with an offsets index. Appending copies the new row
+# in and doubles the storage when it runs out, so n rows cost O(log n) reallocations
+# rather than one array per trial.
+
+
+class RaggedBuffer:
+    def __init__(self, capacity = 1 << 16, dtype = np.float64):
+        self.data = np.empty(capacity, dtype = dtype)
+        self.offsets = [0]  # row i is data[offsets[i]:offsets[i + 1]]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def size(self):
+        """Number of values stored (over all rows)."""
+        return self.offsets[-1]
+
+    def append(self, values):
+        """Copy a 1-D row in and return its index."""
+        values = np.asarray(values, dtype = self.data.dtype).ravel()
+        start = self.offsets[-1]
+        stop = start + len(values)
+        if stop > len(self.data):
+            grown = np.empty(max(stop, 2 * len(self.data)), dtype = self.data.dtype)
+            grown[:start] = self.data[:start]
+            self.data = grown
+        self.data[start:stop] = values
+        self.offsets.append(stop)
+        return len(self) - 1
+
+    def __getitem__(self, i):
+        """Row i as a view (valid until an append has to grow the buffer)."""
+        if i < 0:
+            i += len(self)
+        return self.data[self.offsets[i]:self.offsets[i + 1]]
+
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def clear(self):
+        self.offsets = [0]
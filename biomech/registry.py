@@ -0,0 +1,99 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from biomech.results_store import is_sqlite_path, read_table
+
+# Athletes' latest weighed body mass and protocol box height, so drop landings and drop
+# jumps for a whole team can be processed without typing them in. Each trial is matched
+# on the subject token at the start of its file name (SMITH01 in SMITH01-DJ-LEFT.csv).
+#
+# The registry is a CSV (or an SQLite table, 'athletes' by default) with one row per
+# weighing: athlete, date, body_mass_kg or body_mass_lb, and optionally box_height_cm
+# or box_height_in. The latest value of each column (by date, then row order) is used,
+# so new weighings are just appended. The file is read once and re-read only when it
+# changes.
+
+subject_pattern = r"^([A-Za-z0-9]+)"  # first run of letters/digits in the file name
+kg_per_lb = 1 / 2.2046
+m_per_in = 0.0254
+
+
+def subject_token(file_name, pattern = subject_pattern):
+    """Athlete id from a trial file name (upper case), None if it has none."""
+    match = re.search(pattern, os.path.basename(file_name))
+    return match.group(1).upper() if match else None
+
+
+def _column(dat, metric, imperial, factor):
+    # metric values as they are, imperial ones converted, metric preferred when both are given
+    values = pd.Series(np.nan, index = dat.index)
+    if imperial in dat:
+        values = pd.to_numeric(dat[imperial], errors = 'coerce') * factor
+    if metric in dat:
+        values = pd.to_numeric(dat[metric], errors = 'coerce').fillna(values)
+    return values
+
+
+def latest_values(rows):
+    """{athlete: {"bodymass": kg, "drop_height": m}} from registry rows (dicts), None where unknown."""
+    dat = pd.DataFrame(list(rows))
+    if dat.empty or "athlete" not in dat:
+        return {}
+    dat = dat[dat["athlete"].notna()]
+    if "date" in dat:
+        dat = dat.assign(_date = pd.to_datetime(dat["date"], errors = 'coerce'))
+        dat = dat.sort_values("_date", kind = 'stable', na_position = 'first')
+    latest = pd.DataFrame({"athlete": dat["athlete"].astype(str).str.strip().str.upper(),
+                           "bodymass": _column(dat, "body_mass_kg", "body_mass_lb", kg_per_lb),
+                           "drop_height": _column(dat, "box_height_cm", "box_height_in", m_per_in * 100) / 100})
+    latest = latest.groupby("athlete", sort = False).last()  # last non-missing value of each column
+    return {athlete: {key: (None if pd.isna(value) else float(value)) for key, value in row.items()}
+            for athlete, row in latest.to_dict('index').items()}
+
+
+class AthleteRegistry:
+    def __init__(self, path, table = 'athletes', pattern = subject_pattern):
+        self.path = path
+        self.table = table
+        self.pattern = pattern
+        self._athletes = {}
+        self._mtime = None
+        self._entered = {}  # typed in this session for athletes missing from the file
+
+    def exists(self):
+        return self.path is not None and os.path.exists(self.path)
+
+    def _load(self):
+        mtime = os.path.getmtime(self.path) if self.exists() else None
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        if mtime is None:
+            rows = []
+        elif is_sqlite_path(self.path):
+            rows = read_table(self.path, self.table)
+        else:
+            rows = pd.read_csv(self.path).to_dict('records')
+        self._athletes = latest_values(rows)
+
+    def lookup(self, file_name):
+        """(athlete, {"bodymass": kg, "drop_height": m}) for a trial, values None when unknown."""
+        athlete = subject_token(file_name, self.pattern)
+        self._load()
+        known = {"bodymass": None, "drop_height": None}
+        known.update(self._athletes.get(athlete, {}))
+        for key, value in self._entered.get(athlete, {}).items():
+            if known[key] is None:
+                known[key] = value
+        return athlete, known
+
+    def remember(self, athlete, bodymass = None, drop_height = None):
+        """Keep values entered by hand for the rest of the session (the file isn't changed)."""
+        entered = self._entered.setdefault(athlete, {})
+        if bodymass is not None:
+            entered["bodymass"] = bodymass
+        if drop_height is not None:
+            entered["drop_height"] = drop_height
@@ -0,0 +1,68 @@
+import csv
+import os
+import sqlite3
+from contextlib import closing
+
+# Small helpers for saving per-trial results incrementally, so long studies don't
+# re-read and re-write the whole results file on every save.
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+
+def is_sqlite_path(path):
+    return path.lower().endswith(SQLITE_EXTENSIONS)
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def upsert_rows(db_path, table, key, rows):
+    """Insert or update rows (dicts) in an SQLite table keyed on column `key`.
+
+    The table is created on first use and gains columns as new keys show up.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    columns = list(dict.fromkeys(col for row in rows for col in row))
+    # connect() as a context manager only commits, closing() also releases the file
+    with closing(sqlite3.connect(db_path)) as con, con:
+        col_defs = ", ".join(f"{_quote(col)}{' PRIMARY KEY' if col == key else ''}" for col in columns)
+        con.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({col_defs})")
+        existing = {info[1] for info in con.execute(f"PRAGMA table_info({_quote(table)})")}
+        for col in columns:
+            if col not in existing:
+                con.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(col)}")
+
+        names = ", ".join(_quote(col) for col in columns)
+        marks = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{_quote(col)} = excluded.{_quote(col)}" for col in columns if col != key)
+        sql = f"INSERT INTO {_quote(table)} ({names}) VALUES ({marks}) ON CONFLICT({_quote(key)}) "
+        sql += f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        con.executemany(sql, [[row.get(col) for col in columns] for row in rows])
+
+
+def read_table(db_path, table):
+    with closing(sqlite3.connect(db_path)) as con:
+        cur = con.execute(f"SELECT * FROM {_quote(table)}")
+        columns = [d[0] for d in cur.description]
+        return [dict(zip(columns, values)) for values in cur.fetchall()]
+
+
+def append_csv_rows(csv_path, rows, columns):
+    """Append rows (dicts) to a CSV, writing the header only when the file is new."""
+    new_file = not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0
+    with open(csv_path, 'a', newline = '') as f:
+        writer = csv.DictWriter(f, fieldnames = columns, extrasaction = 'ignore')
+        if new_file:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def latest_csv_rows(csv_path, key):
+    """The last row (dict of strings) for each `key` value in a CSV written by append_csv_rows."""
+    if not os.path.exists(csv_path):
+        return {}
+    with open(csv_path, newline = '') as f:
+        return {row[key]: row for row in csv.DictReader(f) if key in row}
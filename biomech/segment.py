@@ -0,0 +1,113 @@
+import numpy as np
+
+from biomech.forceplate import quiet_samples, sf
+
+# Splits a continuous recording (several CMJs, or several drop landings/jumps with the
+# athlete stepping off the plate in between) into single trials that look like the
+# one-jump files the analyses expect. Everything is found in one vectorised pass over
+# the total force: runs of loaded/unloaded samples (short unloaded runs are flights,
+# long ones are the plate being empty) and runs of stable standing (rolling SD from
+# cumulative sums). The trials come back as slices, and split() turns them into views
+# of the original array, so no force data is copied.
+#
+#   'cmj'  - a trial per flight that follows at least quiet_samples of stable standing,
+#            starting in that standing (the analyses take body weight from it)
+#   'drop' - a trial per contact after the plate was empty, starting lead seconds
+#            before the contact
+
+kinds = ('cmj', 'drop')
+contact_threshold = 30  # N, below this nobody is on the plate
+max_flight = 1.5  # s, unloaded for longer than this is an empty plate, not a flight
+min_flight = 0.1  # s, shorter unloaded runs are noise
+stable_window = 0.25  # s, rolling window for stable standing
+stable_fraction = 0.02  # rolling SD below this fraction of the rolling mean is standing still
+max_lead = 3.0  # s, most standing kept before a CMJ
+drop_lead = 1.0  # s, empty plate kept before a drop contact
+max_tail = 5.0  # s, most kept after the landing (or the drop contact)
+
+
+def runs(mask):
+    """(starts, stops) of the runs of True in a boolean array."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], mask, [False])).astype(np.int8)))
+    return edges[0::2], edges[1::2]
+
+
+def rolling_sd(x, window):
+    """SD and mean of x[i:i + window] for every full window, from cumulative sums."""
+    x = np.asarray(x, dtype = np.float64)
+    x = x - x.mean()  # keeps the sums of squares small
+    c1 = np.concatenate(([0.0], np.cumsum(x)))
+    c2 = np.concatenate(([0.0], np.cumsum(x * x)))
+    s1 = c1[window:] - c1[:-window]
+    s2 = c2[window:] - c2[:-window]
+    mean = s1 / window
+    var = np.maximum(s2 / window - mean ** 2, 0.0)
+    return np.sqrt(var), mean
+
+
+def _next_at_or_after(starts, positions, default):
+    # first value of the sorted `starts` >= each position, `default` when there is none
+    i = np.searchsorted(starts, positions)
+    return np.append(starts, default)[i]
+
+
+def trial_bounds(fz, kind = 'cmj', sf = sf, quiet_samples = quiet_samples):
+    """(starts, anchors, stops) sample arrays, one entry per trial in fz (the total force).
+
+    The anchor is the landing of a CMJ or the contact of a drop, the trial is start:stop.
+    """
+    if kind not in kinds:
+        raise ValueError(f"unknown recording kind '{kind}', choose from {kinds}")
+    fz = np.asarray(fz, dtype = np.float64)
+    n = len(fz)
+    unloaded_starts, unloaded_stops = runs(fz < contact_threshold)
+    length = unloaded_stops - unloaded_starts
+    # unloaded runs that touch the anchors of the recording can't be flights
+    inside = (unloaded_starts > 0) & (unloaded_stops < n)
+    is_flight = inside & (length >= min_flight * sf) & (length <= max_flight * sf)
+    empty = length > max_flight * sf
+    empty_starts, empty_stops = unloaded_starts[empty], unloaded_stops[empty]
+
+    if kind == 'cmj':
+        takeoffs, lands = unloaded_starts[is_flight], unloaded_stops[is_flight]
+        window = int(stable_window * sf)
+        if n <= window or not len(takeoffs):
+            return np.empty(0, int), np.empty(0, int), np.empty(0, int)
+        sd, mean = rolling_sd(fz, window)
+        stable = (sd <= stable_fraction * (mean + fz.mean())) & (fz[:len(sd)] >= contact_threshold)
+        stable_starts, stable_stops = runs(stable)
+        stable_stops = stable_stops + window - 1  # last window start -> end of its samples
+        keep = stable_stops - stable_starts >= quiet_samples
+        stable_starts, stable_stops = stable_starts[keep], stable_stops[keep]
+        # last long enough stable run that anchors before each takeoff, with no other flight in between
+        before = np.searchsorted(stable_stops, takeoffs, side = 'right') - 1
+        found = before >= 0
+        previous_land = np.concatenate(([-1], lands[:-1]))
+        found[found] &= stable_starts[before[found]] >= previous_land[found]
+        takeoffs, lands, before = takeoffs[found], lands[found], before[found]
+        starts = np.maximum(stable_starts[before], stable_stops[before] - int(max_lead * sf))
+        anchors = lands
+    else:
+        contacts = empty_stops[empty_stops < n]
+        contact_from = empty_starts[empty_stops < n]
+        starts = np.maximum(contact_from, contacts - int(drop_lead * sf))
+        anchors = contacts
+
+    if not len(starts):
+        return starts, anchors, starts
+    # each trial runs to the next trial, the plate emptying, or max_tail after it, whichever comes first
+    next_start = np.append(starts[1:], n)
+    stops = np.minimum.reduce([next_start, _next_at_or_after(empty_starts, anchors, n),
+                               anchors + int(max_tail * sf), np.full(len(anchors), n)])
+    return starts, anchors, stops
+
+
+def trial_slices(fz, kind = 'cmj', sf = sf, quiet_samples = quiet_samples):
+    """Slices of fz (the total force of a continuous recording) holding one trial each."""
+    starts, _, stops = trial_bounds(fz, kind, sf, quiet_samples)
+    return [slice(int(a), int(b)) for a, b in zip(starts, stops)]
+
+
+def split(data, slices):
+    """Views of data (1-D, or samples x channels) for each trial slice, nothing is copied."""
+    return [data[s] for s in slices]
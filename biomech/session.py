@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import struct
+import zlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from biomech import analyses
+from biomech.filtering import lowpass
+from biomech.forceplate import sf
+
+# A processed session in one file, so last month's trials can be reviewed and analysed
+# again without their CSVs. The file has a fixed size header, then the Fz of every trial
+# back to back in one data section, then a JSON index: the test, the sampling rate and
+# analysis parameters (Fz columns, filter cutoff...) and for each trial its name, entered
+# body mass and box height, event indices, outcome values and where its signal is in the
+# data section. Each signal is one (samples x plates) float64 block, zlib compressed on
+# its own (level 1: about 2x for plate exports, 8x for the Hawkin ones) so a trial is
+# read without decompressing the others.
+#
+# Session() reads only the header and the index, which is enough for the tables; the data
+# section is memory-mapped the first time a signal is asked for, so only the pages of the
+# trials looked at are read. Saved with compress = False the blocks are raw (8 byte
+# aligned) and signals are read-only views of the map.
+#
+#   header: magic, format version, index offset, index length (header_format, padded to data_start)
+#   data:   trial blocks at data_start + offset, nbytes long
+#   index:  UTF-8 JSON
+
+extension = ".session"
+magic = b"BIOMSESS"
+format_version = 1
+header_format = struct.Struct("<8sIQQ")
+data_start = 64
+compress_level = 1
+
+
+def _block(fz, compress):
+    # one trial's Fz as (samples x plates) float64 bytes, compressed or raw (whole float64s,
+    # so raw blocks stay 8 byte aligned)
+    fz = np.asarray(fz, dtype = np.float64)
+    fz = fz.reshape(-1, 1) if fz.ndim == 1 else fz
+    raw = np.ascontiguousarray(fz).tobytes()
+    return fz.shape, zlib.compress(raw, compress_level) if compress else raw
+
+
+def save(path, test, trials, params = None, sf = sf, compress = True):
+    """Write a session file with the trials (an iterable, read one at a time).
+
+    Each trial is a dict with "name", "fz" ((samples x plates) array, or one column per
+    plate), "bodymass", "drop_height" (the entered values, None if not needed), "events"
+    (name -> sample index) and "values" (test.analyze's outcome values). params are the
+    analysis parameters to keep with them (e.g. {"cutoff": 50, "fz_columns": [5, 16]}).
+    The file is written next to path and moved over it once complete.
+    """
+    index = {"format": format_version, "test": type(test).__name__, "sf": sf, "params": dict(params or {}),
+             "compression": "zlib" if compress else None,
+             "created": datetime.now().isoformat(timespec = 'seconds'), "trials": []}
+    partial = path + ".partial"
+    try:
+        _write(partial, index, trials, compress)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    os.replace(partial, path)
+    return path
+
+
+def _write(path, index, trials, compress):
+    with open(path, 'wb') as f:
+        f.write(bytes(data_start))
+        offset = 0
+        for trial in trials:
+            fz = trial["fz"]
+            if isinstance(fz, (list, tuple)):
+                fz = np.column_stack(fz)
+            shape, block = _block(fz, compress)
+            f.write(block)
+            index["trials"].append({"name": trial["name"], "samples": shape[0], "plates": shape[1],
+                                    "offset": offset, "nbytes": len(block),
+                                    "bodymass": trial.get("bodymass"), "drop_height": trial.get("drop_height"),
+                                    "events": {name: int(idx) for name, idx in dict(trial["events"]).items()},
+                                    "values": {key: float(value) for key, value in trial["values"].items()}})
+            offset += len(block)
+        encoded = json.dumps(index).encode('utf-8')
+        f.write(encoded)
+        f.seek(0)
+        f.write(header_format.pack(magic, format_version, data_start + offset, len(encoded)))
+
+
+class Session:
+    """A session file opened for reading: the index now, each signal when it is asked for."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            head = f.read(header_format.size)
+            if len(head) < header_format.size or head[:len(magic)] != magic:
+                raise ValueError(f"{path} is not a session file")
+            _, version, index_offset, index_length = header_format.unpack(head)
+            if version > format_version:
+                raise ValueError(f"{path} is a newer session file (format {version}), update the program")
+            f.seek(index_offset)
+            index = json.loads(f.read(index_length).decode('utf-8'))
+        self.test_name = index["test"]
+        self.sf = index["sf"]
+        self.params = index["params"]
+        self.compression = index["compression"]
+        self.created = index["created"]
+        self.trials = index["trials"]
+        self._rows = {trial["name"]: row for row, trial in enumerate(self.trials)}
+        self._data = None
+
+    def __len__(self):
+        return len(self.trials)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def names(self):
+        return [trial["name"] for trial in self.trials]
+
+    def trial(self, name):
+        """The index entry of a trial: inputs, events, values and where its signal is."""
+        return self.trials[self._rows[name]]
+
+    def test(self):
+        """A new instance of the analyses test the session was processed with."""
+        return getattr(analyses, self.test_name)()
+
+    def signal(self, name):
+        """(samples x plates) float64 Fz of a trial."""
+        trial = self.trial(name)
+        if self._data is None:
+            self._data = np.memmap(self.path, dtype = np.uint8, mode = 'r')
+        block = self._data[data_start + trial["offset"]:data_start + trial["offset"] + trial["nbytes"]]
+        if self.compression == "zlib":
+            values = np.frombuffer(zlib.decompress(block), dtype = np.float64)
+        else:
+            values = block.view(np.float64)
+        return values.reshape(trial["samples"], trial["plates"])
+
+    def values(self):
+        """Outcome values as a DataFrame, one row per trial."""
+        return pd.DataFrame([trial["values"] for trial in self.trials], index = pd.Index(self.names, name = "trial"))
+
+    def analyze(self, name, test = None, cutoff = None):
+        """Analyse a trial again from its stored signal, with its stored inputs.
+
+        test and cutoff default to the session's; raises ValueError like test.analyze.
+        """
+        test = self.test() if test is None else test
+        cutoff = self.params.get("cutoff") if cutoff is None else cutoff
+        trial = self.trial(name)
+        fz = list(self.signal(name).T[:test.plates])
+        if cutoff is not None:
+            fz = [lowpass(f, cutoff, self.sf) for f in fz]
+        return test.analyze(fz[0] if test.plates == 1 else fz, sf = self.sf,
+                            bodymass = trial["bodymass"], drop_height = trial["drop_height"])
+
+    def close(self):
+        # views returned by signal() keep the map open until they are gone
+        self._data = None
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Summarise, export or re-analyse a saved force plate session.")
+    parser.add_argument("path")
+    parser.add_argument("--csv", help = "write the outcome values here, one row per trial")
+    parser.add_argument("--reanalyse", action = 'store_true',
+                        help = "analyse every trial again from its stored signal and compare with the saved results")
+    args = parser.parse_args(argv)
+
+    with Session(args.path) as stored:
+        print(f"{stored.test_name}: {len(stored)} trials at {stored.sf} Hz, saved {stored.created}, parameters {stored.params}")
+        if args.csv:
+            stored.values().to_csv(args.csv)
+            print(f"Values written to {args.csv}")
+        if args.reanalyse:
+            test = stored.test()
+            changed = 0
+            for name in stored.names:
+                trial = stored.trial(name)
+                try:
+                    result = stored.analyze(name, test)
+                except ValueError as error:
+                    print(f"  {name}: {error}")
+                    changed += 1
+                    continue
+                if dict(result["events"]) != trial["events"] or not np.allclose(
+                        [result["values"][key] for key in trial["values"]], list(trial["values"].values()),
+                        rtol = 1e-9, equal_nan = True):
+                    print(f"  {name}: different from the saved results")
+                    changed += 1
+            print(f"Re-analysed {len(stored)} trials, {changed} differ from the saved results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Readers/writers for headerless single-column signal files (LLR exports and the
+# corrected signals written by the LLR programs). Text goes through pandas' C tokenizer
+# (np.loadtxt is pure Python before NumPy 1.23), and corrected signals can carry a
+# binary .npy sidecar so later analyses skip text parsing altogether.
+
+
+def sidecar_path(file_path):
+    return os.path.splitext(file_path)[0] + ".npy"
+
+
+def read_signal(file_path, column = 0, use_sidecar = True):
+    """Read one column of a whitespace-delimited text signal as float64.
+
+    Same result as np.loadtxt(file_path, usecols = column). If a .npy sidecar written by
+    write_signal exists and is at least as new as the text file it is loaded instead.
+    """
+    if use_sidecar:
+        sidecar = sidecar_path(file_path)
+        if os.path.exists(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(file_path):
+            return np.load(sidecar)
+    dat = pd.read_csv(file_path, sep = r'\s+', header = None, usecols = [column],
+                      comment = '#', dtype = np.float64, engine = 'c', float_precision = 'round_trip')
+    return dat.iloc[:, 0].to_numpy()
+
+
+def write_signal(file_path, signal, fmt = '%0.8f', sidecar = False):
+    """Write a single-column text file (same layout as np.savetxt with `fmt`).
+
+    With sidecar = True the exact float64 values are also saved next to it as .npy.
+    """
+    signal = np.asarray(signal, dtype = np.float64)
+    pd.DataFrame({0: signal}).to_csv(file_path, header = False, index = False, float_format = fmt)
+    if sidecar:
+        np.save(sidecar_path(file_path), signal)
@@ -0,0 +1,169 @@
+import argparse
+import socket
+import threading
+import time
+
+import numpy as np
+
+from biomech import forceplate, live
+from biomech.forceplate import sf
+
+# A stand-in for a force plate amplifier, for testing the live mode (and measuring
+# acquisition throughput, detector latency and UI frame rate) without a plate. Trial
+# CSVs (Bertec exports, the single column Misc/SPM1D CMJ Data files, biomech.synthetic
+# trials) are played back to back as Fz frames in biomech.live packets, over UDP to a
+# receiver or over TCP to the first client that connects.
+#
+#   python -m biomech.simulator trial1.csv trial2.csv --protocol udp --port 5005
+#   python -m biomech.simulator "Misc/SPM1D CMJ Data/"*.csv --plates 2 --speed 4 --jitter-ms 3 --loss 0.01
+#
+# Each plate is one channel of the frames. Files with fewer force columns than plates
+# have their force shared evenly between the plates. Packets are sent on a fixed
+# schedule (speed times real time, 0 for as fast as possible); jitter delays each
+# packet without shifting the ones after it, and lost packets still use up their
+# sequence number so the receiver counts them. Jitter and loss come from a seeded
+# generator, so a run can be repeated exactly.
+
+default_columns = ('F', 'Q')  # Bertec exports: left and right plate Fz
+frames_per_packet = 10
+
+
+def load_channels(file_path, plates = 2, columns = default_columns):
+    """(samples x plates) float32 Fz of one trial CSV.
+
+    Uses the lettered columns when the file has them, else its only column.
+    """
+    dat = forceplate.read_trial(file_path)
+    if dat.shape[1] == 1:
+        fz = [forceplate.fz_column(dat, 0)]
+    else:
+        fz = [forceplate.fz_column(dat, ord(col.upper()) - 65) for col in columns]
+    if len(fz) != plates:
+        total = np.sum(fz, axis = 0)
+        fz = [total / plates] * plates
+    return np.column_stack(fz).astype(np.float32)
+
+
+class Simulator:
+    def __init__(self, frames, sf = sf, speed = 1.0, frames_per_packet = frames_per_packet,
+                 jitter = 0.0, loss = 0.0, seed = None, loop = False):
+        self.frames = np.ascontiguousarray(frames, dtype = np.float32)
+        self.sf = sf
+        self.speed = speed
+        self.frames_per_packet = frames_per_packet
+        self.jitter = jitter  # s, SD of the extra delay of each packet
+        self.loss = loss  # fraction of packets dropped
+        self.seed = seed
+        self.loop = loop
+        self.sent = 0
+        self.dropped = 0
+        self.elapsed = None
+
+    @classmethod
+    def from_files(cls, file_paths, plates = 2, columns = default_columns, **options):
+        return cls(np.concatenate([load_channels(path, plates, columns) for path in file_paths]), **options)
+
+    def packets(self):
+        """(send time in s from the start, packet bytes or None if it is lost) in order."""
+        rng = np.random.default_rng(self.seed)
+        step = self.frames_per_packet
+        period = step / (self.sf * self.speed) if self.speed else 0.0
+        sequence = 0
+        while True:
+            for start in range(0, len(self.frames), step):
+                due = sequence * period + (abs(rng.normal(0, self.jitter)) if self.jitter else 0.0)
+                lost = self.loss and rng.random() < self.loss
+                yield due, None if lost else live.pack(sequence, self.frames[start:start + step])
+                sequence += 1
+            if not self.loop:
+                return
+
+    def _play(self, send, stop_event):
+        started = time.perf_counter()
+        for due, packet in self.packets():
+            if stop_event is not None and stop_event.is_set():
+                break
+            wait = due - (time.perf_counter() - started)
+            if wait > 0:
+                time.sleep(wait)
+            if packet is None:
+                self.dropped += 1
+                continue
+            send(packet)
+            self.sent += 1
+        self.elapsed = time.perf_counter() - started
+
+    def serve_udp(self, port, host = "127.0.0.1", stop_event = None):
+        """Send every packet to a receiver listening on host:port."""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            self._play(lambda packet: sock.sendto(packet, (host, port)), stop_event)
+
+    def serve_tcp(self, port, host = "127.0.0.1", stop_event = None, ready = None):
+        """Wait for one client on host:port and stream to it (ready is set once listening)."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server.bind((host, port))
+            server.listen(1)
+            if ready is not None:
+                ready.set()
+            client, _ = server.accept()
+            with client:
+                client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self._play(client.sendall, stop_event)
+
+    def start(self, protocol = 'udp', port = 5005, host = "127.0.0.1"):
+        """Play in a background thread; returns (thread, stop event)."""
+        stop_event = threading.Event()
+        ready = threading.Event()
+        if protocol == 'tcp':
+            target, kwargs = self.serve_tcp, {"ready": ready}
+        else:
+            target, kwargs = self.serve_udp, {}
+            ready.set()
+        thread = threading.Thread(target = target, args = (port, host, stop_event), kwargs = kwargs, daemon = True)
+        thread.start()
+        ready.wait()
+        return thread, stop_event
+
+    def summary(self):
+        samples = self.sent * self.frames_per_packet
+        rate = samples / self.elapsed if self.elapsed else float('nan')
+        return (f"sent {self.sent} packets ({samples} frames), dropped {self.dropped}, "
+                f"{self.elapsed:.2f} s, {rate:.0f} frames/s")
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Replay force plate trial CSVs as a live Fz stream (UDP or TCP).")
+    parser.add_argument("files", nargs = '+')
+    parser.add_argument("--protocol", choices = ('udp', 'tcp'), default = 'udp')
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 5005)
+    parser.add_argument("--plates", type = int, default = 2, help = "channels per frame")
+    parser.add_argument("--columns", nargs = '+', default = list(default_columns), help = "Fz column letters, one per plate")
+    parser.add_argument("--sample-rate", type = float, default = sf)
+    parser.add_argument("--speed", type = float, default = 1.0, help = "playback speed, 0 = as fast as possible")
+    parser.add_argument("--frames-per-packet", type = int, default = frames_per_packet)
+    parser.add_argument("--jitter-ms", type = float, default = 0.0, help = "SD of the extra delay per packet")
+    parser.add_argument("--loss", type = float, default = 0.0, help = "fraction of packets dropped")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--loop", action = 'store_true', help = "start again after the last file")
+    args = parser.parse_args(argv)
+
+    simulator = Simulator.from_files(args.files, args.plates, args.columns, sf = args.sample_rate, speed = args.speed,
+                                     frames_per_packet = args.frames_per_packet, jitter = args.jitter_ms / 1000,
+                                     loss = args.loss, seed = args.seed, loop = args.loop)
+    print(f"Streaming {len(simulator.frames)} frames x {args.plates} plates over {args.protocol} "
+          f"{args.host}:{args.port} at {args.speed or 'max'}x")
+    try:
+        if args.protocol == 'tcp':
+            simulator.serve_tcp(args.port, args.host)
+        else:
+            simulator.serve_udp(args.port, args.host)
+    except KeyboardInterrupt:
+        pass
+    if simulator.elapsed is not None:
+        print(simulator.summary())
+
+
+if __name__ == "__main__":
+    main()
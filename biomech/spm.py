@@ -0,0 +1,301 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.integrate import cumulative_trapezoid
+from biomech import permutation
+from biomech.normalise import n_points, parse_trial, time_normalise, trial_name
+
+# SPM1D CMJ pipeline from the 'Misc/Cleary SPM1D CMJ' notebooks as an importable module:
+# read each Hawkin export once, integrate it once, crop start of movement -> takeoff and
+# normalise to body mass and 0-100% of the phase (force, velocity, position and power
+# together), pair trials by subject and run paired SPM t-tests per variable or one
+# Hotelling's T2 test over several variables (parametric like the notebooks, or
+# sign-flip permutations with --nonparam). Normalised curves are cached next to the
+# data so a rerun only processes new or changed files.
+#
+#   python -m biomech.spm "Misc/SPM1D CMJ Data" --plot spm.png
+#   python -m biomech.spm "Misc/SPM1D CMJ Data" --variables force velocity power --hotelling
+
+sf = 1000  # Hz, Hawkin sampling frequency
+quiet_samples = 1000  # first 1 s is the weighing phase
+takeoff_threshold = 30  # N
+gravity = 9.81
+alpha = 0.05
+
+all_variables = ('force', 'velocity', 'position', 'power')
+units = {'force': 'N/kg', 'velocity': 'm/s', 'position': 'm', 'power': 'W/kg'}
+
+CACHE_FILE = ".spm_cache.npz"
+CACHE_VERSION = 2  # bump when the curve calculation changes so old caches are ignored
+
+
+def read_force(file_path):
+    """Total vertical force, the first column of the exported CSV."""
+    return pd.read_csv(file_path, usecols = [0]).iloc[:, 0].to_numpy(dtype = np.float64)
+
+
+def cmj_phase(fz, quiet_samples = quiet_samples):
+    """Body weight (mean, sd) and the start of movement and takeoff indices.
+
+    Same rules as the notebooks' while loops: movement starts at the first sample (from 20)
+    more than 5 SD below body weight, backed up to the last sample within 1 SD of it, and
+    takeoff is the first sample at or below 30 N after that.
+    """
+    fz = np.asarray(fz, dtype = np.float64)
+    bw_mean = fz[:quiet_samples].mean()
+    bw_sd = fz[:quiet_samples].std(ddof = 1)
+
+    below = np.flatnonzero(fz[20:] <= bw_mean - 5 * bw_sd)
+    if below.size == 0:
+        raise ValueError("no countermovement found (force never drops 5 SD below body weight)")
+    start_move = int(below[0]) + 20
+    within = np.flatnonzero(fz[:start_move + 1] >= bw_mean - bw_sd)
+    if within.size == 0:
+        raise ValueError("force is never within 1 SD of body weight before the countermovement")
+    start_move = int(within[-1])
+
+    airborne = np.flatnonzero(fz[start_move:] <= takeoff_threshold)
+    if airborne.size == 0:
+        raise ValueError(f"no takeoff found (force never drops to {takeoff_threshold} N)")
+    takeoff = start_move + int(airborne[0])
+    return {"bw_mean": bw_mean, "bw_sd": bw_sd, "start_move": start_move, "takeoff": takeoff}
+
+
+def cmj_curves(fz, sf = sf):
+    """Force (N/kg), COM velocity (m/s), position (m) and power (W/kg) from start of movement
+    to takeoff, as a (4 x samples) array in the order of `all_variables`.
+
+    Velocity and position are integrated from the start of the file (the weighing phase,
+    where they stay near zero) up to takeoff only.
+    """
+    fz = np.asarray(fz, dtype = np.float64)
+    phase = cmj_phase(fz)
+    start_move, takeoff = phase["start_move"], phase["takeoff"]
+    bodymass = phase["bw_mean"] / gravity
+    force = fz[:takeoff] / bodymass
+    velocity = cumulative_trapezoid(force - gravity, dx = 1 / sf, initial = 0)
+    position = cumulative_trapezoid(velocity, dx = 1 / sf, initial = 0)
+    return np.vstack((force, velocity, position, force * velocity))[:, start_move:]
+
+
+def trial_files(folder):
+    return sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith('.csv'))
+
+
+def _stamp(file_path):
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CurveCache:
+    """Time normalised (variables x n_points) curves keyed by trial name, saved to one .npz file.
+
+    An entry is reused only while the source file's modification time and size are
+    unchanged and the curves were made with the same n_points and CACHE_VERSION.
+    """
+
+    def __init__(self, cache_path, n_points = n_points):
+        self.cache_path = cache_path
+        self.n_points = n_points
+        self.entries = {}
+        self.changed = False
+        if cache_path and os.path.exists(cache_path):
+            self._load()
+
+    def _load(self):
+        try:
+            with np.load(self.cache_path) as cache:
+                if int(cache["version"]) != CACHE_VERSION or cache["curves"].shape[1:] != (len(all_variables), self.n_points):
+                    return
+                for name, stamp, curve in zip(cache["names"], cache["stamps"], cache["curves"]):
+                    self.entries[str(name)] = (tuple(int(s) for s in stamp), curve)
+        except (OSError, KeyError, ValueError):
+            # unreadable cache, everything is recomputed and the cache rewritten
+            self.entries = {}
+
+    def get(self, file_path):
+        entry = self.entries.get(trial_name(file_path))
+        if entry is not None and entry[0] == _stamp(file_path):
+            return entry[1]
+        return None
+
+    def put(self, file_path, curve):
+        self.entries[trial_name(file_path)] = (_stamp(file_path), curve)
+        self.changed = True
+
+    def save(self):
+        if not self.cache_path or not self.changed:
+            return
+        names = sorted(self.entries)
+        np.savez(self.cache_path,
+                 version = CACHE_VERSION,
+                 names = np.array(names),
+                 stamps = np.array([self.entries[n][0] for n in names], dtype = np.int64).reshape(-1, 2),
+                 curves = np.array([self.entries[n][1] for n in names]).reshape(-1, len(all_variables), self.n_points))
+        self.changed = False
+
+
+def load_curves(file_paths, cache = None, n_points = n_points):
+    """(trial names, n_trials x variables x n_points curves, number of trials recomputed).
+
+    Each new or changed file is read and integrated once; all of its variables are
+    normalised together with every other trial in one time_normalise call.
+    """
+    curves = [cache.get(path) if cache is not None else None for path in file_paths]
+    stale = [i for i, curve in enumerate(curves) if curve is None]
+    if stale:
+        segments = [segment for i in stale for segment in cmj_curves(read_force(file_paths[i]))]
+        fresh = time_normalise(segments, n_points).reshape(len(stale), len(all_variables), n_points)
+        for i, curve in zip(stale, fresh):
+            curves[i] = curve
+            if cache is not None:
+                cache.put(file_paths[i], curve)
+    names = [trial_name(path) for path in file_paths]
+    return names, np.array(curves).reshape(-1, len(all_variables), n_points), len(stale)
+
+
+def pair_by_subject(names, curves, conditions = ('PRE', 'POST')):
+    """Subjects with trials in both conditions and their (pre, post) curves, row aligned.
+
+    Repeated trials of a subject in the same condition are averaged. Trials without a
+    condition token or whose subject is missing the other condition are left out.
+    """
+    first, second = (c.upper() for c in conditions)
+    rows = {}
+    for i, name in enumerate(names):
+        subject, condition = parse_trial(name, conditions)
+        if condition is not None:
+            rows.setdefault(subject, {}).setdefault(condition, []).append(i)
+    subjects = sorted(s for s, trials in rows.items() if first in trials and second in trials)
+    shape = (-1,) + curves.shape[1:]
+    pre = np.array([curves[rows[s][first]].mean(axis = 0) for s in subjects]).reshape(shape)
+    post = np.array([curves[rows[s][second]].mean(axis = 0) for s in subjects]).reshape(shape)
+    return subjects, pre, post
+
+
+def paired_ttest(pre, post, alpha = alpha):
+    """spm1d paired t-test with parametric inference (what the notebooks run)."""
+    import spm1d
+    return spm1d.stats.ttest_paired(pre, post).inference(alpha = alpha)
+
+
+def paired_hotelling(pre, post, alpha = alpha):
+    """spm1d paired Hotelling's T2 on (subjects x nodes x variables) curves."""
+    import spm1d
+    return spm1d.stats.hotellings_paired(pre, post).inference(alpha = alpha)
+
+
+def run_pipeline(folder, cache_path = "", conditions = ('PRE', 'POST'), n_points = n_points, alpha = alpha,
+                 nonparam = False, iterations = permutation.iterations, workers = None, seed = 0,
+                 variables = ('force',), hotelling = False):
+    """Ingest every CSV in folder and run the paired SPM tests.
+
+    Returns the curves plus result['spm'], a dict of SPM inference results: one
+    paired t-test per variable, or a single 'hotelling' entry when hotelling = True.
+    cache_path '' uses '.spm_cache.npz' in folder and None turns the cache off. With
+    nonparam = True inference uses sign-flip permutations (see biomech.permutation).
+    """
+    unknown = [v for v in variables if v not in all_variables]
+    if unknown:
+        raise ValueError(f"unknown variables {unknown}, choose from {all_variables}")
+    if cache_path == "":
+        cache_path = os.path.join(folder, CACHE_FILE)
+    cache = CurveCache(cache_path, n_points) if cache_path else None
+    files = trial_files(folder)
+    names, curves, n_computed = load_curves(files, cache, n_points)
+    if cache is not None:
+        cache.save()
+
+    subjects, pre, post = pair_by_subject(names, curves, conditions)
+    if len(subjects) < 2:
+        raise ValueError(f"need at least 2 subjects with both {conditions[0]} and {conditions[1]} trials, found {len(subjects)}")
+    columns = [all_variables.index(v) for v in variables]
+    pre = {v: pre[:, c] for v, c in zip(variables, columns)}
+    post = {v: post[:, c] for v, c in zip(variables, columns)}
+
+    if hotelling:
+        # spm1d layout: subjects x nodes x variables
+        pre_stack = np.stack([pre[v] for v in variables], axis = -1)
+        post_stack = np.stack([post[v] for v in variables], axis = -1)
+        spm = {"hotelling": (permutation.paired_hotelling_nonparam(pre_stack, post_stack, alpha, iterations,
+                                                                   workers = workers, seed = seed)
+                             if nonparam else paired_hotelling(pre_stack, post_stack, alpha))}
+    else:
+        spm = {v: (permutation.paired_ttest_nonparam(pre[v], post[v], alpha, iterations, workers = workers, seed = seed)
+                   if nonparam else paired_ttest(pre[v], post[v], alpha))
+               for v in variables}
+    return {"names": names,
+            "curves": curves,
+            "n_computed": n_computed,
+            "subjects": subjects,
+            "pre": pre,
+            "post": post,
+            "spm": spm}
+
+
+def cluster_table(spmi):
+    """One row per suprathreshold cluster: start/end node and p value."""
+    return pd.DataFrame([{"Start node": c.endpoints[0], "End node": c.endpoints[1], "p": float(c.P)}
+                         for c in spmi.clusters], columns = ["Start node", "End node", "p"])
+
+
+def plot_spm(spm, save_path):
+    """Plot every SPM result in the dict returned by run_pipeline, one panel each."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    fig, axes = plt.subplots(len(spm), 1, figsize = (10, 4 * len(spm) + 2), squeeze = False)
+    for ax, (name, spmi) in zip(axes[:, 0], spm.items()):
+        plt.sca(ax)
+        spmi.plot()
+        spmi.plot_threshold_label()
+        ax.set_title(name.capitalize())
+    plt.xlabel('Time (0-100%)')
+    plt.tight_layout()
+    plt.savefig(save_path, dpi = 150, bbox_inches = 'tight')
+    plt.close(fig)
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Paired SPM1D analysis of CMJ curves (start of movement to takeoff).")
+    parser.add_argument("folder", help = "folder of CSV exports named like 001-PRE.csv / 001-POST.csv")
+    parser.add_argument("--conditions", nargs = 2, default = ["PRE", "POST"], metavar = ("A", "B"))
+    parser.add_argument("--variables", nargs = "+", default = ["force"], choices = all_variables)
+    parser.add_argument("--hotelling", action = "store_true", help = "one Hotelling's T2 test over all --variables")
+    parser.add_argument("--alpha", type = float, default = alpha)
+    parser.add_argument("--points", type = int, default = n_points, help = "nodes per normalised curve")
+    parser.add_argument("--nonparam", action = "store_true", help = "permutation inference instead of parametric")
+    parser.add_argument("--iterations", type = int, default = permutation.iterations)
+    parser.add_argument("--workers", type = int, default = None)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--cache", default = "", help = f"cache file (default: {CACHE_FILE} in folder)")
+    parser.add_argument("--no-cache", action = "store_true")
+    parser.add_argument("--out", default = None, help = "CSV for the SPM curves and thresholds")
+    parser.add_argument("--plot", default = None, help = "image file for the SPM plots")
+    args = parser.parse_args(argv)
+
+    result = run_pipeline(args.folder, None if args.no_cache else args.cache,
+                          tuple(args.conditions), args.points, args.alpha,
+                          args.nonparam, args.iterations, args.workers, args.seed,
+                          tuple(args.variables), args.hotelling)
+    print(f"{len(result['names'])} trials ({result['n_computed']} processed, the rest cached), "
+          f"{len(result['subjects'])} paired subjects")
+    out = {"Node": np.arange(args.points)}
+    for name, spmi in result["spm"].items():
+        print(f"{name}: critical value = {spmi.zstar:.3f}, H0 rejected: {bool(spmi.h0reject)}")
+        clusters = cluster_table(spmi)
+        if len(clusters):
+            print(clusters.to_string(index = False))
+        out[name] = spmi.z
+        out[f"{name} critical"] = spmi.zstar
+
+    if args.out:
+        pd.DataFrame(out).to_csv(args.out, index = False)
+    if args.plot:
+        plot_spm(result["spm"], args.plot)
+
+
+if __name__ == "__main__":
+    main()
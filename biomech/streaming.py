@@ -0,0 +1,198 @@
+import numpy as np
+import pandas as pd
+
+from biomech import kernels
+from biomech.forceplate import (body_weight, end_land_delay, gravity, land_delay, last_above, quiet_samples, sf,
+                                takeoff_threshold)
+from biomech.timeline import EventTimeline
+
+# Online version of forceplate.detect_cmj_events for force arriving in blocks (a live
+# plate, a file read in chunks). Body weight comes from the same first quiet_samples,
+# the velocity is integrated block by block in the same order as
+# cumulative_trapezoid, and each event uses the same search as the offline rules over
+# only the samples that are new since the last block, so a completed trial gives the
+# same events as detect_cmj_events on the whole array. Each event is emitted as soon as
+# the samples that decide it have arrived:
+#
+#   start_move  when the force first drops 5 SD below body weight
+#   start_ecc   at takeoff (the lowest velocity between start_move and takeoff)
+#   start_con   at the first velocity >= 0 after start_ecc (before takeoff in a normal jump)
+#   takeoff     at the first sample <= takeoff_threshold
+#   land        at the first sample >= takeoff_threshold, land_delay after takeoff
+#   end_land    at the first sample back at body weight, end_land_delay after landing
+#
+# The samples of the trial are kept until reset(), so memory grows with the trial.
+
+# 'settling' is a trial that has landed but whose velocity hasn't come back to zero yet
+states = ('quiet', 'standing', 'moving', 'flight', 'landing', 'settling', 'done', 'failed')
+
+
+class CMJDetector:
+    def __init__(self, sf = sf, end_land_delay = end_land_delay, quiet_samples = quiet_samples, capacity = 1 << 14):
+        self.sf = sf
+        self.end_land_delay = end_land_delay
+        self.quiet_samples = quiet_samples
+        self._capacity = capacity
+        self.reset()
+
+    def reset(self):
+        self._fz = np.empty(self._capacity)
+        self._velo = np.empty(self._capacity)
+        self.n = 0  # samples received
+        self.n_velo = 0  # velo[i] is at sample i + 1, so it lags one sample
+        self.state = 'quiet'
+        self.error = None
+        self.bw_mean = self.bw_sd = self.bodymass = None
+        self.events = EventTimeline(sf = self.sf)
+        self._cursor = 20  # next sample the current search starts from
+        self._con_cursor = None  # next velocity searched for start_con
+
+    @property
+    def fz(self):
+        return self._fz[:self.n]
+
+    @property
+    def velo(self):
+        return self._velo[:self.n_velo]
+
+    @property
+    def done(self):
+        return self.state in ('done', 'failed')
+
+    def jump_height(self):
+        """Jump height (m) from the takeoff velocity, once the sample after takeoff is in."""
+        takeoff = self.events.get("takeoff")
+        if takeoff is None or takeoff >= self.n_velo:
+            return None
+        return self._velo[takeoff] ** 2 / (gravity * 2)
+
+    def _grow(self, n):
+        if n <= len(self._fz):
+            return
+        size = max(n, 2 * len(self._fz))
+        for name in ('_fz', '_velo'):
+            grown = np.empty(size)
+            old = getattr(self, name)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+
+    def _integrate(self):
+        # velo for the samples received since the last call, carrying the running sum
+        # the way np.cumsum would over the whole trial
+        if self.n < 2 or self.n_velo == self.n - 1:
+            return
+        start = self.n_velo  # first new velo index, uses samples start and start + 1
+        self._velo[start:self.n - 1] = kernels.velocity(self._fz[start:self.n], self.bw_mean, self.bodymass,
+                                                        1 / self.sf, self._velo[start - 1] if start > 0 else None)
+        self.n_velo = self.n - 1
+
+    def feed(self, block):
+        """Add a block of samples; returns the [(event, sample)] found in it, in order."""
+        block = np.asarray(block, dtype = np.float64).ravel()
+        if self.done or not len(block):
+            return []
+        self._grow(self.n + len(block))
+        self._fz[self.n:self.n + len(block)] = block
+        self.n += len(block)
+        if self.state == 'quiet':
+            if self.n < self.quiet_samples:
+                return []
+            self.bw_mean, self.bw_sd, self.bodymass = body_weight(self._fz[:self.quiet_samples], self.quiet_samples)
+            self.state = 'standing'
+        self._integrate()
+        emitted = []
+        try:
+            while self._step(emitted):
+                pass
+        except ValueError as error:  # the offline rules would fail on this trial too
+            self.state = 'failed'
+            self.error = str(error)
+        return emitted
+
+    def _emit(self, emitted, name, sample):
+        self.events[name] = sample
+        emitted.append((name, sample))
+
+    def _search(self, level, above = False):
+        # first sample from the cursor at or below level (at or above if above), only
+        # looking at samples not searched yet; None (and the cursor moves on) if it
+        # hasn't happened yet
+        found = kernels.first_crossing(self._fz[:self.n], level, self._cursor, above)
+        if found < 0:
+            self._cursor = max(self._cursor, self.n)
+            return None
+        return found
+
+    def _step(self, emitted):
+        """Advance one state if the data allows it; True if it did."""
+        self._find_start_con(emitted)
+        if self.state == 'standing':
+            below = self._search(self.bw_mean - self.bw_sd * 5)
+            if below is None:
+                return False
+            self._emit(emitted, "start_move", last_above(self.fz, self.bw_mean, below, "start of movement"))
+            self._cursor = self.events["start_move"]
+            self.state = 'moving'
+            return True
+        if self.state == 'moving':
+            takeoff = self._search(takeoff_threshold)
+            if takeoff is None:
+                return False
+            start_move = self.events["start_move"]
+            self._emit(emitted, "start_ecc", start_move + int(np.argmin(self.velo[start_move:takeoff])))
+            self._emit(emitted, "takeoff", takeoff)
+            self._con_cursor = self.events["start_ecc"]
+            self._find_start_con(emitted)
+            self._cursor = takeoff + land_delay
+            self.state = 'flight'
+            return True
+        if self.state == 'flight':
+            land = self._search(takeoff_threshold, above = True)
+            if land is None:
+                return False
+            self._emit(emitted, "land", land)
+            self._cursor = land + self.end_land_delay
+            self.state = 'landing'
+            return True
+        if self.state == 'landing':
+            back = self._search(self.bw_mean)
+            if back is None:
+                return False
+            self._emit(emitted, "end_land", last_above(self.fz, self.bw_mean, back, "end of landing"))
+            self.state = 'done' if "start_con" in self.events else 'settling'
+            return False
+        return False
+
+    def _find_start_con(self, emitted):
+        if self._con_cursor is None or "start_con" in self.events:
+            return
+        start_con = kernels.first_crossing(self.velo, 0, self._con_cursor, above = True)
+        if start_con >= 0:
+            self._emit(emitted, "start_con", start_con)
+            if self.state == 'settling':
+                self.state = 'done'
+        else:
+            self._con_cursor = max(self._con_cursor, self.n_velo)
+
+
+def stream_events(blocks, **options):
+    """Feed blocks (any iterable of arrays) to a CMJDetector until the trial is done.
+
+    Stops reading as soon as end_land is found, so a reader can skip the rest of a file.
+    """
+    detector = CMJDetector(**options)
+    for block in blocks:
+        detector.feed(block)
+        if detector.done:
+            break
+    return detector
+
+
+def csv_blocks(file_path, columns, chunk_rows = 2000):
+    """Total force of the given (0-based) columns of a trial CSV, chunk_rows samples at a time.
+
+    The file is only read as far as the blocks are taken, e.g. by stream_events.
+    """
+    with pd.read_csv(file_path, chunksize = chunk_rows) as reader:
+        for chunk in reader:
+            yield chunk.iloc[:, list(columns)].to_numpy(dtype = np.float64).sum(axis = 1)
@@ -0,0 +1,251 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# Synthetic force plate trials in the layout the Bertec programs read (22 columns with
+# Fz for the left and right plates in columns F and Q by default). Each trial is built
+# from an acceleration profile, so the ground truth (event samples, takeoff velocity,
+# jump height) is known exactly and can be checked against the analysis code, and
+# trials can be generated by the thousand for load tests.
+#
+#   python -m biomech.synthetic out_folder --kind cmj --count 1000 --duration 10
+
+sf = 1000  # Hz
+gravity = 9.81
+n_columns = 22
+fz_columns = (5, 16)  # left, right (columns F and Q)
+kinds = ('cmj', 'single_leg', 'drop_landing', 'drop_jump')
+single_leg_kinds = ('single_leg', 'drop_landing')  # all force on one plate, leg in the file name
+
+# phase durations in seconds, override any of them with the `timing` argument
+default_timing = {"unweight": 0.35,  # start of movement -> peak downward velocity
+                  "push": 0.45,  # braking + propulsion
+                  "offload": 0.03,  # force falling to zero before takeoff
+                  "contact": 0.25,  # drop jump ground contact before offloading
+                  "impact": 0.05,  # landing impact peak
+                  "absorb": 0.35,  # rest of the landing
+                  "drop": 1.0}  # time in the air before a drop landing/jump contact
+
+
+def _sin(n):
+    return np.sin(np.pi * np.arange(n) / n)
+
+
+def _sin2(n):
+    return _sin(n) ** 2
+
+
+def _samples(seconds, sf):
+    return max(int(round(seconds * sf)), 1)
+
+
+def _landing(v_contact, timing, sf):
+    # two positive lobes (impact + absorption) that bring a downward velocity to zero
+    n_i, n_b = _samples(timing["impact"], sf), _samples(timing["absorb"], sf)
+    impact, absorb = _sin(n_i), _sin(n_b)
+    a_i = 0.6 * -v_contact * sf / impact.sum()
+    a_b = 0.4 * -v_contact * sf / absorb.sum()
+    return np.concatenate((a_i * impact, a_b * absorb))
+
+
+def _takeoff(v_start, vto, lead, timing, sf):
+    # `lead` (a negative lobe or nothing) then a push lobe and the offload to -g,
+    # with the push scaled so the velocity at the end is exactly vto
+    n_p, n_o = _samples(timing["push"] if lead.size else timing["contact"], sf), _samples(timing["offload"], sf)
+    offload = -gravity * np.sin(0.5 * np.pi * np.arange(n_o) / n_o) ** 2
+    push = _sin(n_p)
+    a_p = (vto - v_start - (lead.sum() + offload.sum()) / sf) * sf / push.sum()
+    return np.concatenate((lead, a_p * push, offload))
+
+
+def _first_at_or_above_zero(velocity, start):
+    return start + int(np.flatnonzero(velocity[start:] >= 0)[0])
+
+
+def trial_acceleration(kind = 'cmj', jump_height = 0.3, drop_height = 0.3, unweight_fraction = 0.6,
+                       timing = None, sf = sf):
+    """Centre of mass acceleration (m/s^2) from the first on/off plate change to the end of
+    landing, whether each sample is in contact with the plate, and the events.
+
+    Events are sample indices relative to the start of the returned arrays.
+    """
+    timing = {**default_timing, **(timing or {})}
+    vto = np.sqrt(2 * gravity * jump_height)
+    events = {}
+
+    if kind in ('cmj', 'single_leg'):
+        unweight = -unweight_fraction * gravity * _sin2(_samples(timing["unweight"], sf))
+        contact = _takeoff(0.0, vto, unweight, timing, sf)
+        velocity = np.cumsum(contact) / sf
+        events["start_move"] = 0
+        events["start_ecc"] = len(unweight)
+        events["start_con"] = _first_at_or_above_zero(velocity, len(unweight))
+        lead_air = 0
+    elif kind in ('drop_landing', 'drop_jump'):
+        v_impact = -np.sqrt(2 * gravity * drop_height)
+        lead_air = _samples(timing["drop"], sf)
+        events["ground_contact"] = lead_air
+        if kind == 'drop_landing':
+            landing = _landing(v_impact, timing, sf)
+            accel = np.concatenate((np.full(lead_air, -gravity), landing))
+            in_contact = np.concatenate((np.zeros(lead_air, bool), np.ones(len(landing), bool)))
+            events["end_land"] = len(accel)
+            return accel, in_contact, events, {"impact_velocity": v_impact, "takeoff_velocity": None,
+                                              "jump_height": None, "flight_time": None}
+        contact = _takeoff(v_impact, vto, np.empty(0), timing, sf)
+        velocity = v_impact + np.cumsum(contact) / sf
+        events["start_con"] = lead_air + _first_at_or_above_zero(velocity, 0)
+    else:
+        raise ValueError(f"unknown trial kind '{kind}', choose from {kinds}")
+
+    flight = _samples(2 * vto / gravity, sf)
+    landing = _landing(-vto, timing, sf)
+    accel = np.concatenate((np.full(lead_air, -gravity), contact, np.full(flight, -gravity), landing))
+    in_contact = np.concatenate((np.zeros(lead_air, bool), np.ones(len(contact), bool),
+                                 np.zeros(flight, bool), np.ones(len(landing), bool)))
+    events["takeoff"] = lead_air + len(contact)
+    events["land"] = events["takeoff"] + flight
+    events["end_land"] = events["land"] + len(landing)
+    truth = {"impact_velocity": None if kind in ('cmj', 'single_leg') else -np.sqrt(2 * gravity * drop_height),
+             "takeoff_velocity": vto,
+             "jump_height": jump_height,
+             "flight_time": flight / sf}
+    return accel, in_contact, events, truth
+
+
+def make_trial(kind = 'cmj', duration = 8.0, start_time = 2.0, bodymass = 80.0, jump_height = 0.3,
+               drop_height = 0.3, asymmetry = 0.0, leg = 'left', noise = 2.0, sway = 0.0,
+               unweight_fraction = 0.6, timing = None, sf = sf, fz_columns = fz_columns, seed = None):
+    """One synthetic trial.
+
+    The movement (or the drop) starts at start_time and the rest of the trial is quiet
+    stance (or empty plates before a drop). asymmetry is (right - left) / total force
+    for two-legged trials; single leg kinds put everything on the `leg` plate. noise is the
+    SD (N) of each plate's white noise and sway the amplitude of slow postural sway as a
+    fraction of body weight.
+
+    Returns a dict with the 22 column DataFrame ('data'), the noise-free total force,
+    ground truth events as absolute sample indices, jump height, takeoff velocity etc.
+    """
+    rng = np.random.default_rng(seed)
+    weight = bodymass * gravity
+    accel, in_contact, events, truth = trial_acceleration(kind, jump_height, drop_height, unweight_fraction, timing, sf)
+
+    n = _samples(duration, sf)
+    start = _samples(start_time, sf)
+    if start + len(accel) > n:
+        raise ValueError(f"a {duration} s trial is too short for this movement starting at {start_time} s")
+    on_plate_before = kind in ('cmj', 'single_leg')
+
+    total = np.zeros(n)
+    if on_plate_before:
+        total[:start] = weight
+    total[start:start + len(accel)] = np.where(in_contact, bodymass * (gravity + accel), 0.0)
+    total[start + len(accel):] = weight
+    contact = total > 0
+    # slow sway while standing, not while moving
+    standing = contact.copy()
+    standing[start:start + len(accel)] = False
+    t = np.arange(n) / sf
+    total_measured = total + standing * sway * weight * np.sin(2 * np.pi * 0.3 * t + rng.uniform(0, 2 * np.pi))
+
+    if kind in single_leg_kinds:
+        right_share = 1.0 if leg == 'right' else 0.0
+    else:
+        right_share = 0.5 * (1 + asymmetry)
+    left = (1 - right_share) * total_measured + rng.normal(0, noise, n)
+    right = right_share * total_measured + rng.normal(0, noise, n)
+
+    data = rng.normal(0, noise / 10, (n, n_columns))
+    data[:, fz_columns[0]] = left
+    data[:, fz_columns[1]] = right
+    names = [f"Channel {chr(65 + i)}" for i in range(n_columns)]
+    names[fz_columns[0]], names[fz_columns[1]] = "Fz Left", "Fz Right"
+
+    events = {name: start + idx for name, idx in events.items()}
+    if kind == 'drop_landing':
+        events["peak_force"] = int(np.argmax(total))
+    return {"kind": kind,
+            "data": pd.DataFrame(data, columns = names),
+            "fz_total": total,
+            "sf": sf,
+            "fz_columns": fz_columns,
+            "bodymass": bodymass,
+            "leg": leg if kind in single_leg_kinds else None,
+            "drop_height": drop_height if kind in ('drop_landing', 'drop_jump') else None,
+            "events": events,
+            **truth}
+
+
+def write_trial(trial, file_path):
+    trial["data"].to_csv(file_path, index = False, float_format = '%.4f')
+
+
+def random_trials(count, kind = 'cmj', seed = 0, **fixed):
+    """Yield `count` trials with randomised athletes, jump heights and timing.
+
+    Every trial gets its own child of SeedSequence(seed), so trial i is the same no
+    matter how many are generated. Keyword arguments fix any make_trial parameter.
+    """
+    for child in np.random.SeedSequence(seed).spawn(count):
+        rng = np.random.default_rng(child)
+        params = {"kind": kind,
+                  "bodymass": rng.uniform(50, 110),
+                  "jump_height": rng.uniform(0.15, 0.5) if kind != 'single_leg' else rng.uniform(0.05, 0.2),
+                  "drop_height": rng.uniform(0.2, 0.6),
+                  "asymmetry": rng.normal(0, 0.08),
+                  "leg": 'left' if rng.random() < 0.5 else 'right',
+                  "start_time": rng.uniform(2.0, 3.0),
+                  "timing": {"unweight": rng.uniform(0.25, 0.45), "push": rng.uniform(0.35, 0.55),
+                             "contact": rng.uniform(0.18, 0.35), "absorb": rng.uniform(0.25, 0.45),
+                             "drop": rng.uniform(0.6, 1.2)},
+                  "seed": child}
+        params.update(fixed)
+        yield make_trial(**params)
+
+
+def truth_row(file_name, trial):
+    row = {"File": file_name, "Kind": trial["kind"], "Leg": trial["leg"], "Body Mass (kg)": trial["bodymass"],
+           "Jump Height (m)": trial["jump_height"], "Takeoff Velocity (m/s)": trial["takeoff_velocity"],
+           "Drop Height (m)": trial["drop_height"]}
+    row.update({f"{name} (sample)": idx for name, idx in trial["events"].items()})
+    return row
+
+
+def generate(folder, count, kind = 'cmj', seed = 0, **fixed):
+    """Write `count` random trials plus 'ground_truth.csv' to folder; returns the truth table."""
+    os.makedirs(folder, exist_ok = True)
+    rows = []
+    for i, trial in enumerate(random_trials(count, kind, seed, **fixed)):
+        # the single leg programs take the leg from the file name
+        leg = f"-{trial['leg'].upper()}" if trial["leg"] else ""
+        file_name = f"SYN{i:05d}-{kind.upper()}{leg}.csv"
+        write_trial(trial, os.path.join(folder, file_name))
+        rows.append(truth_row(file_name, trial))
+    truth = pd.DataFrame(rows)
+    truth.to_csv(os.path.join(folder, "ground_truth.csv"), index = False)
+    return truth
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Write synthetic Bertec style force plate trials with known ground truth.")
+    parser.add_argument("folder")
+    parser.add_argument("--kind", choices = kinds, default = 'cmj')
+    parser.add_argument("--count", type = int, default = 10)
+    parser.add_argument("--duration", type = float, default = 8.0, help = "trial length (s)")
+    parser.add_argument("--sample-rate", type = float, default = sf)
+    parser.add_argument("--noise", type = float, default = 2.0, help = "plate noise SD (N)")
+    parser.add_argument("--fz-columns", type = int, nargs = 2, default = list(fz_columns), metavar = ("LEFT", "RIGHT"),
+                        help = "0-based Fz column positions")
+    parser.add_argument("--seed", type = int, default = 0)
+    args = parser.parse_args(argv)
+
+    truth = generate(args.folder, args.count, args.kind, args.seed, duration = args.duration,
+                     sf = args.sample_rate, noise = args.noise, fz_columns = tuple(args.fz_columns))
+    print(f"Wrote {len(truth)} {args.kind} trials and ground_truth.csv to {args.folder}")
+
+
+if __name__ == "__main__":
+    main()
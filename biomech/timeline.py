@@ -0,0 +1,40 @@
+# Trial events as integer sample indices plus the sampling rate. Times, phase durations
+# and positions in a cropped part of the trial are worked out from the indices, so the
+# processors don't allocate a full length time array per trial just to look up a few
+# event times, and never have to find an index again by comparing float times.
+
+sf = 1000  # Hz
+
+
+class EventTimeline(dict):
+    """Event name -> sample index (a dict), with the sampling rate to turn them into times.
+
+    offset is the sample of the full trial that index 0 refers to (0 unless cropped).
+    """
+
+    def __init__(self, events = (), sf = sf, offset = 0):
+        super().__init__({name: int(idx) for name, idx in dict(events).items()})
+        self.sf = sf
+        self.offset = offset
+
+    def time(self, name):
+        """Seconds from the start of the trial (or crop) to the event."""
+        return self[name] / self.sf
+
+    def times(self):
+        return {name: idx / self.sf for name, idx in self.items()}
+
+    def duration(self, start, stop):
+        """Seconds from event `start` to event `stop`."""
+        return (self[stop] - self[start]) / self.sf
+
+    def cropped(self, start):
+        """The same events with indices relative to a crop beginning at sample `start`."""
+        return EventTimeline({name: idx - start for name, idx in self.items()}, self.sf, self.offset + start)
+
+    def absolute(self, name):
+        """Index of the event in the full, uncropped trial."""
+        return self.offset + self[name]
+
+    def copy(self):
+        return EventTimeline(self, self.sf, self.offset)
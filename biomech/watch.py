@@ -0,0 +1,329 @@
+import argparse
+import fnmatch
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from biomech import analyses, forceplate
+from biomech.filtering import lowpass
+from biomech.forceplate import sf
+from biomech.registry import AthleteRegistry, subject_token
+from biomech.results_store import append_csv_rows, is_sqlite_path, upsert_rows
+
+# Watch-folder processing for testing days: the Bertec software writes each trial's CSV
+# into a folder, and every file is analysed as soon as it is finished, without dragging
+# it into a window.
+#
+#   FolderWatcher  - finished files: new or rewritten files whose size and modification
+#                    time haven't changed for `settle` seconds (the export is written in
+#                    pieces). Uses watchdog's file system events when it is installed,
+#                    else scans the folder each poll.
+#   route          - the analysis for a file from the test token in its name
+#                    (SMITH01-CMJ-03.csv, SMITH01_DJ_LEFT.csv)
+#   WatchSession   - routes finished files to a process pool, and appends a row per trial
+#                    (file, athlete, test, time, table values) to a results store
+#
+#   python -m biomech.watch "D:/Testing/2024-06-01" --plates 2 --registry athletes.csv
+#
+# The GUI's "Watch Folder" button uses a WatchSession for its own test, and adds each
+# trial to its table and plots as it comes back from the pool.
+
+settle = 1.0  # s a file must stay the same size before it is processed
+poll_interval = 0.5  # s between polls of a session
+fz_columns = {1: (5,), 2: (5, 16)}  # the windows' default Fz columns: F, or F and Q
+
+# test token in the file name -> analysis, for each plate setup
+routes = {1: {"CMJ": analyses.CMJ(), "SLJ": analyses.SingleLegJump(),
+              "DL": analyses.DropLanding(), "DJ": analyses.DropJump()},
+          2: {"CMJ": analyses.DualCMJ(), "DL": analyses.DualDropLanding(), "DJ": analyses.DualDropJump()}}
+meta_columns = ["file", "trial", "athlete", "test", "processed"]
+
+
+def route(file_name, routes, default = None):
+    """The analysis for the first token of the file name that is in routes, else default.
+
+    A token routed to None means the file is skipped.
+    """
+    tokens = re.split(r"[^A-Z0-9]+", os.path.splitext(os.path.basename(file_name))[0].upper())
+    for token in tokens:
+        if token in routes:
+            return routes[token]
+    return default
+
+
+def leg_of(file_name):
+    """LEFT or RIGHT from a single leg trial's file name, None if it has neither."""
+    name = os.path.basename(file_name).upper()
+    for leg in analyses.leg_colors:
+        if leg in name:
+            return leg
+    return None
+
+
+class FolderWatcher:
+    """Finished files matching pattern in a folder, each returned once by ready()
+    (again if it is rewritten).
+
+    Files already in the folder when the watcher is made are skipped unless existing is
+    True, and paths in ignore (e.g. a results CSV kept in the folder) never count.
+    """
+
+    def __init__(self, folder, pattern = "*.csv", settle = settle, existing = False, ignore = ()):
+        self.folder = folder
+        self.pattern = pattern
+        self.settle = settle
+        self.ignore = {os.path.abspath(path) for path in ignore if path}
+        self._pending = {}  # path -> (size, mtime, first seen with them)
+        self._done = {}  # path -> (size, mtime) when it was returned
+        self._changed = set()  # paths watchdog reported since the last ready()
+        self._lock = threading.Lock()
+        self._observer = None
+        if not existing:
+            self._done = {path: self._stat(path) for path in self._scan()}
+
+    def start(self):
+        """Listen for file system events if watchdog is installed (else ready() scans)."""
+        try:
+            from watchdog.observers import Observer
+        except ImportError:
+            return
+        self._observer = Observer()
+        self._observer.schedule(self, self.folder, recursive = False)
+        self._observer.start()
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    @property
+    def polling(self):
+        return self._observer is None
+
+    def dispatch(self, event):
+        # called by watchdog's observer thread for every event in the folder
+        if event.is_directory:
+            return
+        for path in (event.src_path, getattr(event, 'dest_path', None)):
+            if path and self._matches(path):
+                with self._lock:
+                    self._changed.add(os.path.abspath(path))
+
+    def _matches(self, path):
+        path = os.fsdecode(path)
+        return fnmatch.fnmatch(os.path.basename(path).lower(), self.pattern.lower()) and \
+            os.path.abspath(path) not in self.ignore
+
+    def _scan(self):
+        with os.scandir(self.folder) as entries:
+            return [os.path.abspath(entry.path) for entry in entries if entry.is_file() and self._matches(entry.path)]
+
+    @staticmethod
+    def _stat(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def ready(self, now = None):
+        """Files that have stopped changing since the last calls, sorted by name."""
+        now = time.monotonic() if now is None else now
+        if self.polling:
+            candidates = set(self._scan())
+        else:
+            with self._lock:
+                candidates, self._changed = self._changed, set()
+        candidates |= set(self._pending)
+        finished = []
+        for path in candidates:
+            key = self._stat(path)
+            if key is None:  # deleted or renamed before it settled
+                self._pending.pop(path, None)
+                continue
+            if self._done.get(path) == key:
+                continue
+            seen = self._pending.get(path)
+            if seen is None or seen[:2] != key:
+                self._pending[path] = key + (now,)
+                continue
+            if key[0] == 0 or now - seen[2] < self.settle or not _readable(path):
+                continue
+            del self._pending[path]
+            self._done[path] = key
+            finished.append(path)
+        return sorted(finished)
+
+
+def _readable(path):
+    # the exporting program may still hold the file open exclusively (Windows)
+    try:
+        with open(path, 'rb'):
+            return True
+    except OSError:
+        return False
+
+
+def process_trial(file_path, test, fz_cols, bodymass = None, drop_height = None, cutoff = None, sf = sf):
+    """Read and analyse one trial CSV (runs in the pool's worker processes)."""
+    dat = forceplate.read_trial(file_path)
+    fz = [forceplate.fz_column(dat, col) for col in fz_cols[:test.plates]]
+    if cutoff is not None:
+        fz = [lowpass(f, cutoff, sf) for f in fz]
+    return test.analyze(fz[0] if test.plates == 1 else fz, sf = sf, bodymass = bodymass, drop_height = drop_height)
+
+
+def result_row(file_path, test, result):
+    """Results store row for one trial: meta_columns, then the table values by label."""
+    trial = os.path.splitext(os.path.basename(file_path))[0]
+    row = {"file": os.path.abspath(file_path), "trial": trial, "athlete": subject_token(trial),
+           "test": test.name, "processed": datetime.now().isoformat(timespec = 'seconds')}
+    row.update(zip(test.variables.values(), test.table_values(result["values"])))
+    return row
+
+
+def registry_inputs(registry):
+    """inputs for a WatchSession that take body mass and box height from an AthleteRegistry."""
+    def inputs(file_name, test):
+        athlete, known = registry.lookup(file_name)
+        if test.needs_mass and known["bodymass"] is None:
+            raise ValueError(f"no body mass for {athlete} in {registry.path}")
+        if test.needs_drop_height and known["drop_height"] is None:
+            raise ValueError(f"no box height for {athlete} in {registry.path}")
+        return known["bodymass"], known["drop_height"]
+    return inputs
+
+
+class WatchSession:
+    """Processes the finished files of a folder in a process pool as they appear.
+
+    routes maps file name tokens to analyses (see route()), default is the analysis for
+    files without a test token. inputs(file_name, test) gives (bodymass, drop_height)
+    for tests that need them; it may return None to skip the file, or raise ValueError.
+    Each processed trial is added to store (SQLite, keyed on the file, or a CSV) if given.
+    """
+
+    def __init__(self, folder, routes, fz_cols, default = None, inputs = None, store = None, table = 'trials',
+                 workers = None, cutoff = None, sf = sf, settle = settle, existing = False):
+        self.watcher = FolderWatcher(folder, settle = settle, existing = existing, ignore = [store])
+        self.routes = routes
+        self.default = default
+        self.fz_cols = list(fz_cols)
+        self.inputs = inputs
+        self.store = store
+        self.table = table
+        self.cutoff = cutoff
+        self.sf = sf
+        self.pool = ProcessPoolExecutor(max_workers = workers)
+        self._running = {}  # future -> (file path, test, (bodymass, drop_height))
+        tests = [test for test in list(routes.values()) + [default] if test is not None]
+        labels = [label for test in tests for label in test.variables.values()]
+        self.columns = meta_columns + list(dict.fromkeys(labels))  # CSV store header
+
+    def start(self):
+        self.watcher.start()
+        return self
+
+    def shutdown(self, wait = False):
+        self.watcher.stop()
+        self.pool.shutdown(wait = wait, cancel_futures = True)
+
+    @property
+    def busy(self):
+        return len(self._running)
+
+    def _submit(self, file_path):
+        test = route(file_path, self.routes, self.default)
+        if test is None:
+            return None
+        if test.unilateral and leg_of(file_path) is None:
+            raise ValueError("no LEFT or RIGHT in the file name")
+        bodymass = drop_height = None
+        if self.inputs is not None and (test.needs_mass or test.needs_drop_height):
+            inputs = self.inputs(os.path.basename(file_path), test)
+            if inputs is None:
+                return None
+            bodymass, drop_height = inputs
+        future = self.pool.submit(process_trial, file_path, test, self.fz_cols, bodymass, drop_height,
+                                  self.cutoff, self.sf)
+        self._running[future] = (file_path, test, (bodymass, drop_height))
+        return future
+
+    def poll(self):
+        """Submit newly finished files and collect the trials that are done.
+
+        Returns a dict per file, in the order they finished: {"file", "test", "inputs",
+        "result", "row", "error"}, with result and row None and error the message if it
+        failed. inputs are the (bodymass, drop_height) it was analysed with.
+        """
+        done = []
+        for file_path in self.watcher.ready():
+            try:
+                self._submit(file_path)
+            except ValueError as error:
+                done.append({"file": file_path, "test": None, "inputs": None, "result": None, "row": None,
+                             "error": str(error)})
+        for future in [future for future in self._running if future.done()]:
+            file_path, test, inputs = self._running.pop(future)
+            entry = {"file": file_path, "test": test, "inputs": inputs, "result": None, "row": None, "error": None}
+            try:
+                entry["result"] = future.result()
+            except Exception as error:  # a bad export mustn't stop the session
+                entry["error"] = str(error) or type(error).__name__
+            else:
+                entry["row"] = result_row(file_path, test, entry["result"])
+            done.append(entry)
+        rows = [entry["row"] for entry in done if entry["row"] is not None]
+        if rows and self.store is not None:
+            if is_sqlite_path(self.store):
+                upsert_rows(self.store, self.table, "file", rows)
+            else:
+                append_csv_rows(self.store, rows, self.columns)
+        return done
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Analyse force plate trial CSVs as they are written to a folder.")
+    parser.add_argument("folder")
+    parser.add_argument("--plates", type = int, choices = (1, 2), default = 2)
+    parser.add_argument("--columns", nargs = '+', default = None,
+                        help = "Fz column letters, one per plate (default F, or F and Q)")
+    parser.add_argument("--default", default = None, help = "test token for files without one, e.g. CMJ")
+    parser.add_argument("--registry", default = None, help = "athletes CSV/SQLite for body mass and box height")
+    parser.add_argument("--store", default = None, help = "results .db (default <folder>/watched_results.db) or .csv")
+    parser.add_argument("--workers", type = int, default = None)
+    parser.add_argument("--settle", type = float, default = settle, help = "s a file must stay the same size")
+    parser.add_argument("--cutoff", type = float, default = None, help = "low-pass Fz at this frequency (Hz)")
+    parser.add_argument("--existing", action = 'store_true', help = "also process files already in the folder")
+    args = parser.parse_args(argv)
+
+    fz_cols = fz_columns[args.plates] if args.columns is None else [ord(col.upper()) - 65 for col in args.columns]
+    store = args.store or os.path.join(args.folder, "watched_results.db")
+    inputs = None if args.registry is None else registry_inputs(AthleteRegistry(args.registry))
+    tests = routes[args.plates]
+    session = WatchSession(args.folder, tests, fz_cols, tests.get(str(args.default).upper()), inputs, store,
+                           workers = args.workers, cutoff = args.cutoff, settle = args.settle,
+                           existing = args.existing).start()
+    mode = "polling" if session.watcher.polling else "watching"
+    print(f"{mode} {args.folder} for {', '.join(tests)} trials, results to {store} (Ctrl+C to stop)")
+    try:
+        while True:
+            for entry in session.poll():
+                name = os.path.basename(entry["file"])
+                if entry["error"] is not None:
+                    print(f"  {name}: not analysed, {entry['error']}")
+                else:
+                    print(f"  {name}: {entry['test'].name}")
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        session.shutdown(wait = True)
+
+
+if __name__ == "__main__":
+    main()
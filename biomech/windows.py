@@ -0,0 +1,44 @@
+import numpy as np
+
+# Sliding-window kernels for isometric (MVIC, LLR etc.) analyses.
+# Everything is built on one cumulative sum so a whole trial is O(N)
+# no matter how wide the window is.
+
+
+def moving_average(signal, window):
+    """Mean of every full `window`-sample epoch, one value per start index.
+
+    Returns an array of length len(signal) - window + 1 where element i is
+    signal[i:i + window].mean().
+    """
+    signal = np.asarray(signal, dtype = np.float64)
+    window = int(window)
+    if window < 1 or window > len(signal):
+        raise ValueError(f"window must be between 1 and {len(signal)} samples, got {window}")
+    csum = np.concatenate(([0.0], np.cumsum(signal)))
+    return (csum[window:] - csum[:-window]) / window
+
+
+def max_mean_window(signal, window):
+    """Start index and value of the epoch with the highest mean (e.g. the 250 ms MVIC)."""
+    averages = moving_average(signal, window)
+    start_idx = int(np.argmax(averages))
+    return start_idx, float(averages[start_idx])
+
+
+
+def moving_variance(signal, window):
+    """Population variance of every full `window`-sample epoch (same layout as moving_average)."""
+    signal = np.asarray(signal, dtype = np.float64)
+    # remove the offset first so the sum of squares doesn't lose precision on large forces
+    centred = signal - signal.mean()
+    mean = moving_average(centred, window)
+    mean_sq = moving_average(centred ** 2, window)
+    return np.maximum(mean_sq - mean ** 2, 0.0)
+
+
+def min_variance_window(signal, window):
+    """Start index and variance of the quietest epoch (e.g. a resting baseline)."""
+    variances = moving_variance(signal, window)
+    start_idx = int(np.argmin(variances))
+    return start_idx, float(variances[start_idx])